@@ -4,6 +4,7 @@ Main entry point for File Watcher
 """
 
 import argparse
+import sys
 
 # Support both relative and absolute imports
 try:
@@ -12,14 +13,99 @@ except ImportError:
     from cat_file_watcher import FileWatcher
 
 
+def replay_main(argv):
+    """Entry point of the replay command.
+
+    Args:
+        argv: Command line arguments after "replay"
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src replay",
+        description="Replay an event journal against a config on a virtual clock and compare latencies",
+    )
+    parser.add_argument("--config-filename", required=True, help="Path to the TOML configuration file")
+    parser.add_argument("--journal", required=True, help="Path of the event journal to replay")
+    parser.add_argument(
+        "--session",
+        type=int,
+        default=-1,
+        help="Index of the journal session to replay; each watcher run appends one (default: -1, the last)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        from .journal_replay import JournalReplay
+    except ImportError:
+        from journal_replay import JournalReplay
+
+    try:
+        report = JournalReplay.run(args.config_filename, args.journal, args.session)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if args.json:
+        import json
+
+        print(json.dumps(report, indent=2))
+    else:
+        print(JournalReplay.format_report(report))
+
+
 def main():
     """Main entry point for the file watcher."""
+    if sys.argv[1:2] == ["replay"]:
+        replay_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(description="Monitor files and execute commands on timestamp changes")
     parser.add_argument("--config-filename", required=True, help="Path to the TOML configuration file")
+    parser.add_argument(
+        "--config-cache",
+        help="Path to a compiled config cache file; unchanged configs are loaded from it without parsing TOML",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes; with more than 1, entries are split across workers (default: 1)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Profile the main loop with cProfile and write pstats to PATH (plus a per-subsystem report to PATH.txt)",
+    )
+    parser.add_argument(
+        "--profile-ticks",
+        type=int,
+        default=100,
+        help="Number of main loop ticks to profile with --profile (default: 100)",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="With --profile, also report allocation growth across the profiled ticks using tracemalloc",
+    )
 
     args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.profile_ticks < 1:
+        parser.error("--profile-ticks must be at least 1")
+    if args.profile and args.workers > 1:
+        parser.error("--profile cannot be combined with --workers")
+
+    if args.workers > 1:
+        try:
+            from .sharded_watcher import ShardedFileWatcher
+        except ImportError:
+            from sharded_watcher import ShardedFileWatcher
 
-    watcher = FileWatcher(args.config_filename)
+        watcher = ShardedFileWatcher(args.config_filename, args.workers, args.config_cache)
+    else:
+        watcher = FileWatcher(args.config_filename, args.config_cache)
+        if args.profile:
+            watcher.start_profiling(args.profile, args.profile_ticks, args.profile_memory)
     watcher.run()
 
 
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Adaptive polling intervals for File Watcher
+Polls files that change often at a short interval and quiet files at a long one
+"""
+
+# Support both relative and absolute imports
+try:
+    from .interval_parser import IntervalParser
+except ImportError:
+    from interval_parser import IntervalParser
+
+
+class AdaptiveInterval:
+    """Handles per-entry polling intervals that follow the observed change frequency.
+
+    Entries opt in with adaptive = { min = "200ms", max = "30s" }. An entry
+    starts at the minimum interval, drops back to it whenever a change is
+    detected, and grows by GROWTH_FACTOR after every quiet check until it
+    reaches the maximum. Current intervals are kept in a dictionary keyed by
+    entry key (e.g. "#0").
+    """
+
+    GROWTH_FACTOR = 2.0
+
+    @staticmethod
+    def get_bounds(settings):
+        """Get the interval bounds of an adaptive entry.
+
+        Args:
+            settings: Entry settings dictionary containing "adaptive"
+
+        Returns:
+            tuple: (minimum, maximum) interval in seconds
+        """
+        adaptive = settings["adaptive"]
+        return IntervalParser.parse_interval(adaptive["min"]), IntervalParser.parse_interval(adaptive["max"])
+
+    @staticmethod
+    def get_interval(file_adaptive, entry_key, settings):
+        """Get the current polling interval of an adaptive entry.
+
+        Args:
+            file_adaptive: Dictionary tracking current intervals per entry
+            entry_key: Unique key for tracking
+            settings: Entry settings dictionary containing "adaptive"
+
+        Returns:
+            float: Interval in seconds
+        """
+        interval = file_adaptive.get(entry_key)
+        if interval is None:
+            interval = AdaptiveInterval.get_bounds(settings)[0]
+        return interval
+
+    @staticmethod
+    def record_check(file_adaptive, entry_key, settings, changed):
+        """Update an entry's interval after a check.
+
+        Args:
+            file_adaptive: Dictionary tracking current intervals per entry
+            entry_key: Unique key for tracking
+            settings: Entry settings dictionary containing "adaptive"
+            changed: Whether the check detected a change
+
+        Returns:
+            float: The entry's new interval in seconds
+        """
+        minimum, maximum = AdaptiveInterval.get_bounds(settings)
+        if changed:
+            interval = minimum
+        else:
+            interval = min(
+                maximum,
+                AdaptiveInterval.get_interval(file_adaptive, entry_key, settings) * AdaptiveInterval.GROWTH_FACTOR,
+            )
+        file_adaptive[entry_key] = interval
+        return interval
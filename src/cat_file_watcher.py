@@ -3,40 +3,113 @@
 File Watcher - Monitor files and execute commands on timestamp changes
 """
 
-import os
 import time
 
-from colorama import Fore
-
 # Support both relative and absolute imports
 try:
+    from .adaptive_interval import AdaptiveInterval
+    from .clock import Clock
+    from .clock_monitor import ClockMonitor
     from .config_loader import ConfigLoader
+    from .deadline_scheduler import DeadlineScheduler
+    from .direct_exec import DirectExec
+    from .entry_state import EntryState
     from .error_logger import ErrorLogger
+    from .event_journal import EventJournal
+    from .external_config_merger import ExternalConfigMerger
     from .file_monitor import FileMonitor
     from .interval_parser import IntervalParser
+    from .interval_scheduler import IntervalScheduler
+    from .load_shedder import LoadShedder
+    from .output_capture import OutputCapture
+    from .path_backoff import PathBackoff
     from .process_detector import ProcessDetector
-    from .repo_updater import RepoUpdater
+    from .python_worker_pool import PythonWorkerPool
+    from .shell_session import ShellSession
+    from .state_store import StateStore
+    from .terminal_colors import Fore
+    from .tick_monitor import TickMonitor
+    from .time_period_checker import TimePeriodChecker
     from .timestamp_printer import TimestampPrinter
 except ImportError:
+    from adaptive_interval import AdaptiveInterval
+    from clock import Clock
+    from clock_monitor import ClockMonitor
     from config_loader import ConfigLoader
+    from deadline_scheduler import DeadlineScheduler
+    from direct_exec import DirectExec
+    from entry_state import EntryState
     from error_logger import ErrorLogger
+    from event_journal import EventJournal
+    from external_config_merger import ExternalConfigMerger
     from file_monitor import FileMonitor
     from interval_parser import IntervalParser
+    from interval_scheduler import IntervalScheduler
+    from load_shedder import LoadShedder
+    from output_capture import OutputCapture
+    from path_backoff import PathBackoff
     from process_detector import ProcessDetector
-    from repo_updater import RepoUpdater
+    from python_worker_pool import PythonWorkerPool
+    from shell_session import ShellSession
+    from state_store import StateStore
+    from terminal_colors import Fore
+    from tick_monitor import TickMonitor
+    from time_period_checker import TimePeriodChecker
     from timestamp_printer import TimestampPrinter
 
+# Seconds an auto-update restart waits for the main loop to get ready for it
+RESTART_SAVE_TIMEOUT = 60
+
 
 class FileWatcher:
     """Monitors files and executes commands when timestamps change."""
 
-    def __init__(self, config_path):
-        """Initialize the file watcher with a configuration file."""
+    def __init__(self, config_path, config_cache_path=None):
+        """Initialize the file watcher with a configuration file.
+
+        Args:
+            config_path: Path to the TOML configuration file
+            config_cache_path: Optional path to the compiled config cache file
+        """
         self.config_path = config_path
-        self.config = ConfigLoader.load_config(config_path)
-        self.file_timestamps = {}
-        self.file_last_check = {}
-        self.config_last_check = 0
+        self.config_cache_path = config_cache_path
+        self.config = ConfigLoader.load_config(config_path, config_cache_path)
+        # Mtimes and last check times of all entries, kept in compact typed columns
+        self.file_timestamps = EntryState.create_column(self.config)
+        self.file_last_check = EntryState.create_column(self.config)
+        self.file_backoff = {}
+        self.file_last_run = {}
+        # Current polling intervals of entries with an adaptive setting
+        self.file_adaptive = {}
+        # Cron-scheduled entries, ordered by their next fire time
+        self.scheduler = DeadlineScheduler()
+        self.scheduler.load(self.config)
+        # Entries polled at an interval, ordered by when they have to be visited again
+        self.interval_scheduler = IntervalScheduler(self.config)
+        # Entries paused through the control socket, by identity so they survive reloads
+        self.paused_identities = set()
+        self.paused_entries = set()
+        # Interval bookkeeping uses Clock.monotonic(); ClockMonitor detects suspends and clock steps
+        self.config_last_check = float("-inf")
+        self.clock_monitor = ClockMonitor()
+        self.stats = {
+            "started": Clock.time(),
+            "ticks": 0,
+            "tick_seconds_total": 0.0,
+            "tick_seconds_max": 0.0,
+            "reloads": 0,
+            "control_requests": 0,
+            "triggers": 0,
+            "overruns": 0,
+            "carried_over": 0,
+            "suspends": 0,
+            "clock_jumps": 0,
+        }
+        self._last_overrun_report = None
+        LoadShedder.reset()
+        self._idle_until = None
+        self._control_server = None
+        self._profiler = None
         self.config_timestamp = self._get_file_timestamp(config_path)
 
         # Track external files and their timestamps
@@ -48,8 +121,150 @@ class FileWatcher:
         enable_timestamp = self.config.get("enable_timestamp", True)
         TimestampPrinter.set_enable_timestamp(enable_timestamp)
 
+        # Restore persistent state (only active when state_file is in config)
+        self.state_last_checkpoint = Clock.monotonic()
+        # Event set by the main loop once it got ready for an auto-update restart
+        self._restart_request = None
+        self._restore_state()
+
         # Set up auto-update checker (only active when [auto_update] is in config)
-        self._repo_updater = RepoUpdater(self.config) if "auto_update" in self.config else None
+        self._repo_updater = self._create_repo_updater() if "auto_update" in self.config else None
+
+    def _create_repo_updater(self):
+        """Create the auto-update checker, importing it only when configured."""
+        try:
+            from .repo_updater import RepoUpdater
+        except ImportError:
+            from repo_updater import RepoUpdater
+
+        return RepoUpdater(self.config, before_restart=self._before_restart)
+
+    def _before_restart(self):
+        """Prepare for an auto-update restart of the process.
+
+        Runs on the updater's thread. The main loop gets ready for the
+        restart (see _prepare_restart) at the end of its current tick, so the
+        state is not written while the tick changes it; if that does not
+        happen within RESTART_SAVE_TIMEOUT seconds, the restart goes ahead
+        with the last checkpoint.
+        """
+        import threading
+
+        ready = threading.Event()
+        self._restart_request = ready
+        if not ready.wait(RESTART_SAVE_TIMEOUT):
+            TimestampPrinter.print(
+                "Warning: Main loop did not get ready for the restart in time; restarting anyway",
+                Fore.YELLOW,
+            )
+
+    def _serve_restart_request(self):
+        """Get ready for an auto-update restart if one is waiting for the main loop.
+
+        Returns:
+            bool: True if a restart was waiting
+        """
+        ready = self._restart_request
+        if ready is None:
+            return False
+        self._restart_request = None
+        self._prepare_restart()
+        ready.set()
+        return True
+
+    def _prepare_restart(self):
+        """Save the state for an auto-update restart; runs on the main loop."""
+        self.state_last_checkpoint = Clock.monotonic()
+        self._save_state()
+
+    def _create_control_server(self):
+        """Create the control socket server, importing it only when configured."""
+        try:
+            from .control_server import ControlServer
+        except ImportError:
+            from control_server import ControlServer
+
+        control_server = ControlServer(self.config["control_socket"])
+        return control_server if control_server.start() else None
+
+    def _open_event_journal(self):
+        """Start appending scheduler events to the configured event journal."""
+        journal_path = self.config["event_journal"]
+        try:
+            EventJournal.open(journal_path)
+        except OSError as e:
+            error_msg = f"Cannot open event journal '{journal_path}', continuing without it"
+            TimestampPrinter.print(f"Error: {error_msg}: {e}", Fore.RED)
+            ErrorLogger.log_error(self.config.get("error_log_file"), error_msg, e)
+            return
+        TimestampPrinter.print(f"Journaling scheduler events to '{journal_path}'")
+
+    def start_profiling(self, output_path, ticks=None, trace_memory=False):
+        """Profile the next main loop ticks with cProfile.
+
+        Args:
+            output_path: Path of the pstats output file (a text report is written next to it)
+            ticks: Number of ticks to profile (default: LoopProfiler.DEFAULT_TICKS)
+            trace_memory: If True, also report allocation growth with tracemalloc
+        """
+        try:
+            from .loop_profiler import LoopProfiler
+        except ImportError:
+            from loop_profiler import LoopProfiler
+
+        if self._profiler is not None:
+            self._profiler.finish()
+        self._profiler = LoopProfiler(output_path, ticks or LoopProfiler.DEFAULT_TICKS, trace_memory)
+        self._profiler.start()
+
+    def stop_profiling(self):
+        """Stop profiling early and write the results collected so far.
+
+        Returns:
+            bool: True if profiling was active
+        """
+        if self._profiler is None:
+            return False
+        self._profiler.finish()
+        self._profiler = None
+        return True
+
+    def _restore_state(self):
+        """Seed tracking state from the state file so changes made while down are detected."""
+        state_file = self.config.get("state_file")
+        if not state_file:
+            return
+
+        saved_entries = StateStore.load(state_file)
+        restored = StateStore.restore(
+            self.config, saved_entries, self.file_timestamps, self.file_last_check, self.file_last_run
+        )
+        if restored:
+            TimestampPrinter.print(f"Restored state for {restored} entries from '{state_file}'", Fore.GREEN)
+
+    def _save_state(self):
+        """Write the current tracking state to the state file, if configured."""
+        state_file = self.config.get("state_file")
+        if state_file:
+            StateStore.save(state_file, self.config, self.file_timestamps, self.file_last_run)
+
+    def _checkpoint_state(self):
+        """Periodically checkpoint tracking state to the state file, and when a restart asks for it."""
+        if self._serve_restart_request():
+            return
+
+        if not self.config.get("state_file"):
+            return
+
+        checkpoint_interval = IntervalParser.parse_interval(
+            self.config.get("state_checkpoint_interval", StateStore.DEFAULT_CHECKPOINT_INTERVAL)
+        )
+        current_time = Clock.monotonic()
+        if current_time - self.state_last_checkpoint < checkpoint_interval:
+            return
+
+        self.state_last_checkpoint = current_time
+        self._save_state()
 
     def _get_file_timestamp(self, filepath):
         """Get the modification timestamp of a file (backward compatibility)."""
@@ -69,21 +284,7 @@ class FileWatcher:
         Returns:
             list: List of absolute paths to external files
         """
-        external_files = self.config.get("external_files", [])
-        if not isinstance(external_files, list):
-            return []
-
-        # Get directory of main config file for resolving relative paths
-        main_config_dir = os.path.dirname(os.path.abspath(self.config_path))
-
-        resolved_paths = []
-        for external_file in external_files:
-            # Resolve relative paths relative to main config file
-            if not os.path.isabs(external_file):
-                external_file = os.path.join(main_config_dir, external_file)
-            resolved_paths.append(external_file)
-
-        return resolved_paths
+        return ExternalConfigMerger.resolve_external_file_paths(self.config, self.config_path)
 
     def _update_external_file_tracking(self):
         """Update the tracking of external files and their timestamps."""
@@ -105,61 +306,91 @@ class FileWatcher:
         old index-to-timestamp mappings can cause unintended command execution.
         """
         if "files" not in self.config:
-            self.file_timestamps = {}
-            self.file_last_check = {}
+            self.file_timestamps = EntryState.create_column(self.config)
+            self.file_last_check = EntryState.create_column(self.config)
+            self.file_backoff = {}
+            self.file_last_run = {}
+            self.file_adaptive = {}
             return
 
-        new_timestamps = {}
+        new_timestamps = EntryState.create_column(self.config)
         for index, entry in enumerate(self.config["files"]):
             filename = entry.get("path", "")
-            entry_key = f"#{index}"
 
             if filename:  # Only for actual files, not empty paths
                 current_timestamp = self._get_file_timestamp(filename)
                 if current_timestamp is not None:
-                    new_timestamps[entry_key] = current_timestamp
+                    new_timestamps.set_at(index, current_timestamp)
 
         self.file_timestamps = new_timestamps
         # Clear check times to allow immediate checking if needed
-        self.file_last_check = {}
+        self.file_last_check = EntryState.create_column(self.config)
+        # Backoff state, last runs and adaptive intervals are keyed by index too, so they must not survive index shifts
+        self.file_backoff = {}
+        self.file_last_run = {}
+        self.file_adaptive = {}
+
+    def _on_config_reloaded(self):
+        """Handle a successful config reload.
+
+        Resets file timestamps to prevent false triggers from index shifts,
+        reschedules cron-scheduled entries, resolves directly run commands
+        again and applies the output capture and Python worker options.
+        """
+        self._reset_file_timestamps_after_reload()
+        self.scheduler.load(self.config)
+        self.interval_scheduler = IntervalScheduler(self.config)
+        DirectExec.configure(self.config)
+        OutputCapture.configure(self.config)
+        PythonWorkerPool.configure(self.config)
 
     def _calculate_main_loop_interval(self):
+        """Calculate the main loop interval from config settings (backward compatibility)."""
+        return FileWatcher.calculate_main_loop_interval(self.config)
+
+    @staticmethod
+    def calculate_main_loop_interval(config):
         """Calculate the main loop interval from config settings.
 
         Returns the minimum interval to ensure adequate polling granularity
         for all configured checks (default_interval, config_check_interval,
         and all per-file intervals).
 
+        Args:
+            config: Configuration dictionary
+
         Returns:
             float: Interval in seconds
         """
         intervals = []
 
         # Add default_interval (supports both old format and new format)
-        default_interval = self.config.get("default_interval", "1s")
+        default_interval = config.get("default_interval", "1s")
         intervals.append(IntervalParser.parse_interval(default_interval))
 
         # Add config_check_interval (supports both old format and new format)
-        config_check_interval = self.config.get("config_check_interval", "1s")
+        config_check_interval = config.get("config_check_interval", "1s")
         intervals.append(IntervalParser.parse_interval(config_check_interval))
 
-        # Add all per-file intervals
-        if "files" in self.config:
-            for entry in self.config["files"]:
+        # Add all per-file intervals (adaptive entries may poll as often as their minimum)
+        if "files" in config:
+            for entry in config["files"]:
                 if "interval" in entry:
                     file_interval = entry["interval"]
                     intervals.append(IntervalParser.parse_interval(file_interval))
+                if "adaptive" in entry:
+                    intervals.append(AdaptiveInterval.get_bounds(entry)[0])
 
         # Add all per-command intervals (from commands section before merging)
-        if "commands" in self.config:
-            for entry in self.config["commands"]:
+        if "commands" in config:
+            for entry in config["commands"]:
                 if "interval" in entry:
                     command_interval = entry["interval"]
                     intervals.append(IntervalParser.parse_interval(command_interval))
 
         # Add all per-process intervals (from processes section before merging)
-        if "processes" in self.config:
-            for entry in self.config["processes"]:
+        if "processes" in config:
+            for entry in config["processes"]:
                 if "interval" in entry:
                     process_interval = entry["interval"]
                     intervals.append(IntervalParser.parse_interval(process_interval))
@@ -169,7 +400,7 @@ class FileWatcher:
 
     def _check_config_file(self):
         """Check if config file or external files have been modified and reload if needed."""
-        current_time = time.time()
+        current_time = Clock.monotonic()
 
         # Get config check interval (supports both old and new format), default to "1s"
         config_check_interval_value = self.config.get("config_check_interval", "1s")
@@ -215,36 +446,238 @@ class FileWatcher:
                 f"Detected change in config file '{changed_file}', reloading...",
                 Fore.GREEN,
             )
-            error_log_file = self.config.get("error_log_file")
-            try:
-                new_config = ConfigLoader.load_config(self.config_path)
-                self.config = new_config
-                # If main config changed, reuse current_timestamp; otherwise re-fetch
-                if changed_file == self.config_path:
-                    self.config_timestamp = current_timestamp
+            self._reload_config(changed_file)
+
+    def _reload_config(self, changed_file):
+        """Reload the config, keeping the previous config if the new one is invalid.
+
+        Args:
+            changed_file: Path of the file that triggered the reload (for messages)
+
+        Returns:
+            bool: True if the config was reloaded
+        """
+        error_log_file = self.config.get("error_log_file")
+        try:
+            new_config = ConfigLoader.load_config(self.config_path, self.config_cache_path)
+            self.config = new_config
+            self.config_timestamp = self._get_file_timestamp(self.config_path)
+            # Update external file tracking after reload (list may have changed)
+            self._update_external_file_tracking()
+            self._on_config_reloaded()
+            self._update_paused_entries()
+            self.stats["reloads"] += 1
+            EventJournal.record(EventJournal.RELOAD)
+            TimestampPrinter.print("Config reloaded successfully", Fore.GREEN)
+            return True
+        except SystemExit as e:
+            error_msg = f"Fatal error reloading config file '{changed_file}'"
+            TimestampPrinter.print(f"Error reloading config: {e}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, e)
+            TimestampPrinter.print("Continuing with previous config", Fore.YELLOW)
+        except Exception as e:
+            error_msg = f"Error reloading config file '{changed_file}'"
+            TimestampPrinter.print(f"Error reloading config: {e}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, e)
+            TimestampPrinter.print("Continuing with previous config", Fore.YELLOW)
+        return False
+
+    def _resolve_control_target(self, target):
+        """Find the entries addressed by a control command argument.
+
+        Args:
+            target: Entry key ("#3"), watched path, or group name
+
+        Returns:
+            list: Matching entry keys
+
+        Raises:
+            ValueError: If no entry matches
+        """
+        if not target:
+            raise ValueError("An entry key, path or group name is required")
+
+        entry_keys = []
+        for index, entry in enumerate(self.config.get("files", [])):
+            entry_key = f"#{index}"
+            if target in (entry_key, entry.get("path", "") or None, entry.get("group")):
+                entry_keys.append(entry_key)
+        if not entry_keys:
+            raise ValueError(f"No entry matches '{target}'")
+        return entry_keys
+
+    def _update_paused_entries(self):
+        """Recompute the paused entry keys from the paused identities."""
+        self.paused_entries = {
+            f"#{index}"
+            for index, entry in enumerate(self.config.get("files", []))
+            if StateStore.get_entry_identity(entry) in self.paused_identities
+        }
+
+    def _get_entry_status(self, target=""):
+        """Build the per-entry status reported by the control socket.
+
+        Args:
+            target: Entry key, path or group name to report only matching entries
+                together with their captured output, or empty for all entries
+
+        Returns:
+            list: One dictionary per entry
+
+        Raises:
+            ValueError: If no entry matches the target
+        """
+        statuses = []
+        files_config = self.config.get("files", [])
+        entry_keys = self._resolve_control_target(target) if target else [f"#{i}" for i in range(len(files_config))]
+        # Last checks are monotonic clock values; report them as timestamps
+        wall_offset = Clock.time() - Clock.monotonic()
+        for entry_key in entry_keys:
+            entry = files_config[int(entry_key[1:])]
+            last_check = self.file_last_check.get(entry_key)
+            if last_check is not None:
+                last_check += wall_offset
+            next_due = self.scheduler.get_deadline(entry_key)
+            if next_due is None and last_check is not None:
+                if "adaptive" in entry:
+                    interval = AdaptiveInterval.get_interval(self.file_adaptive, entry_key, entry)
                 else:
-                    self.config_timestamp = self._get_file_timestamp(self.config_path)
-                # Update external file tracking after reload (list may have changed)
-                self._update_external_file_tracking()
-                # Reset file timestamps to prevent false triggers from index shifts
-                self._reset_file_timestamps_after_reload()
-                TimestampPrinter.print("Config reloaded successfully", Fore.GREEN)
-            except SystemExit as e:
-                error_msg = f"Fatal error reloading config file '{changed_file}'"
-                TimestampPrinter.print(f"Error reloading config: {e}", Fore.RED)
-                ErrorLogger.log_error(error_log_file, error_msg, e)
-                TimestampPrinter.print("Continuing with previous config", Fore.YELLOW)
-            except Exception as e:
-                error_msg = f"Error reloading config file '{changed_file}'"
-                TimestampPrinter.print(f"Error reloading config: {e}", Fore.RED)
-                ErrorLogger.log_error(error_log_file, error_msg, e)
-                TimestampPrinter.print("Continuing with previous config", Fore.YELLOW)
-
-    def _check_files(self):
-        """Check all files for timestamp changes and execute commands if needed."""
+                    interval = ConfigLoader.get_interval_for_file(self.config, entry)
+                if PathBackoff.is_backing_off(self.file_backoff, entry_key):
+                    interval = PathBackoff.get_effective_interval(self.file_backoff, entry_key, interval, self.config)
+                next_due = last_check + interval
+            last_run = self.file_last_run.get(entry_key) or {}
+            statuses.append(
+                {
+                    "key": entry_key,
+                    "path": entry.get("path", ""),
+                    "group": entry.get("group"),
+                    "paused": entry_key in self.paused_entries,
+                    "last_check": last_check,
+                    "next_due": next_due,
+                    "last_run": last_run.get("started"),
+                    "last_duration": last_run.get("duration"),
+                    "output_bytes": OutputCapture.get_output_size(entry),
+                }
+            )
+            if target:
+                statuses[-1]["output"] = OutputCapture.get_output(entry)
+        return statuses
+
+    def _handle_profile_command(self, argument):
+        """Handle the profile control command ("on [ticks]", "on-memory [ticks]" or "off").
+
+        Args:
+            argument: Command argument
+
+        Returns:
+            dict: Response payload
+
+        Raises:
+            ValueError: If the argument is invalid
+        """
+        action, _, ticks = argument.partition(" ")
+        if action == "off":
+            return {"profiling": False, "stopped": self.stop_profiling()}
+        if action not in ("on", "on-memory"):
+            raise ValueError("Usage: profile on [ticks] | on-memory [ticks] | off")
+        try:
+            ticks = int(ticks) if ticks.strip() else None
+        except ValueError as e:
+            raise ValueError(f"Invalid tick count '{ticks}'") from e
+
+        output_path = self.config.get("profile_file", "cat-file-watcher.prof")
+        self.start_profiling(output_path, ticks, trace_memory=action == "on-memory")
+        return {"profiling": True, "output": output_path, "ticks": self._profiler.ticks}
+
+    def _handle_control_command(self, command, argument):
+        """Handle a request received on the control socket.
+
+        Args:
+            command: One of ControlServer.COMMANDS
+            argument: Command argument (may be empty)
+
+        Returns:
+            dict: Response payload
+
+        Raises:
+            ValueError: If the request cannot be fulfilled
+        """
+        self.stats["control_requests"] += 1
+
+        if command == "status":
+            return {"entries": self._get_entry_status(argument)}
+
+        if command == "trigger":
+            entry_keys = self._resolve_control_target(argument)
+            for entry_key in entry_keys:
+                FileMonitor.trigger_entry(self.config, entry_key, self.file_timestamps, self.file_last_run)
+            self.stats["triggers"] += len(entry_keys)
+            return {"entries": entry_keys}
+
+        if command == "reload":
+            TimestampPrinter.print("Reload requested via control socket", Fore.GREEN)
+            if not self._reload_config(self.config_path):
+                raise ValueError("Config reload failed; continuing with previous config")
+            return {"entries": len(self.config.get("files", []))}
+
+        if command in ("pause", "resume"):
+            entry_keys = self._resolve_control_target(argument)
+            files_config = self.config["files"]
+            identities = {StateStore.get_entry_identity(files_config[int(entry_key[1:])]) for entry_key in entry_keys}
+            if command == "pause":
+                self.paused_identities |= identities
+            else:
+                self.paused_identities -= identities
+            self._update_paused_entries()
+            TimestampPrinter.print(f"{command.capitalize()}d {len(entry_keys)} entries matching '{argument}'")
+            return {"entries": entry_keys}
+
+        if command == "profile":
+            return self._handle_profile_command(argument)
+
+        # dump-stats
+        stats = dict(self.stats)
+        stats["uptime"] = Clock.time() - stats.pop("started")
+        stats["entries"] = len(self.config.get("files", []))
+        stats["paused"] = len(self.paused_entries)
+        stats["backing_off"] = sum(
+            1 for entry_key in self.file_backoff if PathBackoff.is_backing_off(self.file_backoff, entry_key)
+        )
+        stats.update(LoadShedder.get_stats(self.config))
+        stats.update(OutputCapture.get_stats())
+        return {"stats": stats}
+
+    def _check_files(self, deadline=None):
+        """Check all files for timestamp changes and execute commands if needed.
+
+        Args:
+            deadline: Optional time.monotonic() value after which remaining due
+                entries are carried over to the next tick
+        """
         self.file_timestamps, self.file_last_check = FileMonitor.check_files(
-            self.config, self.file_timestamps, self.file_last_check
+            self.config,
+            self.file_timestamps,
+            self.file_last_check,
+            self.file_backoff,
+            self.file_last_run,
+            self.paused_entries,
+            deadline,
+            self.file_adaptive,
+            self.interval_scheduler,
         )
+        FileMonitor.run_scheduled(self.config, self.scheduler, self.file_last_run, self.paused_entries)
+
+    def _wait_for_next_tick(self, interval):
+        """Sleep until the next tick, serving control requests meanwhile.
+
+        Args:
+            interval: Seconds to wait
+        """
+        if self._control_server is not None:
+            self._control_server.wait(interval, self._handle_control_command)
+        else:
+            Clock.sleep(interval)
 
     def run(self, interval=None):
         """Run the file watcher with the specified check interval (in seconds).
@@ -264,14 +697,145 @@ class FileWatcher:
 
         if self._repo_updater is not None:
             self._repo_updater.start()
+        if self.config.get("control_socket"):
+            self._control_server = self._create_control_server()
+        if self.config.get("event_journal"):
+            self._open_event_journal()
+        # Search PATH and warm Python workers before the first trigger needs them
+        DirectExec.configure(self.config)
+        OutputCapture.configure(self.config)
+        PythonWorkerPool.configure(self.config)
 
         try:
             while True:
-                self._check_config_file()
-                self._check_files()
-                time.sleep(interval)
+                self._wait_for_next_tick(self.run_tick(interval))
         except KeyboardInterrupt:
             TimestampPrinter.print("\nStopping file watcher...")
         finally:
             if self._repo_updater is not None:
                 self._repo_updater.stop()
+            if self._control_server is not None:
+                self._control_server.close()
+            self.stop_profiling()
+            self._save_state()
+            EventJournal.close()
+            PythonWorkerPool.shutdown()
+            ShellSession.shutdown()
+
+    def run_tick(self, interval):
+        """Run one main loop tick.
+
+        Simulations drive the watcher with this directly: on a VirtualClock,
+        advance the clock by the returned wait between ticks.
+
+        Args:
+            interval: Main loop interval in seconds
+
+        Returns:
+            float: Seconds to wait before the next tick
+        """
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.begin_tick()
+        # Tick durations and budgets measure real work, so they stay on the real clock
+        tick_started = time.monotonic()
+        TickMonitor.begin_tick()
+        self._check_clock()
+        self._check_config_file()
+        tick_budget = TickMonitor.get_budget(self.config)
+        self._check_files(tick_started + tick_budget if tick_budget is not None else None)
+        self._checkpoint_state()
+        tick_duration = time.monotonic() - tick_started
+        EventJournal.record(EventJournal.TICK, None, tick_duration)
+        self._record_tick(tick_duration, interval)
+        if profiler is not None and profiler.end_tick() and self._profiler is profiler:
+            self._profiler = None
+        # Sleep only for what is left of the interval so polling does not drift,
+        # but wake up for the next cron firing even if the interval is longer
+        wait = max(0.0, interval - tick_duration, self._get_idle_wait())
+        cron_wait = self.scheduler.get_wait()
+        return wait if cron_wait is None else min(wait, cron_wait)
+
+    def _check_clock(self):
+        """Detect suspends and wall-clock steps since the last tick and react to them.
+
+        After a suspend each entry's missed_runs policy decides what happens to
+        the runs it missed. A wall-clock step does not affect intervals, but
+        cached time period states are recomputed for the new time.
+        """
+        suspended, jumped = self.clock_monitor.check()
+        if jumped:
+            self.stats["clock_jumps"] += 1
+            direction = "forward" if jumped > 0 else "back"
+            TimestampPrinter.print(
+                f"Warning: Wall clock was set {direction} by {abs(jumped):.0f}s; intervals are unaffected",
+                Fore.YELLOW,
+            )
+        if suspended:
+            self.stats["suspends"] += 1
+            affected = ClockMonitor.apply_missed_runs(self.config, self.file_last_check, self.scheduler, suspended)
+            TimestampPrinter.print(
+                f"Warning: Resumed after {suspended:.0f}s of suspend; "
+                f"{affected} entries missed runs and follow their missed_runs policy",
+                Fore.YELLOW,
+            )
+        if suspended or jumped:
+            # Entries outside their time period sleep until a wall-clock time that may have moved
+            self.interval_scheduler.invalidate()
+            TimePeriodChecker.clear_cache()
+            self._idle_until = None
+
+    def _get_idle_wait(self):
+        """Get how long to sleep when every entry is outside its time period.
+
+        The wait ends when the first time period opens, or earlier when the
+        config file is due to be checked for changes.
+
+        Returns:
+            float: Seconds to sleep (0.0 if any entry may need checking)
+        """
+        period_names = TimePeriodChecker.get_entry_period_names(self.config)
+        idle_until = TimePeriodChecker.get_idle_until(self.config, period_names) if period_names else None
+        if idle_until is None:
+            self._idle_until = None
+            return 0.0
+
+        if idle_until != self._idle_until:
+            self._idle_until = idle_until
+            opens_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(idle_until))
+            TimestampPrinter.print(f"All entries are outside their time periods; sleeping until {opens_at}")
+
+        config_check_interval = IntervalParser.parse_interval(self.config.get("config_check_interval", "1s"))
+        next_config_check = self.config_last_check + config_check_interval - Clock.monotonic()
+        return max(0.0, min(idle_until - Clock.time(), next_config_check))
+
+    def _record_tick(self, duration, interval=None):
+        """Record the duration of a main loop tick in the stats and report overruns.
+
+        Args:
+            duration: Tick duration in seconds
+            interval: Main loop interval in seconds (overruns are not checked if None)
+        """
+        self.stats["ticks"] += 1
+        self.stats["tick_seconds_total"] += duration
+        self.stats["tick_seconds_max"] = max(self.stats["tick_seconds_max"], duration)
+        self.stats["carried_over"] += TickMonitor.get_carried_over()
+
+        overran = interval is not None and duration > interval
+        if interval is not None:
+            shed_message = LoadShedder.record_tick(overran)
+            if shed_message is not None:
+                TimestampPrinter.print(
+                    f"Warning: {shed_message}" if overran else shed_message, Fore.YELLOW if overran else Fore.GREEN
+                )
+
+        if not overran:
+            self._last_overrun_report = None
+            return
+
+        self.stats["overruns"] += 1
+        # Report the first overrun of a streak, then at most once per OVERRUN_REPORT_INTERVAL
+        now = time.monotonic()
+        if self._last_overrun_report is None or now - self._last_overrun_report >= TickMonitor.OVERRUN_REPORT_INTERVAL:
+            self._last_overrun_report = now
+            TimestampPrinter.print(f"Warning: {TickMonitor.describe_overrun(duration, interval)}", Fore.YELLOW)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Injectable clock for File Watcher
+Routes scheduling time through one place so simulations can run on a virtual clock
+"""
+
+import time
+from datetime import datetime
+
+
+class SystemClock:
+    """Clock backed by the operating system."""
+
+    def time(self):
+        """Return the wall-clock timestamp (time.time())."""
+        return time.time()
+
+    def monotonic(self):
+        """Return the monotonic clock (time.monotonic())."""
+        return time.monotonic()
+
+    def boottime(self):
+        """Return CLOCK_BOOTTIME, which keeps counting during suspend, or None where unsupported."""
+        return time.clock_gettime(time.CLOCK_BOOTTIME) if hasattr(time, "CLOCK_BOOTTIME") else None
+
+    def now(self):
+        """Return the local wall-clock time as a naive datetime."""
+        return datetime.now()
+
+    def sleep(self, seconds):
+        """Sleep for the given number of seconds."""
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """Clock that only moves when told to, for deterministic and fast simulations.
+
+    sleep() advances the clock instantly, so a main loop running on a virtual
+    clock replays hours of operation in the time its ticks take to compute.
+    suspend() and step_wall() reproduce system suspends and wall-clock steps.
+    """
+
+    def __init__(self, start=1_700_000_000.0):
+        """Initialize the clock.
+
+        Args:
+            start: Initial wall-clock timestamp
+        """
+        self._wall = float(start)
+        self._monotonic = 0.0
+        self._boottime = 0.0
+
+    def time(self):
+        """Return the virtual wall-clock timestamp."""
+        return self._wall
+
+    def monotonic(self):
+        """Return the virtual monotonic clock."""
+        return self._monotonic
+
+    def boottime(self):
+        """Return the virtual boot-time clock (includes suspends)."""
+        return self._boottime
+
+    def now(self):
+        """Return the virtual local time as a naive datetime."""
+        return datetime.fromtimestamp(self._wall)
+
+    def sleep(self, seconds):
+        """Advance the clock instead of sleeping."""
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        """Let time pass normally.
+
+        Args:
+            seconds: Seconds to advance every clock by
+        """
+        self._wall += seconds
+        self._monotonic += seconds
+        self._boottime += seconds
+
+    def suspend(self, seconds):
+        """Simulate a system suspend: the monotonic clock stands still.
+
+        Args:
+            seconds: Length of the suspend in seconds
+        """
+        self._wall += seconds
+        self._boottime += seconds
+
+    def step_wall(self, seconds):
+        """Simulate a wall-clock step (e.g. by NTP) without time passing.
+
+        Args:
+            seconds: Seconds to move the wall clock by (negative to set it back)
+        """
+        self._wall += seconds
+
+
+class Clock:
+    """Process-wide access point for the clock used by scheduling code.
+
+    Defaults to the system clock. Durations that measure real work (tick
+    costs, profiling) keep using the time module directly.
+    """
+
+    _clock = SystemClock()
+
+    @staticmethod
+    def set_clock(clock):
+        """Replace the clock.
+
+        Args:
+            clock: Object with time(), monotonic(), boottime(), now() and sleep()
+                (e.g. VirtualClock), or None to restore the system clock
+        """
+        Clock._clock = clock if clock is not None else SystemClock()
+
+    @staticmethod
+    def get_clock():
+        """Return the clock in use."""
+        return Clock._clock
+
+    @staticmethod
+    def time():
+        """Return the wall-clock timestamp."""
+        return Clock._clock.time()
+
+    @staticmethod
+    def monotonic():
+        """Return the monotonic clock used for interval bookkeeping."""
+        return Clock._clock.monotonic()
+
+    @staticmethod
+    def boottime():
+        """Return the boot-time clock, or None where unsupported."""
+        return Clock._clock.boottime()
+
+    @staticmethod
+    def now():
+        """Return the local wall-clock time as a naive datetime."""
+        return Clock._clock.now()
+
+    @staticmethod
+    def sleep(seconds):
+        """Sleep (or, on a virtual clock, advance) for the given number of seconds."""
+        Clock._clock.sleep(seconds)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Clock discontinuity detection for File Watcher
+Detects system suspends and wall-clock steps and applies per-entry missed-run policies
+"""
+
+# Support both relative and absolute imports
+try:
+    from .clock import Clock
+    from .config_loader import ConfigLoader
+except ImportError:
+    from clock import Clock
+    from config_loader import ConfigLoader
+
+
+class ClockMonitor:
+    """Detects discontinuities between the scheduling clock and real time.
+
+    Interval bookkeeping uses Clock.monotonic(), which is immune to wall-clock
+    steps but (on Linux and macOS) stands still while the system is suspended.
+    Each tick the monotonic clock is compared against CLOCK_BOOTTIME, which
+    keeps counting during suspend, and against the wall clock. Where
+    CLOCK_BOOTTIME is not available, a forward wall-clock jump is treated as a
+    suspend because the two cannot be told apart.
+    """
+
+    # Discrepancies below this many seconds are ordinary scheduling jitter
+    JUMP_THRESHOLD = 30.0
+    DEFAULT_MISSED_RUNS = "run-once"
+    # Upper bound on runs replayed per entry by the "catch-up" policy
+    MAX_CATCH_UP_RUNS = 60
+
+    def __init__(self):
+        """Initialize the monitor with the current clock readings."""
+        self._last = ClockMonitor.read_clocks()
+
+    @staticmethod
+    def read_clocks():
+        """Read the clocks used for discontinuity detection.
+
+        Returns:
+            tuple: (wall, monotonic, boottime) readings; boottime is None where unsupported
+        """
+        return Clock.time(), Clock.monotonic(), Clock.boottime()
+
+    def check(self, readings=None):
+        """Compare the clocks against the previous check.
+
+        Args:
+            readings: Optional (wall, monotonic, boottime) tuple, defaults to read_clocks()
+
+        Returns:
+            tuple: (suspended, jumped) in seconds, each 0.0 unless it exceeds JUMP_THRESHOLD;
+                suspended is time the monotonic clock missed, jumped is how far the wall
+                clock was stepped (negative when set back)
+        """
+        if readings is None:
+            readings = ClockMonitor.read_clocks()
+        last_wall, last_monotonic, last_boottime = self._last
+        wall, monotonic, boottime = readings
+        self._last = readings
+
+        monotonic_elapsed = monotonic - last_monotonic
+        wall_elapsed = wall - last_wall
+        if boottime is not None and last_boottime is not None:
+            suspended = (boottime - last_boottime) - monotonic_elapsed
+            jumped = wall_elapsed - (boottime - last_boottime)
+        elif wall_elapsed > monotonic_elapsed:
+            suspended, jumped = wall_elapsed - monotonic_elapsed, 0.0
+        else:
+            suspended, jumped = 0.0, wall_elapsed - monotonic_elapsed
+
+        return (
+            suspended if suspended >= ClockMonitor.JUMP_THRESHOLD else 0.0,
+            jumped if abs(jumped) >= ClockMonitor.JUMP_THRESHOLD else 0.0,
+        )
+
+    @staticmethod
+    def apply_missed_runs(config, file_last_check, scheduler, suspended, now=None, wall_now=None):
+        """Apply each entry's missed_runs policy after a suspend.
+
+        The monotonic clock did not advance while suspended, so without this
+        every entry would simply resume its interval where it left off.
+
+        - "skip": missed runs are dropped and the entry keeps its original phase
+        - "run-once": the entry runs once now (the default)
+        - "catch-up": the missed runs are replayed, one per tick, up to MAX_CATCH_UP_RUNS
+
+        Cron-scheduled entries fire once for all missed fire times unless their
+        policy is "skip".
+
+        Args:
+            config: Configuration dictionary
+            file_last_check: Dictionary tracking last check time (Clock.monotonic()) per entry
+            scheduler: DeadlineScheduler loaded with the config
+            suspended: Seconds the monotonic clock missed
+            now: Current Clock.monotonic() value, defaults to now
+            wall_now: Current timestamp, defaults to now
+
+        Returns:
+            int: Number of entries that missed at least one run
+        """
+        if now is None:
+            now = Clock.monotonic()
+        if wall_now is None:
+            wall_now = Clock.time()
+
+        affected = 0
+        for index, entry in enumerate(config.get("files", [])):
+            entry_key = f"#{index}"
+            policy = entry.get("missed_runs", ClockMonitor.DEFAULT_MISSED_RUNS)
+
+            if "schedule" in entry:
+                deadline = scheduler.get_deadline(entry_key)
+                if deadline is not None and deadline <= wall_now:
+                    affected += 1
+                    if policy == "skip":
+                        scheduler.skip_missed(entry_key, wall_now)
+                continue
+
+            if entry_key not in file_last_check:
+                continue
+            interval = ConfigLoader.get_interval_for_file(config, entry)
+            if interval <= 0:
+                continue
+            elapsed = now - file_last_check[entry_key] + suspended
+            missed = int(elapsed // interval)
+            if missed == 0:
+                continue
+
+            affected += 1
+            if policy == "skip":
+                file_last_check[entry_key] = now - elapsed % interval
+            elif policy == "catch-up":
+                file_last_check[entry_key] = now - min(missed, ClockMonitor.MAX_CATCH_UP_RUNS) * interval
+            else:
+                file_last_check[entry_key] = now - interval
+        return affected
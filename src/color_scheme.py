@@ -2,8 +2,13 @@
 """Color scheme utilities for terminal output."""
 
 import re
+import sys
 
-from colorama import Fore
+# Support both relative and absolute imports
+try:
+    from .terminal_colors import Fore
+except ImportError:
+    from terminal_colors import Fore
 
 DEFAULT_COLOR_SCHEME = "monokai"
 
@@ -132,10 +137,21 @@ class ColorScheme:
 
     @staticmethod
     def _set_palette(palette: dict[str, str]):
-        """Apply palette values to colorama Fore."""
-        Fore.GREEN = palette.get("green", _COLOR_SCHEMES[DEFAULT_COLOR_SCHEME]["green"])
-        Fore.YELLOW = palette.get("yellow", _COLOR_SCHEMES[DEFAULT_COLOR_SCHEME]["yellow"])
-        Fore.RED = palette.get("red", _COLOR_SCHEMES[DEFAULT_COLOR_SCHEME]["red"])
+        """Apply palette values to Fore (and to colorama's Fore if colorama is loaded)."""
+        targets = [Fore]
+        colorama = sys.modules.get("colorama")
+        if colorama is not None:
+            targets.append(colorama.Fore)
+
+        for target in targets:
+            target.GREEN = palette.get("green", _COLOR_SCHEMES[DEFAULT_COLOR_SCHEME]["green"])
+            target.YELLOW = palette.get("yellow", _COLOR_SCHEMES[DEFAULT_COLOR_SCHEME]["yellow"])
+            target.RED = palette.get("red", _COLOR_SCHEMES[DEFAULT_COLOR_SCHEME]["red"])
+
+    @staticmethod
+    def sync_colorama():
+        """Copy the current palette to colorama's Fore after colorama has been imported."""
+        ColorScheme._set_palette({"green": Fore.GREEN, "yellow": Fore.YELLOW, "red": Fore.RED})
 
 
 # Initialize with default palette on import
@@ -4,26 +4,61 @@ Command executor for File Watcher
 """
 
 import shlex
-import subprocess
 import sys
-from datetime import datetime
-
-from colorama import Fore, Style
 
 # Support both relative and absolute imports
 try:
+    from .clock import Clock
+    from .direct_exec import DirectExec
     from .error_logger import ErrorLogger
+    from .load_shedder import LoadShedder
+    from .output_capture import OutputCapture
     from .process_detector import ProcessDetector
+    from .process_spawner import ProcessSpawner
+    from .python_worker_pool import PythonWorkerPool
+    from .shell_session import ShellSession
+    from .terminal_colors import Fore, Style
+    from .tick_monitor import TickMonitor
     from .timestamp_printer import TimestampPrinter
 except ImportError:
+    from clock import Clock
+    from direct_exec import DirectExec
     from error_logger import ErrorLogger
+    from load_shedder import LoadShedder
+    from output_capture import OutputCapture
     from process_detector import ProcessDetector
+    from process_spawner import ProcessSpawner
+    from python_worker_pool import PythonWorkerPool
+    from shell_session import ShellSession
+    from terminal_colors import Fore, Style
+    from tick_monitor import TickMonitor
     from timestamp_printer import TimestampPrinter
 
+# Ways of running an entry's command string (see CommandExecutor._run_command_string)
+RUNNERS = ("shell", "shell-session", "python-worker")
+DEFAULT_RUNNER = "shell"
+
 
 class CommandExecutor:
     """Handles execution of shell commands with process suppression support."""
 
+    # Seconds a foreground command may run before it is killed
+    COMMAND_TIMEOUT = 30
+
+    # Optional semaphore-like object bounding concurrently running commands
+    # (shared between worker processes in sharded mode)
+    _concurrency_limiter = None
+
+    @staticmethod
+    def set_concurrency_limiter(limiter):
+        """Set a limiter that every command execution must hold while running.
+
+        Args:
+            limiter: Object supporting the context manager protocol
+                (e.g. multiprocessing.BoundedSemaphore), or None for no limit
+        """
+        CommandExecutor._concurrency_limiter = limiter
+
     @staticmethod
     def execute_command(command, filepath, settings, config=None):
         """Execute a shell command if the conditions are met.
@@ -35,23 +70,26 @@ class CommandExecutor:
                 Optional keys: suppress_if_process, enable_log, argv,
                 terminate_if_process, terminate_if_window_title
             config: Optional global configuration dictionary containing log_file
+
+        Returns:
+            bool: False if the command was suppressed or shed, True otherwise
         """
         # Handle terminate_if_process feature
         if "terminate_if_process" in settings:
             CommandExecutor._handle_process_termination(settings, config)
-            return
+            return True
 
         # Handle terminate_if_window_title feature
         if "terminate_if_window_title" in settings:
             CommandExecutor._handle_window_title_termination(settings, config)
-            return
+            return True
 
         # Check if command execution should be suppressed based on running processes
         if CommandExecutor._check_process_suppression(filepath, settings, config):
-            return
+            return False
 
         # Execute the command
-        CommandExecutor._execute_shell_command(command, filepath, settings, config)
+        return CommandExecutor._execute_shell_command(command, filepath, settings, config)
 
     @staticmethod
     def _check_process_suppression(filepath, settings, config):
@@ -69,7 +107,7 @@ class CommandExecutor:
             return False
 
         process_pattern = settings["suppress_if_process"]
-        matched_process = ProcessDetector.get_matching_process(process_pattern)
+        matched_process = TickMonitor.timed("process scan", ProcessDetector.get_matching_process, process_pattern)
         if matched_process:
             # For empty filename, show the command being skipped instead
             if filepath == "":
@@ -97,7 +135,13 @@ class CommandExecutor:
             filepath: The path to the file that changed
             settings: Dictionary containing file-specific settings
             config: Optional global configuration dictionary
+
+        Returns:
+            bool: False if the command was shed because no command slot was free, True otherwise
         """
+        # Imported on first command execution to keep startup cheap
+        import subprocess
+
         error_log_file = config.get("error_log_file") if config else None
         cwd = settings.get("cwd")
         no_focus = settings.get("no_focus", False)
@@ -125,21 +169,50 @@ class CommandExecutor:
         if settings.get("enable_log", False) and config and config.get("log_file"):
             CommandExecutor._write_to_log(filepath, settings, config)
 
+        limiter = CommandExecutor._concurrency_limiter
+        priority = LoadShedder.get_priority(settings)
+        if priority == "critical":
+            # Critical commands never wait for a command slot
+            limiter = None
+        elif limiter is not None and priority == "background" and not limiter.acquire(False):
+            LoadShedder.record_shed_command()
+            TimestampPrinter.print(
+                f"Skipped background command (all command slots busy): {display_command}", Fore.YELLOW
+            )
+            return False
+        elif limiter is not None:
+            limiter.acquire()
+        # Captured output is streamed with the entry's label and kept per entry;
+        # otherwise (and with other runners) commands write to the terminal as is
+        stream = None
+        runner = settings.get("runner", DEFAULT_RUNNER)
+        if not no_focus and runner == DEFAULT_RUNNER and OutputCapture.is_enabled(settings, config):
+            stream = OutputCapture.open(settings)
         try:
-            # Use capture_output=False to allow real-time output for long-running commands
-            if no_focus:
-                # When no_focus is enabled, prevent focus stealing with platform-specific mechanisms
-                result = CommandExecutor._run_no_focus_command(argv, cwd)
-            else:
-                # Default behavior: use shell=True
-                result = subprocess.run(command, shell=True, capture_output=False, text=True, timeout=30, cwd=cwd)
-            CommandExecutor._handle_command_result(result, display_command, filepath, error_log_file)
+            try:
+                if no_focus:
+                    # When no_focus is enabled, prevent focus stealing with platform-specific mechanisms
+                    result = CommandExecutor._run_no_focus_command(argv, cwd)
+                else:
+                    result = CommandExecutor._run_command_string(
+                        command, settings, cwd, stream.feed if stream is not None else None
+                    )
+            finally:
+                if limiter is not None:
+                    limiter.release()
+                if stream is not None:
+                    stream.close()
+            output = OutputCapture.get_output(settings) if stream is not None else None
+            CommandExecutor._handle_command_result(result, display_command, filepath, error_log_file, output)
+            return True
         except subprocess.TimeoutExpired as e:
             if filepath == "":
-                error_msg = f"Command timed out after 30 seconds: {display_command}"
+                error_msg = f"Command timed out after {CommandExecutor.COMMAND_TIMEOUT} seconds: {display_command}"
             else:
-                error_msg = f"Command timed out after 30 seconds for '{filepath}'"
+                error_msg = f"Command timed out after {CommandExecutor.COMMAND_TIMEOUT} seconds for '{filepath}'"
             TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
+            if stream is not None:
+                error_msg = CommandExecutor._with_output(error_msg, OutputCapture.get_output(settings))
             ErrorLogger.log_error(error_log_file, error_msg, e)
             raise
         except Exception as e:
@@ -151,6 +224,48 @@ class CommandExecutor:
             ErrorLogger.log_error(error_log_file, error_msg, e)
             raise
 
+    @staticmethod
+    def _run_command_string(command, settings, cwd, output=None):
+        """Run a command string with the entry's runner.
+
+        Args:
+            command: The command string to run
+            settings: Dictionary containing file-specific settings, may include 'runner'
+            cwd: Working directory for the command
+            output: Callable receiving the command's output as it is written, or None to
+                let the command write to the terminal (only used by the "shell" runner)
+
+        Returns:
+            subprocess.CompletedProcess: Result of the command
+
+        Raises:
+            subprocess.TimeoutExpired: If the command runs longer than COMMAND_TIMEOUT
+        """
+        runner = settings.get("runner", DEFAULT_RUNNER)
+        if runner == "shell-session":
+            if ShellSession.is_supported():
+                return ShellSession.run(command, cwd, CommandExecutor.COMMAND_TIMEOUT)
+            TimestampPrinter.print(
+                'Warning: runner "shell-session" needs a POSIX shell. Falling back to a new shell per command.',
+                Fore.YELLOW,
+            )
+        elif runner == "python-worker":
+            if not PythonWorkerPool.is_supported():
+                TimestampPrinter.print(
+                    'Warning: runner "python-worker" needs os.fork. Falling back to the shell.', Fore.YELLOW
+                )
+            elif PythonWorkerPool.uses_watcher_interpreter(command, cwd):
+                return PythonWorkerPool.run(command, cwd, CommandExecutor.COMMAND_TIMEOUT)
+            # Other interpreters were reported at load and run through the shell
+        else:
+            # Commands without shell syntax skip /bin/sh
+            resolved = DirectExec.resolve(command, cwd)
+            if resolved is not None:
+                return DirectExec.run(resolved, cwd, CommandExecutor.COMMAND_TIMEOUT, output)
+
+        # Default behavior: run the command string through the shell
+        return ProcessSpawner.run(command, True, cwd, CommandExecutor.COMMAND_TIMEOUT, output=output)
+
     @staticmethod
     def _run_no_focus_command(argv, cwd):
         """Run a command without stealing focus (Windows only, asynchronous).
@@ -170,13 +285,17 @@ class CommandExecutor:
         Returns:
             subprocess.CompletedProcess: A mock result object with returncode 0
         """
+        import subprocess
+
         if sys.platform != "win32":
             # no_focus is only supported on Windows
             TimestampPrinter.print(
                 "Warning: no_focus is only supported on Windows. Falling back to normal execution.", Fore.YELLOW
             )
             # Fallback to normal execution - on non-Windows, just run the command
-            result = subprocess.run(argv, shell=False, capture_output=False, text=True, timeout=30, cwd=cwd)
+            result = subprocess.run(
+                argv, shell=False, capture_output=False, text=True, timeout=CommandExecutor.COMMAND_TIMEOUT, cwd=cwd
+            )
             return result
 
         # Windows-specific: Show window without stealing focus
@@ -246,7 +365,7 @@ class CommandExecutor:
         return MockResult()
 
     @staticmethod
-    def _handle_command_result(result, command, filepath, error_log_file):
+    def _handle_command_result(result, command, filepath, error_log_file, output=None):
         """Handle the result of a command execution.
 
         Args:
@@ -254,6 +373,7 @@ class CommandExecutor:
             command: The shell command that was executed
             filepath: The path to the file that changed
             error_log_file: Path to error log file (optional)
+            output: Captured tail of the command's output, or None if not captured
         """
         if result.returncode != 0:
             if filepath == "":
@@ -261,9 +381,25 @@ class CommandExecutor:
             else:
                 error_msg = f"Command failed for '{filepath}' with exit code {result.returncode}"
             TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
-            # Log command execution error (without stderr since we're not capturing it)
+            # Log command execution error with the captured output, if any
             if error_log_file:
-                ErrorLogger.log_error(error_log_file, f"{error_msg}\nCommand: {command}")
+                log_message = f"{error_msg}\nCommand: {command}"
+                if output is not None:
+                    log_message = CommandExecutor._with_output(log_message, output)
+                ErrorLogger.log_error(error_log_file, log_message)
+
+    @staticmethod
+    def _with_output(message, output):
+        """Append captured command output to an error log message.
+
+        Args:
+            message: Error message
+            output: Captured tail of the command's output
+
+        Returns:
+            str: Message followed by the output
+        """
+        return f"{message}\nOutput (last {len(output.encode())} bytes):\n{output}"
 
     @staticmethod
     def _write_to_log(filepath, settings, config):
@@ -277,7 +413,7 @@ class CommandExecutor:
         error_log_file = config.get("error_log_file") if config else None
         try:
             log_file = config.get("log_file")
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp = Clock.now().strftime("%Y-%m-%d %H:%M:%S")
 
             with open(log_file, "a") as f:
                 f.write(f"[{timestamp}] File: {filepath}\n")
@@ -303,7 +439,7 @@ class CommandExecutor:
         error_log_file = config.get("error_log_file") if config else None
         try:
             suppression_log_file = config.get("suppression_log_file")
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp = Clock.now().strftime("%Y-%m-%d %H:%M:%S")
 
             with open(suppression_log_file, "a") as f:
                 f.write(f"[{timestamp}] File: {filepath}\n")
@@ -336,7 +472,7 @@ class CommandExecutor:
 
         # Process each pattern independently with safety check
         for pattern in process_patterns:
-            matched_processes = ProcessDetector.get_all_matching_processes(pattern)
+            matched_processes = TickMonitor.timed("process scan", ProcessDetector.get_all_matching_processes, pattern)
             CommandExecutor._process_matched_processes(pattern, matched_processes, error_log_file)
 
     @staticmethod
@@ -360,7 +496,7 @@ class CommandExecutor:
 
         # Process each pattern independently with safety check
         for pattern in title_patterns:
-            matched_windows = ProcessDetector.get_all_windows_by_title(pattern)
+            matched_windows = TickMonitor.timed("process scan", ProcessDetector.get_all_windows_by_title, pattern)
             CommandExecutor._process_matched_windows(pattern, matched_windows, error_log_file)
 
     @staticmethod
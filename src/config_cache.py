@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Compiled configuration cache for File Watcher
+Stores the fully merged and validated config so unchanged sources skip TOML parsing
+"""
+
+import os
+
+# Support both relative and absolute imports
+try:
+    from .terminal_colors import Fore
+    from .timestamp_printer import TimestampPrinter
+except ImportError:
+    from terminal_colors import Fore
+    from timestamp_printer import TimestampPrinter
+
+
+class ConfigCache:
+    """Handles reading and writing the on-disk compiled config cache.
+
+    The cache file is a pickle of a dictionary with the following keys:
+        version: get_version() of the code that wrote the cache
+        sources: List of (path, mtime_ns, size) signatures of the main config
+            file followed by all external files
+        config: The merged and validated configuration dictionary
+    """
+
+    # Format of the cache file itself; the code that builds the config is stamped separately
+    CACHE_VERSION = 2
+
+    _version = None
+
+    @staticmethod
+    def get_version():
+        """Get the version stamp that a cache must carry to be used.
+
+        The stamp covers the source of every module of the watcher, so a cache
+        written before any change to loading, merging, validation or the
+        modules they rely on is rebuilt instead of skipping the new rules.
+
+        Returns:
+            str: CACHE_VERSION followed by a hash of the watcher's source files
+        """
+        if ConfigCache._version is None:
+            import hashlib
+
+            source_dir = os.path.dirname(os.path.abspath(__file__))
+            digest = hashlib.sha256()
+            for name in sorted(os.listdir(source_dir)):
+                if name.endswith(".py"):
+                    digest.update(name.encode() + b"\0")
+                    with open(os.path.join(source_dir, name), "rb") as f:
+                        digest.update(f.read())
+            ConfigCache._version = f"{ConfigCache.CACHE_VERSION}:{digest.hexdigest()}"
+        return ConfigCache._version
+
+    @staticmethod
+    def get_source_signature(path):
+        """Get the signature of a source file.
+
+        Args:
+            path: Path to the file
+
+        Returns:
+            tuple: (absolute_path, mtime_ns, size), or None if the file is not accessible
+        """
+        absolute_path = os.path.abspath(path)
+        try:
+            stat_result = os.stat(absolute_path)
+        except OSError:
+            return None
+        return (absolute_path, stat_result.st_mtime_ns, stat_result.st_size)
+
+    @staticmethod
+    def load(cache_path, config_path):
+        """Load the cached config if all of its source files are unchanged.
+
+        Args:
+            cache_path: Path to the cache file
+            config_path: Path to the main TOML configuration file
+
+        Returns:
+            dict: Cached configuration, or None on a cache miss
+        """
+        import pickle
+
+        try:
+            with open(cache_path, "rb") as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            TimestampPrinter.print(f"Warning: Ignoring unreadable config cache '{cache_path}': {e}", Fore.YELLOW)
+            return None
+
+        if not isinstance(payload, dict) or payload.get("version") != ConfigCache.get_version():
+            return None
+
+        sources = payload.get("sources") or []
+        if not sources or sources[0] != ConfigCache.get_source_signature(config_path):
+            return None
+
+        for signature in sources[1:]:
+            if ConfigCache.get_source_signature(signature[0]) != signature:
+                return None
+
+        return payload.get("config")
+
+    @staticmethod
+    def store(cache_path, sources, config):
+        """Atomically write the compiled config to the cache file.
+
+        Failures are reported as warnings; the cache is an optimization only.
+
+        Args:
+            cache_path: Path to the cache file
+            sources: List of source signatures, main config first (see get_source_signature)
+            config: Merged and validated configuration dictionary
+        """
+        import pickle
+        import tempfile
+
+        if any(signature is None for signature in sources):
+            return
+
+        payload = {"version": ConfigCache.get_version(), "sources": sources, "config": config}
+        cache_dir = os.path.dirname(os.path.abspath(cache_path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=".config-cache-", dir=cache_dir)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            TimestampPrinter.print(f"Warning: Failed to write config cache '{cache_path}': {e}", Fore.YELLOW)
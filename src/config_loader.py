@@ -5,23 +5,26 @@ Configuration loader for File Watcher
 
 import sys
 
-import toml
-from colorama import Fore
-
 # Support both relative and absolute imports
 try:
     from .color_scheme import ColorScheme
+    from .config_cache import ConfigCache
     from .config_validator import ConfigValidator
+    from .entry_state import EntryState
     from .error_logger import ErrorLogger
     from .external_config_merger import ExternalConfigMerger
     from .interval_parser import IntervalParser
+    from .terminal_colors import Fore
     from .timestamp_printer import TimestampPrinter
 except ImportError:
     from color_scheme import ColorScheme
+    from config_cache import ConfigCache
     from config_validator import ConfigValidator
+    from entry_state import EntryState
     from error_logger import ErrorLogger
     from external_config_merger import ExternalConfigMerger
     from interval_parser import IntervalParser
+    from terminal_colors import Fore
     from timestamp_printer import TimestampPrinter
 
 
@@ -29,11 +32,14 @@ class ConfigLoader:
     """Handles loading and parsing TOML configuration files."""
 
     @staticmethod
-    def load_config(config_path):
+    def load_config(config_path, cache_path=None):
         """Load and parse the TOML configuration file.
 
         Args:
             config_path: Path to the TOML configuration file
+            cache_path: Optional path to the compiled config cache. When the main
+                config and all external files are unchanged, the merged and
+                validated config is loaded from it without parsing TOML.
 
         Returns:
             dict: Parsed configuration
@@ -43,29 +49,84 @@ class ConfigLoader:
         """
         error_log_file = None
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                config = toml.load(f)
-            # Get error_log_file from config if it exists
-            error_log_file = config.get("error_log_file")
+            config = ConfigCache.load(cache_path, config_path) if cache_path else None
+            if config is not None:
+                TimestampPrinter.print(f"Loaded compiled config from cache: {cache_path}")
+                # The cached config keeps its quarantined entries; report them like a full load does
+                ConfigValidator.report_quarantined_entries(config, config.get("error_log_file"))
+            else:
+                # Imported here so that cached loads never pay for the TOML parser
+                import toml
+
+                # Take signatures before parsing so a concurrent edit invalidates the cache
+                main_signature = ConfigCache.get_source_signature(config_path)
+                with open(config_path, "r", encoding="utf-8") as f:
+                    config = toml.load(f)
+                external_signatures = [
+                    ConfigCache.get_source_signature(path)
+                    for path in ExternalConfigMerger.resolve_external_file_paths(config, config_path)
+                ]
+
+                # Get error_log_file from config if it exists
+                error_log_file = config.get("error_log_file")
+
+                # Validate files section format
+                ConfigValidator.validate_files_format(config, error_log_file)
+
+                # Validate commands section format
+                ConfigValidator.validate_commands_format(config, error_log_file)
+
+                # Validate processes section format
+                ConfigValidator.validate_processes_format(config, error_log_file)
+
+                # Validate persistent state options
+                ConfigValidator.validate_state_options(config, error_log_file)
+
+                # Validate command concurrency options
+                ConfigValidator.validate_concurrency_options(config, error_log_file)
+
+                # Validate control socket options
+                ConfigValidator.validate_control_options(config, error_log_file)
+
+                # Validate event journal options
+                ConfigValidator.validate_journal_options(config, error_log_file)
+
+                # Validate command runner options
+                ConfigValidator.validate_runner_options(config, error_log_file)
+
+                # Validate command output capture options
+                ConfigValidator.validate_output_options(config, error_log_file)
+
+                # Validate main loop tick options
+                ConfigValidator.validate_tick_options(config, error_log_file)
 
-            # Validate files section format
-            ConfigValidator.validate_files_format(config, error_log_file)
+                # Validate scheduler options
+                ConfigValidator.validate_scheduler_options(config, error_log_file)
 
-            # Validate commands section format
-            ConfigValidator.validate_commands_format(config, error_log_file)
+                # Validate phase spreading and jitter options
+                ConfigValidator.validate_spreading_options(config, error_log_file)
 
-            # Validate processes section format
-            ConfigValidator.validate_processes_format(config, error_log_file)
+                # Load external files if specified
+                if "external_files" in config:
+                    ExternalConfigMerger.merge_external_files(config, config_path, error_log_file)
 
-            # Load external files if specified
-            if "external_files" in config:
-                ExternalConfigMerger.merge_external_files(config, config_path, error_log_file)
+                # Merge commands and processes sections into files
+                ExternalConfigMerger.merge_sections(config, error_log_file)
 
-            # Merge commands and processes sections into files
-            ExternalConfigMerger.merge_sections(config, error_log_file)
+                # Validate no_focus commands don't use 'start' (after merging)
+                ConfigValidator.validate_no_focus_commands(config, error_log_file)
 
-            # Validate no_focus commands don't use 'start' (after merging)
-            ConfigValidator.validate_no_focus_commands(config, error_log_file)
+                # Report invalid entries once and keep them out of the monitoring loop
+                ConfigValidator.quarantine_invalid_entries(config, error_log_file)
+
+                # Store strings repeated across entries once (kept shared by the cache's pickle)
+                EntryState.share_strings(config)
+
+                if cache_path:
+                    ConfigCache.store(cache_path, [main_signature] + external_signatures, config)
+
+            # Config may come from the cache, so fetch error_log_file again
+            error_log_file = config.get("error_log_file")
 
             # Apply color scheme from config (default: monokai)
             configured_scheme = config.get("color_scheme", ColorScheme.DEFAULT_COLOR_SCHEME)
@@ -84,17 +145,29 @@ class ConfigLoader:
             TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
             ErrorLogger.log_error(error_log_file, error_msg, e)
             sys.exit(1)
-        except toml.TomlDecodeError as e:
-            error_msg = f"Failed to parse TOML configuration: {e}"
-            TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
-            ErrorLogger.log_error(error_log_file, error_msg, e)
-            sys.exit(1)
         except Exception as e:
-            error_msg = f"Unexpected error loading config file '{config_path}'"
-            TimestampPrinter.print(f"Error: {error_msg}: {e}", Fore.RED)
+            if ConfigLoader._is_toml_decode_error(e):
+                error_msg = f"Failed to parse TOML configuration: {e}"
+                TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
+            else:
+                error_msg = f"Unexpected error loading config file '{config_path}'"
+                TimestampPrinter.print(f"Error: {error_msg}: {e}", Fore.RED)
             ErrorLogger.log_error(error_log_file, error_msg, e)
             sys.exit(1)
 
+    @staticmethod
+    def _is_toml_decode_error(exception):
+        """Check for toml.TomlDecodeError without importing toml if it was never used.
+
+        Args:
+            exception: The exception to check
+
+        Returns:
+            bool: True if the exception is a TOML decode error
+        """
+        toml = sys.modules.get("toml")
+        return toml is not None and isinstance(exception, toml.TomlDecodeError)
+
     @staticmethod
     def get_interval_for_file(config, settings):
         """Get the interval for a file in seconds.
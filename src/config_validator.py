@@ -4,17 +4,39 @@ Configuration validation for File Watcher
 """
 
 import sys
-
-from colorama import Fore
+import time
 
 # Support both relative and absolute imports
 try:
+    from .adaptive_interval import AdaptiveInterval
+    from .command_executor import RUNNERS
+    from .cron_schedule import CronSchedule
+    from .deadline_scheduler import SCHEDULER_QUEUES
     from .error_logger import ErrorLogger
+    from .interval_parser import IntervalParser
+    from .load_shedder import PRIORITY_CLASSES
+    from .output_capture import OutputCapture
+    from .python_worker_pool import PythonWorkerPool
+    from .state_store import StateStore
+    from .terminal_colors import Fore
     from .timestamp_printer import TimestampPrinter
 except ImportError:
+    from adaptive_interval import AdaptiveInterval
+    from command_executor import RUNNERS
+    from cron_schedule import CronSchedule
+    from deadline_scheduler import SCHEDULER_QUEUES
     from error_logger import ErrorLogger
+    from interval_parser import IntervalParser
+    from load_shedder import PRIORITY_CLASSES
+    from output_capture import OutputCapture
+    from python_worker_pool import PythonWorkerPool
+    from state_store import StateStore
+    from terminal_colors import Fore
     from timestamp_printer import TimestampPrinter
 
+# Policies for runs missed while the system was suspended (see ClockMonitor)
+MISSED_RUN_POLICIES = ("skip", "run-once", "catch-up")
+
 
 class ConfigValidator:
     """Handles validation of TOML configuration sections."""
@@ -197,3 +219,437 @@ class ConfigValidator:
                 TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
                 ErrorLogger.log_error(error_log_file, error_msg, None)
                 sys.exit(1)
+
+    @staticmethod
+    def validate_state_options(config, error_log_file):
+        """Validate persistent state options.
+
+        Args:
+            config: Configuration dictionary to validate
+            error_log_file: Error log file path for logging
+
+        Raises:
+            SystemExit: If state_catch_up has an unsupported value
+        """
+        catch_up = config.get("state_catch_up", StateStore.DEFAULT_CATCH_UP)
+        if catch_up not in StateStore.CATCH_UP_POLICIES:
+            supported = ", ".join(StateStore.CATCH_UP_POLICIES)
+            error_msg = f"state_catch_up must be one of: {supported} (got '{catch_up}')"
+            TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, None)
+            sys.exit(1)
+
+    @staticmethod
+    def validate_concurrency_options(config, error_log_file):
+        """Validate command concurrency options.
+
+        Args:
+            config: Configuration dictionary to validate
+            error_log_file: Error log file path for logging
+
+        Raises:
+            SystemExit: If max_concurrent_commands is not a positive integer
+        """
+        if "max_concurrent_commands" not in config:
+            return
+
+        max_concurrent_commands = config["max_concurrent_commands"]
+        if (
+            not isinstance(max_concurrent_commands, int)
+            or isinstance(max_concurrent_commands, bool)
+            or max_concurrent_commands < 1
+        ):
+            error_msg = f"max_concurrent_commands must be a positive integer (got {max_concurrent_commands!r})"
+            TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, None)
+            sys.exit(1)
+
+    @staticmethod
+    def validate_control_options(config, error_log_file):
+        """Validate control socket options.
+
+        Args:
+            config: Configuration dictionary to validate
+            error_log_file: Error log file path for logging
+
+        Raises:
+            SystemExit: If control_socket is not a non-empty string
+        """
+        if "control_socket" not in config:
+            return
+
+        control_socket = config["control_socket"]
+        if not isinstance(control_socket, str) or not control_socket:
+            error_msg = f"control_socket must be a non-empty socket file path (got {control_socket!r})"
+            TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, None)
+            sys.exit(1)
+
+    @staticmethod
+    def validate_journal_options(config, error_log_file):
+        """Validate event journal options.
+
+        Args:
+            config: Configuration dictionary to validate
+            error_log_file: Error log file path for logging
+
+        Raises:
+            SystemExit: If event_journal is not a non-empty string
+        """
+        if "event_journal" not in config:
+            return
+
+        event_journal = config["event_journal"]
+        if not isinstance(event_journal, str) or not event_journal:
+            error_msg = f"event_journal must be a non-empty file path (got {event_journal!r})"
+            TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, None)
+            sys.exit(1)
+
+    @staticmethod
+    def validate_output_options(config, error_log_file):
+        """Validate command output capture options.
+
+        Args:
+            config: Configuration dictionary to validate
+            error_log_file: Error log file path for logging
+
+        Raises:
+            SystemExit: If capture_output is not a boolean or output_buffer_size
+                is not a positive integer up to OutputCapture.MAX_BUFFER_SIZE
+        """
+        error_msg = None
+        buffer_size = config.get("output_buffer_size", OutputCapture.DEFAULT_BUFFER_SIZE)
+        if "capture_output" in config and not isinstance(config["capture_output"], bool):
+            error_msg = f"capture_output must be true or false (got {config['capture_output']!r})"
+        elif (
+            not isinstance(buffer_size, int)
+            or isinstance(buffer_size, bool)
+            or not 0 < buffer_size <= OutputCapture.MAX_BUFFER_SIZE
+        ):
+            error_msg = (
+                f"output_buffer_size must be a number of bytes from 1 to {OutputCapture.MAX_BUFFER_SIZE} "
+                f"(got {buffer_size!r})"
+            )
+
+        if error_msg is not None:
+            TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, None)
+            sys.exit(1)
+
+    @staticmethod
+    def validate_tick_options(config, error_log_file):
+        """Validate main loop tick options.
+
+        Args:
+            config: Configuration dictionary to validate
+            error_log_file: Error log file path for logging
+
+        Raises:
+            SystemExit: If tick_budget is not a valid interval
+        """
+        if "tick_budget" not in config:
+            return
+
+        try:
+            IntervalParser.parse_interval(config["tick_budget"])
+        except ValueError as e:
+            error_msg = f"Invalid tick_budget: {e}"
+            TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, None)
+            sys.exit(1)
+
+    @staticmethod
+    def validate_scheduler_options(config, error_log_file):
+        """Validate the scheduler option.
+
+        Args:
+            config: Configuration dictionary to validate
+            error_log_file: Error log file path for logging
+
+        Raises:
+            SystemExit: If scheduler is not a known timer queue implementation
+        """
+        if "scheduler" not in config:
+            return
+
+        scheduler = config["scheduler"]
+        if scheduler not in SCHEDULER_QUEUES:
+            choices = ", ".join(f'"{name}"' for name in SCHEDULER_QUEUES)
+            error_msg = f"scheduler must be one of {choices} (got {scheduler!r})"
+            TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, None)
+            sys.exit(1)
+
+    @staticmethod
+    def validate_spreading_options(config, error_log_file):
+        """Validate phase spreading and jitter options.
+
+        Args:
+            config: Configuration dictionary to validate
+            error_log_file: Error log file path for logging
+
+        Raises:
+            SystemExit: If spread_phases is not a boolean or default_jitter is not a valid interval
+        """
+        error_msg = None
+        if "spread_phases" in config and not isinstance(config["spread_phases"], bool):
+            error_msg = f"spread_phases must be true or false (got {config['spread_phases']!r})"
+        elif "default_jitter" in config:
+            try:
+                IntervalParser.parse_interval(config["default_jitter"])
+            except ValueError as e:
+                error_msg = f"Invalid default_jitter: {e}"
+
+        if error_msg is not None:
+            TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, None)
+            sys.exit(1)
+
+    @staticmethod
+    def validate_runner_options(config, error_log_file):
+        """Validate the options of command runners.
+
+        Args:
+            config: Configuration dictionary to validate
+            error_log_file: Error log file path for logging
+
+        Raises:
+            SystemExit: If python_worker_preload is not a list of module names
+                or python_worker_pool_size is not a positive integer
+        """
+        error_msg = None
+        preload = config.get("python_worker_preload", [])
+        pool_size = config.get("python_worker_pool_size", 1)
+        if not isinstance(preload, list) or not all(isinstance(module, str) and module for module in preload):
+            error_msg = f"python_worker_preload must be a list of module names (got {preload!r})"
+        elif not isinstance(pool_size, int) or isinstance(pool_size, bool) or pool_size < 1:
+            error_msg = f"python_worker_pool_size must be a positive integer (got {pool_size!r})"
+
+        if error_msg is not None:
+            TimestampPrinter.print(f"Error: {error_msg}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, None)
+            sys.exit(1)
+
+    @staticmethod
+    def get_entry_rule_violation(entry):
+        """Check a merged [files] entry against the per-entry usage rules.
+
+        Args:
+            entry: Entry settings dictionary (after merging [[commands]] and [[processes]])
+
+        Returns:
+            tuple: (message, is_fatal) for the first violated rule, or None if the entry is valid
+        """
+        filename = entry.get("path", "")
+
+        for key in ("terminate_if_process", "terminate_if_window_title"):
+            if key not in entry:
+                continue
+
+            if filename != "":
+                return (
+                    f"Fatal configuration error: {key} can only be used with empty filename, but filename is '{filename}'",
+                    True,
+                )
+
+            if "command" in entry and entry["command"]:
+                return (
+                    f"Fatal configuration error: {key} cannot be used with command field (command must be empty)",
+                    True,
+                )
+
+        if "missed_runs" in entry and entry["missed_runs"] not in MISSED_RUN_POLICIES:
+            choices = ", ".join(f'"{policy}"' for policy in MISSED_RUN_POLICIES)
+            return (
+                f"Fatal configuration error: missed_runs must be one of {choices} (got {entry['missed_runs']!r})",
+                True,
+            )
+
+        if "priority" in entry and entry["priority"] not in PRIORITY_CLASSES:
+            choices = ", ".join(f'"{priority}"' for priority in PRIORITY_CLASSES)
+            return (
+                f"Fatal configuration error: priority must be one of {choices} (got {entry['priority']!r})",
+                True,
+            )
+
+        if "runner" in entry:
+            violation = ConfigValidator._get_runner_violation(entry)
+            if violation is not None:
+                return violation, True
+
+        if "capture_output" in entry and not isinstance(entry["capture_output"], bool):
+            return (
+                f"Fatal configuration error: capture_output must be true or false (got {entry['capture_output']!r})",
+                True,
+            )
+
+        if "jitter" in entry:
+            try:
+                IntervalParser.parse_interval(entry["jitter"])
+            except ValueError as e:
+                return f"Fatal configuration error: Invalid jitter: {e}", True
+
+        if "adaptive" in entry:
+            violation = ConfigValidator._get_adaptive_violation(entry)
+            if violation is not None:
+                return violation, True
+
+        if "schedule" in entry:
+            violation = ConfigValidator._get_schedule_violation(entry)
+            if violation is not None:
+                return violation, True
+
+        if (
+            "command" not in entry
+            and "argv" not in entry
+            and "terminate_if_process" not in entry
+            and "terminate_if_window_title" not in entry
+        ):
+            return f"Warning: No command specified for file '{filename}'", False
+
+        return None
+
+    @staticmethod
+    def _get_adaptive_violation(entry):
+        """Check the adaptive interval setting of an entry.
+
+        Args:
+            entry: Entry settings dictionary containing "adaptive"
+
+        Returns:
+            str: Fatal error message, or None if the setting is valid
+        """
+        adaptive = entry["adaptive"]
+        if entry.get("path", "") == "":
+            return "Fatal configuration error: adaptive can only be used with a filename"
+        if "interval" in entry:
+            return "Fatal configuration error: adaptive and interval cannot be used together"
+        if not isinstance(adaptive, dict) or "min" not in adaptive or "max" not in adaptive:
+            return 'Fatal configuration error: adaptive must be a table with min and max, e.g. { min = "200ms", max = "30s" }'
+        try:
+            minimum, maximum = AdaptiveInterval.get_bounds(entry)
+        except ValueError as e:
+            return f"Fatal configuration error: Invalid adaptive interval: {e}"
+        if not 0 < minimum <= maximum:
+            return (
+                f"Fatal configuration error: adaptive min must be above zero and not above max "
+                f"(got {adaptive['min']!r} and {adaptive['max']!r})"
+            )
+        return None
+
+    @staticmethod
+    def _get_runner_violation(entry):
+        """Check the command runner of an entry.
+
+        Args:
+            entry: Entry settings dictionary containing "runner"
+
+        Returns:
+            str: Fatal error message, or None if the runner is valid
+        """
+        runner = entry["runner"]
+        if runner not in RUNNERS:
+            choices = ", ".join(f'"{name}"' for name in RUNNERS)
+            return f"Fatal configuration error: runner must be one of {choices} (got {runner!r})"
+        if entry.get("no_focus", False) and runner != "shell":
+            return f'Fatal configuration error: runner "{runner}" cannot be used with no_focus'
+        if runner == "python-worker":
+            try:
+                PythonWorkerPool.parse_command(entry.get("command", ""))
+            except ValueError as e:
+                return f"Fatal configuration error: {e}"
+        return None
+
+    @staticmethod
+    def _get_schedule_violation(entry):
+        """Check the cron schedule of an entry.
+
+        Args:
+            entry: Entry settings dictionary containing "schedule"
+
+        Returns:
+            str: Fatal error message, or None if the schedule is valid
+        """
+        if entry.get("path", "") != "":
+            return f"Fatal configuration error: schedule can only be used in [[commands]], but filename is '{entry['path']}'"
+        if "interval" in entry:
+            return "Fatal configuration error: schedule and interval cannot be used together"
+        try:
+            CronSchedule.compile(entry["schedule"], entry.get("timezone")).next_fire(time.time())
+        except ValueError as e:
+            return f"Fatal configuration error: {e}"
+        return None
+
+    @staticmethod
+    def report_entry_rule_violation(violation, error_log_file):
+        """Print and log a per-entry rule violation.
+
+        Args:
+            violation: Tuple (message, is_fatal) from get_entry_rule_violation
+            error_log_file: Error log file path for logging
+        """
+        message, is_fatal = violation
+        if is_fatal:
+            TimestampPrinter.print(message, Fore.RED)
+            ErrorLogger.log_error(error_log_file, message)
+        else:
+            TimestampPrinter.print(message, Fore.YELLOW)
+
+    @staticmethod
+    def report_quarantined_entries(config, error_log_file):
+        """Report again the entries quarantined when a cached config was compiled.
+
+        Args:
+            config: Configuration dictionary loaded from the config cache
+            error_log_file: Error log file path for logging
+        """
+        for quarantined in config.get("quarantined_files", []):
+            ConfigValidator.report_entry_rule_violation((quarantined["reason"], quarantined["fatal"]), error_log_file)
+
+    @staticmethod
+    def quarantine_invalid_entries(config, error_log_file):
+        """Remove [files] entries that violate per-entry usage rules.
+
+        Each invalid entry is reported once here, at load time, and moved to
+        config["quarantined_files"] so the monitoring loop never sees it. With
+        state_file set, an entry with the same identity as an earlier valid one
+        (see StateStore.get_entry_identity) is invalid as a duplicate.
+
+        Args:
+            config: Configuration dictionary (after merging sections)
+            error_log_file: Error log file path for logging
+        """
+        if "files" not in config:
+            return
+
+        valid_entries = []
+        quarantined_entries = []
+        # Duplicates only clash in the saved state
+        check_duplicates = bool(config.get("state_file"))
+        identities = set()
+        for entry in config["files"]:
+            violation = ConfigValidator.get_entry_rule_violation(entry)
+            if violation is None:
+                if not check_duplicates:
+                    valid_entries.append(entry)
+                    continue
+                identity = StateStore.get_entry_identity(entry)
+                if identity not in identities:
+                    identities.add(identity)
+                    valid_entries.append(entry)
+                    continue
+                label = entry.get("path", "") or identity.split("\n")[1]
+                settings = ", ".join(StateStore.IDENTITY_SETTINGS)
+                violation = (
+                    f"Fatal configuration error: Duplicate entry '{label}': an earlier entry has the same "
+                    f"path, command and {settings}, so they would share their state in state_file",
+                    True,
+                )
+
+            ConfigValidator.report_entry_rule_violation(violation, error_log_file)
+            quarantined_entries.append({"entry": entry, "reason": violation[0], "fatal": violation[1]})
+
+        config["files"] = valid_entries
+        if quarantined_entries:
+            config["quarantined_files"] = quarantined_entries
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Local control socket for File Watcher
+Accepts line-based commands on a Unix-domain socket from the main loop
+"""
+
+import json
+import os
+import socket
+import time
+
+# Support both relative and absolute imports
+try:
+    from .terminal_colors import Fore
+    from .timestamp_printer import TimestampPrinter
+except ImportError:
+    from terminal_colors import Fore
+    from timestamp_printer import TimestampPrinter
+
+
+class ControlServer:
+    """Serves the control protocol on a Unix-domain socket.
+
+    Each connection carries one request line ("<command> [argument]\\n") and
+    receives one JSON response line: {"ok": true, ...} on success or
+    {"ok": false, "error": "..."} on failure. Requests are handled
+    synchronously by the main loop while it waits for the next tick, so
+    handlers never run concurrently with file checks.
+    """
+
+    COMMANDS = ("status", "trigger", "reload", "pause", "resume", "dump-stats", "profile")
+
+    # Seconds a client may take to send its request line
+    CLIENT_TIMEOUT = 1.0
+
+    # Upper bound on the size of a request line
+    MAX_REQUEST_BYTES = 4096
+
+    def __init__(self, socket_path):
+        """Initialize the control server.
+
+        Args:
+            socket_path: Filesystem path of the Unix-domain socket
+        """
+        self.socket_path = socket_path
+        self._socket = None
+
+    @staticmethod
+    def is_supported():
+        """Check if Unix-domain sockets are available on this platform.
+
+        Returns:
+            bool: True if the control socket can be used
+        """
+        return hasattr(socket, "AF_UNIX")
+
+    def start(self):
+        """Bind and listen on the socket path, replacing a stale socket file.
+
+        Any other kind of file at the path is left alone and the server is not
+        started. The socket is only accessible to the watcher's user, since
+        its requests run commands.
+
+        Returns:
+            bool: True if the server is listening
+        """
+        import stat
+
+        if not ControlServer.is_supported():
+            TimestampPrinter.print("Warning: control_socket is not supported on this platform", Fore.YELLOW)
+            return False
+
+        try:
+            try:
+                mode = os.lstat(self.socket_path).st_mode
+            except FileNotFoundError:
+                mode = None
+            if mode is not None:
+                if not stat.S_ISSOCK(mode):
+                    raise FileExistsError(f"'{self.socket_path}' exists and is not a socket")
+                os.unlink(self.socket_path)
+            server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                server_socket.bind(self.socket_path)
+                # Restrict access before accepting connections
+                os.chmod(self.socket_path, 0o600)
+                server_socket.listen()
+            except OSError:
+                server_socket.close()
+                raise
+            server_socket.setblocking(False)
+        except OSError as e:
+            TimestampPrinter.print(
+                f"Warning: Failed to open control socket '{self.socket_path}': {e}",
+                Fore.YELLOW,
+            )
+            return False
+
+        self._socket = server_socket
+        TimestampPrinter.print(f"Listening for control commands on '{self.socket_path}'", Fore.GREEN)
+        return True
+
+    def close(self):
+        """Stop listening and remove the socket file."""
+        if self._socket is None:
+            return
+        self._socket.close()
+        self._socket = None
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+    def wait(self, timeout, handler):
+        """Wait up to timeout seconds, serving control requests as they arrive.
+
+        Args:
+            timeout: Seconds to wait
+            handler: Callable (command, argument) -> dict returning the response
+                payload; raising ValueError produces an error response
+        """
+        import select
+
+        if self._socket is None:
+            time.sleep(timeout)
+            return
+
+        # Monotonic, so a wall clock step can neither stall nor busy-spin the wait
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            readable, _, _ = select.select([self._socket], [], [], max(0.0, remaining))
+            if readable:
+                self._serve_connection(handler)
+            elif remaining <= 0:
+                return
+
+    def _serve_connection(self, handler):
+        """Accept one connection and answer its request line.
+
+        Args:
+            handler: Request handler (see wait)
+        """
+        try:
+            connection, _ = self._socket.accept()
+        except OSError:
+            return
+
+        with connection:
+            try:
+                connection.setblocking(True)
+                connection.settimeout(ControlServer.CLIENT_TIMEOUT)
+                request = ControlServer._read_request_line(connection)
+                response = ControlServer.dispatch(request, handler)
+                connection.sendall(json.dumps(response).encode("utf-8") + b"\n")
+            except OSError:
+                pass
+
+    @staticmethod
+    def _read_request_line(connection):
+        """Read a request line from a client connection.
+
+        Args:
+            connection: Connected client socket
+
+        Returns:
+            str: The request line without the trailing newline
+        """
+        data = b""
+        while b"\n" not in data and len(data) < ControlServer.MAX_REQUEST_BYTES:
+            chunk = connection.recv(ControlServer.MAX_REQUEST_BYTES)
+            if not chunk:
+                break
+            data += chunk
+        return data.split(b"\n", 1)[0].decode("utf-8", errors="replace").strip()
+
+    @staticmethod
+    def dispatch(request, handler):
+        """Parse a request line and build its response.
+
+        Args:
+            request: Request line, e.g. "pause #3"
+            handler: Request handler (see wait)
+
+        Returns:
+            dict: Response payload
+        """
+        command, _, argument = request.partition(" ")
+        argument = argument.strip()
+        if command not in ControlServer.COMMANDS:
+            supported = ", ".join(ControlServer.COMMANDS)
+            return {"ok": False, "error": f"Unknown command '{command}'. Supported commands: {supported}"}
+
+        try:
+            payload = handler(command, argument)
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+        except Exception as e:
+            # E.g. a triggered command timing out; one request must not stop the watcher
+            error = f"Control request '{request}' failed: {type(e).__name__}: {e}"
+            TimestampPrinter.print(f"Error: {error}", Fore.RED)
+            return {"ok": False, "error": error}
+        return {"ok": True, **payload}
+
+    @staticmethod
+    def send_request(socket_path, request, timeout=5.0):
+        """Send a request to a running watcher and return its response.
+
+        Args:
+            socket_path: Filesystem path of the control socket
+            request: Request line, e.g. "status"
+            timeout: Seconds to wait for the response
+
+        Returns:
+            dict: Decoded response payload
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(socket_path)
+            client.sendall(request.encode("utf-8") + b"\n")
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data.decode("utf-8"))
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Cron expression schedules for File Watcher
+Compiles "minute hour day-of-month month day-of-week" expressions for [[commands]]
+"""
+
+import bisect
+from datetime import datetime, timedelta
+
+# (name, minimum, maximum, value names) for the five cron fields
+CRON_FIELDS = (
+    ("minute", 0, 59, None),
+    ("hour", 0, 23, None),
+    ("day of month", 1, 31, None),
+    ("month", 1, 12, ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")),
+    ("day of week", 0, 7, ("sun", "mon", "tue", "wed", "thu", "fri", "sat")),
+)
+
+CRON_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# Upper bound on search steps for the next fire time; every step advances at
+# least to the next day, month, hour or minute, so this spans several years
+MAX_SEARCH_STEPS = 5000
+
+
+class CronSchedule:
+    """A compiled cron expression that computes its next fire time.
+
+    Each field is compiled to a sorted tuple of allowed values, so finding the
+    next fire time advances directly to the next allowed month, day, hour and
+    minute instead of testing every minute. Day of month and day of week follow
+    the usual cron rule: when both are restricted, a day matching either fires.
+    """
+
+    _compiled = {}
+
+    def __init__(self, expression, timezone=None):
+        """Compile a cron expression.
+
+        Args:
+            expression: Five-field cron expression (e.g. "0 3 * * 1-5") or a macro such as "@daily"
+            timezone: Optional IANA timezone name (e.g. "Asia/Tokyo"); local time if omitted
+
+        Raises:
+            ValueError: If the expression or timezone is invalid
+        """
+        if not isinstance(expression, str):
+            raise ValueError(f"Invalid cron schedule: expected a string, got {type(expression).__name__}")
+        self.expression = expression
+        self.timezone = CronSchedule._get_timezone(timezone)
+
+        fields = CRON_MACROS.get(expression.strip().lower(), expression).split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(
+                f"Invalid cron schedule '{expression}': expected 5 fields (minute hour day-of-month month day-of-week)"
+            )
+
+        values = []
+        for text, (name, minimum, maximum, names) in zip(fields, CRON_FIELDS):
+            values.append(CronSchedule._parse_field(expression, text, name, minimum, maximum, names))
+        self.minutes, self.hours, self.days, self.months, weekdays = values
+        # Both 0 and 7 mean Sunday; datetime.isoweekday() uses 7
+        self.weekdays = frozenset(7 if day == 0 else day for day in weekdays)
+        self.days_restricted = not fields[2].startswith("*")
+        self.weekdays_restricted = not fields[4].startswith("*")
+
+    @staticmethod
+    def compile(expression, timezone=None):
+        """Get a compiled schedule, reusing earlier compilations of the same expression.
+
+        Args:
+            expression: Cron expression
+            timezone: Optional IANA timezone name
+
+        Returns:
+            CronSchedule: The compiled schedule
+
+        Raises:
+            ValueError: If the expression or timezone is invalid
+        """
+        key = (expression, timezone)
+        schedule = CronSchedule._compiled.get(key)
+        if schedule is None:
+            schedule = CronSchedule(expression, timezone)
+            CronSchedule._compiled[key] = schedule
+        return schedule
+
+    @staticmethod
+    def _get_timezone(timezone):
+        """Resolve a timezone name.
+
+        Args:
+            timezone: IANA timezone name, or None for local time
+
+        Returns:
+            tzinfo or None
+
+        Raises:
+            ValueError: If the timezone is unknown
+        """
+        if timezone is None:
+            return None
+        from zoneinfo import ZoneInfo
+
+        try:
+            return ZoneInfo(timezone)
+        except Exception as e:
+            raise ValueError(f"Unknown timezone '{timezone}'") from e
+
+    @staticmethod
+    def _parse_value(expression, text, name, names):
+        """Parse a single field value, accepting names where the field has them."""
+        if names and text.lower() in names:
+            return names.index(text.lower()) + (1 if name == "month" else 0)
+        if not text.isdigit():
+            raise ValueError(f"Invalid cron schedule '{expression}': bad {name} value '{text}'")
+        return int(text)
+
+    @staticmethod
+    def _parse_field(expression, text, name, minimum, maximum, names):
+        """Parse one cron field into the sorted tuple of allowed values.
+
+        Supports "*", single values, ranges ("1-5"), steps ("*/15", "10-50/10")
+        and comma-separated lists of those.
+        """
+        allowed = set()
+        for part in text.split(","):
+            range_text, _, step_text = part.partition("/")
+            step = 1
+            if step_text:
+                if not step_text.isdigit() or int(step_text) == 0:
+                    raise ValueError(f"Invalid cron schedule '{expression}': bad {name} step '{step_text}'")
+                step = int(step_text)
+
+            if range_text == "*":
+                first, last = minimum, maximum
+            elif "-" in range_text:
+                first_text, _, last_text = range_text.partition("-")
+                first = CronSchedule._parse_value(expression, first_text, name, names)
+                last = CronSchedule._parse_value(expression, last_text, name, names)
+            else:
+                first = CronSchedule._parse_value(expression, range_text, name, names)
+                last = maximum if step_text else first
+
+            if not minimum <= first <= last <= maximum:
+                raise ValueError(
+                    f"Invalid cron schedule '{expression}': {name} '{part}' is outside {minimum}-{maximum}"
+                )
+            allowed.update(range(first, last + 1, step))
+        return tuple(sorted(allowed))
+
+    def _day_matches(self, wall):
+        """Check the day-of-month and day-of-week fields for a wall-clock date."""
+        day_match = wall.day in self.days
+        weekday_match = wall.isoweekday() in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def _to_timestamp(self, wall):
+        """Convert a wall-clock time in the schedule's timezone to a timestamp."""
+        wall = wall.replace(fold=0)
+        if self.timezone is None:
+            return wall.timestamp()
+        return wall.replace(tzinfo=self.timezone).timestamp()
+
+    def next_fire(self, after):
+        """Compute the first fire time strictly after a timestamp.
+
+        Args:
+            after: Timestamp (time.time()) to search from
+
+        Returns:
+            float: Timestamp of the next fire time
+
+        Raises:
+            ValueError: If the schedule never fires (e.g. "0 0 31 2 *")
+        """
+        wall = datetime.fromtimestamp(after, self.timezone).replace(tzinfo=None, second=0, microsecond=0)
+        wall += timedelta(minutes=1)
+
+        for _ in range(MAX_SEARCH_STEPS):
+            if wall.month not in self.months:
+                index = bisect.bisect_left(self.months, wall.month)
+                if index < len(self.months):
+                    wall = datetime(wall.year, self.months[index], 1)
+                else:
+                    wall = datetime(wall.year + 1, self.months[0], 1)
+                continue
+
+            if not self._day_matches(wall):
+                wall = datetime(wall.year, wall.month, wall.day) + timedelta(days=1)
+                continue
+
+            if wall.hour not in self.hours:
+                index = bisect.bisect_left(self.hours, wall.hour)
+                if index < len(self.hours):
+                    wall = wall.replace(hour=self.hours[index], minute=0)
+                else:
+                    wall = datetime(wall.year, wall.month, wall.day) + timedelta(days=1)
+                continue
+
+            if wall.minute not in self.minutes:
+                index = bisect.bisect_left(self.minutes, wall.minute)
+                if index < len(self.minutes):
+                    wall = wall.replace(minute=self.minutes[index])
+                else:
+                    wall = wall.replace(minute=0) + timedelta(hours=1)
+                continue
+
+            timestamp = self._to_timestamp(wall)
+            if timestamp > after:
+                return timestamp
+            # Wall-clock time repeated by a DST change; it already fired
+            wall += timedelta(minutes=1)
+
+        raise ValueError(f"Cron schedule '{self.expression}' never fires")
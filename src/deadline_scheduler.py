@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Deadline scheduler for File Watcher
+Keeps cron-scheduled entries in a timer queue ordered by their next fire time
+"""
+
+import random
+
+# Support both relative and absolute imports
+try:
+    from .clock import Clock
+    from .cron_schedule import CronSchedule
+    from .phase_spreader import PhaseSpreader
+    from .timer_wheel import HeapQueue, TimerWheel
+except ImportError:
+    from clock import Clock
+    from cron_schedule import CronSchedule
+    from phase_spreader import PhaseSpreader
+    from timer_wheel import HeapQueue, TimerWheel
+
+# Timer queue implementations selectable with the global "scheduler" option
+SCHEDULER_QUEUES = {"heap": HeapQueue, "timer-wheel": TimerWheel}
+
+
+class DeadlineScheduler:
+    """Timer queue of (deadline, entry key) pairs for entries with a cron schedule.
+
+    Scheduled entries are not polled on every tick. The main loop only asks
+    the queue for expired timers, so hundreds of cron jobs cost nothing
+    between firings. After an entry fires it is pushed back with its next
+    fire time. The queue is a heap by default; with scheduler = "timer-wheel"
+    a hierarchical timer wheel is used, which keeps insert and expiry O(1)
+    for tens of thousands of entries.
+    """
+
+    def __init__(self):
+        """Initialize an empty scheduler."""
+        self._queue = HeapQueue()
+        self._deadlines = {}
+        self._schedules = {}
+        self._jitters = {}
+
+    def load(self, config, now=None):
+        """Rebuild the timer queue from the scheduled entries of a config.
+
+        Args:
+            config: Configuration dictionary (entries with a "schedule" key are scheduled;
+                "scheduler" selects the queue implementation)
+            now: Timestamp to schedule from, defaults to now
+        """
+        if now is None:
+            now = Clock.time()
+        self._queue = SCHEDULER_QUEUES[config.get("scheduler", "heap")](now)
+        self._deadlines = {}
+        self._schedules = {}
+        self._jitters = {}
+
+        for index, entry in enumerate(config.get("files", [])):
+            if "schedule" not in entry:
+                continue
+            entry_key = f"#{index}"
+            self._schedules[entry_key] = CronSchedule.compile(entry["schedule"], entry.get("timezone"))
+            self._jitters[entry_key] = PhaseSpreader.get_jitter(config, entry)
+            self._push(entry_key, now)
+
+    def _push(self, entry_key, after):
+        """Schedule an entry's next firing after a timestamp, delayed by its jitter.
+
+        Args:
+            entry_key: Entry key ("#<index>")
+            after: Timestamp to search from
+        """
+        deadline = self._schedules[entry_key].next_fire(after)
+        if self._jitters[entry_key]:
+            deadline += random.uniform(0.0, self._jitters[entry_key])
+        self._deadlines[entry_key] = deadline
+        self._queue.push(deadline, entry_key)
+
+    def next_deadline(self):
+        """Get the earliest pending fire time.
+
+        Returns:
+            float: Timestamp, or None if nothing is scheduled
+        """
+        return self._queue.peek_deadline()
+
+    def get_wait(self, now=None):
+        """Get the seconds until pop_due returns the next due entry.
+
+        Args:
+            now: Current timestamp, defaults to now
+
+        Returns:
+            float: Seconds (0.0 if an entry is due), or None if nothing is scheduled
+        """
+        expiry = self._queue.peek_expiry()
+        if expiry is None:
+            return None
+        return max(0.0, expiry - (Clock.time() if now is None else now))
+
+    def get_deadline(self, entry_key):
+        """Get the next fire time of an entry.
+
+        Args:
+            entry_key: Entry key ("#<index>")
+
+        Returns:
+            float: Timestamp, or None if the entry is not scheduled
+        """
+        return self._deadlines.get(entry_key)
+
+    def pop_due(self, now=None):
+        """Remove the entries that are due and schedule their next firing.
+
+        Firings missed while the watcher was busy collapse into one run.
+
+        Args:
+            now: Current timestamp, defaults to now
+
+        Returns:
+            list: Keys of due entries in deadline order
+        """
+        if now is None:
+            now = Clock.time()
+        # Timers superseded by skip_missed() no longer match the entry's deadline
+        due = [
+            entry_key for deadline, entry_key in self._queue.pop_until(now) if self._deadlines[entry_key] == deadline
+        ]
+        for entry_key in due:
+            self._push(entry_key, now)
+        return due
+
+    def skip_missed(self, entry_key, now=None):
+        """Drop an entry's missed firing and schedule its next one after now.
+
+        The superseded timer stays in the queue and is ignored when it expires.
+
+        Args:
+            entry_key: Entry key ("#<index>")
+            now: Current timestamp, defaults to now
+        """
+        if now is None:
+            now = Clock.time()
+        deadline = self._deadlines.get(entry_key)
+        if deadline is not None and deadline <= now:
+            self._push(entry_key, now)
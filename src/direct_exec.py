@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Direct execution of simple commands for File Watcher
+Runs command strings without shell syntax as argv, without starting /bin/sh
+"""
+
+import os
+import re
+import shlex
+
+# Support both relative and absolute imports
+try:
+    from .process_spawner import ProcessSpawner
+    from .terminal_colors import Fore
+    from .timestamp_printer import TimestampPrinter
+except ImportError:
+    from process_spawner import ProcessSpawner
+    from terminal_colors import Fore
+    from timestamp_printer import TimestampPrinter
+
+# Characters that make the shell do more than split words and remove quotes
+# (expansions, redirections, pipelines, lists, globs, comments, escapes)
+_SHELL_SYNTAX = re.compile(r"[$`\\|&;<>()*?\[\]{}~#!\n\r]")
+
+# First words the shell handles itself: builtins without an equivalent
+# program and reserved words
+SHELL_BUILTINS = frozenset(
+    (
+        ".",
+        ":",
+        "alias",
+        "bg",
+        "break",
+        "case",
+        "cd",
+        "command",
+        "continue",
+        "do",
+        "done",
+        "elif",
+        "else",
+        "esac",
+        "eval",
+        "exec",
+        "exit",
+        "export",
+        "fc",
+        "fg",
+        "fi",
+        "for",
+        "function",
+        "getopts",
+        "hash",
+        "if",
+        "in",
+        "jobs",
+        "local",
+        "read",
+        "readonly",
+        "return",
+        "select",
+        "set",
+        "shift",
+        "source",
+        "then",
+        "time",
+        "times",
+        "trap",
+        "type",
+        "ulimit",
+        "umask",
+        "unalias",
+        "unset",
+        "until",
+        "wait",
+        "while",
+    )
+)
+
+
+class DirectExec:
+    """Runs simple command strings of runner = "shell" entries without a shell.
+
+    Most commands are a program and its arguments, e.g. "make build" or
+    "./scripts/deploy.sh 'my site'". For those, starting /bin/sh only to
+    split the words and search PATH doubles the processes created per
+    trigger. A command qualifies when it contains no expansions,
+    redirections, pipelines, lists, globs, comments or backslashes, its
+    first word is not a shell builtin or reserved word and does not assign
+    a variable. Quotes are allowed and split the same way the shell does.
+    Everything else runs through the shell as before.
+
+    The program is searched in PATH (or, when it contains a slash, taken
+    relative to the entry's cwd) once per command and cwd, and the result is
+    kept until configure() is called again on config reload. Commands whose
+    program is not found are reported once at load and keep running
+    through the shell, which reports the error when they are triggered.
+    Only POSIX platforms run commands directly; on Windows commands always
+    go through the shell.
+    """
+
+    # (command, cwd) -> (executable path, argv), or None for commands run through the shell
+    _resolved = {}
+
+    @staticmethod
+    def is_supported():
+        """Check whether commands can be run without a shell on this platform.
+
+        Returns:
+            bool: True on POSIX platforms
+        """
+        return os.name == "posix"
+
+    @staticmethod
+    def parse_command(command):
+        """Split a command string into argv if it needs no shell.
+
+        Args:
+            command: Command string of an entry
+
+        Returns:
+            list: argv of the command, or None if the command needs the shell
+        """
+        if _SHELL_SYNTAX.search(command):
+            return None
+        try:
+            argv = shlex.split(command)
+        except ValueError:
+            return None
+        if not argv or argv[0] in SHELL_BUILTINS or "=" in argv[0]:
+            return None
+        return argv
+
+    @staticmethod
+    def configure(config):
+        """Resolve the simple commands of a (re)loaded config, dropping earlier results.
+
+        Prints a warning for each simple command whose program is not found.
+
+        Args:
+            config: Configuration dictionary
+        """
+        DirectExec._resolved.clear()
+        if not DirectExec.is_supported():
+            return
+        for entry in config.get("files", []):
+            command = entry.get("command", "")
+            if not command or entry.get("runner", "shell") != "shell" or entry.get("no_focus", False):
+                continue
+            argv = DirectExec.parse_command(command)
+            if argv is not None and DirectExec.resolve(command, entry.get("cwd")) is None:
+                TimestampPrinter.print(
+                    f"Warning: Command not found: '{argv[0]}' (in command '{command}'). "
+                    "It will run through the shell until the config is reloaded.",
+                    Fore.YELLOW,
+                )
+
+    @staticmethod
+    def resolve(command, cwd):
+        """Get the program and argv to run a command directly with, searching PATH on first use.
+
+        Args:
+            command: Command string of an entry
+            cwd: Working directory of the entry (None for the watcher's)
+
+        Returns:
+            tuple: (absolute executable path, argv), or None if the command must run through the shell
+        """
+        key = (command, cwd)
+        try:
+            return DirectExec._resolved[key]
+        except KeyError:
+            pass
+
+        import shutil
+
+        resolved = None
+        argv = DirectExec.parse_command(command) if DirectExec.is_supported() else None
+        if argv is not None:
+            program = argv[0]
+            if "/" in program:
+                executable = os.path.normpath(os.path.join(os.path.abspath(cwd or "."), program))
+                if not (os.path.isfile(executable) and os.access(executable, os.X_OK)):
+                    executable = None
+            else:
+                executable = shutil.which(program)
+            # Relative PATH directories would be searched from the watcher's cwd, not the entry's
+            if executable is not None and os.path.isabs(executable):
+                resolved = (executable, argv)
+        DirectExec._resolved[key] = resolved
+        return resolved
+
+    @staticmethod
+    def run(resolved, cwd, timeout, output=None):
+        """Run a resolved command.
+
+        Args:
+            resolved: (executable path, argv) from resolve()
+            cwd: Working directory for the command (None for the watcher's)
+            timeout: Seconds to wait for the command before killing it
+            output: Callable receiving the command's output, or None to let it write to the terminal
+
+        Returns:
+            subprocess.CompletedProcess: Result of the command
+
+        Raises:
+            subprocess.TimeoutExpired: If the command did not finish in time
+        """
+        executable, argv = resolved
+        return ProcessSpawner.run(argv, False, cwd, timeout, executable=executable, output=output)
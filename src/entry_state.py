@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Compact per-entry state for File Watcher
+Keeps per-entry values in typed arrays and shares repeated strings between entries
+"""
+
+from array import array
+from collections.abc import MutableMapping
+
+# Value of a slot without an entry (never a valid mtime or check time)
+_MISSING = float("nan")
+
+
+class EntryColumn(MutableMapping):
+    """Mapping of entry keys ("#0", "#1", ...) to floats, stored in an array('d').
+
+    Drop-in replacement for the per-entry dictionaries file_timestamps and
+    file_last_check. A dictionary spends a key string, a float object and a
+    hash table slot on every entry; a column spends the 8 bytes of one array
+    item. Slots without a value hold NaN, and the array grows when an entry
+    beyond its end is assigned.
+
+    Loops that already have the entry index (check_files on every tick) use
+    get_at, set_at and pop_at, which skip formatting and parsing the key.
+    """
+
+    __slots__ = ("_values", "_count")
+
+    def __init__(self, size=0):
+        """Initialize an empty column.
+
+        Args:
+            size: Number of entries to reserve slots for
+        """
+        self._values = array("d", [_MISSING]) * size
+        self._count = 0
+
+    def get_at(self, index, default=None):
+        """Get the value of an entry by its index.
+
+        Args:
+            index: Index of the entry in config["files"]
+            default: Value returned if the entry has no value
+
+        Returns:
+            float: Value of the entry, or default
+        """
+        try:
+            value = self._values[index]
+        except IndexError:
+            return default
+        return value if value == value else default
+
+    def set_at(self, index, value):
+        """Set the value of an entry by its index, growing the column if needed.
+
+        Args:
+            index: Index of the entry in config["files"]
+            value: Value to store (not NaN)
+        """
+        values = self._values
+        try:
+            previous = values[index]
+        except IndexError:
+            if index < 0:
+                raise
+            values.extend(array("d", [_MISSING]) * (index + 1 - len(values)))
+            previous = _MISSING
+        value = float(value)
+        if value != value:
+            raise ValueError(f"Cannot store NaN for entry '#{index}'")
+        if previous != previous:
+            self._count += 1
+        values[index] = value
+
+    def pop_at(self, index, default=None):
+        """Remove the value of an entry by its index.
+
+        Args:
+            index: Index of the entry in config["files"]
+            default: Value returned if the entry has no value
+
+        Returns:
+            float: Removed value of the entry, or default
+        """
+        value = self.get_at(index)
+        if value is None:
+            return default
+        self._values[index] = _MISSING
+        self._count -= 1
+        return value
+
+    def get(self, entry_key, default=None):
+        try:
+            index = int(entry_key[1:]) if entry_key[0] == "#" and entry_key[1] != "-" else -1
+        except (TypeError, ValueError, IndexError, KeyError):
+            return default
+        return self.get_at(index, default) if index >= 0 else default
+
+    def __getitem__(self, entry_key):
+        value = self.get(entry_key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(entry_key)
+        return value
+
+    def __contains__(self, entry_key):
+        return self.get(entry_key, _MISSING) is not _MISSING
+
+    def __setitem__(self, entry_key, value):
+        if type(entry_key) is not str or entry_key[:1] != "#" or not entry_key[1:].isdigit():
+            raise KeyError(f"Not an entry key: {entry_key!r}")
+        self.set_at(int(entry_key[1:]), value)
+
+    def __delitem__(self, entry_key):
+        if self.get(entry_key, _MISSING) is _MISSING:
+            raise KeyError(entry_key)
+        self.pop_at(int(entry_key[1:]))
+
+    def __iter__(self):
+        for index, value in enumerate(self._values):
+            if value == value:
+                yield f"#{index}"
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def clear(self):
+        self._values = array("d")
+        self._count = 0
+
+
+class _KeyedColumn:
+    """Index-based access to a per-entry dictionary keyed by "#<index>", like an EntryColumn."""
+
+    __slots__ = ("_mapping",)
+
+    def __init__(self, mapping):
+        self._mapping = mapping
+
+    def get_at(self, index, default=None):
+        return self._mapping.get(f"#{index}", default)
+
+    def set_at(self, index, value):
+        self._mapping[f"#{index}"] = value
+
+    def pop_at(self, index, default=None):
+        return self._mapping.pop(f"#{index}", default)
+
+
+class EntryState:
+    """Handles building compact per-entry state for a config."""
+
+    @staticmethod
+    def by_index(state):
+        """Get index-based access to per-entry state.
+
+        Args:
+            state: EntryColumn, or a dictionary keyed by entry key ("#<index>")
+
+        Returns:
+            EntryColumn or _KeyedColumn: Object with get_at, set_at and pop_at
+                that reads and updates state in place
+        """
+        return state if type(state) is EntryColumn else _KeyedColumn(state)
+
+    @staticmethod
+    def create_column(config):
+        """Create an empty column with a slot for every entry of a config.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            EntryColumn: Empty column sized to config["files"]
+        """
+        return EntryColumn(len(config.get("files", [])))
+
+    @staticmethod
+    def share_strings(config):
+        """Make entries with equal string keys and values share one string object.
+
+        The TOML parser creates a new string for every key and value it reads,
+        so 100k entries hold 100k copies of "path", "command" and of values
+        repeated across entries such as intervals and commands. Entries are
+        rebuilt in place, so they keep their identity and key order.
+
+        Args:
+            config: Configuration dictionary (its "files" entries are updated in place)
+        """
+        pool = {}
+        for entry in config.get("files", []):
+            items = list(entry.items())
+            entry.clear()
+            for key, value in items:
+                if type(value) is str:
+                    value = pool.setdefault(value, value)
+                elif type(value) is list:
+                    value = [pool.setdefault(item, item) if type(item) is str else item for item in value]
+                entry[pool.setdefault(key, key)] = value
@@ -5,8 +5,12 @@ Handles logging of exceptions and errors to a specified error log file with time
 """
 
 import sys
-import traceback
-from datetime import datetime
+
+# Support both relative and absolute imports
+try:
+    from .clock import Clock
+except ImportError:
+    from clock import Clock
 
 
 class ErrorLogger:
@@ -25,12 +29,15 @@ class ErrorLogger:
             return
 
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp = Clock.now().strftime("%Y-%m-%d %H:%M:%S")
 
             with open(error_log_file, "a") as f:
                 f.write(f"[{timestamp}] ERROR: {message}\n")
 
                 if exception:
+                    # Imported here since it is only needed when an exception is logged
+                    import traceback
+
                     # Write exception details
                     f.write(f"Exception type: {type(exception).__name__}\n")
                     f.write(f"Exception message: {str(exception)}\n")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Event journal for File Watcher
+Appends scheduler events to a compact binary file so real workloads can be replayed offline
+"""
+
+import struct
+
+# Support both relative and absolute imports
+try:
+    from .clock import Clock
+except ImportError:
+    from clock import Clock
+
+
+class EventJournal:
+    """Append-only binary journal of scheduler events.
+
+    Enabled with the global event_journal option. Every watcher run appends
+    a session header followed by fixed-size event records:
+
+        header: b"CFWJ", version (uint8), wall-clock start, monotonic start (doubles)
+        event:  type (uint8), entry index (uint32), Clock.monotonic() time, value (doubles)
+
+    The value depends on the event type: the stat result (NaN if the path is
+    missing) for STAT, and the duration in seconds for COMMAND_FINISH and
+    TICK. Events not tied to an entry use NO_ENTRY. Like LoadShedder, the
+    journal is shared by the process; capture() records into a list instead
+    of a file, which replays use to measure themselves the same way.
+    """
+
+    MAGIC = b"CFWJ"
+    VERSION = 1
+
+    DUE = 1
+    STAT = 2
+    CHANGE = 3
+    COMMAND_START = 4
+    COMMAND_FINISH = 5
+    SUPPRESSED = 6
+    RELOAD = 7
+    TICK = 8
+
+    EVENT_NAMES = {
+        DUE: "due",
+        STAT: "stat",
+        CHANGE: "change",
+        COMMAND_START: "command start",
+        COMMAND_FINISH: "command finish",
+        SUPPRESSED: "suppressed",
+        RELOAD: "reload",
+        TICK: "tick",
+    }
+
+    NO_ENTRY = 0xFFFFFFFF
+
+    _HEADER = struct.Struct("<4sBdd")
+    _EVENT = struct.Struct("<BIdd")
+
+    _enabled = False
+    _file = None
+    _captured = None
+
+    @staticmethod
+    def open(path):
+        """Start appending events to a journal file.
+
+        Args:
+            path: Path of the journal file
+
+        Raises:
+            OSError: If the file cannot be opened
+        """
+        EventJournal.close()
+        EventJournal._file = open(path, "ab")
+        EventJournal._file.write(
+            EventJournal._HEADER.pack(EventJournal.MAGIC, EventJournal.VERSION, Clock.time(), Clock.monotonic())
+        )
+        EventJournal._enabled = True
+
+    @staticmethod
+    def capture():
+        """Start recording events in memory instead of a file.
+
+        Returns:
+            list: List that receives (type, entry index, time, value) tuples
+        """
+        EventJournal.close()
+        EventJournal._captured = []
+        EventJournal._enabled = True
+        return EventJournal._captured
+
+    @staticmethod
+    def close():
+        """Stop journaling and flush the journal file, if any."""
+        if EventJournal._file is not None:
+            EventJournal._file.close()
+        EventJournal._file = None
+        EventJournal._captured = None
+        EventJournal._enabled = False
+
+    @staticmethod
+    def is_enabled():
+        """Return whether events are being journaled."""
+        return EventJournal._enabled
+
+    @staticmethod
+    def record(event, entry_key=None, value=0.0):
+        """Journal an event (a no-op unless journaling is enabled).
+
+        Args:
+            event: Event type (e.g. EventJournal.STAT)
+            entry_key: Entry key ("#<index>"), or None for events not tied to an entry
+            value: Event value (stat result or duration)
+        """
+        if not EventJournal._enabled:
+            return
+        entry = int(entry_key[1:]) if entry_key else EventJournal.NO_ENTRY
+        now = Clock.monotonic()
+        if EventJournal._captured is not None:
+            EventJournal._captured.append((event, entry, now, value))
+        if EventJournal._file is not None:
+            EventJournal._file.write(EventJournal._EVENT.pack(event, entry, now, value))
+            # One write per tick keeps the journal current without a syscall per event
+            if event == EventJournal.TICK:
+                EventJournal._file.flush()
+
+    @staticmethod
+    def read(path):
+        """Read the sessions of a journal file.
+
+        A truncated final record (e.g. after a crash) is ignored. A record with an
+        unknown type, or one cut short by a session header (a crash in the middle of
+        a write followed by a restart), ends its session: reading resumes at the
+        next session header instead of misreading the rest of the file.
+
+        Args:
+            path: Path of the journal file
+
+        Returns:
+            list: One dictionary per session with "wall_start" and "events", a list of
+                (type, entry index, time, value) tuples with times relative to the session start
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not an event journal
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        header_size = EventJournal._HEADER.size
+        event_size = EventJournal._EVENT.size
+        sessions = []
+        offset = 0
+        while offset < len(data):
+            if data[offset : offset + 4] == EventJournal.MAGIC:
+                if offset + header_size > len(data):
+                    break
+                _, version, wall_start, monotonic_start = EventJournal._HEADER.unpack_from(data, offset)
+                if version != EventJournal.VERSION:
+                    raise ValueError(f"Unsupported event journal version {version} in '{path}'")
+                sessions.append({"wall_start": wall_start, "monotonic_start": monotonic_start, "events": []})
+                offset += header_size
+                continue
+            if not sessions:
+                raise ValueError(f"'{path}' is not an event journal")
+            if offset + event_size > len(data):
+                break
+            # An unknown type, or a session header starting inside the record (cut short by a crash)
+            header_inside = data.find(EventJournal.MAGIC, offset + 1, offset + event_size + 3) >= 0
+            if data[offset] not in EventJournal.EVENT_NAMES or header_inside:
+                offset = data.find(EventJournal.MAGIC, offset + 1)
+                if offset < 0:
+                    break
+                continue
+            event, entry, at, value = EventJournal._EVENT.unpack_from(data, offset)
+            sessions[-1]["events"].append((event, entry, at - sessions[-1]["monotonic_start"], value))
+            offset += event_size
+
+        for session in sessions:
+            del session["monotonic_start"]
+        return sessions
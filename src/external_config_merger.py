@@ -6,17 +6,16 @@ External configuration file merger for File Watcher
 import os
 import sys
 
-import toml
-from colorama import Fore
-
 # Support both relative and absolute imports
 try:
     from .config_validator import ConfigValidator
     from .error_logger import ErrorLogger
+    from .terminal_colors import Fore
     from .timestamp_printer import TimestampPrinter
 except ImportError:
     from config_validator import ConfigValidator
     from error_logger import ErrorLogger
+    from terminal_colors import Fore
     from timestamp_printer import TimestampPrinter
 
 
@@ -51,6 +50,33 @@ class ExternalConfigMerger:
                 merged_entry.update(entry)
                 config["files"].append(merged_entry)
 
+    @staticmethod
+    def resolve_external_file_paths(config, main_config_path):
+        """Resolve external file paths from config to absolute paths.
+
+        Args:
+            config: Main configuration dictionary
+            main_config_path: Path to the main config file (for resolving relative paths)
+
+        Returns:
+            list: List of absolute paths to external files (empty if external_files is not a list)
+        """
+        external_files = config.get("external_files", [])
+        if not isinstance(external_files, list):
+            return []
+
+        # Get directory of main config file for resolving relative paths
+        main_config_dir = os.path.dirname(os.path.abspath(main_config_path))
+
+        resolved_paths = []
+        for external_file in external_files:
+            # Resolve relative paths relative to main config file
+            if not os.path.isabs(external_file):
+                external_file = os.path.join(main_config_dir, external_file)
+            resolved_paths.append(external_file)
+
+        return resolved_paths
+
     @staticmethod
     def merge_external_files(config, main_config_path, error_log_file):
         """Merge files sections from external TOML files.
@@ -63,6 +89,9 @@ class ExternalConfigMerger:
         Raises:
             SystemExit: If external file is not found, cannot be parsed, or contains invalid sections
         """
+        # Imported here to keep module import (and startup) cheap
+        import toml
+
         external_files = config.get("external_files", [])
         if not isinstance(external_files, list):
             error_msg = "external_files must be a list of file paths"
@@ -3,22 +3,39 @@
 File monitoring logic for File Watcher
 """
 
-import os
 import time
 
-from colorama import Fore
-
 # Support both relative and absolute imports
 try:
+    from .adaptive_interval import AdaptiveInterval
+    from .clock import Clock
     from .command_executor import CommandExecutor
     from .config_loader import ConfigLoader
+    from .entry_state import EntryState
     from .error_logger import ErrorLogger
+    from .event_journal import EventJournal
+    from .filesystem import FileSystem
+    from .load_shedder import PRIORITY_CLASSES, LoadShedder
+    from .path_backoff import PathBackoff
+    from .phase_spreader import PhaseSpreader
+    from .terminal_colors import Fore
+    from .tick_monitor import TickMonitor
     from .time_period_checker import TimePeriodChecker
     from .timestamp_printer import TimestampPrinter
 except ImportError:
+    from adaptive_interval import AdaptiveInterval
+    from clock import Clock
     from command_executor import CommandExecutor
     from config_loader import ConfigLoader
+    from entry_state import EntryState
     from error_logger import ErrorLogger
+    from event_journal import EventJournal
+    from filesystem import FileSystem
+    from load_shedder import PRIORITY_CLASSES, LoadShedder
+    from path_backoff import PathBackoff
+    from phase_spreader import PhaseSpreader
+    from terminal_colors import Fore
+    from tick_monitor import TickMonitor
     from time_period_checker import TimePeriodChecker
     from timestamp_printer import TimestampPrinter
 
@@ -37,18 +54,43 @@ class FileMonitor:
             float: Timestamp or None if file is not accessible
         """
         try:
-            return os.path.getmtime(filepath)
+            return FileSystem.getmtime(filepath)
         except OSError:
             return None
 
     @staticmethod
-    def check_files(config, file_timestamps, file_last_check):
+    def check_files(
+        config,
+        file_timestamps,
+        file_last_check,
+        file_backoff=None,
+        file_last_run=None,
+        paused_entries=None,
+        deadline=None,
+        file_adaptive=None,
+        interval_scheduler=None,
+    ):
         """Check all files for timestamp changes and execute commands if needed.
 
         Args:
             config: Configuration dictionary
-            file_timestamps: Dictionary tracking file timestamps
-            file_last_check: Dictionary tracking last check time per file
+            file_timestamps: EntryColumn or dictionary tracking file timestamps
+            file_last_check: EntryColumn or dictionary tracking last check time (Clock.monotonic()) per file
+            file_backoff: Optional dictionary tracking backoff state per file.
+                When given, missing or erroring entries are polled less often
+                and their repeated errors are reported only once.
+            file_last_run: Optional dictionary recording the start time and
+                duration of the last command run per file
+            paused_entries: Optional set of entry keys that must not be checked
+            deadline: Optional time.monotonic() value after which no further due
+                entries are processed. Due entries are then processed by priority
+                class and oldest check first, so entries left over are the first
+                of their class to be processed next tick.
+            file_adaptive: Optional dictionary tracking the current interval of
+                entries with an adaptive setting. Without it those entries poll
+                at their minimum interval.
+            interval_scheduler: Optional IntervalScheduler; when given, only the
+                entries whose timers expired are visited instead of all entries
 
         Returns:
             tuple: Updated (file_timestamps, file_last_check) dictionaries
@@ -57,132 +99,379 @@ class FileMonitor:
             TimestampPrinter.print("Warning: No 'files' section found in configuration.", Fore.YELLOW)
             return file_timestamps, file_last_check
 
-        error_log_file = config.get("error_log_file")
-        current_time = time.time()
+        # Intervals are measured on the monotonic clock, so wall-clock steps do not affect them
+        current_time = Clock.monotonic()
         files_config = config["files"]
-
-        for index, entry in enumerate(files_config):
+        # Parent directory mtimes are shared by all backed-off entries within one tick
+        parent_mtimes = {}
+        # State is read and written by entry index, without formatting and parsing keys
+        last_checks = EntryState.by_index(file_last_check)
+        timestamps = EntryState.by_index(file_timestamps)
+
+        if interval_scheduler is None:
+            order = range(len(files_config))
+        else:
+            order = interval_scheduler.pop_due(current_time, len(files_config), file_last_check)
+        # Under a tick budget, due entries are collected per priority class and processed
+        # after the scan: higher classes first, then the entries waiting longest
+        due_by_rank = [[] for _ in PRIORITY_CLASSES] if deadline is not None else None
+        processed = 0
+        carried_over = 0
+
+        for index in order:
+            entry = files_config[index]
             filename = entry.get("path", "")
             settings = entry
             entry_key = f"#{index}"
+            # When the entry has to be visited again; unless an interval says otherwise, next tick
+            visit_at = current_time
 
             try:
-                # Validate and check if entry should be processed
-                if not FileMonitor._should_process_entry(filename, settings, error_log_file):
+                if paused_entries and entry_key in paused_entries:
                     continue
 
-                # Check time period
+                # Cron-scheduled entries are run by run_scheduled, not polled
+                if "schedule" in entry:
+                    visit_at = None
+                    continue
+
+                # Check time period; outside it the entry sleeps until the period opens
                 if not TimePeriodChecker.should_monitor_file(config, settings):
+                    opens_at = TimePeriodChecker.get_period_state(config, settings["time_period"])[1]
+                    visit_at = current_time + max(0.0, opens_at - Clock.time())
                     continue
 
                 # Check interval timing
-                interval = ConfigLoader.get_interval_for_file(config, settings)
-                if entry_key in file_last_check:
-                    if current_time - file_last_check[entry_key] < interval:
+                if "adaptive" in settings:
+                    interval = AdaptiveInterval.get_interval(file_adaptive or {}, entry_key, settings)
+                else:
+                    interval = ConfigLoader.get_interval_for_file(config, settings)
+
+                # Stretch or pause low-priority entries while load is being shed
+                shed_factor = LoadShedder.get_interval_factor(settings)
+                if shed_factor is None:
+                    continue
+                interval *= shed_factor
+
+                previous_check = last_checks.get_at(index)
+                if previous_check is not None:
+                    elapsed = current_time - previous_check
+                    if elapsed < interval:
+                        visit_at = previous_check + interval
                         continue
+                    if file_backoff and PathBackoff.is_backing_off(file_backoff, entry_key):
+                        backoff_interval = PathBackoff.get_effective_interval(file_backoff, entry_key, interval, config)
+                        if elapsed < backoff_interval and not PathBackoff.has_parent_changed(
+                            file_backoff, entry_key, filename, parent_mtimes
+                        ):
+                            # The parent is looked at again after a regular interval,
+                            # the path itself once the backed-off interval has passed
+                            visit_at = min(previous_check + backoff_interval, current_time + interval)
+                            continue
+                elif filename == "" and PhaseSpreader.is_enabled(config):
+                    # Defer the first run of periodic commands to the entry's phase
+                    last_check = current_time - interval + PhaseSpreader.get_phase(settings, interval)
+                    last_checks.set_at(index, last_check)
+                    visit_at = last_check + interval
+                    continue
 
-                file_last_check[entry_key] = current_time
+                if due_by_rank is not None:
+                    # Scheduled again once processed or carried over
+                    visit_at = None
+                    waiting_since = float("-inf") if previous_check is None else previous_check
+                    due_by_rank[LoadShedder.get_rank(settings)].append((waiting_since, index, interval, shed_factor))
+                    continue
 
-                # Process the entry
-                file_timestamps = FileMonitor._process_entry(filename, settings, entry_key, config, file_timestamps)
+                visit_at = FileMonitor._check_due_entry(
+                    index,
+                    settings,
+                    config,
+                    current_time,
+                    previous_check,
+                    interval,
+                    shed_factor,
+                    last_checks,
+                    timestamps,
+                    file_backoff,
+                    file_last_run,
+                    file_adaptive,
+                )
 
             except Exception as e:
-                error_msg = f"Error processing file '{filename}'"
-                TimestampPrinter.print(f"{error_msg}: {e}", Fore.RED)
-                ErrorLogger.log_error(error_log_file, error_msg, e)
+                visit_at = current_time
+                FileMonitor._report_entry_error(filename, entry_key, config, file_backoff, e)
                 continue
-
+            finally:
+                if interval_scheduler is not None and visit_at is not None:
+                    interval_scheduler.schedule(index, visit_at)
+
+        for bucket in due_by_rank or ():
+            # Only due entries are ordered, so the cost follows the work left rather than the config size
+            bucket.sort()
+            for _, index, interval, shed_factor in bucket:
+                visit_at = current_time
+                try:
+                    # Leave due entries for the next tick once the tick budget is spent
+                    if processed and time.monotonic() >= deadline:
+                        carried_over += 1
+                        continue
+                    processed += 1
+                    visit_at = FileMonitor._check_due_entry(
+                        index,
+                        files_config[index],
+                        config,
+                        current_time,
+                        last_checks.get_at(index),
+                        interval,
+                        shed_factor,
+                        last_checks,
+                        timestamps,
+                        file_backoff,
+                        file_last_run,
+                        file_adaptive,
+                    )
+                except Exception as e:
+                    visit_at = current_time
+                    FileMonitor._report_entry_error(
+                        files_config[index].get("path", ""), f"#{index}", config, file_backoff, e
+                    )
+                finally:
+                    if interval_scheduler is not None:
+                        interval_scheduler.schedule(index, visit_at)
+
+        if carried_over:
+            TickMonitor.record_carried_over(carried_over)
         return file_timestamps, file_last_check
 
     @staticmethod
-    def _should_process_entry(filename, settings, error_log_file):
-        """Validate and check if entry should be processed.
+    def _check_due_entry(
+        index,
+        settings,
+        config,
+        current_time,
+        previous_check,
+        interval,
+        shed_factor,
+        last_checks,
+        timestamps,
+        file_backoff,
+        file_last_run,
+        file_adaptive,
+    ):
+        """Record the check of a due entry and process it.
 
         Args:
-            filename: File path
+            index: Index of the entry in config["files"]
             settings: Entry settings
-            error_log_file: Error log file path
+            config: Configuration dictionary
+            current_time: Clock.monotonic() value of the tick
+            previous_check: Last check time of the entry, or None if never checked
+            interval: Current interval of the entry, including load shedding
+            shed_factor: Load shedding factor included in interval
+            last_checks: Last check times as returned by EntryState.by_index (updated in place)
+            timestamps: File timestamps as returned by EntryState.by_index (updated in place)
+            file_backoff: Optional dictionary tracking backoff state per file
+            file_last_run: Optional dictionary recording the last command run per file
+            file_adaptive: Optional dictionary tracking the current interval of adaptive entries
 
         Returns:
-            bool: True if entry should be processed
+            float: Clock.monotonic() value at which the entry is due next
         """
-        # Validate terminate_if_process configuration
-        if "terminate_if_process" in settings:
-            if filename != "":
-                error_msg = f"Fatal configuration error: terminate_if_process can only be used with empty filename, but filename is '{filename}'"
-                TimestampPrinter.print(error_msg, Fore.RED)
-                ErrorLogger.log_error(error_log_file, error_msg)
-                return False
-
-            if "command" in settings and settings["command"]:
-                error_msg = "Fatal configuration error: terminate_if_process cannot be used with command field (command must be empty)"
-                TimestampPrinter.print(error_msg, Fore.RED)
-                ErrorLogger.log_error(error_log_file, error_msg)
-                return False
-
-        # Validate terminate_if_window_title configuration
-        if "terminate_if_window_title" in settings:
-            if filename != "":
-                error_msg = f"Fatal configuration error: terminate_if_window_title can only be used with empty filename, but filename is '{filename}'"
-                TimestampPrinter.print(error_msg, Fore.RED)
-                ErrorLogger.log_error(error_log_file, error_msg)
-                return False
-
-            if "command" in settings and settings["command"]:
-                error_msg = "Fatal configuration error: terminate_if_window_title cannot be used with command field (command must be empty)"
-                TimestampPrinter.print(error_msg, Fore.RED)
-                ErrorLogger.log_error(error_log_file, error_msg)
-                return False
-
-        # Check if command is specified
+        filename = settings.get("path", "")
+        entry_key = f"#{index}"
+        EventJournal.record(EventJournal.DUE, entry_key)
+
         if (
-            "command" not in settings
-            and "argv" not in settings
-            and "terminate_if_process" not in settings
-            and "terminate_if_window_title" not in settings
+            settings.get("missed_runs") == "catch-up"
+            and interval > 0
+            and previous_check is not None
+            and current_time - previous_check >= 2 * interval
         ):
-            TimestampPrinter.print(f"Warning: No command specified for file '{filename}'", Fore.YELLOW)
-            return False
+            # Replay missed runs one per tick, keeping the original phase
+            last_check = previous_check + interval
+        else:
+            last_check = current_time
+            if previous_check is None and PhaseSpreader.is_enabled(config):
+                # First check of a file entry: the next one comes at the entry's phase
+                last_check += PhaseSpreader.get_phase(settings, interval) - interval
+            last_check += PhaseSpreader.get_delay(config, settings)
+        last_checks.set_at(index, last_check)
+
+        # Process the entry
+        track_adaptive = file_adaptive is not None and "adaptive" in settings
+        previous_timestamp = timestamps.get_at(index) if track_adaptive else None
+        FileMonitor._process_entry(
+            filename, settings, index, entry_key, config, timestamps, file_backoff, file_last_run
+        )
+        if track_adaptive:
+            changed = previous_timestamp is not None and timestamps.get_at(index) != previous_timestamp
+            AdaptiveInterval.record_check(file_adaptive, entry_key, settings, changed)
+            interval = AdaptiveInterval.get_interval(file_adaptive, entry_key, settings) * shed_factor
+
+        if file_backoff is not None and PathBackoff.reset(file_backoff, entry_key, "error"):
+            TimestampPrinter.print(f"Entry for '{filename}' recovered from errors", Fore.GREEN)
+        return last_check + interval
 
-        return True
+    @staticmethod
+    def run_scheduled(config, scheduler, file_last_run=None, paused_entries=None, now=None):
+        """Run the commands of cron-scheduled entries that are due.
+
+        Args:
+            config: Configuration dictionary
+            scheduler: DeadlineScheduler loaded with the config
+            file_last_run: Optional dictionary recording the last command run per file
+            paused_entries: Optional set of entry keys that must not run
+            now: Current timestamp, defaults to now
+        """
+        files_config = config.get("files", [])
+        for entry_key in scheduler.pop_due(now):
+            if paused_entries and entry_key in paused_entries:
+                continue
+            settings = files_config[int(entry_key[1:])]
+            # Paused while load is being shed; the next firing is already scheduled
+            if LoadShedder.get_interval_factor(settings) is None:
+                continue
+            try:
+                if not TimePeriodChecker.should_monitor_file(config, settings):
+                    continue
+                FileMonitor._run_command(settings.get("command", ""), "", settings, config, entry_key, file_last_run)
+            except Exception as e:
+                FileMonitor._report_entry_error("", entry_key, config, None, e)
 
     @staticmethod
-    def _process_entry(filename, settings, entry_key, config, file_timestamps):
-        """Process a single file entry.
+    def trigger_entry(config, entry_key, file_timestamps, file_last_run=None):
+        """Run an entry's command immediately, regardless of changes and intervals.
+
+        For file entries the current timestamp becomes the new baseline, so the
+        next check does not run the command again for the same change.
+
+        Args:
+            config: Configuration dictionary
+            entry_key: Key of the entry to run ("#<index>")
+            file_timestamps: Dictionary tracking file timestamps
+            file_last_run: Optional dictionary recording the last command run per file
+        """
+        settings = config["files"][int(entry_key[1:])]
+        filename = settings.get("path", "")
+        TimestampPrinter.print(f"Manually triggered entry {entry_key}")
+        FileMonitor._run_command(settings.get("command", ""), filename, settings, config, entry_key, file_last_run)
+
+        if filename != "":
+            current_timestamp = FileMonitor.get_file_timestamp(filename)
+            if current_timestamp is not None:
+                file_timestamps[entry_key] = current_timestamp
+
+    @staticmethod
+    def _report_entry_error(filename, entry_key, config, file_backoff, exception):
+        """Report an error raised while processing an entry.
+
+        Without backoff tracking every error is reported. With backoff tracking
+        only the first error of a streak is reported, plus a single notice when
+        the entry starts backing off.
 
         Args:
             filename: File path
-            settings: Entry settings
             entry_key: Unique key for tracking
             config: Configuration dictionary
-            file_timestamps: Dictionary tracking file timestamps
+            file_backoff: Dictionary tracking backoff state per file, or None
+            exception: The exception that was raised
+        """
+        error_log_file = config.get("error_log_file")
+        error_msg = f"Error processing file '{filename}'"
+
+        if file_backoff is None:
+            TimestampPrinter.print(f"{error_msg}: {exception}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, exception)
+            return
+
+        should_report, started_backoff = PathBackoff.record_error(file_backoff, entry_key)
+        if should_report:
+            TimestampPrinter.print(f"{error_msg}: {exception}", Fore.RED)
+            ErrorLogger.log_error(error_log_file, error_msg, exception)
+        if started_backoff:
+            backoff_msg = (
+                f"Repeated errors processing file '{filename}', backing off "
+                f"(up to every {PathBackoff.get_max_interval(config)}s) and suppressing further error reports"
+            )
+            TimestampPrinter.print(f"Warning: {backoff_msg}", Fore.YELLOW)
+            ErrorLogger.log_error(error_log_file, backoff_msg)
 
-        Returns:
-            dict: Updated file_timestamps dictionary
+    @staticmethod
+    def _process_entry(filename, settings, index, entry_key, config, timestamps, file_backoff=None, file_last_run=None):
+        """Process a single file entry.
+
+        Args:
+            filename: File path
+            settings: Entry settings
+            index: Index of the entry in config["files"]
+            entry_key: Unique key for tracking ("#<index>")
+            config: Configuration dictionary
+            timestamps: File timestamps as returned by EntryState.by_index (updated in place)
+            file_backoff: Optional dictionary tracking backoff state per file
+            file_last_run: Optional dictionary recording the last command run per file
         """
         # Handle empty filename (periodic tasks)
         if filename == "":
             command = settings.get("command", "")
-            CommandExecutor.execute_command(command, filename, settings, config)
-            return file_timestamps
+            FileMonitor._run_command(command, filename, settings, config, entry_key, file_last_run)
+            return
 
         # Get current timestamp
-        current_timestamp = FileMonitor.get_file_timestamp(filename)
+        current_timestamp = TickMonitor.timed("stat", FileMonitor.get_file_timestamp, filename)
+        EventJournal.record(
+            EventJournal.STAT, entry_key, float("nan") if current_timestamp is None else current_timestamp
+        )
 
+        previous_timestamp = timestamps.get_at(index)
         if current_timestamp is None:
-            if entry_key in file_timestamps:
+            if previous_timestamp is not None:
                 TimestampPrinter.print(f"Warning: File '{filename}' is no longer accessible", Fore.YELLOW)
-                del file_timestamps[entry_key]
-            return file_timestamps
+                timestamps.pop_at(index)
+            if file_backoff is not None:
+                PathBackoff.record_missing(file_backoff, entry_key, filename)
+            return
+
+        if file_backoff is not None:
+            PathBackoff.reset(file_backoff, entry_key, "missing")
 
         # Check if first time seeing this file
-        if entry_key not in file_timestamps:
-            file_timestamps[entry_key] = current_timestamp
+        if previous_timestamp is None:
+            timestamps.set_at(index, current_timestamp)
             TimestampPrinter.print(f"Started monitoring '{filename}'", Fore.GREEN)
         # Check if timestamp changed
-        elif current_timestamp != file_timestamps[entry_key]:
+        elif current_timestamp != previous_timestamp:
             TimestampPrinter.print(f"Detected change in '{filename}'")
-            CommandExecutor.execute_command(settings.get("command", ""), filename, settings, config)
-            file_timestamps[entry_key] = current_timestamp
+            EventJournal.record(EventJournal.CHANGE, entry_key)
+            FileMonitor._run_command(settings.get("command", ""), filename, settings, config, entry_key, file_last_run)
+            timestamps.set_at(index, current_timestamp)
+
+    @staticmethod
+    def _run_command(command, filename, settings, config, entry_key, file_last_run):
+        """Execute an entry's command and record when it ran and how long it took.
 
-        return file_timestamps
+        Args:
+            command: The shell command to execute
+            filename: File path
+            settings: Entry settings
+            config: Configuration dictionary
+            entry_key: Unique key for tracking
+            file_last_run: Dictionary recording the last command run per file, or None
+        """
+        started = Clock.time()
+        began = time.monotonic()
+        journal_started = Clock.monotonic()
+        EventJournal.record(EventJournal.COMMAND_START, entry_key)
+        scan_cost_before = TickMonitor.get_cost("process scan")
+        executed = None
+        try:
+            executed = CommandExecutor.execute_command(command, filename, settings, config)
+        finally:
+            duration = time.monotonic() - began
+            if executed is False:
+                EventJournal.record(EventJournal.SUPPRESSED, entry_key)
+            else:
+                EventJournal.record(EventJournal.COMMAND_FINISH, entry_key, Clock.monotonic() - journal_started)
+            # Process scans for suppression or termination are accounted separately
+            TickMonitor.record("command", duration - (TickMonitor.get_cost("process scan") - scan_cost_before))
+            if file_last_run is not None:
+                file_last_run[entry_key] = {"started": started, "duration": duration}
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Injectable filesystem for File Watcher
+Routes the stat calls of change detection through one place so simulations can run without touching disk
+"""
+
+import os
+
+# Support both relative and absolute imports
+try:
+    from .clock import Clock
+except ImportError:
+    from clock import Clock
+
+
+class OsFileSystem:
+    """Filesystem backed by the operating system."""
+
+    def getmtime(self, path):
+        """Return the modification time of a path in seconds (raises OSError if not accessible)."""
+        return os.path.getmtime(path)
+
+    def stat_mtime_ns(self, path):
+        """Return the modification time of a path in nanoseconds (raises OSError if not accessible)."""
+        return os.stat(path).st_mtime_ns
+
+
+class MemoryFileSystem:
+    """In-memory filesystem holding only modification times.
+
+    Writing or removing a file also updates the modification time of its
+    parent directory, as on disk, so missing-path backoff behaves the same.
+    Modification times default to Clock.time(), so they follow a VirtualClock.
+    """
+
+    def __init__(self):
+        """Initialize an empty filesystem."""
+        self._mtimes = {}
+
+    @staticmethod
+    def _normalize(path):
+        """Get the absolute form of a path used as key."""
+        return os.path.abspath(path)
+
+    def _touch_parent(self, path, mtime_ns):
+        """Update the modification time of a path's parent directory."""
+        self._mtimes[os.path.dirname(path)] = mtime_ns
+
+    def write(self, path, mtime=None):
+        """Create or modify a file.
+
+        Args:
+            path: File path
+            mtime: Modification time in seconds, defaults to Clock.time()
+        """
+        path = self._normalize(path)
+        mtime_ns = int((Clock.time() if mtime is None else mtime) * 1_000_000_000)
+        if path not in self._mtimes:
+            self._touch_parent(path, mtime_ns)
+        self._mtimes[path] = mtime_ns
+
+    def mkdir(self, path, mtime=None):
+        """Create a directory (a path that only carries a modification time).
+
+        Args:
+            path: Directory path
+            mtime: Modification time in seconds, defaults to Clock.time()
+        """
+        self.write(path, mtime)
+
+    def remove(self, path):
+        """Remove a file.
+
+        Args:
+            path: File path
+
+        Raises:
+            FileNotFoundError: If the path does not exist
+        """
+        path = self._normalize(path)
+        if path not in self._mtimes:
+            raise FileNotFoundError(path)
+        del self._mtimes[path]
+        self._touch_parent(path, int(Clock.time() * 1_000_000_000))
+
+    def exists(self, path):
+        """Return whether a path exists."""
+        return self._normalize(path) in self._mtimes
+
+    def getmtime(self, path):
+        """Return the modification time of a path in seconds (raises FileNotFoundError if missing)."""
+        return self.stat_mtime_ns(path) / 1_000_000_000
+
+    def stat_mtime_ns(self, path):
+        """Return the modification time of a path in nanoseconds (raises FileNotFoundError if missing)."""
+        # Configs mostly use absolute, normalized paths, which need no normalization
+        mtime_ns = self._mtimes.get(path)
+        if mtime_ns is None:
+            mtime_ns = self._mtimes.get(self._normalize(path))
+            if mtime_ns is None:
+                raise FileNotFoundError(path)
+        return mtime_ns
+
+
+class FileSystem:
+    """Process-wide access point for the filesystem used by change detection.
+
+    Defaults to the operating system. Only modification-time lookups go
+    through here; commands and config loading still use the real filesystem.
+    """
+
+    _filesystem = OsFileSystem()
+
+    @staticmethod
+    def set_filesystem(filesystem):
+        """Replace the filesystem.
+
+        Args:
+            filesystem: Object with getmtime() and stat_mtime_ns() (e.g. MemoryFileSystem),
+                or None to restore the operating system filesystem
+        """
+        FileSystem._filesystem = filesystem if filesystem is not None else OsFileSystem()
+
+    @staticmethod
+    def get_filesystem():
+        """Return the filesystem in use."""
+        return FileSystem._filesystem
+
+    @staticmethod
+    def getmtime(path):
+        """Return the modification time of a path in seconds.
+
+        Raises:
+            OSError: If the path is not accessible
+        """
+        return FileSystem._filesystem.getmtime(path)
+
+    @staticmethod
+    def stat_mtime_ns(path):
+        """Return the modification time of a path in nanoseconds.
+
+        Raises:
+            OSError: If the path is not accessible
+        """
+        return FileSystem._filesystem.stat_mtime_ns(path)
@@ -10,6 +10,10 @@ import re
 class IntervalParser:
     """Handles parsing of interval strings to seconds."""
 
+    # Parsed intervals by string; every entry is re-parsed each tick, but
+    # configs only use a handful of distinct interval strings
+    _parsed = {}
+
     @staticmethod
     def parse_interval(interval_value):
         """Parse interval value to seconds.
@@ -27,6 +31,10 @@ class IntervalParser:
         """
         # Handle time string format
         if isinstance(interval_value, str):
+            seconds = IntervalParser._parsed.get(interval_value)
+            if seconds is not None:
+                return seconds
+
             # Parse time string format: number + unit (ms/s/m/h)
             # Supports decimal numbers like "0.5s"
             match = re.match(r"^(\d+\.?\d*|\.\d+)(ms|s|m|h)$", interval_value.strip())
@@ -41,12 +49,14 @@ class IntervalParser:
 
             # Convert to seconds based on unit
             if unit == "ms":
-                return number / 1000.0
+                seconds = number / 1000.0
             elif unit == "s":
-                return number
+                seconds = number
             elif unit == "m":
-                return number * 60.0
-            elif unit == "h":
-                return number * 3600.0
+                seconds = number * 60.0
+            else:
+                seconds = number * 3600.0
+            IntervalParser._parsed[interval_value] = seconds
+            return seconds
 
         raise ValueError(f"Invalid interval type: {type(interval_value).__name__}. Expected string (time format)")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Interval scheduler for File Watcher
+Keeps interval-polled entries in a timer queue so a tick only visits entries that may be due
+"""
+
+# Support both relative and absolute imports
+try:
+    from .deadline_scheduler import SCHEDULER_QUEUES
+    from .load_shedder import LoadShedder
+except ImportError:
+    from deadline_scheduler import SCHEDULER_QUEUES
+    from load_shedder import LoadShedder
+
+
+class IntervalScheduler:
+    """Timer queue of entry indexes for the entries check_files polls at an interval.
+
+    Without a scheduler, check_files visits every entry on every tick only to
+    find that most of them are not due. With one, each visited entry is put
+    back into the queue with the time it has to be visited again: its next
+    due time when only its interval is left to wait for, the next tick when
+    it waits for something else (paused, outside its time period, shed,
+    backing off, carried over), and never for cron-scheduled entries, which
+    DeadlineScheduler runs. A tick then only visits the expired timers.
+
+    The first tick after creation or invalidate() visits every entry to fill
+    the queue. This also happens when the load shedding level changes, since
+    that changes intervals, and when the last check times are replaced (e.g.
+    on reload); the owner must call invalidate() when it changes last check
+    times in place (e.g. after a suspend). Timers are set
+    on Clock.monotonic(), which wall-clock steps do not move. The queue
+    follows the global scheduler option like DeadlineScheduler; timers are
+    set RESOLUTION early, so the timer wheel's rounding to its slots never
+    makes an entry wait past the tick that would have found it due.
+    """
+
+    # Slot width of the timer wheel, and how early timers are set
+    RESOLUTION = 0.01
+
+    def __init__(self, config):
+        """Initialize a scheduler whose first tick visits every entry.
+
+        Args:
+            config: Configuration dictionary ("scheduler" selects the queue implementation)
+        """
+        self._queue_type = SCHEDULER_QUEUES[config.get("scheduler", "heap")]
+        self._queue = None
+        self._shed_level = None
+        self._last_checks = None
+
+    def invalidate(self):
+        """Make the next tick visit every entry and rebuild the queue."""
+        self._queue = None
+
+    def pop_due(self, now, count, last_checks):
+        """Remove the entries to visit in this tick.
+
+        Args:
+            now: Current Clock.monotonic() value
+            count: Number of entries in the config
+            last_checks: Last check times the timers are based on; replacing them
+                (e.g. on reload) makes this tick visit every entry
+
+        Returns:
+            list or range: Indexes of the entries to visit, in index order
+        """
+        shed_level = LoadShedder.get_level()
+        if self._queue is None or self._shed_level != shed_level or self._last_checks is not last_checks:
+            self._queue = self._queue_type(now, IntervalScheduler.RESOLUTION)
+            self._shed_level = shed_level
+            self._last_checks = last_checks
+            return range(count)
+        # An index is only in the queue once, but a duplicate must not be visited twice
+        return sorted({index for _, index in self._queue.pop_until(now)})
+
+    def schedule(self, index, visit_at):
+        """Put a visited entry back into the queue.
+
+        Args:
+            index: Index of the entry in config["files"]
+            visit_at: Clock.monotonic() value at which the entry has to be visited again
+        """
+        self._queue.push(visit_at - IntervalScheduler.RESOLUTION, index)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Event journal replay for File Watcher
+Drives the scheduler against a recorded journal on a virtual clock and reports latencies
+"""
+
+import math
+from collections import deque
+
+# Support both relative and absolute imports
+try:
+    from .cat_file_watcher import FileWatcher
+    from .clock import Clock, VirtualClock
+    from .command_executor import CommandExecutor
+    from .event_journal import EventJournal
+    from .filesystem import FileSystem, MemoryFileSystem
+    from .timestamp_printer import TimestampPrinter
+except ImportError:
+    from cat_file_watcher import FileWatcher
+    from clock import Clock, VirtualClock
+    from command_executor import CommandExecutor
+    from event_journal import EventJournal
+    from filesystem import FileSystem, MemoryFileSystem
+    from timestamp_printer import TimestampPrinter
+
+# Percentiles reported for latency distributions
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+
+
+class JournalReplay:
+    """Replays a journal session against a config and compares it with the recording.
+
+    The watched paths live in a MemoryFileSystem: each entry starts with its
+    first journaled stat result, and every later stat result that differs is
+    written at the time of the entry's previous stat, the earliest moment the
+    change can have happened. Commands are not run; each takes its journaled
+    duration on the VirtualClock (or is suppressed again), so the replay
+    reproduces the recorded workload in the time its ticks take to compute.
+
+    Entries are matched by index, so the replayed config should be the one
+    the journal was recorded with; reloads in the journal are only counted.
+    """
+
+    @staticmethod
+    def get_change_times(events):
+        """Get when the watched paths changed according to a journal.
+
+        Args:
+            events: Journal events of one session
+
+        Returns:
+            tuple: (baseline, changes) where baseline maps entry index to its first stat result
+                and changes is a time-ordered list of (time, entry index, new stat result)
+        """
+        baseline = {}
+        last_stat = {}
+        changes = []
+        for event, entry, at, value in events:
+            if event != EventJournal.STAT:
+                continue
+            previous = last_stat.get(entry)
+            if previous is None:
+                baseline[entry] = value
+            elif not JournalReplay._same_stat(previous[1], value):
+                changes.append((previous[0], entry, value))
+            last_stat[entry] = (at, value)
+        changes.sort(key=lambda change: change[0])
+        return baseline, changes
+
+    @staticmethod
+    def summarize(events, changes):
+        """Compute the metrics of a journal session.
+
+        Args:
+            events: Journal events of one session
+            changes: Time-ordered list of (time, entry index, stat result) changes to
+                measure detection latency against
+
+        Returns:
+            dict: Event counts, tick latency and detection latency percentiles in
+                seconds, and command concurrency
+        """
+        counts = {name: 0 for name in EventJournal.EVENT_NAMES.values()}
+        tick_latencies = []
+        detection_latencies = []
+        commands = []
+        pending_changes = {}
+        for at, entry, _ in changes:
+            pending_changes.setdefault(entry, deque()).append(at)
+
+        for event, entry, at, value in events:
+            name = EventJournal.EVENT_NAMES.get(event, "unknown")
+            counts[name] = counts.get(name, 0) + 1
+            if event == EventJournal.TICK:
+                tick_latencies.append(value)
+            elif event == EventJournal.COMMAND_FINISH:
+                commands.append((at - value, at))
+            elif event == EventJournal.CHANGE:
+                # Measure from the oldest change this detection covers
+                pending = pending_changes.get(entry)
+                first = None
+                while pending and pending[0] <= at:
+                    changed_at = pending.popleft()
+                    if first is None:
+                        first = changed_at
+                if first is not None:
+                    detection_latencies.append(at - first)
+
+        return {
+            "counts": counts,
+            "tick_latency": JournalReplay._get_percentiles(tick_latencies),
+            "detection_latency": JournalReplay._get_percentiles(detection_latencies),
+            "command_concurrency": JournalReplay._get_concurrency(commands),
+        }
+
+    @staticmethod
+    def replay(config_path, session):
+        """Replay a journal session against a config on a virtual clock.
+
+        Args:
+            config_path: Path to the TOML configuration file the journal was recorded with
+            session: Journal session as returned by EventJournal.read()
+
+        Returns:
+            list: Events journaled during the replay
+        """
+        events = session["events"]
+        baseline, changes = JournalReplay.get_change_times(events)
+        outcomes = {}
+        for event, entry, _, value in events:
+            if event == EventJournal.COMMAND_FINISH:
+                outcomes.setdefault(entry, deque()).append(value)
+            elif event == EventJournal.SUPPRESSED:
+                outcomes.setdefault(entry, deque()).append(None)
+
+        clock = VirtualClock(session["wall_start"])
+        filesystem = MemoryFileSystem()
+        execute_command = CommandExecutor.execute_command
+        Clock.set_clock(clock)
+        FileSystem.set_filesystem(filesystem)
+        TimestampPrinter.set_output_sink(lambda line: None)
+        try:
+            filesystem.write(config_path)
+            watcher = FileWatcher(config_path)
+            files_config = watcher.config.get("files", [])
+            entry_indexes = {id(settings): index for index, settings in enumerate(files_config)}
+
+            def apply_stat(entry, value):
+                if entry >= len(files_config) or not files_config[entry].get("path"):
+                    return
+                path = files_config[entry]["path"]
+                if value == value:
+                    filesystem.write(path, mtime=value)
+                elif filesystem.exists(path):
+                    filesystem.remove(path)
+
+            def replay_command(command, filepath, settings, config=None):
+                pending = outcomes.get(entry_indexes.get(id(settings)))
+                duration = pending.popleft() if pending else 0.0
+                if duration is None:
+                    return False
+                clock.advance(duration)
+                return True
+
+            for entry, value in baseline.items():
+                apply_stat(entry, value)
+            CommandExecutor.execute_command = staticmethod(replay_command)
+
+            end = events[-1][2] if events else 0.0
+            interval = watcher._calculate_main_loop_interval()
+            replayed = EventJournal.capture()
+            applied = 0
+            while True:
+                now = clock.monotonic()
+                # A change happened after the stat that still saw the old value
+                while applied < len(changes) and changes[applied][0] < now:
+                    apply_stat(changes[applied][1], changes[applied][2])
+                    applied += 1
+                if now > end:
+                    break
+                clock.advance(watcher.run_tick(interval))
+            return replayed
+        finally:
+            EventJournal.close()
+            CommandExecutor.execute_command = staticmethod(execute_command)
+            TimestampPrinter.set_output_sink(None)
+            FileSystem.set_filesystem(None)
+            Clock.set_clock(None)
+
+    @staticmethod
+    def run(config_path, journal_path, session_index=-1):
+        """Replay a recorded journal session and compare the replay with the recording.
+
+        Args:
+            config_path: Path to the TOML configuration file the journal was recorded with
+            journal_path: Path of the event journal
+            session_index: Index of the journal session to replay (default: the last one)
+
+        Returns:
+            dict: {"recorded": metrics, "replayed": metrics} as returned by summarize()
+
+        Raises:
+            OSError: If the journal cannot be read
+            ValueError: If the journal is invalid or has no such session
+        """
+        sessions = EventJournal.read(journal_path)
+        if not sessions:
+            raise ValueError(f"Event journal '{journal_path}' contains no sessions")
+        try:
+            session = sessions[session_index]
+        except IndexError:
+            raise ValueError(f"Event journal '{journal_path}' has {len(sessions)} sessions") from None
+
+        _, changes = JournalReplay.get_change_times(session["events"])
+        replayed = JournalReplay.replay(config_path, session)
+        return {
+            "recorded": JournalReplay.summarize(session["events"], changes),
+            "replayed": JournalReplay.summarize(replayed, changes),
+        }
+
+    @staticmethod
+    def format_report(report):
+        """Format a replay report as a text table.
+
+        Args:
+            report: Report as returned by run()
+
+        Returns:
+            str: Table comparing the recorded and replayed metrics
+        """
+        recorded, replayed = report["recorded"], report["replayed"]
+        rows = [("", "recorded", "replayed")]
+        for name in ("tick", "due", "stat", "change", "command finish", "suppressed", "reload"):
+            rows.append((f"{name} events", str(recorded["counts"][name]), str(replayed["counts"][name])))
+        for metric, unit, scale in (("tick_latency", "ms", 1000.0), ("detection_latency", "s", 1.0)):
+            for percentile, _ in PERCENTILES:
+                values = [summary[metric][percentile] for summary in (recorded, replayed)]
+                rows.append(
+                    (
+                        f"{metric.replace('_', ' ')} {percentile}",
+                        *("-" if value is None else f"{value * scale:.3f} {unit}" for value in values),
+                    )
+                )
+        for key in ("max", "mean"):
+            values = [summary["command_concurrency"][key] for summary in (recorded, replayed)]
+            rows.append((f"command concurrency {key}", *(f"{value:.2f}" for value in values)))
+
+        widths = [max(len(row[column]) for row in rows) for column in range(3)]
+        return "\n".join(
+            f"{row[0]:<{widths[0]}}  {row[1]:>{widths[1]}}  {row[2]:>{widths[2]}}".rstrip() for row in rows
+        )
+
+    @staticmethod
+    def _same_stat(first, second):
+        """Compare two stat results, treating two missing paths (NaN) as equal."""
+        return first == second or (first != first and second != second)
+
+    @staticmethod
+    def _get_percentiles(values):
+        """Get nearest-rank percentiles of a list of values (None where the list is empty)."""
+        ordered = sorted(values)
+        if not ordered:
+            return {name: None for name, _ in PERCENTILES}
+        return {name: ordered[max(0, math.ceil(len(ordered) * fraction) - 1)] for name, fraction in PERCENTILES}
+
+    @staticmethod
+    def _get_concurrency(commands):
+        """Get the peak and mean number of commands running at once.
+
+        Args:
+            commands: List of (start, end) times of command runs
+
+        Returns:
+            dict: "max" and "mean" concurrency (mean over the span from first start to last end)
+        """
+        if not commands:
+            return {"max": 0, "mean": 0.0}
+        boundaries = sorted([(start, 1) for start, _ in commands] + [(end, -1) for _, end in commands])
+        running = peak = 0
+        for _, change in boundaries:
+            running += change
+            peak = max(peak, running)
+        span = boundaries[-1][0] - boundaries[0][0]
+        busy = sum(end - start for start, end in commands)
+        return {"max": peak, "mean": busy / span if span > 0 else float(peak)}
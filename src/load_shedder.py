@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Priority classes and load shedding for File Watcher
+Stretches or pauses low-priority entries while main loop ticks keep overrunning
+"""
+
+# Entry priority classes, highest first
+PRIORITY_CLASSES = ("critical", "normal", "background")
+DEFAULT_PRIORITY = "normal"
+
+
+class LoadShedder:
+    """Tracks sustained overload and decides which priority classes to shed.
+
+    Shedding escalates one level after every OVERLOAD_TICKS consecutive
+    overrunning ticks and steps back one level after RECOVERY_TICKS
+    consecutive ticks that finish within the interval:
+
+        0: nothing is shed
+        1: background entries poll STRETCH_FACTOR times less often
+        2: background entries are paused
+        3: background entries are paused and normal entries are stretched
+
+    Critical entries are never shed. Like TickMonitor, the state is shared by
+    the process, which runs a single watcher.
+    """
+
+    LEVELS = ("none", "stretch background", "pause background", "pause background, stretch normal")
+    OVERLOAD_TICKS = 5
+    RECOVERY_TICKS = 20
+    STRETCH_FACTOR = 4.0
+
+    _level = 0
+    _overruns = 0
+    _on_time = 0
+    _stats = {"shed_escalations": 0, "shed_commands": 0}
+
+    @staticmethod
+    def reset():
+        """Return to the unshed state and clear the statistics."""
+        LoadShedder._level = 0
+        LoadShedder._overruns = 0
+        LoadShedder._on_time = 0
+        LoadShedder._stats = {"shed_escalations": 0, "shed_commands": 0}
+
+    @staticmethod
+    def get_level():
+        """Get the current shedding level.
+
+        Returns:
+            int: Index into LEVELS (0 when nothing is shed)
+        """
+        return LoadShedder._level
+
+    @staticmethod
+    def get_priority(settings):
+        """Get an entry's priority class.
+
+        Args:
+            settings: Entry settings dictionary
+
+        Returns:
+            str: "critical", "normal" or "background"
+        """
+        return settings.get("priority", DEFAULT_PRIORITY)
+
+    @staticmethod
+    def get_rank(settings):
+        """Get an entry's priority rank for ordering (0 is the most important).
+
+        Args:
+            settings: Entry settings dictionary
+
+        Returns:
+            int: Index of the entry's priority in PRIORITY_CLASSES
+        """
+        return PRIORITY_CLASSES.index(LoadShedder.get_priority(settings))
+
+    @staticmethod
+    def get_interval_factor(settings):
+        """Get how much an entry's interval is stretched at the current shedding level.
+
+        Args:
+            settings: Entry settings dictionary
+
+        Returns:
+            float: Interval multiplier, or None if the entry is paused
+        """
+        priority = LoadShedder.get_priority(settings)
+        level = LoadShedder._level
+        if priority == "background" and level >= 2:
+            return None
+        if (priority == "background" and level == 1) or (priority == "normal" and level >= 3):
+            return LoadShedder.STRETCH_FACTOR
+        return 1.0
+
+    @staticmethod
+    def record_tick(overran):
+        """Record whether a tick overran and adjust the shedding level.
+
+        Args:
+            overran: True if the tick took longer than the main loop interval
+
+        Returns:
+            str: Description of a level change to report, or None if the level did not change
+        """
+        if overran:
+            LoadShedder._on_time = 0
+            LoadShedder._overruns += 1
+            if LoadShedder._overruns < LoadShedder.OVERLOAD_TICKS or LoadShedder._level == len(LoadShedder.LEVELS) - 1:
+                return None
+            LoadShedder._overruns = 0
+            LoadShedder._level += 1
+            LoadShedder._stats["shed_escalations"] += 1
+            return (
+                f"Sustained overload ({LoadShedder.OVERLOAD_TICKS} overrunning ticks); "
+                f"shedding load: {LoadShedder.LEVELS[LoadShedder._level]}"
+            )
+
+        LoadShedder._overruns = 0
+        if LoadShedder._level == 0:
+            return None
+        LoadShedder._on_time += 1
+        if LoadShedder._on_time < LoadShedder.RECOVERY_TICKS:
+            return None
+        LoadShedder._on_time = 0
+        LoadShedder._level -= 1
+        return f"Load recovered; shedding reduced to: {LoadShedder.LEVELS[LoadShedder._level]}"
+
+    @staticmethod
+    def record_shed_command():
+        """Count a background command that was skipped because no command slot was free."""
+        LoadShedder._stats["shed_commands"] += 1
+
+    @staticmethod
+    def get_stats(config):
+        """Get shedding metrics for dump-stats.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            dict: Current level, number of entries currently stretched or paused, and counters
+        """
+        stretched = paused = 0
+        for entry in config.get("files", []):
+            factor = LoadShedder.get_interval_factor(entry)
+            if factor is None:
+                paused += 1
+            elif factor != 1.0:
+                stretched += 1
+        return {
+            "shed_level": LoadShedder.LEVELS[LoadShedder._level],
+            "shed_stretched_entries": stretched,
+            "shed_paused_entries": paused,
+            **LoadShedder._stats,
+        }
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Main loop profiler for File Watcher
+Profiles a number of main loop ticks with cProfile and reports time per subsystem
+"""
+
+import os
+
+# Support both relative and absolute imports
+try:
+    from .terminal_colors import Fore
+    from .timestamp_printer import TimestampPrinter
+except ImportError:
+    from terminal_colors import Fore
+    from timestamp_printer import TimestampPrinter
+
+
+# Subsystems reported separately, matched against profiled functions in order.
+# Each rule is (subsystem, module file names, function name fragments); a function
+# matches when its file is one of the modules or its name contains a fragment.
+SUBSYSTEM_RULES = (
+    ("stat", ("genericpath.py",), ("posix.stat", "nt.stat", "get_file_timestamp", "_get_mtime")),
+    ("time-period checks", ("time_period_checker.py",), ()),
+    ("process scan", ("process_detector.py",), ("psutil",)),
+    ("scheduling", ("interval_scheduler.py", "timer_wheel.py", "deadline_scheduler.py"), ()),
+    (
+        "command dispatch",
+        (
+            "command_executor.py",
+            "subprocess.py",
+            "process_spawner.py",
+            "direct_exec.py",
+            "shell_session.py",
+            "python_worker_pool.py",
+            "output_capture.py",
+        ),
+        ("_posixsubprocess", "posix.waitpid", "posix.posix_spawn", "select.select"),
+    ),
+    ("printing", ("timestamp_printer.py",), ("builtins.print", "method 'write'", "method 'flush'")),
+)
+
+# Number of allocation sites listed in the tracemalloc section of the report
+TOP_ALLOCATIONS = 15
+
+
+class LoopProfiler:
+    """Profiles main loop ticks and writes pstats plus a per-subsystem report.
+
+    The raw profile is written to output_path in pstats format (readable with
+    `python -m pstats`), and a text report with the time per subsystem, the
+    most expensive functions and, optionally, tracemalloc allocation growth
+    across the profiled ticks is written to output_path + ".txt".
+    """
+
+    DEFAULT_TICKS = 100
+
+    def __init__(self, output_path, ticks=DEFAULT_TICKS, trace_memory=False):
+        """Initialize the profiler.
+
+        Args:
+            output_path: Path of the pstats output file
+            ticks: Number of ticks to profile
+            trace_memory: If True, also track allocation growth with tracemalloc
+        """
+        import cProfile
+
+        self.output_path = output_path
+        self.ticks = ticks
+        self.trace_memory = trace_memory
+        self.ticks_done = 0
+        self._profile = cProfile.Profile()
+        self._first_snapshot = None
+        self._tick_memory = []
+        self._started_tracing = False
+
+    def start(self):
+        """Announce profiling and start tracing allocations if requested."""
+        if self.trace_memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+        TimestampPrinter.print(f"Profiling the next {self.ticks} ticks to '{self.output_path}'", Fore.GREEN)
+
+    def begin_tick(self):
+        """Start profiling a tick."""
+        self._profile.enable()
+
+    def end_tick(self):
+        """Stop profiling a tick and write the report once enough ticks were profiled.
+
+        Returns:
+            bool: True if profiling is finished
+        """
+        self._profile.disable()
+        self.ticks_done += 1
+
+        if self.trace_memory:
+            import tracemalloc
+
+            self._tick_memory.append(tracemalloc.get_traced_memory()[0])
+            if self._first_snapshot is None:
+                self._first_snapshot = tracemalloc.take_snapshot()
+
+        if self.ticks_done < self.ticks:
+            return False
+        self.finish()
+        return True
+
+    def finish(self):
+        """Write the pstats file and the text report, and stop tracing allocations."""
+        import pstats
+
+        if self.ticks_done == 0:
+            self._stop_memory_tracing()
+            TimestampPrinter.print("Profiling stopped before any tick was profiled", Fore.YELLOW)
+            return
+
+        report_path = f"{self.output_path}.txt"
+        try:
+            self._profile.dump_stats(self.output_path)
+            stats = pstats.Stats(self._profile)
+            with open(report_path, "w", encoding="utf-8") as f:
+                f.write(f"Profiled ticks: {self.ticks_done}\n\n")
+                f.write("Time per subsystem (own time, seconds):\n")
+                for subsystem, seconds in LoopProfiler.summarize_subsystems(stats).items():
+                    f.write(f"  {subsystem:<20} {seconds:.6f}\n")
+                f.write("\n")
+                if self.trace_memory:
+                    self._write_memory_report(f)
+                stats.stream = f
+                stats.sort_stats("tottime").print_stats(30)
+        except OSError as e:
+            TimestampPrinter.print(f"Warning: Failed to write profile '{self.output_path}': {e}", Fore.YELLOW)
+            return
+        finally:
+            self._stop_memory_tracing()
+
+        TimestampPrinter.print(f"Profile written to '{self.output_path}' (report: '{report_path}')", Fore.GREEN)
+
+    def _write_memory_report(self, f):
+        """Write the allocation growth across the profiled ticks.
+
+        Args:
+            f: Open report file
+        """
+        import tracemalloc
+
+        if not tracemalloc.is_tracing() or self._first_snapshot is None:
+            return
+
+        growth = self._tick_memory[-1] - self._tick_memory[0]
+        f.write(f"Traced memory after first tick: {self._tick_memory[0]} bytes\n")
+        f.write(f"Traced memory after last tick: {self._tick_memory[-1]} bytes (growth: {growth} bytes)\n")
+        f.write("Top allocation growth since the first tick:\n")
+        last_snapshot = tracemalloc.take_snapshot()
+        for stat in last_snapshot.compare_to(self._first_snapshot, "lineno")[:TOP_ALLOCATIONS]:
+            f.write(f"  {stat}\n")
+        f.write("\n")
+
+    def _stop_memory_tracing(self):
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracing:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @staticmethod
+    def classify_function(function_key):
+        """Find the subsystem a profiled function belongs to.
+
+        Args:
+            function_key: pstats function key (filename, line number, function name)
+
+        Returns:
+            str: Subsystem name, or "other"
+        """
+        filename, _, function_name = function_key
+        module_file = os.path.basename(filename)
+        for subsystem, module_files, fragments in SUBSYSTEM_RULES:
+            if module_file in module_files or any(fragment in function_name for fragment in fragments):
+                return subsystem
+        return "other"
+
+    @staticmethod
+    def summarize_subsystems(stats):
+        """Sum the own time of profiled functions per subsystem.
+
+        Args:
+            stats: pstats.Stats of the profiled ticks
+
+        Returns:
+            dict: Mapping of subsystem name to seconds, in report order
+        """
+        totals = {subsystem: 0.0 for subsystem, _, _ in SUBSYSTEM_RULES}
+        totals["other"] = 0.0
+        for function_key, (_, _, own_time, _, _) in stats.stats.items():
+            totals[LoopProfiler.classify_function(function_key)] += own_time
+        return totals
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Command output capture for File Watcher
+Streams command output to the console line by line and keeps its tail per entry
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+# Support both relative and absolute imports
+try:
+    from .state_store import StateStore
+    from .timestamp_printer import TimestampPrinter
+except ImportError:
+    from state_store import StateStore
+    from timestamp_printer import TimestampPrinter
+
+
+class _OutputStream:
+    """Output of one command run, split into prefixed console lines and kept in its entry's buffer."""
+
+    __slots__ = ("buffer", "identity", "label", "partial")
+
+    def __init__(self, identity, label):
+        self.identity = identity
+        self.label = label
+        self.partial = b""
+        self.buffer = bytearray()
+
+    def feed(self, chunk):
+        """Take a chunk of output read from the command.
+
+        Args:
+            chunk: Bytes read from the command's stdout/stderr pipe; empty once
+                background processes the command left running have closed it
+        """
+        if not chunk:
+            self.close()
+            return
+        with OutputCapture._lock:
+            OutputCapture._append(self, chunk)
+            lines = (self.partial + chunk).split(b"\n")
+            self.partial = lines.pop()
+            # A line without newline is printed in pieces instead of growing without bound
+            while len(self.partial) > OutputCapture.MAX_LINE_BYTES:
+                lines.append(self.partial[: OutputCapture.MAX_LINE_BYTES])
+                self.partial = self.partial[OutputCapture.MAX_LINE_BYTES :]
+            for line in lines:
+                self._print(line)
+
+    def close(self):
+        """Print the last line if the output did not end with a newline."""
+        with OutputCapture._lock:
+            if self.partial:
+                self._print(self.partial)
+                self.partial = b""
+
+    def _print(self, line):
+        """Print one line of output with the entry's label."""
+        text = line.rstrip(b"\r").decode("utf-8", errors="replace")
+        TimestampPrinter.print(f"[{self.label}] {text}")
+
+
+class OutputCapture:
+    """Captures the output of commands with capture_output enabled.
+
+    Without capture, commands write straight to the watcher's terminal, so
+    the output of concurrent commands interleaves and nothing is left to
+    look at after a failure. With capture_output = true (globally or per
+    entry), stdout and stderr of the command go to a pipe that is read as
+    the command runs. Each line is printed with the entry's path (or its
+    command for [[commands]] entries) in front, and the last
+    output_buffer_size bytes are kept per entry for the control socket's
+    status command and for the error log when the command fails.
+
+    Memory is bounded: a buffer never holds more than output_buffer_size
+    bytes (at most MAX_BUFFER_SIZE) of the entry's current or last run, all buffers together at most
+    MAX_TOTAL_BYTES (the buffers of the entries that ran longest ago are
+    dropped first), and a line without newline is printed in pieces of
+    MAX_LINE_BYTES. Buffers are keyed by entry identity, so they survive
+    reloads that move entries. Capture applies to the "shell" runner on
+    POSIX platforms; other runners keep writing to the terminal.
+
+    Output of processes a command leaves running in the background is
+    printed and kept like the command's own, also after the command is
+    done; it is read on another thread, so the buffers are guarded by a lock.
+    Once the entry runs again, such late output of an earlier run is still
+    printed but no longer kept, so a failure is logged with its own output.
+    """
+
+    DEFAULT_BUFFER_SIZE = 16384
+
+    # Upper bound on output_buffer_size
+    MAX_BUFFER_SIZE = 1024 * 1024
+
+    # Upper bound on the bytes kept in all buffers together
+    MAX_TOTAL_BYTES = 8 * 1024 * 1024
+
+    # Longest line printed at once
+    MAX_LINE_BYTES = 4096
+
+    _buffer_size = DEFAULT_BUFFER_SIZE
+    _buffers = OrderedDict()
+    _total_bytes = 0
+    _lock = threading.RLock()
+
+    @staticmethod
+    def is_supported():
+        """Check whether command output can be read while the command runs.
+
+        Returns:
+            bool: True on POSIX platforms, where pipes can be waited on with select
+        """
+        return os.name == "posix"
+
+    @staticmethod
+    def configure(config):
+        """Apply the buffer size of a (re)loaded config, shrinking existing buffers if needed.
+
+        Args:
+            config: Configuration dictionary
+        """
+        with OutputCapture._lock:
+            OutputCapture._buffer_size = config.get("output_buffer_size", OutputCapture.DEFAULT_BUFFER_SIZE)
+            for buffer in OutputCapture._buffers.values():
+                excess = len(buffer) - OutputCapture._buffer_size
+                if excess > 0:
+                    del buffer[:excess]
+                    OutputCapture._total_bytes -= excess
+
+    @staticmethod
+    def is_enabled(settings, config):
+        """Check whether an entry's command output is captured.
+
+        Args:
+            settings: Entry settings, may include 'capture_output'
+            config: Optional global configuration dictionary, may include 'capture_output'
+
+        Returns:
+            bool: True if the output should be captured
+        """
+        default = config.get("capture_output", False) if config else False
+        return settings.get("capture_output", default) and OutputCapture.is_supported()
+
+    @staticmethod
+    def open(settings):
+        """Start capturing the output of a command run of an entry.
+
+        Args:
+            settings: Entry settings
+
+        Returns:
+            _OutputStream: Stream to feed the command's output to
+        """
+        label = settings.get("path", "") or settings.get("command", "")
+        stream = _OutputStream(StateStore.get_entry_identity(settings), label)
+        # Each run starts with an empty buffer, dropping the output of earlier runs
+        with OutputCapture._lock:
+            previous = OutputCapture._buffers.pop(stream.identity, None)
+            if previous is not None:
+                OutputCapture._total_bytes -= len(previous)
+            OutputCapture._buffers[stream.identity] = stream.buffer
+        return stream
+
+    @staticmethod
+    def get_output(settings):
+        """Get the kept output of an entry.
+
+        Args:
+            settings: Entry settings
+
+        Returns:
+            str: Last captured output of the entry (empty if none)
+        """
+        with OutputCapture._lock:
+            buffer = OutputCapture._buffers.get(StateStore.get_entry_identity(settings))
+            return buffer.decode("utf-8", errors="replace") if buffer else ""
+
+    @staticmethod
+    def get_output_size(settings):
+        """Get the number of kept output bytes of an entry.
+
+        Args:
+            settings: Entry settings
+
+        Returns:
+            int: Size of the entry's buffer in bytes
+        """
+        return len(OutputCapture._buffers.get(StateStore.get_entry_identity(settings), b""))
+
+    @staticmethod
+    def get_stats():
+        """Get buffer statistics for dump-stats.
+
+        Returns:
+            dict: Number of kept buffers and their total size in bytes
+        """
+        return {"output_buffers": len(OutputCapture._buffers), "output_buffer_bytes": OutputCapture._total_bytes}
+
+    @staticmethod
+    def reset():
+        """Drop all kept output."""
+        with OutputCapture._lock:
+            OutputCapture._buffers.clear()
+            OutputCapture._total_bytes = 0
+
+    @staticmethod
+    def _append(stream, chunk):
+        """Add output to an entry's buffer, enforcing the per-entry and total limits.
+
+        Called with _lock held. Output of a run the entry has run again since is not kept.
+
+        Args:
+            stream: Stream of the run the output belongs to
+            chunk: Bytes of output
+        """
+        buffers = OutputCapture._buffers
+        buffer = buffers.pop(stream.identity, stream.buffer)
+        if buffer is not stream.buffer:
+            buffers[stream.identity] = buffer
+            return
+        buffers[stream.identity] = buffer
+
+        size = len(buffer)
+        buffer += chunk[-OutputCapture._buffer_size :]
+        excess = len(buffer) - OutputCapture._buffer_size
+        if excess > 0:
+            del buffer[:excess]
+        OutputCapture._total_bytes += len(buffer) - size
+
+        while OutputCapture._total_bytes > OutputCapture.MAX_TOTAL_BYTES and len(buffers) > 1:
+            OutputCapture._total_bytes -= len(buffers.popitem(last=False)[1])
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Path backoff tracking for File Watcher
+Backs off polling of entries whose path is missing or whose processing keeps failing
+"""
+
+import os
+
+# Support both relative and absolute imports
+try:
+    from .filesystem import FileSystem
+    from .interval_parser import IntervalParser
+except ImportError:
+    from filesystem import FileSystem
+    from interval_parser import IntervalParser
+
+
+class PathBackoff:
+    """Handles per-entry exponential backoff for missing or erroring paths.
+
+    Backoff state is kept in a dictionary keyed by entry key (e.g. "#0").
+    Each value is a dictionary with the following keys:
+        kind: "missing" or "error"
+        failures: Number of consecutive missing/error results
+        parent_mtime: Modification time of the parent directory when the
+            path was last seen missing (None for errors or unreadable parents)
+    """
+
+    # Number of consecutive failures before the interval starts growing
+    THRESHOLD = 3
+
+    # Upper bound for the backed-off interval unless overridden by config
+    DEFAULT_MAX_INTERVAL = "1m"
+
+    @staticmethod
+    def get_max_interval(config):
+        """Get the backoff ceiling in seconds.
+
+        Args:
+            config: Global configuration dictionary, may include 'backoff_max_interval'
+
+        Returns:
+            float: Maximum backed-off interval in seconds
+        """
+        return IntervalParser.parse_interval(config.get("backoff_max_interval", PathBackoff.DEFAULT_MAX_INTERVAL))
+
+    @staticmethod
+    def get_effective_interval(file_backoff, entry_key, interval, config):
+        """Get the polling interval for an entry, taking backoff into account.
+
+        Args:
+            file_backoff: Dictionary tracking backoff state per entry
+            entry_key: Unique key for tracking
+            interval: Configured interval in seconds
+            config: Global configuration dictionary
+
+        Returns:
+            float: Effective interval in seconds (never below the configured interval)
+        """
+        state = file_backoff.get(entry_key)
+        if state is None or state["failures"] < PathBackoff.THRESHOLD:
+            return interval
+
+        exponent = state["failures"] - PathBackoff.THRESHOLD + 1
+        ceiling = max(PathBackoff.get_max_interval(config), interval)
+        return min(interval * (2**exponent), ceiling)
+
+    @staticmethod
+    def is_backing_off(file_backoff, entry_key):
+        """Check whether an entry is currently backed off.
+
+        Args:
+            file_backoff: Dictionary tracking backoff state per entry
+            entry_key: Unique key for tracking
+
+        Returns:
+            bool: True if the entry has reached the backoff threshold
+        """
+        state = file_backoff.get(entry_key)
+        return state is not None and state["failures"] >= PathBackoff.THRESHOLD
+
+    @staticmethod
+    def has_parent_changed(file_backoff, entry_key, filename, parent_mtimes):
+        """Check whether the parent directory of a missing path has changed.
+
+        A change of the parent directory mtime means entries were added or
+        removed, so the missing path may have reappeared.
+
+        Args:
+            file_backoff: Dictionary tracking backoff state per entry
+            entry_key: Unique key for tracking
+            filename: Path of the entry
+            parent_mtimes: Per-tick cache of parent directory mtimes, shared
+                between entries so each directory is stat'ed at most once per tick
+
+        Returns:
+            bool: True if the parent directory changed since the path went missing
+        """
+        state = file_backoff.get(entry_key)
+        if state is None or state["kind"] != "missing" or state["parent_mtime"] is None:
+            return False
+
+        parent = PathBackoff._get_parent_dir(filename)
+        if parent not in parent_mtimes:
+            parent_mtimes[parent] = PathBackoff._get_mtime(parent)
+        return parent_mtimes[parent] != state["parent_mtime"]
+
+    @staticmethod
+    def record_missing(file_backoff, entry_key, filename):
+        """Record that an entry's path was not accessible.
+
+        Args:
+            file_backoff: Dictionary tracking backoff state per entry
+            entry_key: Unique key for tracking
+            filename: Path of the entry
+        """
+        state = file_backoff.get(entry_key)
+        if state is None or state["kind"] != "missing":
+            state = {"kind": "missing", "failures": 0, "parent_mtime": None}
+            file_backoff[entry_key] = state
+
+        state["failures"] += 1
+        state["parent_mtime"] = PathBackoff._get_mtime(PathBackoff._get_parent_dir(filename))
+
+    @staticmethod
+    def record_error(file_backoff, entry_key):
+        """Record that processing an entry raised an exception.
+
+        Args:
+            file_backoff: Dictionary tracking backoff state per entry
+            entry_key: Unique key for tracking
+
+        Returns:
+            tuple: (should_report, started_backoff) where should_report is True
+                only for the first error of a streak and started_backoff is True
+                when this error made the entry reach the backoff threshold
+        """
+        state = file_backoff.get(entry_key)
+        if state is None or state["kind"] != "error":
+            state = {"kind": "error", "failures": 0, "parent_mtime": None}
+            file_backoff[entry_key] = state
+
+        state["failures"] += 1
+        return state["failures"] == 1, state["failures"] == PathBackoff.THRESHOLD
+
+    @staticmethod
+    def reset(file_backoff, entry_key, kind=None):
+        """Clear the backoff state of an entry.
+
+        Args:
+            file_backoff: Dictionary tracking backoff state per entry
+            entry_key: Unique key for tracking
+            kind: If given, only clear state of this kind ("missing" or "error")
+
+        Returns:
+            dict: The cleared state, or None if nothing was cleared
+        """
+        state = file_backoff.get(entry_key)
+        if state is None or (kind is not None and state["kind"] != kind):
+            return None
+        del file_backoff[entry_key]
+        return state
+
+    @staticmethod
+    def _get_parent_dir(filename):
+        """Get the absolute parent directory of a path."""
+        return os.path.dirname(os.path.abspath(filename))
+
+    @staticmethod
+    def _get_mtime(path):
+        """Get the modification time of a path in nanoseconds, or None if not accessible."""
+        try:
+            return FileSystem.stat_mtime_ns(path)
+        except OSError:
+            return None
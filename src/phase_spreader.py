@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Phase spreading and jitter for File Watcher
+Spreads entries that share an interval across that interval so checks and commands do not burst
+"""
+
+import hashlib
+import random
+
+# Support both relative and absolute imports
+try:
+    from .interval_parser import IntervalParser
+    from .state_store import StateStore
+except ImportError:
+    from interval_parser import IntervalParser
+    from state_store import StateStore
+
+
+class PhaseSpreader:
+    """Computes per-entry phase offsets and jitter.
+
+    Without spreading, every entry sharing default_interval becomes due on the
+    same tick. With spread_phases = true each entry gets a fixed phase within
+    its interval derived from a hash of its identity, so the phases of many
+    entries are evenly distributed and stay the same across restarts and
+    reloads. Jitter adds a random delay of up to the configured amount to each
+    check on top of that.
+    """
+
+    @staticmethod
+    def is_enabled(config):
+        """Check whether phase spreading is enabled.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            bool: True if spread_phases is set
+        """
+        return config.get("spread_phases", False) is True
+
+    @staticmethod
+    def get_phase(settings, interval):
+        """Get an entry's phase offset within its interval.
+
+        Args:
+            settings: Entry settings dictionary
+            interval: Entry interval in seconds
+
+        Returns:
+            float: Offset in seconds, in [0, interval)
+        """
+        # CRC32 clusters for similar identities such as numbered commands; BLAKE2 does not
+        digest = hashlib.blake2b(StateStore.get_entry_identity(settings).encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2**64 * interval
+
+    @staticmethod
+    def get_jitter(config, settings):
+        """Get the maximum random delay for an entry's checks.
+
+        Args:
+            config: Configuration dictionary
+            settings: Entry settings dictionary (its "jitter" overrides default_jitter)
+
+        Returns:
+            float: Maximum jitter in seconds (0.0 when not configured)
+        """
+        jitter = settings.get("jitter", config.get("default_jitter"))
+        return IntervalParser.parse_interval(jitter) if jitter else 0.0
+
+    @staticmethod
+    def get_delay(config, settings):
+        """Draw a random delay for an entry's next check.
+
+        Args:
+            config: Configuration dictionary
+            settings: Entry settings dictionary
+
+        Returns:
+            float: Delay in seconds, between 0 and the entry's jitter
+        """
+        jitter = PhaseSpreader.get_jitter(config, settings)
+        return random.uniform(0.0, jitter) if jitter else 0.0
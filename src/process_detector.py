@@ -6,7 +6,12 @@ Process detection utilities for File Watcher
 import re
 import sys
 
-import psutil
+
+def _import_psutil():
+    """Import psutil on first use so configs without process features never load it."""
+    import psutil
+
+    return psutil
 
 
 class ProcessDetector:
@@ -35,6 +40,7 @@ class ProcessDetector:
         Returns:
             str: Name of the matched process, or None if no match found
         """
+        psutil = _import_psutil()
         try:
             # Compile the regex pattern
             pattern = re.compile(process_pattern)
@@ -73,6 +79,7 @@ class ProcessDetector:
         Returns:
             list: List of tuples (pid, process_name) for matched processes, or empty list if none found
         """
+        psutil = _import_psutil()
         try:
             # Compile the regex pattern
             pattern = re.compile(process_pattern)
@@ -113,6 +120,7 @@ class ProcessDetector:
         Returns:
             bool: True if termination signal was sent successfully, False otherwise
         """
+        psutil = _import_psutil()
         try:
             proc = psutil.Process(pid)
             proc.terminate()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Process spawner for File Watcher
+Starts command processes at a cost that does not grow with the watcher's memory
+"""
+
+import os
+import sys
+
+# Shell for command strings on POSIX platforms (the one subprocess uses for shell=True)
+SHELL = "/bin/sh"
+
+# Seconds between checks for the exit of a command where the platform cannot
+# wait on a process with select (doubled from the first value up to the last one)
+_FIRST_POLL_INTERVAL = 0.001
+_MAX_POLL_INTERVAL = 0.05
+
+# Bytes read from a command's output pipe at once
+_READ_SIZE = 65536
+
+
+class ProcessSpawner:
+    """Runs commands without forking the watcher.
+
+    A plain fork() copies the page tables of the watcher, so with large
+    configs, snapshots and caches every command launch gets slower as the
+    watcher grows (about 25 ms per launch at 2 GB RSS against 0.4 ms for a
+    small process). On Linux with Python 3.10+, subprocess starts children
+    with vfork(), which shares the parent's memory until exec, so it is
+    used as is. Elsewhere on POSIX, commands are started with
+    os.posix_spawn, which the C library implements without copying the
+    parent's memory; since posix_spawn cannot change the working directory
+    from Python, a cwd is applied by /bin/sh before it execs the program.
+    Platforms with neither (Windows, which has no fork) use subprocess.
+
+    With captured output, the command's exit is waited on together with its
+    output pipe: select wakes up on output or on the exit (through a pidfd
+    on Linux or a kqueue on macOS and the BSDs), so neither is noticed late.
+    Elsewhere the exit is polled at up to _MAX_POLL_INTERVAL. Processes the
+    command leaves running in the background inherit the pipe; once the
+    command has exited, their output is read until they close it on a
+    daemon thread, so they never write to a closed pipe, and passed on to
+    the same output callable, ending with an empty chunk.
+    """
+
+    @staticmethod
+    def uses_posix_spawn():
+        """Check whether commands are started with os.posix_spawn instead of subprocess.
+
+        Returns:
+            bool: True on POSIX platforms where subprocess would fork the watcher
+        """
+        subprocess_uses_vfork = sys.platform.startswith("linux") and sys.version_info >= (3, 10)
+        return hasattr(os, "posix_spawn") and not subprocess_uses_vfork
+
+    @staticmethod
+    def run(args, shell, cwd, timeout, executable=None, output=None):
+        """Run a command and wait for it, like subprocess.run.
+
+        Args:
+            args: Command string if shell is True, argv list otherwise
+            shell: Run the command string through the shell
+            cwd: Working directory for the command (None for the watcher's)
+            timeout: Seconds to wait for the command before killing it
+            executable: Program to execute instead of args[0] (argv only)
+            output: Callable receiving chunks of the command's stdout and stderr
+                as they are written, or None to let the command write to the terminal.
+                Output of background processes that outlive the command arrives from
+                another thread after this returns, followed by an empty chunk
+
+        Returns:
+            subprocess.CompletedProcess: Result with the command's exit code
+
+        Raises:
+            subprocess.TimeoutExpired: If the command did not finish in time
+        """
+        import subprocess
+
+        if not ProcessSpawner.uses_posix_spawn():
+            if output is None:
+                return subprocess.run(args, shell=shell, executable=executable, text=True, timeout=timeout, cwd=cwd)
+            process = subprocess.Popen(
+                args, shell=shell, executable=executable, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+            )
+            with process.stdout:
+                return ProcessSpawner._wait(process, args, timeout, process.stdout.fileno(), output)
+
+        if shell:
+            executable, argv = SHELL, [SHELL, "-c", args]
+        else:
+            argv = list(args)
+            executable = executable or argv[0]
+        if cwd is not None:
+            # The program keeps its argv; $0 of the wrapper carries the directory
+            argv = [SHELL, "-c", 'cd -- "$0" && exec "$@"', cwd, executable, *argv[1:]]
+            executable = SHELL
+
+        read_fd = None
+        file_actions = []
+        if output is not None:
+            read_fd, write_fd = os.pipe()
+            file_actions = [(os.POSIX_SPAWN_DUP2, write_fd, 1), (os.POSIX_SPAWN_DUP2, write_fd, 2)]
+        try:
+            try:
+                process = _SpawnedProcess(executable, argv, file_actions)
+            finally:
+                if read_fd is not None:
+                    os.close(write_fd)
+            return ProcessSpawner._wait(process, args, timeout, read_fd, output)
+        finally:
+            if read_fd is not None:
+                os.close(read_fd)
+
+    @staticmethod
+    def _wait(process, args, timeout, read_fd, output):
+        """Wait for a started command, passing on its output as it arrives.
+
+        Args:
+            process: subprocess.Popen or _SpawnedProcess of the command
+            args: Command as given to run(), used in results and errors
+            timeout: Seconds to wait before killing the command
+            read_fd: Read end of the command's output pipe, or None if not captured
+                (closed by the caller; reading on for background processes uses a duplicate)
+            output: Callable receiving the output chunks (used with read_fd)
+
+        Returns:
+            subprocess.CompletedProcess: Result with the command's exit code
+
+        Raises:
+            subprocess.TimeoutExpired: If the command did not finish in time
+        """
+        import select
+        import subprocess
+        import time
+
+        deadline = time.monotonic() + timeout
+        interval = _FIRST_POLL_INTERVAL
+        exit_watch = _watch_exit(process.pid)
+        try:
+            while True:
+                returncode = process.poll()
+                if returncode is not None:
+                    # Pass on what the command wrote before exiting; background processes
+                    # still holding the pipe are read on another thread until they close it
+                    while read_fd is not None:
+                        if time.monotonic() >= deadline or not select.select([read_fd], [], [], 0)[0]:
+                            _start_drain(os.dup(read_fd), output)
+                            break
+                        chunk = os.read(read_fd, _READ_SIZE)
+                        if not chunk:
+                            break
+                        output(chunk)
+                    return subprocess.CompletedProcess(args, returncode)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(args, timeout)
+                if exit_watch is None:
+                    wait = min(interval, remaining)
+                    interval = min(interval * 2, _MAX_POLL_INTERVAL)
+                    if read_fd is None:
+                        time.sleep(wait)
+                        continue
+                    waitables = [read_fd]
+                else:
+                    # Wakes up on output or on the exit, whichever comes first
+                    wait = remaining
+                    waitables = [exit_watch] if read_fd is None else [read_fd, exit_watch]
+                if read_fd in select.select(waitables, [], [], wait)[0]:
+                    chunk = os.read(read_fd, _READ_SIZE)
+                    if chunk:
+                        output(chunk)
+                        interval = _FIRST_POLL_INTERVAL
+                        continue
+                    # All writers are gone; only the exit is left to wait for
+                    read_fd = None
+        except BaseException:
+            # Like subprocess.run: do not leave the command running on timeout or Ctrl+C
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            if exit_watch is not None:
+                exit_watch.close()
+
+
+class _SpawnedProcess:
+    """A command started with os.posix_spawn, with the parts of the Popen interface used here."""
+
+    __slots__ = ("pid", "returncode")
+
+    def __init__(self, executable, argv, file_actions):
+        """Start the command.
+
+        Args:
+            executable: Path of the program to execute (searched in PATH if it has no slash)
+            argv: Arguments for the program, starting with its name
+            file_actions: os.posix_spawn file actions, e.g. to redirect output
+        """
+        import signal
+
+        # Python ignores these signals; restore the defaults for the child like subprocess does
+        default_signals = [getattr(signal, name) for name in ("SIGPIPE", "SIGXFSZ") if hasattr(signal, name)]
+        spawn = os.posix_spawn if os.path.dirname(executable) else os.posix_spawnp
+        self.pid = spawn(executable, argv, os.environ, file_actions=file_actions, setsigdef=default_signals)
+        self.returncode = None
+
+    def poll(self):
+        """Check whether the command has exited.
+
+        Returns:
+            int: Exit code (negative signal number if killed), or None while running
+        """
+        if self.returncode is None:
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+            if pid == self.pid:
+                self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+    def wait(self):
+        """Wait for the command to exit.
+
+        Returns:
+            int: Exit code (negative signal number if killed)
+        """
+        if self.returncode is None:
+            _, status = os.waitpid(self.pid, 0)
+            self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+    def kill(self):
+        """Kill the command if it is still running."""
+        import signal
+
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+
+class _PidFd:
+    """A Linux pidfd, which select reports readable once its process has exited."""
+
+    __slots__ = ("fd",)
+
+    def __init__(self, fd):
+        self.fd = fd
+
+    def fileno(self):
+        """Get the file descriptor for select."""
+        return self.fd
+
+    def close(self):
+        """Close the pidfd."""
+        os.close(self.fd)
+
+
+def _watch_exit(pid):
+    """Get something select can wait on for the exit of a child process.
+
+    Args:
+        pid: Process ID of the child (not reaped yet)
+
+    Returns:
+        object: Object with fileno() and close() that becomes readable when the
+        process exits, or None where the platform cannot watch processes (the exit
+        is polled then)
+    """
+    import select
+
+    try:
+        if hasattr(os, "pidfd_open"):
+            return _PidFd(os.pidfd_open(pid))
+        if hasattr(select, "kqueue"):
+            kqueue = select.kqueue()
+            try:
+                kqueue.control([select.kevent(pid, select.KQ_FILTER_PROC, select.KQ_EV_ADD, select.KQ_NOTE_EXIT)], 0)
+            except OSError:
+                kqueue.close()
+                raise
+            return kqueue
+    except OSError:
+        # Linux before 5.3 has no pidfd_open
+        pass
+    return None
+
+
+def _start_drain(read_fd, output):
+    """Pass on output of a command's background processes on a daemon thread.
+
+    Args:
+        read_fd: Read end of the output pipe, closed by the thread at EOF
+        output: Callable receiving the output chunks, and an empty chunk at EOF
+    """
+    import threading
+
+    threading.Thread(target=_drain, args=(read_fd, output), name="OutputDrain", daemon=True).start()
+
+
+def _drain(read_fd, output):
+    """Read an output pipe until all writers have closed it.
+
+    Args:
+        read_fd: Read end of the output pipe, closed when done
+        output: Callable receiving the output chunks, and an empty chunk at EOF
+    """
+    try:
+        while True:
+            chunk = os.read(read_fd, _READ_SIZE)
+            if not chunk:
+                break
+            output(chunk)
+    finally:
+        os.close(read_fd)
+        output(b"")
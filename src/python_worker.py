@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Warm Python worker for File Watcher
+Imports the preloaded modules once, then runs each job in a forked child via runpy
+
+Usage (started by PythonWorkerPool):
+    python python_worker.py RESULT_FD [MODULE ...]
+
+Jobs arrive on stdin as one JSON object per line with the keys "module"
+(module name for -m, or null), "argv", "cwd" and "env". The exit code of
+each job is written to RESULT_FD as a line of text. The worker exits when
+stdin is closed.
+"""
+
+import json
+import os
+
+# runpy.run_path imports pkgutil on first use; import it once here instead of in every job
+import pkgutil  # noqa: F401
+import runpy
+import sys
+
+
+def run_job(job, result_fd):
+    """Run a job in the current (forked) process and exit with its status.
+
+    Args:
+        job: Job dictionary as sent by PythonWorkerPool
+        result_fd: Result pipe of the worker, closed so the job cannot write to it
+    """
+    code = 1
+    try:
+        os.close(result_fd)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.close(devnull)
+        sys.stdin = open(0, closefd=False)
+        os.chdir(job["cwd"])
+        os.environ.clear()
+        os.environ.update(job["env"])
+        sys.argv = list(job["argv"])
+
+        # Same sys.path[0] as "python -m module" and "python script.py"
+        if job["module"] is not None:
+            sys.path[0] = os.getcwd()
+            runpy.run_module(job["module"], run_name="__main__", alter_sys=True)
+        else:
+            sys.path[0] = os.path.dirname(os.path.abspath(sys.argv[0]))
+            runpy.run_path(sys.argv[0], run_name="__main__")
+        code = 0
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def main():
+    """Preload modules, then run jobs from stdin until it is closed."""
+    result_fd = int(sys.argv[1])
+    # Resolve preloaded modules like "python -c" does, not from this file's directory
+    sys.path[0] = ""
+    for module in sys.argv[2:]:
+        try:
+            __import__(module)
+        except Exception as e:
+            print(f"Warning: Python worker could not preload '{module}': {e}", file=sys.stderr)
+
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            return
+        job = json.loads(line)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            run_job(job, result_fd)
+        _, status = os.waitpid(pid, 0)
+        os.write(result_fd, f"{os.waitstatus_to_exitcode(status)}\n".encode())
+
+
+if __name__ == "__main__":
+    main()
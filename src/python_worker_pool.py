@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Warm Python worker pool for File Watcher
+Runs Python script commands in pre-started interpreters instead of fresh processes
+"""
+
+import os
+import re
+import shlex
+import sys
+
+# Support both relative and absolute imports
+try:
+    from .terminal_colors import Fore
+    from .timestamp_printer import TimestampPrinter
+except ImportError:
+    from terminal_colors import Fore
+    from timestamp_printer import TimestampPrinter
+
+# Worker script run by each pooled interpreter
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_worker.py")
+
+# Executable names accepted as the first word of a python-worker command
+_PYTHON_EXECUTABLE = re.compile(r"python[0-9.]*(\.exe)?")
+
+
+class _Worker:
+    """A pooled worker process and the read end of its result pipe."""
+
+    __slots__ = ("process", "result_fd", "preload")
+
+    def __init__(self, process, result_fd, preload):
+        self.process = process
+        self.result_fd = result_fd
+        self.preload = preload
+
+
+class PythonWorkerPool:
+    """Keeps warm Python interpreters for entries with runner = "python-worker".
+
+    Each worker imports the modules listed in python_worker_preload once and
+    then forks a child per command, which runs the script with runpy in the
+    entry's cwd with the watcher's environment and the command's arguments
+    as sys.argv. The fork copies the warm interpreter, so a trigger costs
+    the script's own work instead of interpreter startup and imports, and
+    every run still starts from the same clean state.
+
+    Workers run the watcher's own interpreter, so a command only uses the
+    pool when its first word resolves (in PATH, or relative to the entry's
+    cwd when it contains a slash) to the same file as sys.executable.
+    Commands naming another interpreter, e.g. python3.8 or a virtualenv's
+    python, are reported once at load and run through the shell, so they
+    keep the interpreter and installed packages they ask for.
+
+    Up to python_worker_pool_size idle workers are kept (default: 1); more
+    are started when commands overlap. A worker is killed with its running
+    command on timeout and replaced on the next run. Workers need os.fork,
+    so on Windows these entries run through the shell as usual.
+    """
+
+    DEFAULT_POOL_SIZE = 1
+
+    _pool_size = DEFAULT_POOL_SIZE
+    _preload = ()
+    _idle = []
+    _atexit_registered = False
+
+    # (command, cwd) -> whether the command's interpreter is the watcher's
+    _same_interpreter = {}
+
+    @staticmethod
+    def is_supported():
+        """Check whether workers can run on this platform.
+
+        Returns:
+            bool: True if os.fork is available
+        """
+        return hasattr(os, "fork")
+
+    @staticmethod
+    def parse_command(command):
+        """Split a python-worker command into the module or script to run and its argv.
+
+        Args:
+            command: Command string such as "python script.py --flag" or "python3 -m package.tool"
+
+        Returns:
+            tuple: (module name or None for a script, argv for the run with the script or module first)
+
+        Raises:
+            ValueError: If the command does not run a Python script or module
+        """
+        try:
+            words = shlex.split(command)
+        except ValueError as e:
+            raise ValueError(f"cannot split command {command!r}: {e}") from None
+        if not words or not _PYTHON_EXECUTABLE.fullmatch(os.path.basename(words[0])):
+            raise ValueError(f'runner "python-worker" needs a command starting with python (got {command!r})')
+        args = words[1:]
+        if len(args) >= 2 and args[0] == "-m":
+            return args[1], args[1:]
+        if args and not args[0].startswith("-"):
+            return None, args
+        raise ValueError(
+            f'runner "python-worker" needs "python script.py ..." or "python -m module ..." '
+            f"without interpreter options (got {command!r})"
+        )
+
+    @staticmethod
+    def configure(config):
+        """Apply the worker options of a (re)loaded config and start its workers.
+
+        Idle workers started with other preloaded modules are stopped. Workers
+        are only started when an entry of the config uses the pool.
+
+        Args:
+            config: Configuration dictionary
+        """
+        PythonWorkerPool._same_interpreter.clear()
+        preload = tuple(config.get("python_worker_preload", ()))
+        PythonWorkerPool._pool_size = config.get("python_worker_pool_size", PythonWorkerPool.DEFAULT_POOL_SIZE)
+        if preload != PythonWorkerPool._preload:
+            PythonWorkerPool.shutdown()
+            PythonWorkerPool._preload = preload
+
+        if not PythonWorkerPool.is_supported():
+            return
+        uses_pool = False
+        for entry in config.get("files", []):
+            if entry.get("runner") != "python-worker":
+                continue
+            command = entry.get("command", "")
+            if PythonWorkerPool.uses_watcher_interpreter(command, entry.get("cwd")):
+                uses_pool = True
+            else:
+                TimestampPrinter.print(
+                    f"Warning: '{shlex.split(command)[0]}' is not the interpreter running the watcher "
+                    f"({sys.executable}). Command '{command}' will run through the shell.",
+                    Fore.YELLOW,
+                )
+        if uses_pool:
+            while len(PythonWorkerPool._idle) < PythonWorkerPool._pool_size:
+                PythonWorkerPool._idle.append(PythonWorkerPool._start_worker())
+
+    @staticmethod
+    def uses_watcher_interpreter(command, cwd):
+        """Check whether a python-worker command asks for the interpreter running the watcher.
+
+        The result is kept until configure() is called again on config reload.
+
+        Args:
+            command: Command string accepted by parse_command()
+            cwd: Working directory of the entry (None for the watcher's)
+
+        Returns:
+            bool: True if the command's first word is the same file as sys.executable
+                and belongs to the same virtual environment (or to none, like it)
+        """
+        key = (command, cwd)
+        try:
+            return PythonWorkerPool._same_interpreter[key]
+        except KeyError:
+            pass
+
+        import shutil
+
+        program = shlex.split(command)[0]
+        if os.path.dirname(program):
+            executable = os.path.join(os.path.abspath(cwd or "."), program)
+        else:
+            executable = shutil.which(program)
+        try:
+            same = executable is not None and os.path.samefile(executable, sys.executable)
+        except OSError:
+            same = False
+        # A venv's python is a symlink to its base interpreter, but runs with the venv's site-packages
+        if same:
+            same = _get_venv(executable) == _get_venv(sys.executable)
+        PythonWorkerPool._same_interpreter[key] = same
+        return same
+
+    @staticmethod
+    def run(command, cwd, timeout):
+        """Run a Python command in a pooled worker.
+
+        Args:
+            command: Command string accepted by parse_command()
+            cwd: Working directory for the command (None for the watcher's)
+            timeout: Seconds to wait for the command before killing it
+
+        Returns:
+            subprocess.CompletedProcess: Result with the command's exit code
+
+        Raises:
+            subprocess.TimeoutExpired: If the command did not finish in time
+            RuntimeError: If the worker died before reporting the exit code
+        """
+        import json
+        import select
+        import subprocess
+        import time
+
+        module, argv = PythonWorkerPool.parse_command(command)
+        job = {"module": module, "argv": argv, "cwd": os.path.abspath(cwd or "."), "env": dict(os.environ)}
+        worker = PythonWorkerPool._acquire()
+        try:
+            worker.process.stdin.write(json.dumps(job) + "\n")
+            worker.process.stdin.flush()
+
+            output = b""
+            deadline = time.monotonic() + timeout
+            while not output.endswith(b"\n"):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([worker.result_fd], [], [], remaining)[0]:
+                    raise subprocess.TimeoutExpired(command, timeout)
+                chunk = os.read(worker.result_fd, 64)
+                if not chunk:
+                    raise RuntimeError(f"Python worker exited unexpectedly (exit code {worker.process.wait()})")
+                output += chunk
+        except BaseException:
+            PythonWorkerPool._stop_worker(worker, kill=True)
+            raise
+        PythonWorkerPool._release(worker)
+        return subprocess.CompletedProcess(command, int(output))
+
+    @staticmethod
+    def shutdown():
+        """Stop all idle workers."""
+        while PythonWorkerPool._idle:
+            PythonWorkerPool._stop_worker(PythonWorkerPool._idle.pop())
+
+    @staticmethod
+    def _start_worker():
+        """Start a worker process with the configured preloaded modules.
+
+        Returns:
+            _Worker: The started worker
+        """
+        import atexit
+        import subprocess
+
+        if not PythonWorkerPool._atexit_registered:
+            atexit.register(PythonWorkerPool.shutdown)
+            PythonWorkerPool._atexit_registered = True
+
+        preload = PythonWorkerPool._preload
+        result_fd, worker_fd = os.pipe()
+        try:
+            # A session of its own, so a timeout kills the running command along with the worker
+            process = subprocess.Popen(
+                [sys.executable, WORKER_SCRIPT, str(worker_fd), *preload],
+                stdin=subprocess.PIPE,
+                pass_fds=(worker_fd,),
+                start_new_session=True,
+                text=True,
+            )
+        except BaseException:
+            os.close(result_fd)
+            raise
+        finally:
+            os.close(worker_fd)
+        return _Worker(process, result_fd, preload)
+
+    @staticmethod
+    def _stop_worker(worker, kill=False):
+        """Stop a worker, killing its running command if asked to.
+
+        Args:
+            worker: Worker to stop
+            kill: Kill the worker's process group instead of letting it finish
+        """
+        import signal
+        import subprocess
+
+        if kill:
+            try:
+                os.killpg(worker.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        try:
+            worker.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            worker.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            worker.process.kill()
+            worker.process.wait()
+        os.close(worker.result_fd)
+
+    @staticmethod
+    def _acquire():
+        """Take an idle live worker from the pool, or start a new one."""
+        while PythonWorkerPool._idle:
+            worker = PythonWorkerPool._idle.pop()
+            if worker.process.poll() is None and worker.preload == PythonWorkerPool._preload:
+                return worker
+            PythonWorkerPool._stop_worker(worker)
+        return PythonWorkerPool._start_worker()
+
+    @staticmethod
+    def _release(worker):
+        """Return a worker to the pool, or stop it if the pool is full."""
+        if len(PythonWorkerPool._idle) < PythonWorkerPool._pool_size and worker.preload == PythonWorkerPool._preload:
+            PythonWorkerPool._idle.append(worker)
+        else:
+            PythonWorkerPool._stop_worker(worker)
+
+
+def _get_venv(executable):
+    """Find the virtual environment an interpreter path belongs to, without following symlinks.
+
+    Like Python at startup, looks for pyvenv.cfg next to the executable and one
+    directory up.
+
+    Args:
+        executable: Path of a Python interpreter (symlinks not resolved)
+
+    Returns:
+        str: Absolute directory of the virtual environment, or None for a base interpreter
+    """
+    bin_dir = os.path.dirname(os.path.abspath(executable))
+    for directory in (bin_dir, os.path.dirname(bin_dir)):
+        if os.path.isfile(os.path.join(directory, "pyvenv.cfg")):
+            return os.path.normcase(directory)
+    return None
@@ -11,14 +11,14 @@ import subprocess
 import sys
 import threading
 
-from colorama import Fore
-
 # Support both relative and absolute imports
 try:
     from .interval_parser import IntervalParser
+    from .terminal_colors import Fore
     from .timestamp_printer import TimestampPrinter
 except ImportError:
     from interval_parser import IntervalParser
+    from terminal_colors import Fore
     from timestamp_printer import TimestampPrinter
 
 
@@ -32,13 +32,16 @@ class RepoUpdater:
 
     DEFAULT_INTERVAL = "1h"
 
-    def __init__(self, config):
+    def __init__(self, config, before_restart=None):
         """Initialize the repo updater from configuration.
 
         Args:
             config: Global configuration dictionary.  Reads the
                     ``[auto_update]`` sub-table for settings.
+            before_restart: Optional callable invoked right before the
+                    process is replaced (e.g. to checkpoint watcher state).
         """
+        self.before_restart = before_restart
         auto_update_config = config.get("auto_update", {})
         self.enabled = auto_update_config.get("enabled", False)
         interval_str = auto_update_config.get("interval", self.DEFAULT_INTERVAL)
@@ -112,6 +115,11 @@ class RepoUpdater:
     def _restart(self):
         """Replace the current process with a fresh instance (self-restart)."""
         TimestampPrinter.print("Restarting...", Fore.GREEN)
+        if self.before_restart is not None:
+            try:
+                self.before_restart()
+            except Exception as e:
+                TimestampPrinter.print(f"Warning: Error before restart: {e}", Fore.YELLOW)
         try:
             os.execv(sys.executable, [sys.executable] + sys.argv)
         except OSError as exc:
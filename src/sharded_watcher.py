@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Sharded multi-process file watcher for File Watcher
+Splits config entries across worker processes supervised by a single parent
+"""
+
+import time
+import zlib
+
+# Support both relative and absolute imports
+try:
+    from .cat_file_watcher import FileWatcher
+    from .clock_monitor import ClockMonitor
+    from .color_scheme import ColorScheme
+    from .command_executor import CommandExecutor
+    from .deadline_scheduler import DeadlineScheduler
+    from .direct_exec import DirectExec
+    from .entry_state import EntryState
+    from .file_monitor import FileMonitor
+    from .interval_parser import IntervalParser
+    from .interval_scheduler import IntervalScheduler
+    from .load_shedder import LoadShedder
+    from .output_capture import OutputCapture
+    from .python_worker_pool import PythonWorkerPool
+    from .shell_session import ShellSession
+    from .state_store import StateStore
+    from .terminal_colors import Fore
+    from .tick_monitor import TickMonitor
+    from .time_period_checker import TimePeriodChecker
+    from .timestamp_printer import TimestampPrinter
+except ImportError:
+    from cat_file_watcher import FileWatcher
+    from clock_monitor import ClockMonitor
+    from color_scheme import ColorScheme
+    from command_executor import CommandExecutor
+    from deadline_scheduler import DeadlineScheduler
+    from direct_exec import DirectExec
+    from entry_state import EntryState
+    from file_monitor import FileMonitor
+    from interval_parser import IntervalParser
+    from interval_scheduler import IntervalScheduler
+    from load_shedder import LoadShedder
+    from output_capture import OutputCapture
+    from python_worker_pool import PythonWorkerPool
+    from shell_session import ShellSession
+    from state_store import StateStore
+    from terminal_colors import Fore
+    from tick_monitor import TickMonitor
+    from time_period_checker import TimePeriodChecker
+    from timestamp_printer import TimestampPrinter
+
+
+def _get_shard_key(entry):
+    """Get the key that decides which shard an entry belongs to.
+
+    Entries watching the same path share a shard so they share the per-tick
+    parent directory cache; periodic commands and processes are spread by identity.
+
+    Args:
+        entry: Entry settings dictionary
+
+    Returns:
+        str: Shard key
+    """
+    return entry.get("path", "") or StateStore.get_entry_identity(entry)
+
+
+def _worker_main(worker_index, shard_config, paused_identities, output_queue, control_queue, command_slots):
+    """Entry point of a shard worker process.
+
+    Args:
+        worker_index: Index of this worker
+        shard_config: Configuration dictionary restricted to this worker's entries
+        paused_identities: Identities of the entries paused through the control socket
+        output_queue: Queue receiving formatted output lines for the supervisor
+        control_queue: Queue delivering ("config", shard config) and ("paused",
+            identities) messages (None stops the worker)
+        command_slots: Shared semaphore bounding concurrent commands, or None
+    """
+    TimestampPrinter.set_output_sink(output_queue.put)
+    CommandExecutor.set_concurrency_limiter(command_slots)
+    try:
+        _ShardWorker(worker_index, shard_config, paused_identities).run(control_queue)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        PythonWorkerPool.shutdown()
+        ShellSession.shutdown()
+
+
+class _ShardWorker:
+    """Watch loop for the entries of one shard, running inside a worker process."""
+
+    def __init__(self, worker_index, shard_config, paused_identities):
+        """Initialize the worker with its shard of the config.
+
+        Args:
+            worker_index: Index of this worker
+            shard_config: Configuration dictionary restricted to this worker's entries
+            paused_identities: Identities of the entries paused through the control socket
+        """
+        self.worker_index = worker_index
+        self.paused_identities = paused_identities
+        self._apply_config(shard_config)
+
+    def _apply_config(self, shard_config):
+        """Switch to a new shard config, taking current file timestamps as baseline.
+
+        Args:
+            shard_config: Configuration dictionary restricted to this worker's entries
+        """
+        self.config = shard_config
+        TimestampPrinter.set_enable_timestamp(shard_config.get("enable_timestamp", True))
+        ColorScheme.apply(shard_config.get("color_scheme", ColorScheme.DEFAULT_COLOR_SCHEME))
+
+        self.file_timestamps = EntryState.create_column(shard_config)
+        for index, entry in enumerate(shard_config.get("files", [])):
+            filename = entry.get("path", "")
+            if filename:
+                current_timestamp = FileMonitor.get_file_timestamp(filename)
+                if current_timestamp is not None:
+                    self.file_timestamps.set_at(index, current_timestamp)
+        self.file_last_check = EntryState.create_column(shard_config)
+        self.file_backoff = {}
+        self.file_last_run = {}
+        self.file_adaptive = {}
+        self.scheduler = DeadlineScheduler()
+        self.scheduler.load(shard_config)
+        self.interval_scheduler = IntervalScheduler(shard_config)
+        DirectExec.configure(shard_config)
+        OutputCapture.configure(shard_config)
+        PythonWorkerPool.configure(shard_config)
+        self.clock_monitor = ClockMonitor()
+        self.interval = FileWatcher.calculate_main_loop_interval(shard_config)
+        self._update_paused_entries()
+
+    def _update_paused_entries(self):
+        """Recompute the paused entry keys of this shard from the paused identities."""
+        self.paused_entries = {
+            f"#{index}"
+            for index, entry in enumerate(self.config.get("files", []))
+            if StateStore.get_entry_identity(entry) in self.paused_identities
+        }
+
+    def run(self, control_queue):
+        """Check this shard's entries until told to stop.
+
+        Args:
+            control_queue: Queue delivering ("config", shard config) and
+                ("paused", identities) messages (None stops the worker)
+        """
+        import queue
+
+        while True:
+            tick_started = time.monotonic()
+            TickMonitor.begin_tick()
+            suspended, jumped = self.clock_monitor.check()
+            if suspended:
+                ClockMonitor.apply_missed_runs(self.config, self.file_last_check, self.scheduler, suspended)
+            if suspended or jumped:
+                self.interval_scheduler.invalidate()
+                TimePeriodChecker.clear_cache()
+            tick_budget = TickMonitor.get_budget(self.config)
+            self.file_timestamps, self.file_last_check = FileMonitor.check_files(
+                self.config,
+                self.file_timestamps,
+                self.file_last_check,
+                self.file_backoff,
+                self.file_last_run,
+                self.paused_entries,
+                tick_started + tick_budget if tick_budget is not None else None,
+                self.file_adaptive,
+                self.interval_scheduler,
+            )
+            FileMonitor.run_scheduled(self.config, self.scheduler, self.file_last_run, self.paused_entries)
+            tick_duration = time.monotonic() - tick_started
+            overran = tick_duration > self.interval
+            shed_message = LoadShedder.record_tick(overran)
+            if shed_message is not None:
+                TimestampPrinter.print(
+                    f"Warning: {shed_message}" if overran else shed_message, Fore.YELLOW if overran else Fore.GREEN
+                )
+
+            wait = max(0.0, self.interval - tick_duration)
+            cron_wait = self.scheduler.get_wait()
+            try:
+                message = control_queue.get(timeout=wait if cron_wait is None else min(wait, cron_wait))
+            except queue.Empty:
+                continue
+            if message is None:
+                return
+            kind, payload = message
+            if kind == "config":
+                self._apply_config(payload)
+            else:
+                self.paused_identities = payload
+                self._update_paused_entries()
+
+
+class ShardedFileWatcher(FileWatcher):
+    """Supervises worker processes that each watch a shard of the config entries.
+
+    The supervisor owns config reloading and auto-update, redistributes the
+    entries to the workers after each reload, prints the output of all workers
+    and restarts workers that die. The global max_concurrent_commands setting
+    bounds the number of commands running at once across all workers. Paused
+    entries are passed on to the workers; tick budgets, load shedding and
+    Python workers apply within each worker.
+    """
+
+    def __init__(self, config_path, workers, config_cache_path=None):
+        """Initialize the sharded watcher.
+
+        Args:
+            config_path: Path to the TOML configuration file
+            workers: Number of worker processes
+            config_cache_path: Optional path to the compiled config cache file
+        """
+        import multiprocessing
+
+        self.workers = workers
+        self._mp_context = multiprocessing.get_context()
+        self._output_queue = self._mp_context.Queue()
+        self._processes = [None] * workers
+        self._control_queues = [None] * workers
+        super().__init__(config_path, config_cache_path)
+
+        max_concurrent_commands = self.config.get("max_concurrent_commands")
+        self._command_slots = (
+            self._mp_context.BoundedSemaphore(max_concurrent_commands) if max_concurrent_commands else None
+        )
+        self._shards = ShardedFileWatcher.partition(self.config, workers)
+
+    @staticmethod
+    def partition(config, workers):
+        """Split the config entries into one shard config per worker.
+
+        Entries are assigned by a stable hash of their shard key, so an entry
+        stays on the same worker across reloads and restarts.
+
+        Args:
+            config: Configuration dictionary
+            workers: Number of shards
+
+        Returns:
+            list: Shard configuration dictionaries (global settings are shared)
+        """
+        shard_entries = [[] for _ in range(workers)]
+        for entry in config.get("files", []):
+            shard_index = zlib.crc32(_get_shard_key(entry).encode("utf-8")) % workers
+            shard_entries[shard_index].append(entry)
+
+        shards = []
+        for entries in shard_entries:
+            shard_config = {key: value for key, value in config.items() if key not in ("commands", "processes")}
+            shard_config["files"] = entries
+            shards.append(shard_config)
+        return shards
+
+    def _restore_state(self):
+        """Persistent state is not supported in sharded mode."""
+        if self.config.get("state_file"):
+            TimestampPrinter.print("Warning: state_file is ignored when running with multiple workers", Fore.YELLOW)
+
+    def _save_state(self):
+        """Persistent state is not supported in sharded mode."""
+
+    def _prepare_restart(self):
+        """Stop the workers so they do not outlive an auto-update restart; runs on the supervisor loop."""
+        self.stop_workers()
+
+    def _on_config_reloaded(self):
+        """Redistribute the reloaded entries to the workers."""
+        self._shards = ShardedFileWatcher.partition(self.config, self.workers)
+        for worker_index, control_queue in enumerate(self._control_queues):
+            if control_queue is not None:
+                control_queue.put(("config", self._shards[worker_index]))
+
+    def _update_paused_entries(self):
+        """Recompute the paused entry keys and pass the paused identities on to the workers."""
+        super()._update_paused_entries()
+        for control_queue in self._control_queues:
+            if control_queue is not None:
+                control_queue.put(("paused", frozenset(self.paused_identities)))
+
+    def _handle_control_command(self, command, argument):
+        """Handle a control request; per-entry commands are not available in sharded mode.
+
+        Args:
+            command: One of ControlServer.COMMANDS
+            argument: Command argument (may be empty)
+
+        Returns:
+            dict: Response payload
+
+        Raises:
+            ValueError: If the request cannot be fulfilled
+        """
+        if command not in ("reload", "pause", "resume", "dump-stats"):
+            raise ValueError(f"'{command}' is not supported when running with multiple workers")
+        response = super()._handle_control_command(command, argument)
+        if command == "dump-stats":
+            response["stats"]["workers"] = self.workers
+        return response
+
+    def _start_worker(self, worker_index):
+        """Start (or restart) a worker process for one shard.
+
+        Args:
+            worker_index: Index of the worker to start
+        """
+        control_queue = self._mp_context.Queue()
+        process = self._mp_context.Process(
+            target=_worker_main,
+            args=(
+                worker_index,
+                self._shards[worker_index],
+                frozenset(self.paused_identities),
+                self._output_queue,
+                control_queue,
+                self._command_slots,
+            ),
+            name=f"cat-file-watcher-worker-{worker_index}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[worker_index] = process
+        self._control_queues[worker_index] = control_queue
+
+    def start_workers(self):
+        """Start all worker processes."""
+        for worker_index in range(self.workers):
+            self._start_worker(worker_index)
+
+    def poll_once(self, timeout=0.0):
+        """Print pending worker output and restart workers that died.
+
+        Args:
+            timeout: Seconds to wait for the first output line
+        """
+        import queue
+
+        try:
+            line = self._output_queue.get(timeout=timeout) if timeout > 0 else self._output_queue.get_nowait()
+            while True:
+                TimestampPrinter.write_line(line)
+                line = self._output_queue.get_nowait()
+        except queue.Empty:
+            pass
+
+        for worker_index, process in enumerate(self._processes):
+            if process is not None and not process.is_alive():
+                TimestampPrinter.print(
+                    f"Worker {worker_index} exited with code {process.exitcode}, restarting", Fore.YELLOW
+                )
+                self._start_worker(worker_index)
+
+    def stop_workers(self, timeout=5.0):
+        """Stop all worker processes and print their remaining output.
+
+        Args:
+            timeout: Seconds to wait for each worker to exit before terminating it
+        """
+        processes = self._processes
+        self._processes = [None] * self.workers
+        for control_queue in self._control_queues:
+            if control_queue is not None:
+                control_queue.put(None)
+
+        for process in processes:
+            if process is None:
+                continue
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._control_queues = [None] * self.workers
+        self.poll_once()
+
+    def run(self, interval=None):
+        """Run the supervisor loop until interrupted.
+
+        Args:
+            interval: Optional supervisor polling interval in seconds. If not
+                     specified, config_check_interval is used.
+        """
+        if interval is None:
+            interval = IntervalParser.parse_interval(self.config.get("config_check_interval", "1s"))
+
+        TimestampPrinter.print(f"Starting file watcher with config: {self.config_path}", Fore.GREEN)
+        TimestampPrinter.print(f"Watching {len(self.config.get('files', []))} entries with {self.workers} workers")
+        TimestampPrinter.print("Press Ctrl+C to stop.")
+
+        # Fork the workers before the auto-update thread exists
+        self.start_workers()
+        if self._repo_updater is not None:
+            self._repo_updater.start()
+        if self.config.get("control_socket"):
+            self._control_server = self._create_control_server()
+
+        try:
+            while True:
+                self._check_config_file()
+                deadline = time.monotonic() + interval
+                while time.monotonic() < deadline:
+                    if self._control_server is not None:
+                        self._control_server.wait(0, self._handle_control_command)
+                    self.poll_once(timeout=min(max(0.0, deadline - time.monotonic()), 0.1))
+                    self._serve_restart_request()
+        except KeyboardInterrupt:
+            TimestampPrinter.print("\nStopping file watcher...")
+        finally:
+            if self._repo_updater is not None:
+                self._repo_updater.stop()
+            if self._control_server is not None:
+                self._control_server.close()
+            self.stop_workers()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Persistent shell sessions for File Watcher
+Runs command strings in long-lived shells instead of a fresh /bin/sh per command
+"""
+
+import os
+import shlex
+from collections import OrderedDict
+
+# Support both relative and absolute imports
+try:
+    from .terminal_colors import Fore
+    from .timestamp_printer import TimestampPrinter
+except ImportError:
+    from terminal_colors import Fore
+    from timestamp_printer import TimestampPrinter
+
+# Shell kept running by each session
+SHELL = "/bin/sh"
+
+
+class _Session:
+    """A session shell, the read end of its result pipe and the last command number."""
+
+    __slots__ = ("process", "result_fd", "sequence")
+
+    def __init__(self, process, result_fd):
+        self.process = process
+        self.result_fd = result_fd
+        self.sequence = 0
+
+
+class ShellSession:
+    """Keeps a shell per working directory for entries with runner = "shell-session".
+
+    Spawning a command with subprocess forks the watcher, whose page tables
+    grow with its memory, and execs /bin/sh before the command itself runs.
+    A session shell is started once per cwd; each command is sent to it over
+    its stdin as
+
+        ( eval '<command>' ) 3>&- </dev/null; echo "<number> $?" >&3
+
+    so the command runs in a subshell forked from the small shell and cannot
+    change the session's directory, variables or options. The number ahead of
+    the exit code tells the result of this command apart from a stale one.
+    Output goes straight to the watcher's terminal as with the shell runner.
+
+    A timed out command is killed together with its session. If the session
+    cannot be written to, the command never reached it and is run in a fresh
+    shell with the time left; if the session dies after taking the command,
+    the command may have run partly, so the failure is reported instead of
+    running it again. The next command for that cwd starts a new session. Sessions take
+    the watcher's environment when they start and need a POSIX shell with
+    /dev/fd, so on other platforms these entries use a fresh shell as usual.
+    """
+
+    # Least recently used sessions are closed beyond this many
+    MAX_SESSIONS = 16
+
+    # Seconds between checks that the session is still alive while waiting
+    POLL_INTERVAL = 0.5
+
+    _sessions = OrderedDict()
+    _atexit_registered = False
+
+    @staticmethod
+    def is_supported():
+        """Check whether session shells can run on this platform.
+
+        Returns:
+            bool: True if /bin/sh and /dev/fd are available
+        """
+        return os.name == "posix" and os.path.exists(SHELL) and os.path.isdir("/dev/fd")
+
+    @staticmethod
+    def run(command, cwd, timeout):
+        """Run a command string in the session shell of its working directory.
+
+        Args:
+            command: Shell command string
+            cwd: Working directory for the command (None for the watcher's)
+            timeout: Seconds to wait for the command before killing it
+
+        Returns:
+            subprocess.CompletedProcess: Result with the command's exit code
+
+        Raises:
+            subprocess.TimeoutExpired: If the command did not finish in time
+        """
+        import select
+        import subprocess
+        import time
+
+        key = os.path.abspath(cwd or ".")
+        session = ShellSession._sessions.pop(key, None)
+        if session is None or session.process.poll() is not None:
+            if session is not None:
+                ShellSession._close_session(session)
+            session = ShellSession._start_session(key)
+
+        session.sequence += 1
+        expected = str(session.sequence).encode()
+        deadline = time.monotonic() + timeout
+        try:
+            session.process.stdin.write(
+                f'( eval {shlex.quote(command)} ) 3>&- </dev/null; echo "{session.sequence} $?" >&3\n'
+            )
+            session.process.stdin.flush()
+        except OSError as e:
+            # The shell never got the command, so running it elsewhere cannot run it twice
+            ShellSession._close_session(session, kill=True)
+            TimestampPrinter.print(
+                f"Warning: Shell session in '{key}' failed ({e}). Running the command in a new shell.", Fore.YELLOW
+            )
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(command, timeout) from None
+            return subprocess.run(command, shell=True, text=True, timeout=remaining, cwd=cwd)
+        except BaseException:
+            ShellSession._close_session(session, kill=True)
+            raise
+
+        output = b""
+        try:
+            while True:
+                lines = output.split(b"\n")
+                reported = [line.split() for line in lines[:-1]]
+                returncodes = [int(fields[1]) for fields in reported if fields[:1] == [expected]]
+                if returncodes:
+                    break
+                output = lines[-1]
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(command, timeout)
+                if select.select([session.result_fd], [], [], min(remaining, ShellSession.POLL_INTERVAL))[0]:
+                    chunk = os.read(session.result_fd, 4096)
+                    if not chunk:
+                        raise RuntimeError(f"Shell session in '{key}' exited before reporting the exit code")
+                    output += chunk
+                elif session.process.poll() is not None:
+                    # The command may have run partly, so it is not run again
+                    raise RuntimeError(
+                        f"Shell session in '{key}' exited before reporting the exit code "
+                        f"(exit code {session.process.returncode})"
+                    )
+        except BaseException:
+            ShellSession._close_session(session, kill=True)
+            raise
+
+        # Another thread may have started a session for this cwd meanwhile
+        other = ShellSession._sessions.pop(key, None)
+        if other is not None:
+            ShellSession._close_session(other)
+        ShellSession._sessions[key] = session
+        while len(ShellSession._sessions) > ShellSession.MAX_SESSIONS:
+            ShellSession._close_session(ShellSession._sessions.popitem(last=False)[1])
+        return subprocess.CompletedProcess(command, returncodes[0])
+
+    @staticmethod
+    def shutdown():
+        """Close all session shells."""
+        while ShellSession._sessions:
+            ShellSession._close_session(ShellSession._sessions.popitem()[1])
+
+    @staticmethod
+    def _start_session(cwd):
+        """Start a session shell in a working directory.
+
+        Args:
+            cwd: Absolute working directory of the session
+
+        Returns:
+            _Session: The started session
+        """
+        import atexit
+        import subprocess
+
+        if not ShellSession._atexit_registered:
+            atexit.register(ShellSession.shutdown)
+            ShellSession._atexit_registered = True
+
+        result_fd, shell_fd = os.pipe()
+        try:
+            # A session of its own, so a timeout kills the running command along with the shell
+            process = subprocess.Popen(
+                [SHELL, "-s"],
+                stdin=subprocess.PIPE,
+                pass_fds=(shell_fd,),
+                cwd=cwd,
+                start_new_session=True,
+                text=True,
+            )
+        except BaseException:
+            os.close(result_fd)
+            raise
+        finally:
+            os.close(shell_fd)
+        # Results go to fd 3; /dev/fd reaches the pipe even where the shell only redirects fds 0-9
+        process.stdin.write(f"exec 3>/dev/fd/{shell_fd}\n")
+        return _Session(process, result_fd)
+
+    @staticmethod
+    def _close_session(session, kill=False):
+        """Close a session shell, killing its running command if asked to.
+
+        Args:
+            session: Session to close
+            kill: Kill the session's process group instead of letting it exit
+        """
+        import signal
+        import subprocess
+
+        if kill:
+            try:
+                os.killpg(session.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        try:
+            session.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            session.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            session.process.kill()
+            session.process.wait()
+        os.close(session.result_fd)
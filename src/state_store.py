@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Persistent watcher state for File Watcher
+Checkpoints per-entry signatures and last-run info so restarts detect changes made while down
+"""
+
+import os
+
+# Support both relative and absolute imports
+try:
+    from .clock import Clock
+    from .terminal_colors import Fore
+    from .timestamp_printer import TimestampPrinter
+except ImportError:
+    from clock import Clock
+    from terminal_colors import Fore
+    from timestamp_printer import TimestampPrinter
+
+
+class StateStore:
+    """Handles loading, saving and restoring the persistent watcher state.
+
+    The state file is compact JSON:
+        {"version": 1, "entries": {identity: [mtime, last_run], ...}}
+    where identity identifies an entry independently of its position in the
+    config, mtime is the last seen file timestamp (None for periodic entries)
+    and last_run is the wall-clock start time of the last command run (or None).
+    """
+
+    STATE_VERSION = 1
+
+    DEFAULT_CHECKPOINT_INTERVAL = "30s"
+
+    # Entry settings that tell apart entries with the same path and action
+    IDENTITY_SETTINGS = ("cwd", "interval", "schedule", "time_period")
+
+    # "run": fire entries whose files changed while the watcher was down and
+    #        resume periodic commands from their last run
+    # "skip": only record the current state as baseline (no catch-up)
+    CATCH_UP_POLICIES = ("run", "skip")
+    DEFAULT_CATCH_UP = "run"
+
+    @staticmethod
+    def get_entry_identity(entry):
+        """Build a stable identity for an entry that does not depend on its index.
+
+        The identity is made of the path, the action and those of
+        IDENTITY_SETTINGS the entry sets, so e.g. one command on two schedules
+        gives two identities. With state_file set, entries that share all of
+        them are rejected at load as duplicates, since they would share their
+        saved state.
+
+        Args:
+            entry: Entry settings dictionary
+
+        Returns:
+            str: Identity string
+        """
+        if "argv" in entry:
+            action = repr(entry["argv"])
+        elif "terminate_if_process" in entry:
+            action = f"terminate_if_process:{entry['terminate_if_process']!r}"
+        elif "terminate_if_window_title" in entry:
+            action = f"terminate_if_window_title:{entry['terminate_if_window_title']!r}"
+        else:
+            action = entry.get("command", "")
+        identity = f"{entry.get('path', '')}\n{action}"
+        # Unset settings add nothing, so identities of entries without them stay as they were
+        for key in StateStore.IDENTITY_SETTINGS:
+            value = entry.get(key)
+            if value:
+                identity += f"\n{key}={value}"
+        return identity
+
+    @staticmethod
+    def load(state_file):
+        """Load saved state from the state file.
+
+        Args:
+            state_file: Path to the state file
+
+        Returns:
+            dict: Mapping of entry identity to [mtime, last_run] (empty if unavailable)
+        """
+        import json
+
+        try:
+            with open(state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            TimestampPrinter.print(f"Warning: Ignoring unreadable state file '{state_file}': {e}", Fore.YELLOW)
+            return {}
+
+        if not isinstance(state, dict) or state.get("version") != StateStore.STATE_VERSION:
+            return {}
+        entries = state.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    @staticmethod
+    def save(state_file, config, file_timestamps, file_last_run):
+        """Atomically write the current state to the state file.
+
+        Args:
+            state_file: Path to the state file
+            config: Configuration dictionary
+            file_timestamps: Dictionary tracking file timestamps per entry key
+            file_last_run: Dictionary tracking last command run per entry key
+
+        Returns:
+            bool: True if the state was written
+        """
+        import json
+        import tempfile
+
+        entries = {}
+        for index, entry in enumerate(config.get("files", [])):
+            entry_key = f"#{index}"
+            last_run = file_last_run.get(entry_key)
+            entries[StateStore.get_entry_identity(entry)] = [
+                file_timestamps.get(entry_key),
+                last_run["started"] if last_run else None,
+            ]
+
+        state_dir = os.path.dirname(os.path.abspath(state_file))
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=".state-", dir=state_dir)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": StateStore.STATE_VERSION, "entries": entries}, f, separators=(",", ":"))
+                os.replace(tmp_path, state_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            TimestampPrinter.print(f"Warning: Failed to write state file '{state_file}': {e}", Fore.YELLOW)
+            return False
+        return True
+
+    @staticmethod
+    def restore(config, saved_entries, file_timestamps, file_last_check, file_last_run):
+        """Seed tracking dictionaries from saved state according to the catch-up policy.
+
+        With the "run" policy, file entries get their saved timestamp as baseline,
+        so the first check detects (and runs the command for) files that changed
+        while the watcher was down. Periodic entries resume their interval from
+        the last run instead of firing immediately.
+
+        Args:
+            config: Configuration dictionary
+            saved_entries: Mapping returned by load()
+            file_timestamps: Dictionary tracking file timestamps (updated in place)
+            file_last_check: Dictionary tracking last check time (Clock.monotonic(), updated in place)
+            file_last_run: Dictionary tracking last command run (updated in place)
+
+        Returns:
+            int: Number of entries restored from saved state
+        """
+        if config.get("state_catch_up", StateStore.DEFAULT_CATCH_UP) != "run":
+            return 0
+
+        restored = 0
+        for index, entry in enumerate(config.get("files", [])):
+            saved = saved_entries.get(StateStore.get_entry_identity(entry))
+            if not isinstance(saved, list) or len(saved) != 2:
+                continue
+
+            entry_key = f"#{index}"
+            mtime, last_run = saved
+            if entry.get("path", "") != "":
+                if mtime is None:
+                    continue
+                file_timestamps[entry_key] = mtime
+            else:
+                if last_run is None:
+                    continue
+                # Saved runs are timestamps; interval bookkeeping uses the monotonic clock
+                file_last_check[entry_key] = Clock.monotonic() - (Clock.time() - last_run)
+            if last_run is not None:
+                file_last_run[entry_key] = {"started": last_run, "duration": None}
+            restored += 1
+
+        return restored
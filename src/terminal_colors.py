@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+ANSI color codes for File Watcher
+Drop-in replacement for colorama's Fore and Style constants that needs no import of colorama
+"""
+
+
+class Fore:
+    """Foreground color codes (attribute names match colorama.Fore)."""
+
+    BLACK = "\033[30m"
+    RED = "\033[31m"
+    GREEN = "\033[32m"
+    YELLOW = "\033[33m"
+    BLUE = "\033[34m"
+    MAGENTA = "\033[35m"
+    CYAN = "\033[36m"
+    WHITE = "\033[37m"
+    RESET = "\033[39m"
+
+
+class Style:
+    """Style codes (attribute names match colorama.Style)."""
+
+    BRIGHT = "\033[1m"
+    DIM = "\033[2m"
+    NORMAL = "\033[22m"
+    RESET_ALL = "\033[0m"
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tick cost accounting for File Watcher
+Attributes main loop tick time to its causes so overruns can be explained
+"""
+
+import time
+
+# Support both relative and absolute imports
+try:
+    from .interval_parser import IntervalParser
+except ImportError:
+    from interval_parser import IntervalParser
+
+
+class TickMonitor:
+    """Accumulates the cost of the current main loop tick per cause.
+
+    FileMonitor and CommandExecutor record the time spent in stat calls,
+    process scans and commands; the main loop resets the accounting at the
+    start of every tick and reads it back when the tick overran its interval.
+    """
+
+    CAUSES = ("stat", "process scan", "command")
+
+    # Minimum seconds between two overrun reports while ticks keep overrunning
+    OVERRUN_REPORT_INTERVAL = 60.0
+
+    _costs = dict.fromkeys(CAUSES, 0.0)
+    _carried_over = 0
+
+    @staticmethod
+    def begin_tick():
+        """Reset the accounting for a new tick."""
+        TickMonitor._costs = dict.fromkeys(TickMonitor.CAUSES, 0.0)
+        TickMonitor._carried_over = 0
+
+    @staticmethod
+    def record(cause, seconds):
+        """Add time spent on a cause during the current tick.
+
+        Args:
+            cause: One of CAUSES
+            seconds: Time spent
+        """
+        TickMonitor._costs[cause] += seconds
+
+    @staticmethod
+    def timed(cause, func, *args):
+        """Call a function and record its duration under a cause.
+
+        Args:
+            cause: One of CAUSES
+            func: Function to call
+            *args: Arguments for the function
+
+        Returns:
+            The function's return value
+        """
+        started = time.monotonic()
+        try:
+            return func(*args)
+        finally:
+            TickMonitor._costs[cause] += time.monotonic() - started
+
+    @staticmethod
+    def get_cost(cause):
+        """Get the time recorded for a cause during the current tick.
+
+        Args:
+            cause: One of CAUSES
+
+        Returns:
+            float: Seconds
+        """
+        return TickMonitor._costs[cause]
+
+    @staticmethod
+    def record_carried_over(count):
+        """Record due entries left for the next tick because the tick budget ran out.
+
+        Args:
+            count: Number of entries carried over
+        """
+        TickMonitor._carried_over += count
+
+    @staticmethod
+    def get_carried_over():
+        """Get the number of due entries carried over during the current tick.
+
+        Returns:
+            int: Number of entries
+        """
+        return TickMonitor._carried_over
+
+    @staticmethod
+    def get_budget(config):
+        """Get the per-tick work budget.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            float: Budget in seconds, or None when ticks are not budgeted
+        """
+        tick_budget = config.get("tick_budget")
+        return IntervalParser.parse_interval(tick_budget) if tick_budget else None
+
+    @staticmethod
+    def describe_overrun(duration, interval):
+        """Describe an overrunning tick and what it spent its time on.
+
+        Args:
+            duration: Tick duration in seconds
+            interval: Main loop interval in seconds
+
+        Returns:
+            str: Human-readable description
+        """
+        costs = dict(TickMonitor._costs)
+        costs["other"] = max(0.0, duration - sum(costs.values()))
+        slowest = sorted((item for item in costs.items() if item[1] > 0), key=lambda item: item[1], reverse=True)
+        breakdown = ", ".join(f"{cause} {seconds:.3f}s" for cause, seconds in slowest)
+        message = f"Tick took {duration:.3f}s, exceeding the {interval}s interval"
+        if slowest:
+            message += f" (mostly {slowest[0][0]}; {breakdown})"
+        if TickMonitor._carried_over:
+            message += f"; {TickMonitor._carried_over} due entries carried over to the next tick"
+        return message
@@ -4,20 +4,27 @@ Time period checker for File Watcher
 Validates if current time is within configured time periods
 """
 
-from datetime import datetime, time
-
-from colorama import Fore
+from datetime import datetime, time, timedelta
 
 # Support both relative and absolute imports
 try:
+    from .clock import Clock
+    from .terminal_colors import Fore
     from .timestamp_printer import TimestampPrinter
 except ImportError:
+    from clock import Clock
+    from terminal_colors import Fore
     from timestamp_printer import TimestampPrinter
 
 
 class TimePeriodChecker:
     """Handles time period validation for file watching."""
 
+    # Window state per (start, end) string pair: (is_active, valid_until timestamp).
+    # Entries outside their window stay parked until the precomputed transition,
+    # so they cost one lookup per tick instead of datetime.now() and parsing.
+    _window_cache = {}
+
     @staticmethod
     def parse_time(time_str):
         """Parse time string in HH:MM format.
@@ -55,7 +62,7 @@ class TimePeriodChecker:
             bool: True if current time is within the period, False otherwise
         """
         if current_time is None:
-            current_time = datetime.now().time()
+            current_time = Clock.now().time()
 
         # If start_time < end_time, it's a normal period (e.g., 09:00-17:00)
         if start_time <= end_time:
@@ -65,6 +72,116 @@ class TimePeriodChecker:
             # Current time is in period if it's >= start OR <= end
             return current_time >= start_time or current_time <= end_time
 
+    @staticmethod
+    def get_window_state(start_time, end_time, now=None):
+        """Compute whether a time period is active and when that next changes.
+
+        Uses the same inclusive bounds as is_in_time_period.
+
+        Args:
+            start_time: Start time (datetime.time object)
+            end_time: End time (datetime.time object)
+            now: Current local datetime, defaults to now
+
+        Returns:
+            tuple: (is_active, next_transition) where next_transition is the
+                datetime at which the period opens (if inactive) or its last
+                active instant (if active)
+        """
+        if now is None:
+            now = Clock.now()
+        current_time = now.time()
+        today = now.date()
+        tomorrow = today + timedelta(days=1)
+
+        if start_time <= end_time:
+            if current_time < start_time:
+                return False, datetime.combine(today, start_time)
+            if current_time <= end_time:
+                return True, datetime.combine(today, end_time)
+            return False, datetime.combine(tomorrow, start_time)
+
+        # Period spans midnight (e.g., 23:00-01:00)
+        if current_time <= end_time:
+            return True, datetime.combine(today, end_time)
+        if current_time < start_time:
+            return False, datetime.combine(today, start_time)
+        return True, datetime.combine(tomorrow, end_time)
+
+    @staticmethod
+    def get_period_state(config, period_name, now=None):
+        """Get the cached state of a named time period.
+
+        Args:
+            config: Configuration dictionary
+            period_name: Name of the time period
+            now: Current timestamp (time.time()), defaults to now
+
+        Returns:
+            tuple: (is_active, valid_until timestamp), or None if the period is not found or invalid
+        """
+        period_config = config.get("time_periods", {}).get(period_name)
+        if not isinstance(period_config, dict):
+            return None
+        cache_key = (period_config.get("start"), period_config.get("end"))
+
+        if now is None:
+            now = Clock.time()
+        cached = TimePeriodChecker._window_cache.get(cache_key)
+        if cached is not None and now < cached[1]:
+            return cached
+
+        period = TimePeriodChecker.get_time_period_config(config, period_name)
+        if period is None:
+            return None
+        is_active, next_transition = TimePeriodChecker.get_window_state(
+            period["start"], period["end"], datetime.fromtimestamp(now)
+        )
+        state = (is_active, next_transition.timestamp())
+        TimePeriodChecker._window_cache[cache_key] = state
+        return state
+
+    @staticmethod
+    def clear_cache():
+        """Forget cached period states, e.g. after the wall clock was stepped."""
+        TimePeriodChecker._window_cache.clear()
+
+    @staticmethod
+    def get_idle_until(config, period_names, now=None):
+        """Get when the next time period opens if all given periods are inactive.
+
+        Args:
+            config: Configuration dictionary
+            period_names: Names of the time periods used by every entry
+            now: Current timestamp (time.time()), defaults to now
+
+        Returns:
+            float: Timestamp at which the first period opens, or None if any
+                period is active or invalid
+        """
+        idle_until = None
+        for period_name in period_names:
+            state = TimePeriodChecker.get_period_state(config, period_name, now)
+            if state is None or state[0]:
+                return None
+            idle_until = state[1] if idle_until is None else min(idle_until, state[1])
+        return idle_until
+
+    @staticmethod
+    def get_entry_period_names(config):
+        """Get the time periods of all entries if every entry is restricted to one.
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            set: Period names, or None if any entry is monitored regardless of time
+        """
+        entries = config.get("files", [])
+        if not entries or any("time_period" not in entry for entry in entries):
+            return None
+        return {entry["time_period"] for entry in entries}
+
     @staticmethod
     def get_time_period_config(config, period_name):
         """Get time period configuration by name.
@@ -112,13 +229,13 @@ class TimePeriodChecker:
             return True
 
         period_name = settings["time_period"]
-        period_config = TimePeriodChecker.get_time_period_config(config, period_name)
+        state = TimePeriodChecker.get_period_state(config, period_name)
 
         # If time period config is invalid, default to monitoring
-        if period_config is None:
+        if state is None:
             TimestampPrinter.print(
                 f"Warning: Time period '{period_name}' not found or invalid, monitoring anyway", Fore.YELLOW
             )
             return True
 
-        return TimePeriodChecker.is_in_time_period(period_config["start"], period_config["end"])
+        return state[0]
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Timer queues for the File Watcher deadline scheduler
+Provides a binary heap and a hashed hierarchical timer wheel with the same interface
+"""
+
+import heapq
+import math
+
+
+class HeapQueue:
+    """Timer queue backed by a binary heap: O(log n) insert and expiry."""
+
+    def __init__(self, now=0.0, resolution=None):
+        """Initialize an empty queue.
+
+        Args:
+            now: Current timestamp (unused; accepted for interface parity with TimerWheel)
+            resolution: Unused; accepted for interface parity with TimerWheel
+        """
+        self._heap = []
+
+    def __len__(self):
+        """Return the number of pending timers."""
+        return len(self._heap)
+
+    def push(self, deadline, key):
+        """Add a timer.
+
+        Args:
+            deadline: Timestamp at which the timer expires
+            key: Timer key
+        """
+        heapq.heappush(self._heap, (deadline, key))
+
+    def peek_deadline(self):
+        """Get the earliest pending deadline.
+
+        Returns:
+            float: Timestamp, or None if the queue is empty
+        """
+        return self._heap[0][0] if self._heap else None
+
+    def peek_expiry(self):
+        """Get when the earliest pending timer is released by pop_until.
+
+        Returns:
+            float: Timestamp, or None if the queue is empty
+        """
+        return self.peek_deadline()
+
+    def pop_until(self, now):
+        """Remove all timers that expired at or before now.
+
+        Args:
+            now: Current timestamp
+
+        Returns:
+            list: (deadline, key) pairs in deadline order
+        """
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            expired.append(heapq.heappop(self._heap))
+        return expired
+
+
+class TimerWheel:
+    """Hashed hierarchical timer wheel: O(1) insert and amortized O(1) expiry.
+
+    Time is divided into ticks of RESOLUTION seconds (or the resolution
+    given). Level 0 has one slot per tick for the next SLOTS ticks; each
+    higher level has slots covering SLOTS times as many ticks as the level
+    below. When the wheel turns past a slot boundary of a higher level, that
+    slot's timers cascade down to finer levels. Timers further out than the
+    top level wait in an overflow list. A timer expires at the first tick boundary at or after its deadline, so
+    it fires at most one resolution late and never early. If the clock goes
+    back, the wheel is turned back with it, so timers set from the earlier
+    time do not fire early either.
+    """
+
+    RESOLUTION = 1.0
+    SLOT_BITS = 6
+    SLOTS = 1 << SLOT_BITS
+    LEVELS = 4
+
+    def __init__(self, now=0.0, resolution=None):
+        """Initialize an empty wheel.
+
+        Args:
+            now: Current timestamp; the wheel starts turning from here
+            resolution: Seconds per tick (RESOLUTION if None)
+        """
+        self._resolution = resolution or TimerWheel.RESOLUTION
+        self._levels = [[[] for _ in range(TimerWheel.SLOTS)] for _ in range(TimerWheel.LEVELS)]
+        self._level_counts = [0] * TimerWheel.LEVELS
+        self._overflow = []
+        # Timers whose tick has already been passed when they were added
+        self._expired = []
+        self._current_tick = math.floor(now / self._resolution)
+        self._count = 0
+
+    def __len__(self):
+        """Return the number of pending timers."""
+        return self._count
+
+    def push(self, deadline, key):
+        """Add a timer.
+
+        Args:
+            deadline: Timestamp at which the timer expires
+            key: Timer key
+        """
+        self._count += 1
+        self._place(deadline, key)
+
+    def _place(self, deadline, key):
+        """Put a timer into the slot matching its distance from the current tick."""
+        tick = math.ceil(deadline / self._resolution)
+        delta = tick - self._current_tick
+        if delta <= 0:
+            self._expired.append((deadline, key))
+            return
+
+        # Level k holds timers SLOTS**k to SLOTS**(k + 1) - 1 ticks away
+        level = (delta.bit_length() - 1) // TimerWheel.SLOT_BITS
+        if level >= TimerWheel.LEVELS:
+            self._overflow.append((deadline, key))
+            return
+        index = (tick >> (TimerWheel.SLOT_BITS * level)) & (TimerWheel.SLOTS - 1)
+        self._levels[level][index].append((deadline, key))
+        self._level_counts[level] += 1
+
+    def _cascade(self, level):
+        """Move the timers of the current slot of a level down to finer levels."""
+        index = (self._current_tick >> (TimerWheel.SLOT_BITS * level)) & (TimerWheel.SLOTS - 1)
+        timers = self._levels[level][index]
+        self._levels[level][index] = []
+        self._level_counts[level] -= len(timers)
+        for deadline, key in timers:
+            self._place(deadline, key)
+
+    def _advance(self):
+        """Turn the wheel by one tick and collect the timers of the new tick."""
+        self._current_tick += 1
+        tick = self._current_tick
+        for level in range(1, TimerWheel.LEVELS):
+            if tick & ((1 << (TimerWheel.SLOT_BITS * level)) - 1):
+                break
+            self._cascade(level)
+        else:
+            # Top level wrapped: timers in the overflow list may be in range now
+            overflow = self._overflow
+            self._overflow = []
+            for deadline, key in overflow:
+                self._place(deadline, key)
+
+        index = tick & (TimerWheel.SLOTS - 1)
+        if self._levels[0][index]:
+            self._expired.extend(self._levels[0][index])
+            self._level_counts[0] -= len(self._levels[0][index])
+            self._levels[0][index] = []
+
+    def _rewind(self, target_tick):
+        """Turn the wheel back to an earlier tick after the clock went back.
+
+        Every pending timer is placed again relative to the earlier tick, so
+        timers set after the clock step are not mistaken for expired ones.
+
+        Args:
+            target_tick: Tick of the current time
+        """
+        timers = [timer for slots in self._levels for slot in slots for timer in slot]
+        timers += self._overflow + self._expired
+        self._levels = [[[] for _ in range(TimerWheel.SLOTS)] for _ in range(TimerWheel.LEVELS)]
+        self._level_counts = [0] * TimerWheel.LEVELS
+        self._overflow = []
+        self._expired = []
+        self._current_tick = target_tick
+        for deadline, key in timers:
+            self._place(deadline, key)
+
+    def _skip_empty_ticks(self, target_tick):
+        """Jump over ticks where nothing can expire or cascade.
+
+        When the finest levels are empty, nothing happens until the next slot
+        boundary of the lowest non-empty level, so the wheel can move to just
+        before that boundary instead of turning one tick at a time.
+
+        Args:
+            target_tick: Tick the wheel must not move past
+        """
+        empty_levels = 0
+        while empty_levels < TimerWheel.LEVELS and self._level_counts[empty_levels] == 0:
+            empty_levels += 1
+        if empty_levels == 0:
+            return
+        span = 1 << (TimerWheel.SLOT_BITS * empty_levels)
+        boundary = (self._current_tick // span + 1) * span
+        self._current_tick = max(self._current_tick, min(target_tick, boundary - 1))
+
+    def peek_deadline(self):
+        """Get the earliest pending deadline.
+
+        Scans slots outward from the current tick, so this is O(slots) rather
+        than O(1); it is used once per tick to time the main loop's wait.
+
+        Returns:
+            float: Timestamp, or None if the wheel is empty
+        """
+        if self._count == 0:
+            return None
+        if self._expired:
+            return min(deadline for deadline, _ in self._expired)
+        for level in range(TimerWheel.LEVELS):
+            shift = TimerWheel.SLOT_BITS * level
+            start = self._current_tick >> shift
+            for offset in range(1, TimerWheel.SLOTS + 1):
+                slot = self._levels[level][(start + offset) & (TimerWheel.SLOTS - 1)]
+                if slot:
+                    return min(deadline for deadline, _ in slot)
+        return min(deadline for deadline, _ in self._overflow)
+
+    def peek_expiry(self):
+        """Get when the earliest pending timer is released by pop_until.
+
+        That is the first tick boundary at or after its deadline.
+
+        Returns:
+            float: Timestamp, or None if the wheel is empty
+        """
+        deadline = self.peek_deadline()
+        if deadline is None:
+            return None
+        return math.ceil(deadline / self._resolution) * self._resolution
+
+    def pop_until(self, now):
+        """Remove all timers that expired at or before now.
+
+        Args:
+            now: Current timestamp
+
+        Returns:
+            list: (deadline, key) pairs in deadline order
+        """
+        target_tick = math.floor(now / self._resolution)
+        if target_tick < self._current_tick:
+            self._rewind(target_tick)
+        while self._current_tick < target_tick:
+            self._skip_empty_ticks(target_tick)
+            if self._current_tick < target_tick:
+                self._advance()
+
+        if not self._expired:
+            return []
+        expired = sorted(self._expired)
+        self._expired = []
+        self._count -= len(expired)
+        return expired
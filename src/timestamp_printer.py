@@ -4,20 +4,21 @@ Timestamp printer utility for File Watcher
 Provides timestamped printing functionality
 """
 
-from datetime import datetime
-
-from colorama import Style, init
+import re
+import sys
 
 # Support both relative and absolute imports
 try:
+    from .clock import Clock
     from .color_scheme import ColorScheme
+    from .terminal_colors import Style
 except ImportError:
+    from clock import Clock
     from color_scheme import ColorScheme
+    from terminal_colors import Style
 
-# Initialize colorama for cross-platform colored terminal output
-init(autoreset=True)
-# Ensure default color palette is applied at startup
-ColorScheme.reset_to_default()
+# Matches ANSI SGR sequences, used to strip colors when stdout is not a terminal
+_ANSI_ESCAPE_PATTERN = re.compile(r"\033\[[0-9;]*m")
 
 
 class TimestampPrinter:
@@ -26,6 +27,30 @@ class TimestampPrinter:
     # Global configuration for timestamp display
     _enable_timestamp = True
 
+    # Non-terminal stdout seen at import time; colors are stripped when printing to it
+    _plain_stream = None
+
+    # Optional callable receiving each formatted line instead of stdout
+    _output_sink = None
+
+    @staticmethod
+    def init_terminal():
+        """Prepare stdout for colored output.
+
+        colorama is only imported when stdout is a terminal, where it is needed
+        to translate ANSI codes on Windows. Otherwise colors are stripped from
+        output written to that stream, as colorama would have done.
+        """
+        stream = sys.stdout
+        if stream is not None and stream.isatty():
+            import colorama
+
+            colorama.init(autoreset=True)
+            ColorScheme.sync_colorama()
+            TimestampPrinter._plain_stream = None
+        else:
+            TimestampPrinter._plain_stream = stream
+
     @staticmethod
     def set_enable_timestamp(enable):
         """Set whether to enable timestamps in print statements.
@@ -35,24 +60,52 @@ class TimestampPrinter:
         """
         TimestampPrinter._enable_timestamp = enable
 
+    @staticmethod
+    def set_output_sink(sink):
+        """Redirect formatted output lines to a callable (e.g. a worker's output queue).
+
+        Args:
+            sink: Callable taking one string argument, or None to print to stdout again
+        """
+        TimestampPrinter._output_sink = sink
+
+    @staticmethod
+    def write_line(line):
+        """Write an already formatted line to stdout.
+
+        Args:
+            line: The line to write; colors are stripped for non-terminal stdout
+        """
+        if sys.stdout is TimestampPrinter._plain_stream:
+            print(_ANSI_ESCAPE_PATTERN.sub("", line))
+        else:
+            print(line)
+
     @staticmethod
     def print(message, color=None):
         """Print a message with optional timestamp prefix and color.
 
         Args:
             message: The message to print
-            color: Optional color code from colorama.Fore (e.g., Fore.GREEN, Fore.RED)
+            color: Optional color code from Fore (e.g., Fore.GREEN, Fore.RED)
                    If None, uses default terminal color
         """
         # Construct the message with timestamp if enabled
         if TimestampPrinter._enable_timestamp:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp = Clock.now().strftime("%Y-%m-%d %H:%M:%S")
             output = f"[{timestamp}] {message}"
         else:
             output = message
 
         # Apply color if specified
         if color:
-            print(f"{color}{output}{Style.RESET_ALL}")
+            output = f"{color}{output}{Style.RESET_ALL}"
+
+        if TimestampPrinter._output_sink is not None:
+            TimestampPrinter._output_sink(output)
         else:
-            print(output)
+            TimestampPrinter.write_line(output)
+
+
+# Initialize terminal output (colorama is only loaded for terminals)
+TimestampPrinter.init_terminal()
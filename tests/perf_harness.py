@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Performance regression harness for File Watcher
+Times key scenarios and compares them against baselines stored in perf_baselines.json
+
+Usage:
+    python tests/perf_harness.py                    # compare against the stored baselines
+    python tests/perf_harness.py --threshold 0.5    # tolerate up to 50% slowdown
+    python tests/perf_harness.py --update           # record new baselines
+    python tests/perf_harness.py tick-10k           # run selected scenarios only
+
+Timings are stored relative to a fixed pure-Python calibration workload
+measured in the same run, so baselines recorded on one machine stay
+meaningful on another of a different speed.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from clock import Clock, VirtualClock
+from config_loader import ConfigLoader
+from entry_state import EntryState
+from file_monitor import FileMonitor
+from filesystem import FileSystem, MemoryFileSystem
+from process_detector import ProcessDetector
+from terminal_colors import Fore
+from timestamp_printer import TimestampPrinter
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_baselines.json")
+
+# Allowed slowdown relative to the baseline before a scenario counts as regressed
+DEFAULT_THRESHOLD = 0.25
+
+# Each scenario is timed this many times after a warm-up run; the fastest run counts
+REPEATS = 7
+
+
+def calibrate():
+    """Time the calibration workload that scenario timings are expressed in.
+
+    Returns:
+        float: Seconds of the fastest of REPEATS runs
+    """
+
+    def workload():
+        total = 0
+        table = {}
+        for index in range(1_000_000):
+            table[index & 1023] = total
+            total += index % 7
+        return total
+
+    return _time_fastest(workload)
+
+
+def scenario_tick(scale=1.0):
+    """One main loop tick over 10k due file entries on an in-memory filesystem."""
+    entries = max(1, int(10_000 * scale))
+    clock = VirtualClock()
+    filesystem = MemoryFileSystem()
+    config = {"default_interval": "0s", "files": []}
+    for index in range(entries):
+        path = f"/perf/dir{index % 100}/file{index}.txt"
+        filesystem.write(path)
+        config["files"].append({"path": path, "command": "echo"})
+    file_timestamps, file_last_check = EntryState.create_column(config), EntryState.create_column(config)
+
+    def run():
+        Clock.set_clock(clock)
+        FileSystem.set_filesystem(filesystem)
+        try:
+            FileMonitor.check_files(config, file_timestamps, file_last_check, {}, {})
+            clock.advance(1.0)
+        finally:
+            Clock.set_clock(None)
+            FileSystem.set_filesystem(None)
+
+    # The first tick starts monitoring every entry; measure the steady state
+    run()
+    return run, None
+
+
+def scenario_load_config(scale=1.0):
+    """Cold load_config of a main config with 100 external files of 20 entries each."""
+    external_files = max(1, int(100 * scale))
+    test_dir = tempfile.mkdtemp()
+    paths = []
+    for file_index in range(external_files):
+        path = os.path.join(test_dir, f"external{file_index}.toml")
+        with open(path, "w") as f:
+            for entry_index in range(20):
+                f.write(
+                    f'[[files]]\npath = "watched/{file_index}/{entry_index}.txt"\n'
+                    f'command = "make target{entry_index}"\ninterval = "5s"\n'
+                )
+        paths.append(path)
+    config_path = os.path.join(test_dir, "config.toml")
+    with open(config_path, "w") as f:
+        f.write(f'default_interval = "1s"\nexternal_files = {json.dumps(paths)}\n')
+
+    def run():
+        ConfigLoader.load_config(config_path)
+
+    return run, lambda: shutil.rmtree(test_dir, ignore_errors=True)
+
+
+class _SyntheticProcess:
+    """Stand-in for psutil.Process carrying pre-fetched info."""
+
+    __slots__ = ("info",)
+
+    def __init__(self, pid):
+        self.info = {
+            "pid": pid,
+            "name": f"worker-{pid % 97}",
+            "cmdline": [f"/usr/bin/worker-{pid % 97}", "--serve", f"--port={8000 + pid % 1000}"],
+        }
+
+
+def scenario_process_snapshot(scale=1.0):
+    """Scan of 5k synthetic processes for a pattern that matches none of them."""
+    processes = [_SyntheticProcess(pid) for pid in range(max(1, int(5_000 * scale)))]
+
+    def run():
+        with patch("psutil.process_iter", return_value=processes):
+            ProcessDetector.get_all_matching_processes(r"^editor-\d+$")
+
+    return run, None
+
+
+def scenario_log_sink(scale=1.0):
+    """20k colored, timestamped lines written through TimestampPrinter's output sink."""
+    lines = max(1, int(20_000 * scale))
+    sink = []
+
+    def run():
+        previous_sink = TimestampPrinter._output_sink
+        TimestampPrinter.set_output_sink(sink.append)
+        try:
+            for index in range(lines):
+                TimestampPrinter.print(f"Detected change in 'watched/file{index}.txt'", Fore.GREEN)
+        finally:
+            TimestampPrinter.set_output_sink(previous_sink)
+        sink.clear()
+
+    return run, None
+
+
+# Scenario name -> factory taking a scale and returning (run, cleanup or None)
+SCENARIOS = {
+    "tick-10k": scenario_tick,
+    "load-config-100-external": scenario_load_config,
+    "process-snapshot-5k": scenario_process_snapshot,
+    "log-sink-20k": scenario_log_sink,
+}
+
+
+def measure(names=None, scale=1.0):
+    """Time scenarios relative to the calibration workload.
+
+    Args:
+        names: Scenario names to run (default: all)
+        scale: Fraction of the full scenario size (for quick smoke runs)
+
+    Returns:
+        dict: Mapping of scenario name to {"seconds": fastest run, "relative": seconds / calibration}
+    """
+    calibration = calibrate()
+    results = {}
+    # Messages printed by the scenarios would dominate their timings
+    TimestampPrinter.set_output_sink(lambda line: None)
+    try:
+        for name in names or SCENARIOS:
+            run, cleanup = SCENARIOS[name](scale)
+            try:
+                seconds = _time_fastest(run)
+            finally:
+                if cleanup is not None:
+                    cleanup()
+            results[name] = {"seconds": seconds, "relative": seconds / calibration}
+    finally:
+        TimestampPrinter.set_output_sink(None)
+    return results
+
+
+def compare(baselines, results, threshold=DEFAULT_THRESHOLD):
+    """Compare results against baselines.
+
+    Args:
+        baselines: Mapping of scenario name to stored result (may lack scenarios)
+        results: Mapping of scenario name to measured result
+        threshold: Allowed slowdown as a fraction (0.25 allows 25% slower)
+
+    Returns:
+        tuple: (regressed scenario names, readable report)
+    """
+    rows = [("scenario", "baseline", "current", "change", "")]
+    regressed = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            rows.append((name, "-", f"{result['relative']:.3f}x", "", "new, no baseline"))
+            continue
+        change = result["relative"] / baseline["relative"] - 1.0
+        status = ""
+        if change > threshold:
+            regressed.append(name)
+            status = f"REGRESSED (threshold +{threshold:.0%})"
+        rows.append((name, f"{baseline['relative']:.3f}x", f"{result['relative']:.3f}x", f"{change:+.1%}", status))
+
+    widths = [max(len(row[column]) for row in rows) for column in range(4)]
+    lines = [
+        f"{row[0]:<{widths[0]}}  {row[1]:>{widths[1]}}  {row[2]:>{widths[2]}}  {row[3]:>{widths[3]}}  {row[4]}".rstrip()
+        for row in rows
+    ]
+    lines.append("(times are multiples of the calibration workload; lower is faster)")
+    return regressed, "\n".join(lines)
+
+
+def load_baselines(path=BASELINE_FILE):
+    """Load stored baselines, or an empty mapping if none were recorded yet."""
+    try:
+        with open(path) as f:
+            return json.load(f)["scenarios"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(results, path=BASELINE_FILE):
+    """Store results as the new baselines, keeping baselines of scenarios that were not run."""
+    scenarios = {**load_baselines(path), **results}
+    with open(path, "w") as f:
+        json.dump({"scenarios": dict(sorted(scenarios.items()))}, f, indent=2)
+        f.write("\n")
+
+
+def _time_fastest(run):
+    """Run a callable once to warm up, then return the fastest of REPEATS timed runs."""
+    run()
+    fastest = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        run()
+        fastest = min(fastest, time.perf_counter() - started)
+    return fastest
+
+
+def main():
+    """Command line entry point of the harness."""
+    parser = argparse.ArgumentParser(description="Compare performance scenarios against stored baselines")
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed slowdown as a fraction before failing (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument("--update", action="store_true", help="Store the measured results as the new baselines")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    results = measure(args.scenarios or None)
+    regressed, report = compare(load_baselines(), results, args.threshold)
+    print(report)
+    if args.update:
+        save_baselines(results)
+        print(f"Baselines updated in {BASELINE_FILE}")
+    elif regressed:
+        print(f"\n{len(regressed)} scenario(s) regressed: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for adaptive per-entry polling intervals
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from adaptive_interval import AdaptiveInterval
+from cat_file_watcher import FileWatcher
+from config_loader import ConfigLoader
+from file_monitor import FileMonitor
+
+
+class TestAdaptiveInterval:
+    """Test cases for intervals that follow the observed change frequency."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.watched_file = os.path.join(self.test_dir, "watched.txt")
+        with open(self.watched_file, "w") as f:
+            f.write("content\n")
+        self.settings = {"path": self.watched_file, "command": "echo", "adaptive": {"min": "200ms", "max": "2s"}}
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_grows_while_quiet_and_resets_on_change(self):
+        """Test that the interval doubles up to max and drops to min after a change."""
+        file_adaptive = {}
+        assert AdaptiveInterval.get_interval(file_adaptive, "#0", self.settings) == 0.2
+        grown = [AdaptiveInterval.record_check(file_adaptive, "#0", self.settings, False) for _ in range(5)]
+        assert grown == [0.4, 0.8, 1.6, 2.0, 2.0]
+        assert AdaptiveInterval.record_check(file_adaptive, "#0", self.settings, True) == 0.2
+
+    def test_check_files_follows_changes(self):
+        """Test that check_files polls quiet files less often and changed files at the minimum."""
+        config = {"files": [self.settings]}
+        file_timestamps, file_last_check, file_adaptive = {}, {}, {}
+
+        def check_due():
+            # Make the entry due regardless of its current interval
+            if "#0" in file_last_check:
+                file_last_check["#0"] -= 10
+            FileMonitor.check_files(config, file_timestamps, file_last_check, file_adaptive=file_adaptive)
+
+        # The baseline check and two more quiet checks: 0.2 -> 0.4 -> 0.8 -> 1.6
+        for _ in range(3):
+            check_due()
+        assert file_adaptive["#0"] == 1.6
+
+        with open(self.watched_file, "w") as f:
+            f.write("changed\n")
+        os.utime(self.watched_file, (0, file_timestamps["#0"] + 5))
+        check_due()
+        assert file_adaptive["#0"] == 0.2
+
+    def test_main_loop_polls_at_adaptive_minimum(self):
+        """Test that the main loop ticks often enough for the adaptive minimum."""
+        config = {"default_interval": "5s", "config_check_interval": "5s", "files": [self.settings]}
+        assert FileWatcher.calculate_main_loop_interval(config) == 0.2
+
+    @pytest.mark.parametrize(
+        "entry, reason",
+        [
+            ('[[commands]]\ncommand = "echo"\nadaptive = { min = "1s", max = "5s" }', "only be used with a filename"),
+            (
+                '[[files]]\npath = "x.txt"\ncommand = "echo"\ninterval = "1s"\nadaptive = { min = "1s", max = "5s" }',
+                "cannot be used together",
+            ),
+            ('[[files]]\npath = "x.txt"\ncommand = "echo"\nadaptive = { min = "1s" }', "table with min and max"),
+            ('[[files]]\npath = "x.txt"\ncommand = "echo"\nadaptive = { min = "9s", max = "5s" }', "not above max"),
+            (
+                '[[files]]\npath = "x.txt"\ncommand = "echo"\nadaptive = { min = "fast", max = "5s" }',
+                "Invalid adaptive",
+            ),
+        ],
+    )
+    def test_invalid_settings_quarantined(self, entry, reason):
+        """Test that misused or invalid adaptive settings are reported once at load."""
+        with open(self.config_file, "w") as f:
+            f.write(entry + "\n")
+        config = ConfigLoader.load_config(self.config_file)
+        assert config["files"] == []
+        assert reason in config["quarantined_files"][0]["reason"]
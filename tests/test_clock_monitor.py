@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for monotonic scheduling, clock discontinuity detection and missed-run policies
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from clock_monitor import ClockMonitor
+from config_loader import ConfigLoader
+from deadline_scheduler import DeadlineScheduler
+from file_monitor import FileMonitor
+
+WALL = 1_700_000_000.0
+
+
+class TestClockMonitor:
+    """Test cases for detecting suspends and wall-clock steps."""
+
+    def _monitor(self, boottime=True):
+        """Create a monitor baselined at fixed clock readings."""
+        monitor = ClockMonitor()
+        monitor._last = (WALL, 100.0, 500.0 if boottime else None)
+        return monitor
+
+    def test_steady_clocks(self):
+        """Test that ordinary elapsed time and small drift are not reported."""
+        monitor = self._monitor()
+        assert monitor.check((WALL + 10, 110.0, 510.0)) == (0.0, 0.0)
+        assert monitor.check((WALL + 25, 120.0, 520.0)) == (0.0, 0.0)
+
+    def test_suspend_with_boottime(self):
+        """Test that time counted by CLOCK_BOOTTIME but not the monotonic clock is a suspend."""
+        monitor = self._monitor()
+        assert monitor.check((WALL + 3610, 110.0, 4110.0)) == (3600.0, 0.0)
+
+    @pytest.mark.parametrize("step", [3600.0, -3600.0])
+    def test_wall_clock_step_with_boottime(self, step):
+        """Test that a wall-clock step is not mistaken for a suspend."""
+        monitor = self._monitor()
+        assert monitor.check((WALL + 10 + step, 110.0, 510.0)) == (0.0, step)
+
+    def test_without_boottime(self):
+        """Test that forward jumps count as suspends and backward jumps as steps without CLOCK_BOOTTIME."""
+        monitor = self._monitor(boottime=False)
+        assert monitor.check((WALL + 3610, 110.0, None)) == (3600.0, 0.0)
+        assert monitor.check((WALL + 10, 120.0, None)) == (0.0, -3610.0)
+
+
+class TestMissedRuns:
+    """Test cases for the per-entry missed_runs policies."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.marker_file = os.path.join(self.test_dir, "marker.txt")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _config(self, policy):
+        """Build a config with one periodic command using the given policy."""
+        entry = {"path": "", "command": f"echo run >> {self.marker_file}", "interval": "60s"}
+        if policy is not None:
+            entry["missed_runs"] = policy
+        return {"files": [entry]}
+
+    @pytest.mark.parametrize(
+        "policy, expected_last_check",
+        [
+            # Checked 40s ago plus a 1000s suspend: 17 runs missed, the next one 40s away
+            ("skip", 1000.0 - 20.0),
+            ("run-once", 1000.0 - 60.0),
+            (None, 1000.0 - 60.0),
+            ("catch-up", 1000.0 - 17 * 60.0),
+        ],
+    )
+    def test_interval_policies(self, policy, expected_last_check):
+        """Test how each policy reschedules an interval entry after a suspend."""
+        file_last_check = {"#0": 1000.0 - 40.0}
+        affected = ClockMonitor.apply_missed_runs(
+            self._config(policy), file_last_check, DeadlineScheduler(), 1000.0, now=1000.0
+        )
+        assert affected == 1
+        assert file_last_check["#0"] == pytest.approx(expected_last_check)
+
+    def test_catch_up_is_bounded(self):
+        """Test that catch-up replays at most MAX_CATCH_UP_RUNS runs."""
+        file_last_check = {"#0": 0.0}
+        ClockMonitor.apply_missed_runs(
+            self._config("catch-up"), file_last_check, DeadlineScheduler(), 10**6, now=1000.0
+        )
+        assert file_last_check["#0"] == 1000.0 - ClockMonitor.MAX_CATCH_UP_RUNS * 60.0
+
+    def test_catch_up_replays_one_run_per_tick(self):
+        """Test that missed runs are replayed on successive ticks, then the interval resumes."""
+        config = self._config("catch-up")
+        file_last_check = {"#0": time.monotonic() - 30.0}
+        ClockMonitor.apply_missed_runs(config, file_last_check, DeadlineScheduler(), 150.0)
+
+        file_timestamps = {}
+        for _ in range(5):
+            file_timestamps, file_last_check = FileMonitor.check_files(config, file_timestamps, file_last_check)
+        with open(self.marker_file) as f:
+            assert f.read() == "run\n" * 3
+
+    def test_skip_drops_missed_cron_firing(self):
+        """Test that a skipped cron entry is rescheduled without firing."""
+        config = {
+            "files": [
+                {"path": "", "command": "echo a", "schedule": "0 * * * *", "timezone": "UTC", "missed_runs": "skip"},
+                {"path": "", "command": "echo b", "schedule": "0 * * * *", "timezone": "UTC"},
+            ]
+        }
+        scheduler = DeadlineScheduler()
+        scheduler.load(config, now=WALL)
+        resumed = WALL + 7200
+
+        assert ClockMonitor.apply_missed_runs(config, {}, scheduler, 7200, wall_now=resumed) == 2
+        assert scheduler.pop_due(resumed) == ["#1"]
+        assert scheduler.get_deadline("#0") > resumed
+
+    def test_watcher_applies_policy_after_suspend(self):
+        """Test that the main loop detects a suspend and makes missed entries due."""
+        with open(self.config_file, "w") as f:
+            f.write(f"""[[commands]]
+command = "echo run >> {self.marker_file}"
+interval = "1h"
+""")
+        watcher = FileWatcher(self.config_file)
+        watcher._check_files()
+        wall, monotonic, boottime = ClockMonitor.read_clocks()
+        watcher.clock_monitor._last = (wall - 7200, monotonic, boottime - 7200 if boottime is not None else None)
+
+        with patch.object(ClockMonitor, "read_clocks", return_value=(wall, monotonic, boottime)):
+            watcher._check_clock()
+        watcher._check_files()
+
+        assert watcher.stats["suspends"] == 1
+        with open(self.marker_file) as f:
+            assert f.read() == "run\n" * 2
+
+    def test_invalid_policy_quarantined(self):
+        """Test that an unknown missed_runs policy is reported at load."""
+        with open(self.config_file, "w") as f:
+            f.write('[[commands]]\ncommand = "echo"\nmissed_runs = "always"\n')
+        config = ConfigLoader.load_config(self.config_file)
+        assert config["files"] == []
+        assert "missed_runs must be one of" in config["quarantined_files"][0]["reason"]
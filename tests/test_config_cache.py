@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled config cache
+"""
+
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from color_scheme import ColorScheme
+from config_cache import ConfigCache
+from config_loader import ConfigLoader
+from terminal_colors import Fore
+
+
+class TestConfigCache:
+    """Test cases for ConfigCache and its use in ConfigLoader."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.external_file = os.path.join(self.test_dir, "external.toml")
+        self.cache_file = os.path.join(self.test_dir, "config.cache")
+        self.test_file = os.path.join(self.test_dir, "test.txt")
+        with open(self.test_file, "w") as f:
+            f.write("Initial content\n")
+
+        with open(self.config_file, "w") as f:
+            f.write(f'''default_interval = "2s"
+external_files = ["external.toml"]
+
+[[files]]
+path = "{self.test_file}"
+command = "echo 'main'"
+
+[[commands]]
+command = "echo 'periodic'"
+interval = "5s"
+''')
+        self._write_external("echo 'external'")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        ColorScheme.reset_to_default()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write_external(self, command):
+        """Write the external file with the given command."""
+        with open(self.external_file, "w") as f:
+            f.write(f'''[[files]]
+path = "{self.test_file}"
+command = "{command}"
+''')
+
+    def _load_without_toml(self):
+        """Load the config while failing the test if TOML would be parsed."""
+        with patch("toml.load", side_effect=AssertionError("TOML should not be parsed on a cache hit")):
+            return ConfigLoader.load_config(self.config_file, self.cache_file)
+
+    def test_cache_written_and_reused(self):
+        """Test that an unchanged config is loaded from the cache without parsing TOML."""
+        parsed = ConfigLoader.load_config(self.config_file, self.cache_file)
+        assert os.path.exists(self.cache_file)
+
+        cached = self._load_without_toml()
+        assert cached == parsed
+        assert [entry["command"] for entry in cached["files"]] == ["echo 'main'", "echo 'external'", "echo 'periodic'"]
+
+    def test_quarantined_entries_reported_on_cache_hit(self):
+        """Test that invalid entries are reported on every load, not only when the cache is written."""
+        with open(self.config_file, "a") as f:
+            f.write('\n[[commands]]\ncommand = "echo bad"\npriority = "urgent"\n')
+        with patch("config_validator.TimestampPrinter.print") as mock_print:
+            ConfigLoader.load_config(self.config_file, self.cache_file)
+        reports = [call for call in mock_print.call_args_list if "priority must be one of" in call.args[0]]
+        assert len(reports) == 1
+
+        with patch("config_validator.TimestampPrinter.print") as mock_print:
+            cached = self._load_without_toml()
+        assert [call for call in mock_print.call_args_list if "priority must be one of" in call.args[0]] == reports
+        assert len(cached["quarantined_files"]) == 1
+
+    def test_main_config_change_invalidates_cache(self):
+        """Test that editing the main config forces a re-parse."""
+        ConfigLoader.load_config(self.config_file, self.cache_file)
+
+        with open(self.config_file, "a") as f:
+            f.write("\n[[commands]]\ncommand = \"echo 'added'\"\n")
+
+        config = ConfigLoader.load_config(self.config_file, self.cache_file)
+        assert config["files"][-1]["command"] == "echo 'added'"
+
+    def test_external_file_change_invalidates_cache(self):
+        """Test that editing an external file forces a re-parse."""
+        ConfigLoader.load_config(self.config_file, self.cache_file)
+
+        self._write_external("echo 'external changed'")
+        stat_result = os.stat(self.external_file)
+        os.utime(self.external_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+
+        config = ConfigLoader.load_config(self.config_file, self.cache_file)
+        assert config["files"][1]["command"] == "echo 'external changed'"
+
+    def test_version_mismatch_is_a_miss(self):
+        """Test that a cache written by another cache version is ignored."""
+        ConfigLoader.load_config(self.config_file, self.cache_file)
+        with open(self.cache_file, "rb") as f:
+            payload = pickle.load(f)
+        payload["version"] = f"{ConfigCache.CACHE_VERSION + 1}:{ConfigCache.get_version().split(':')[1]}"
+        with open(self.cache_file, "wb") as f:
+            pickle.dump(payload, f)
+
+        assert ConfigCache.load(self.cache_file, self.config_file) is None
+
+    def test_code_change_is_a_miss(self):
+        """Test that a cache written by a different version of the code is ignored."""
+        ConfigLoader.load_config(self.config_file, self.cache_file)
+        assert ConfigCache.load(self.cache_file, self.config_file) is not None
+        with patch.object(ConfigCache, "_version", f"{ConfigCache.CACHE_VERSION}:changed-source"):
+            assert ConfigCache.load(self.cache_file, self.config_file) is None
+
+    def test_corrupt_cache_is_a_miss(self):
+        """Test that an unreadable cache file falls back to parsing."""
+        with open(self.cache_file, "wb") as f:
+            f.write(b"not a pickle")
+
+        config = ConfigLoader.load_config(self.config_file, self.cache_file)
+        assert config["default_interval"] == "2s"
+        assert ConfigCache.load(self.cache_file, self.config_file) is not None
+
+    def test_custom_color_scheme_survives_cache(self):
+        """Test that a custom color palette is re-applied on a cache hit."""
+        with open(self.config_file, "a") as f:
+            f.write('\n[color_scheme]\nred = "#0A141E"\n')
+
+        ConfigLoader.load_config(self.config_file, self.cache_file)
+        ColorScheme.reset_to_default()
+        assert Fore.RED != "\033[38;2;10;20;30m"
+
+        self._load_without_toml()
+        assert Fore.RED == "\033[38;2;10;20;30m"
+
+    def test_watcher_reload_uses_cache(self):
+        """Test that the watcher passes the cache path on reload."""
+        watcher = FileWatcher(self.config_file, self.cache_file)
+        assert watcher.config_cache_path == self.cache_file
+
+        time.sleep(0.05)
+        with open(self.config_file, "a") as f:
+            f.write("\n[[commands]]\ncommand = \"echo 'reloaded'\"\n")
+        watcher.config_last_check = 0
+        watcher._check_config_file()
+        assert watcher.config["files"][-1]["command"] == "echo 'reloaded'"
+
+        cached = self._load_without_toml()
+        assert cached["files"][-1]["command"] == "echo 'reloaded'"
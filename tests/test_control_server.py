@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for the local control socket
+"""
+
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from command_executor import CommandExecutor
+from control_server import ControlServer
+
+pytestmark = pytest.mark.skipif(not ControlServer.is_supported(), reason="Unix-domain sockets are not available")
+
+
+class TestControlServer:
+    """Test cases for control socket commands."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.socket_path = os.path.join(self.test_dir, "control.sock")
+        self.marker_file = os.path.join(self.test_dir, "marker.txt")
+        self.test_file = os.path.join(self.test_dir, "test.txt")
+        with open(self.test_file, "w") as f:
+            f.write("Initial content\n")
+        self._write_config()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write_config(self, extra_entries=""):
+        """Write a config with one grouped file entry and the control socket enabled."""
+        with open(self.config_file, "w") as f:
+            f.write(f'''default_interval = "0.05s"
+config_check_interval = "1h"
+control_socket = "{self.socket_path}"
+
+[[files]]
+path = "{self.test_file}"
+command = "echo changed >> {self.marker_file}"
+group = "docs"
+{extra_entries}''')
+
+    def _modify_test_file(self):
+        """Modify test_file so its timestamp visibly changes."""
+        future = time.time() + 5
+        os.utime(self.test_file, (future, future))
+
+    def _marker_count(self):
+        """Return how many times the command ran."""
+        if not os.path.exists(self.marker_file):
+            return 0
+        with open(self.marker_file) as f:
+            return len(f.readlines())
+
+    def _request(self, watcher, request):
+        """Send a request over the socket while the watcher serves it."""
+        result = {}
+        client = threading.Thread(
+            target=lambda: result.update(ControlServer.send_request(self.socket_path, request)), daemon=True
+        )
+        client.start()
+        while client.is_alive():
+            watcher._wait_for_next_tick(0.05)
+        return result
+
+    def test_status_over_socket(self):
+        """Test that status reports per-entry scheduling information over the socket."""
+        watcher = FileWatcher(self.config_file)
+        watcher._control_server = watcher._create_control_server()
+        try:
+            watcher._check_files()
+            response = self._request(watcher, "status")
+        finally:
+            watcher._control_server.close()
+
+        assert response["ok"] is True
+        entry = response["entries"][0]
+        assert entry["key"] == "#0"
+        assert entry["group"] == "docs"
+        assert entry["next_due"] == pytest.approx(entry["last_check"] + 0.05)
+        assert not os.path.exists(self.socket_path)
+
+    def test_unknown_command_is_an_error(self):
+        """Test that unknown commands get an error response."""
+        response = ControlServer.dispatch("explode", lambda command, argument: {})
+        assert response["ok"] is False
+        assert "Unknown command" in response["error"]
+
+    def test_trigger_runs_command_without_change(self):
+        """Test that trigger runs an entry's command immediately."""
+        watcher = FileWatcher(self.config_file)
+        response = ControlServer.dispatch(f"trigger {self.test_file}", watcher._handle_control_command)
+        assert response == {"ok": True, "entries": ["#0"]}
+        assert self._marker_count() == 1
+
+    def test_failing_handler_is_an_error(self):
+        """Test that a trigger whose command times out gets an error response instead of stopping the watcher."""
+        self._write_config('[[commands]]\ncommand = "sleep 5"\ngroup = "slow"\n')
+        watcher = FileWatcher(self.config_file)
+        with patch.object(CommandExecutor, "COMMAND_TIMEOUT", 0.2), patch("control_server.TimestampPrinter.print"):
+            response = ControlServer.dispatch("trigger slow", watcher._handle_control_command)
+        assert response["ok"] is False
+        assert "TimeoutExpired" in response["error"]
+
+    def test_pause_and_resume_by_group(self):
+        """Test that a paused group is not checked until resumed."""
+        watcher = FileWatcher(self.config_file)
+        watcher._check_files()
+
+        ControlServer.dispatch("pause docs", watcher._handle_control_command)
+        self._modify_test_file()
+        watcher.file_last_check = {}
+        watcher._check_files()
+        assert self._marker_count() == 0
+
+        ControlServer.dispatch("resume docs", watcher._handle_control_command)
+        watcher._check_files()
+        assert self._marker_count() == 1
+
+    def test_pause_survives_reload(self):
+        """Test that paused entries stay paused when a reload shifts their index."""
+        watcher = FileWatcher(self.config_file)
+        ControlServer.dispatch("pause #0", watcher._handle_control_command)
+
+        with open(self.config_file) as f:
+            content = f.read()
+        header, files_part = content.split("[[files]]", 1)
+        with open(self.config_file, "w") as f:
+            f.write(f'{header}[[commands]]\ncommand = "echo other"\ninterval = "1h"\n\n[[files]]{files_part}')
+
+        response = ControlServer.dispatch("reload", watcher._handle_control_command)
+        assert response["ok"] is True
+        assert watcher.config["files"][0]["path"] == self.test_file
+        assert watcher.paused_entries == {"#0"}
+
+    def test_missing_target_is_an_error(self):
+        """Test that commands addressing no entry get an error response."""
+        watcher = FileWatcher(self.config_file)
+        response = ControlServer.dispatch("pause nothing-here", watcher._handle_control_command)
+        assert response["ok"] is False
+        assert "No entry matches" in response["error"]
+
+    def test_dump_stats(self):
+        """Test that dump-stats reports loop counters."""
+        watcher = FileWatcher(self.config_file)
+        watcher._record_tick(0.25)
+        response = ControlServer.dispatch("dump-stats", watcher._handle_control_command)
+        stats = response["stats"]
+        assert stats["ticks"] == 1
+        assert stats["tick_seconds_max"] == 0.25
+        assert stats["entries"] == 1
+        assert stats["control_requests"] == 1
+
+    def test_socket_path_handling(self):
+        """Test that only a stale socket is replaced and the new socket is private to the user."""
+        import stat
+
+        with open(self.socket_path, "w") as f:
+            f.write("not a socket\n")
+        server = ControlServer(self.socket_path)
+        with patch("control_server.TimestampPrinter.print"):
+            assert not server.start()
+        with open(self.socket_path) as f:
+            assert f.read() == "not a socket\n"
+        os.unlink(self.socket_path)
+
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+        with patch("control_server.TimestampPrinter.print"):
+            assert server.start()
+        try:
+            assert stat.S_IMODE(os.stat(self.socket_path).st_mode) == 0o600
+        finally:
+            server.close()
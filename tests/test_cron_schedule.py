@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tests for cron-expression schedules of [[commands]]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from clock import Clock, VirtualClock
+from config_loader import ConfigLoader
+from cron_schedule import CronSchedule
+from deadline_scheduler import DeadlineScheduler
+from file_monitor import FileMonitor
+
+
+def _utc(*args):
+    """Build a UTC timestamp."""
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+class TestCronSchedule:
+    """Test cases for compiling cron expressions and computing fire times."""
+
+    def test_weekdays_at_three(self):
+        """Test that a weekday schedule skips the weekend."""
+        schedule = CronSchedule("0 3 * * 1-5", "UTC")
+        # Friday 2024-01-05 04:00 -> Monday 2024-01-08 03:00
+        assert schedule.next_fire(_utc(2024, 1, 5, 4, 0)) == _utc(2024, 1, 8, 3, 0)
+        # Strictly after: firing at exactly 03:00 moves on to the next day
+        assert schedule.next_fire(_utc(2024, 1, 8, 3, 0)) == _utc(2024, 1, 9, 3, 0)
+
+    def test_steps_lists_and_names(self):
+        """Test steps, lists, ranges with names and macros."""
+        assert CronSchedule("*/15 * * * *", "UTC").next_fire(_utc(2024, 1, 1, 10, 16)) == _utc(2024, 1, 1, 10, 30)
+        assert CronSchedule("5,35 8-9 * * *", "UTC").next_fire(_utc(2024, 1, 1, 9, 36)) == _utc(2024, 1, 2, 8, 5)
+        assert CronSchedule("0 12 * feb-mar mon", "UTC").next_fire(_utc(2024, 1, 1)) == _utc(2024, 2, 5, 12, 0)
+        assert CronSchedule("@monthly", "UTC").next_fire(_utc(2024, 1, 15)) == _utc(2024, 2, 1)
+        assert CronSchedule("0 0 * * 7", "UTC").next_fire(_utc(2024, 1, 1)) == _utc(2024, 1, 7)
+
+    def test_day_of_month_or_day_of_week(self):
+        """Test that restricting both day fields fires on either."""
+        schedule = CronSchedule("0 0 13 * 5", "UTC")
+        # 2024-01-05 is a Friday, before the 13th
+        assert schedule.next_fire(_utc(2024, 1, 1)) == _utc(2024, 1, 5)
+        assert schedule.next_fire(_utc(2024, 1, 12, 1)) == _utc(2024, 1, 13)
+
+    def test_leap_day(self):
+        """Test that a leap-day schedule finds the next leap year."""
+        assert CronSchedule("0 0 29 2 *", "UTC").next_fire(_utc(2024, 3, 1)) == _utc(2028, 2, 29)
+
+    def test_timezone(self):
+        """Test that fire times are computed in the schedule's timezone."""
+        schedule = CronSchedule("0 9 * * *", "Asia/Tokyo")
+        # 09:00 JST is 00:00 UTC
+        assert schedule.next_fire(_utc(2023, 12, 31, 23, 0)) == _utc(2024, 1, 1, 0, 0)
+
+    @pytest.mark.parametrize(
+        "expression",
+        ["61 * * * *", "* * *", "*/0 * * * *", "0 0 * * funday", "5-1 * * * *", "0 0 31 2 *"],
+    )
+    def test_invalid_expressions(self, expression):
+        """Test that invalid or never-firing expressions are rejected."""
+        with pytest.raises(ValueError):
+            CronSchedule(expression, "UTC").next_fire(_utc(2024, 1, 1))
+
+    def test_unknown_timezone(self):
+        """Test that unknown timezones are rejected."""
+        with pytest.raises(ValueError, match="Unknown timezone"):
+            CronSchedule("0 3 * * *", "Mars/Olympus_Mons")
+
+    def test_compile_reuses_schedules(self):
+        """Test that identical expressions share one compiled schedule."""
+        assert CronSchedule.compile("0 3 * * *", "UTC") is CronSchedule.compile("0 3 * * *", "UTC")
+
+
+class TestDeadlineScheduler:
+    """Test cases for the deadline heap and its use by the watcher."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.marker_file = os.path.join(self.test_dir, "marker.txt")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_pop_due_in_deadline_order(self):
+        """Test that due entries come out in deadline order and are rescheduled."""
+        config = {
+            "files": [
+                {"path": "", "command": "echo hourly", "schedule": "0 * * * *", "timezone": "UTC"},
+                {"path": "", "command": "echo polled", "interval": "1s"},
+                {"path": "", "command": "echo quarter", "schedule": "*/15 * * * *", "timezone": "UTC"},
+            ]
+        }
+        scheduler = DeadlineScheduler()
+        scheduler.load(config, now=_utc(2024, 1, 1, 10, 5))
+
+        assert scheduler.next_deadline() == _utc(2024, 1, 1, 10, 15)
+        assert scheduler.get_deadline("#1") is None
+        assert scheduler.pop_due(_utc(2024, 1, 1, 10, 14)) == []
+        assert scheduler.pop_due(_utc(2024, 1, 1, 11, 0)) == ["#2", "#0"]
+        assert scheduler.get_deadline("#0") == _utc(2024, 1, 1, 12, 0)
+        assert scheduler.get_deadline("#2") == _utc(2024, 1, 1, 11, 15)
+
+    def test_scheduled_command_runs_only_when_due(self):
+        """Test that scheduled commands are not polled but run at their fire time."""
+        with open(self.config_file, "w") as f:
+            f.write(f"""[[commands]]
+command = "echo fired >> {self.marker_file}"
+schedule = "* * * * *"
+""")
+        watcher = FileWatcher(self.config_file)
+        watcher._check_files()
+        assert not os.path.exists(self.marker_file)
+
+        deadline = watcher.scheduler.next_deadline()
+        FileMonitor.run_scheduled(watcher.config, watcher.scheduler, watcher.file_last_run, now=deadline)
+        with open(self.marker_file) as f:
+            assert f.read() == "fired\n"
+        assert watcher.file_last_run["#0"]["started"] is not None
+        assert watcher.scheduler.next_deadline() == deadline + 60
+
+    @pytest.mark.parametrize("scheduler", ["heap", "timer-wheel"])
+    def test_loop_wakes_up_for_next_firing(self, scheduler):
+        """Test that a main loop interval longer than the time to the next firing does not delay it."""
+        with open(self.config_file, "w") as f:
+            f.write(f"""default_interval = "1h"
+config_check_interval = "1h"
+scheduler = "{scheduler}"
+
+[[commands]]
+command = "echo fired >> {self.marker_file}"
+schedule = "* * * * *"
+""")
+        clock = VirtualClock(_utc(2024, 1, 1, 10, 0, 29) + 0.5)
+        Clock.set_clock(clock)
+        try:
+            watcher = FileWatcher(self.config_file)
+            wait = watcher.run_tick(3600)
+            assert 30 <= wait <= 31
+            clock.advance(wait)
+            watcher.run_tick(3600)
+        finally:
+            Clock.set_clock(None)
+        with open(self.marker_file) as f:
+            assert f.read() == "fired\n"
+
+    @pytest.mark.parametrize(
+        "entry, reason",
+        [
+            ('[[files]]\npath = "x.txt"\ncommand = "echo"\nschedule = "0 3 * * *"', "only be used in [[commands]]"),
+            ('[[commands]]\ncommand = "echo"\nschedule = "0 3 * * *"\ninterval = "1m"', "cannot be used together"),
+            ('[[commands]]\ncommand = "echo"\nschedule = "0 25 * * *"', "outside 0-23"),
+        ],
+    )
+    def test_invalid_schedule_entries_quarantined(self, entry, reason):
+        """Test that misused or invalid schedules are reported once at load."""
+        with open(self.config_file, "w") as f:
+            f.write(entry + "\n")
+        config = ConfigLoader.load_config(self.config_file)
+        assert config["files"] == []
+        assert reason in config["quarantined_files"][0]["reason"]
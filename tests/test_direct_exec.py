@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for running simple commands without a shell
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from command_executor import CommandExecutor
+from direct_exec import DirectExec
+
+pytestmark = pytest.mark.skipif(not DirectExec.is_supported(), reason="direct execution needs a POSIX platform")
+
+
+class TestDirectExec:
+    """Test cases for shell-free execution of simple commands."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = os.path.realpath(tempfile.mkdtemp())
+        self.tool = os.path.join(self.test_dir, "tool.sh")
+        with open(self.tool, "w") as f:
+            f.write('#!/bin/sh\necho "$PWD $#" > out.txt\nexit "${EXIT_CODE:-0}"\n')
+        os.chmod(self.tool, 0o755)
+        DirectExec.configure({})
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        DirectExec.configure({})
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _run(self, command, cwd=None):
+        """Run a command through the executor's default runner, recording subprocess.run calls."""
+        with patch("subprocess.run", wraps=subprocess.run) as mock_run:
+            result = CommandExecutor._run_command_string(command, {"command": command}, cwd)
+        return result, mock_run.call_args
+
+    def test_parse_command(self):
+        """Test that only commands without shell syntax are split."""
+        assert DirectExec.parse_command("make build -j4") == ["make", "build", "-j4"]
+        assert DirectExec.parse_command("deploy 'my site' \"a b\" CFLAGS=-O2") == [
+            "deploy",
+            "my site",
+            "a b",
+            "CFLAGS=-O2",
+        ]
+        for command in (
+            "echo $HOME",
+            "make && make test",
+            "ls *.txt",
+            "cat < in.txt",
+            "echo `date`",
+            "echo a\\ b",
+            "cd build",
+            "FOO=1 make",
+            "true # comment",
+            "echo 'unterminated",
+            "",
+        ):
+            assert DirectExec.parse_command(command) is None, command
+
+    def test_simple_command_runs_without_shell(self):
+        """Test that a simple command is run directly with its program resolved relative to cwd."""
+        result, call = self._run("./tool.sh 'one arg' two", self.test_dir)
+        assert result.returncode == 0
+        assert call.args[0] == ["./tool.sh", "one arg", "two"]
+        assert call.kwargs["executable"] == self.tool
+        assert not call.kwargs.get("shell", False)
+        with open(os.path.join(self.test_dir, "out.txt")) as f:
+            assert f.read().split() == [self.test_dir, "2"]
+
+    def test_shell_syntax_uses_shell(self):
+        """Test that commands with shell syntax still run through the shell."""
+        result, call = self._run("./tool.sh > /dev/null && exit 4", self.test_dir)
+        assert result.returncode == 4
+        assert call.kwargs["shell"] is True
+
+    def test_resolution_cached_until_configure(self):
+        """Test that PATH is searched once per command until the config is applied again."""
+        expected = shutil.which("true")
+        with patch("shutil.which", wraps=shutil.which) as mock_which:
+            assert DirectExec.resolve("true", None)[0] == expected
+            assert DirectExec.resolve("true", None) is not None
+            assert mock_which.call_count == 1
+            DirectExec.configure({"files": [{"path": "", "command": "true"}]})
+            DirectExec.resolve("true", None)
+            assert mock_which.call_count == 2
+
+    def test_missing_program_reported_at_load(self):
+        """Test that a missing program is reported by configure and its command runs through the shell."""
+        config = {
+            "files": [
+                {"path": "", "command": "no-such-program-xyz --flag"},
+                {"path": "", "command": "no-such-program-xyz | cat", "runner": "shell"},
+            ]
+        }
+        with patch("direct_exec.TimestampPrinter.print") as mock_print:
+            DirectExec.configure(config)
+        assert mock_print.call_count == 1
+        assert "no-such-program-xyz" in mock_print.call_args.args[0]
+
+        with patch("command_executor.TimestampPrinter.print") as mock_print:
+            CommandExecutor.execute_command("no-such-program-xyz --flag", "", {"command": "no-such-program-xyz --flag"})
+        messages = [call.args[0] for call in mock_print.call_args_list]
+        assert any("exit code 127" in message for message in messages)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for compact per-entry state and its memory budget
+"""
+
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from config_loader import ConfigLoader
+from entry_state import EntryColumn, EntryState
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Resident memory budget per watched file entry in bytes, covering its config
+# entry and all watcher state after the first ticks. An entry takes roughly
+# 300 bytes on a typical developer machine (about 850 before entry state was
+# kept in columns); the budget leaves headroom for other allocators.
+RSS_PER_ENTRY_BUDGET = 512
+
+# Number of entries the memory budget is measured with
+RSS_ENTRIES = 20_000
+
+# Loads the compiled config cache written by the test, so the measurement is not
+# inflated by memory the TOML parser freed but the allocator kept, then reports
+# the resident memory growth per entry after two ticks over an in-memory filesystem
+RSS_SCRIPT = """
+import gc, sys
+import psutil
+from cat_file_watcher import FileWatcher
+from clock import Clock, VirtualClock
+from filesystem import FileSystem, MemoryFileSystem
+from timestamp_printer import TimestampPrinter
+
+config_path, cache_path, entries = sys.argv[1], sys.argv[2], int(sys.argv[3])
+TimestampPrinter.set_output_sink(lambda line: None)
+Clock.set_clock(VirtualClock())
+filesystem = MemoryFileSystem()
+FileSystem.set_filesystem(filesystem)
+filesystem.write(config_path)
+for index in range(entries):
+    filesystem.write(f"/watched/dir{index % 100}/file{index}.txt")
+gc.collect()
+before = psutil.Process().memory_info().rss
+watcher = FileWatcher(config_path, cache_path)
+watcher.run_tick(1.0)
+watcher.run_tick(1.0)
+gc.collect()
+assert len(watcher.file_timestamps) == entries
+print((psutil.Process().memory_info().rss - before) / entries)
+"""
+
+
+class TestEntryColumn:
+    """Test cases for the array-backed entry mapping."""
+
+    def test_mapping_behavior(self):
+        """Test that a column behaves like a dictionary of entry keys."""
+        column = EntryColumn(2)
+        assert len(column) == 0
+        assert "#0" not in column
+        assert column.get("#0") is None
+
+        column["#1"] = 1.5
+        column["#4"] = 3
+        column["#1"] = 2.5
+        assert len(column) == 2
+        assert column["#1"] == 2.5
+        assert column["#4"] == 3.0
+        assert list(column) == ["#1", "#4"]
+        assert column == {"#1": 2.5, "#4": 3.0}
+
+        del column["#1"]
+        assert "#1" not in column
+        with pytest.raises(KeyError):
+            column["#1"]
+        with pytest.raises(KeyError):
+            del column["#1"]
+        assert len(column) == 1
+
+        column.clear()
+        assert len(column) == 0
+        assert column.get("#4", "default") == "default"
+
+    def test_rejects_other_keys_and_nan(self):
+        """Test that only entry keys and real numbers can be stored."""
+        column = EntryColumn()
+        for key in ("file.txt", "#-1", "#x", 0):
+            assert key not in column
+            with pytest.raises(KeyError):
+                column[key] = 1.0
+        with pytest.raises(ValueError):
+            column["#0"] = math.nan
+        assert len(column) == 0
+
+    def test_index_access(self):
+        """Test that index access matches key access for columns and dictionaries."""
+        for state in (EntryColumn(1), {}):
+            by_index = EntryState.by_index(state)
+            assert by_index.get_at(3) is None
+            by_index.set_at(3, 1.5)
+            assert state["#3"] == 1.5
+            assert by_index.get_at(3) == 1.5
+            assert by_index.pop_at(3) == 1.5
+            assert by_index.pop_at(3, "default") == "default"
+            assert len(state) == 0
+        column = EntryColumn()
+        assert EntryState.by_index(column) is column
+
+
+class TestEntryState:
+    """Test cases for sharing strings between entries."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write_config(self, entries):
+        """Write a config watching a distinct file per entry."""
+        with open(self.config_file, "w") as f:
+            f.write('default_interval = "0s"\n')
+            for index in range(entries):
+                f.write(
+                    f'[[files]]\npath = "/watched/dir{index % 100}/file{index}.txt"\n'
+                    f'command = "make target{index % 50}"\ninterval = "5s"\n'
+                )
+
+    def test_loaded_entries_share_strings(self):
+        """Test that loaded entries share their keys and repeated values."""
+        self._write_config(60)
+        files = ConfigLoader.load_config(self.config_file)["files"]
+
+        first, second, repeated = files[0], files[1], files[50]
+        assert list(first) == ["path", "command", "interval"]
+        assert all(a is b for a, b in zip(first, second))
+        assert first["interval"] is second["interval"]
+        assert first["command"] is repeated["command"]
+        assert first["path"] == "/watched/dir0/file0.txt"
+
+    def test_share_strings_keeps_entry_identity(self):
+        """Test that entries are rebuilt in place, including string lists."""
+        entry = {"path": "a", "terminate_if_process": ["".join(["ed", "itor"])], "interval": 5}
+        other = {"terminate_if_process": ["".join(["ed", "itor"])]}
+        config = {"files": [entry, other]}
+        EntryState.share_strings(config)
+        assert config["files"][0] is entry
+        assert entry == {"path": "a", "terminate_if_process": ["editor"], "interval": 5}
+        assert entry["terminate_if_process"][0] is other["terminate_if_process"][0]
+
+    def test_rss_per_entry_within_budget(self):
+        """Test that resident memory per watched entry stays within the budget."""
+        self._write_config(RSS_ENTRIES)
+        cache_file = os.path.join(self.test_dir, "config.cache")
+        ConfigLoader.load_config(self.config_file, cache_file)
+
+        result = subprocess.run(
+            [sys.executable, "-c", RSS_SCRIPT, self.config_file, cache_file, str(RSS_ENTRIES)],
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, result.stderr
+        per_entry = float(result.stdout.split()[-1])
+        assert per_entry < RSS_PER_ENTRY_BUDGET, (
+            f"{per_entry:.0f} bytes per entry (budget {RSS_PER_ENTRY_BUDGET} bytes)"
+        )
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for load-time validation of per-entry rules
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from config_loader import ConfigLoader
+from config_validator import ConfigValidator
+
+
+class TestEntryRuleValidation:
+    """Test cases for per-entry rules enforced when the config is loaded."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.error_log_file = os.path.join(self.test_dir, "error.log")
+        self.test_file = os.path.join(self.test_dir, "test.txt")
+        with open(self.test_file, "w") as f:
+            f.write("Initial content\n")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_rule_violations(self):
+        """Test that each rule is detected with the expected severity."""
+        cases = [
+            ({"path": "a.txt", "terminate_if_process": "x"}, "empty filename", True),
+            ({"path": "", "command": "echo", "terminate_if_process": "x"}, "command must be empty", True),
+            ({"path": "a.txt", "terminate_if_window_title": "x"}, "empty filename", True),
+            ({"path": "", "command": "echo", "terminate_if_window_title": "x"}, "command must be empty", True),
+            ({"path": "a.txt"}, "No command specified", False),
+        ]
+        for entry, expected_text, expected_fatal in cases:
+            message, is_fatal = ConfigValidator.get_entry_rule_violation(entry)
+            assert expected_text in message
+            assert is_fatal == expected_fatal
+
+    def test_valid_entries_have_no_violation(self):
+        """Test that valid entries pass the rules."""
+        valid_entries = [
+            {"path": "a.txt", "command": "echo"},
+            {"path": "a.txt", "argv": ["notepad.exe"], "no_focus": True},
+            {"path": "", "terminate_if_process": "x"},
+            {"path": "", "command": "", "terminate_if_window_title": "x"},
+        ]
+        for entry in valid_entries:
+            assert ConfigValidator.get_entry_rule_violation(entry) is None
+
+    def test_invalid_entries_are_quarantined_at_load(self):
+        """Test that invalid entries are removed from files and kept in quarantined_files."""
+        config_content = f'''error_log_file = "{self.error_log_file}"
+
+[[files]]
+path = "{self.test_file}"
+terminate_if_process = "python"
+
+[[files]]
+path = "{self.test_file}"
+command = "echo 'ok'"
+
+[[commands]]
+command = "echo 'bad'"
+terminate_if_process = "python"
+'''
+        with open(self.config_file, "w") as f:
+            f.write(config_content)
+
+        config = ConfigLoader.load_config(self.config_file)
+        assert len(config["files"]) == 1
+        assert config["files"][0]["command"] == "echo 'ok'"
+        assert len(config["quarantined_files"]) == 2
+        assert "empty filename" in config["quarantined_files"][0]["reason"]
+
+        with open(self.error_log_file, "r") as f:
+            assert f.read().count("Fatal configuration error") == 2
+
+    def test_violations_reported_once_not_per_tick(self):
+        """Test that checking files repeatedly does not repeat warnings or error log entries."""
+        config_content = f'''default_interval = "0.01s"
+error_log_file = "{self.error_log_file}"
+
+[[files]]
+path = "{self.test_file}"
+terminate_if_window_title = "Test Window"
+
+[[files]]
+path = "{self.test_file}"
+'''
+        with open(self.config_file, "w") as f:
+            f.write(config_content)
+
+        watcher = FileWatcher(self.config_file)
+
+        captured_output = io.StringIO()
+        with patch("sys.stdout", captured_output):
+            for _ in range(5):
+                watcher.file_last_check = {}
+                watcher._check_files()
+
+        assert "No command specified" not in captured_output.getvalue()
+        assert "Fatal configuration error" not in captured_output.getvalue()
+        with open(self.error_log_file, "r") as f:
+            assert f.read().count("Fatal configuration error") == 1
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Tests for the event journal and its deterministic replay
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from clock import Clock, VirtualClock
+from command_executor import CommandExecutor
+from config_loader import ConfigLoader
+from event_journal import EventJournal
+from filesystem import FileSystem, MemoryFileSystem
+from journal_replay import JournalReplay
+from timestamp_printer import TimestampPrinter
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+WALL = 1_700_000_000.0
+
+
+class TestEventJournal:
+    """Test cases for recording and reading the journal."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.journal_file = os.path.join(self.test_dir, "events.bin")
+        self.watched_file = os.path.join(self.test_dir, "watched.txt")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        EventJournal.close()
+        Clock.set_clock(None)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_sessions_round_trip(self):
+        """Test that each open appends a session and a truncated final record is ignored."""
+        Clock.set_clock(VirtualClock(WALL))
+        EventJournal.open(self.journal_file)
+        Clock.sleep(2)
+        EventJournal.record(EventJournal.STAT, "#3", 123.5)
+        EventJournal.record(EventJournal.RELOAD)
+        EventJournal.open(self.journal_file)
+        EventJournal.record(EventJournal.TICK, None, 0.25)
+        EventJournal.close()
+        with open(self.journal_file, "ab") as f:
+            f.write(b"\x01\x00")
+
+        sessions = EventJournal.read(self.journal_file)
+        assert [session["wall_start"] for session in sessions] == [WALL, WALL + 2]
+        assert sessions[0]["events"] == [
+            (EventJournal.STAT, 3, 2.0, 123.5),
+            (EventJournal.RELOAD, EventJournal.NO_ENTRY, 2.0, 0.0),
+        ]
+        assert sessions[1]["events"] == [(EventJournal.TICK, EventJournal.NO_ENTRY, 0.0, 0.25)]
+
+    def test_corrupt_record_resyncs_at_next_session(self):
+        """Test that reading stops a session at an invalid record and resumes at the next header."""
+        Clock.set_clock(VirtualClock(WALL))
+        EventJournal.open(self.journal_file)
+        for index in range(4):
+            EventJournal.record(EventJournal.STAT, f"#{index}", 1.0)
+        EventJournal.open(self.journal_file)
+        EventJournal.record(EventJournal.TICK, None, 0.25)
+        EventJournal.close()
+        with open(self.journal_file, "r+b") as f:
+            f.seek(EventJournal._HEADER.size + 2 * EventJournal._EVENT.size)
+            f.write(b"\xee")
+
+        sessions = EventJournal.read(self.journal_file)
+        assert [event[1] for event in sessions[0]["events"]] == [0, 1]
+        assert sessions[1]["events"] == [(EventJournal.TICK, EventJournal.NO_ENTRY, 0.0, 0.25)]
+
+    @pytest.mark.parametrize("written", [1, 19, 20])
+    def test_record_cut_short_by_restart(self, written):
+        """Test that a partially written record followed by a new session does not hide the session."""
+        Clock.set_clock(VirtualClock(WALL))
+        EventJournal.open(self.journal_file)
+        EventJournal.record(EventJournal.STAT, "#0", 1.0)
+        EventJournal.close()
+        with open(self.journal_file, "ab") as f:
+            f.write(EventJournal._EVENT.pack(EventJournal.STAT, 1, 0.0, 1.0)[:written])
+        EventJournal.open(self.journal_file)
+        EventJournal.record(EventJournal.TICK, None, 0.25)
+        EventJournal.close()
+
+        sessions = EventJournal.read(self.journal_file)
+        assert [len(session["events"]) for session in sessions] == [1, 1]
+        assert sessions[1]["events"] == [(EventJournal.TICK, EventJournal.NO_ENTRY, 0.0, 0.25)]
+
+    def test_rejects_other_files(self):
+        """Test that a file without a journal header is rejected."""
+        with open(self.journal_file, "wb") as f:
+            f.write(b"\x01" * 64)
+        with pytest.raises(ValueError, match="not an event journal"):
+            EventJournal.read(self.journal_file)
+
+    def test_watcher_journals_events(self):
+        """Test that a watcher journals due entries, stats, changes, commands and ticks."""
+        with open(self.watched_file, "w") as f:
+            f.write("content\n")
+        with open(self.config_file, "w") as f:
+            f.write(
+                f'event_journal = "{self.journal_file}"\n'
+                f'[[files]]\npath = "{self.watched_file}"\ncommand = "echo"\ninterval = "0s"\n'
+            )
+        watcher = FileWatcher(self.config_file)
+        watcher._open_event_journal()
+        watcher.run_tick(0.1)
+        os.utime(self.watched_file, (0, os.path.getmtime(self.watched_file) + 5))
+        watcher.run_tick(0.1)
+        EventJournal.close()
+
+        events = EventJournal.read(self.journal_file)[0]["events"]
+        kinds = [event for event, _, _, _ in events]
+        assert kinds == [
+            EventJournal.DUE,
+            EventJournal.STAT,
+            EventJournal.TICK,
+            EventJournal.DUE,
+            EventJournal.STAT,
+            EventJournal.CHANGE,
+            EventJournal.COMMAND_START,
+            EventJournal.COMMAND_FINISH,
+            EventJournal.TICK,
+        ]
+        assert events[4][3] == os.path.getmtime(self.watched_file)
+
+    def test_invalid_option(self):
+        """Test that a non-string event_journal is rejected at load."""
+        with open(self.config_file, "w") as f:
+            f.write('event_journal = 1\n[[commands]]\ncommand = "echo"\n')
+        with pytest.raises(SystemExit):
+            ConfigLoader.load_config(self.config_file)
+
+
+class TestJournalReplay:
+    """Test cases for replaying a journal on a virtual clock."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.journal_file = os.path.join(self.test_dir, "events.bin")
+        with open(self.config_file, "w") as f:
+            f.write(
+                f'event_journal = "{self.journal_file}"\ndefault_interval = "10s"\nconfig_check_interval = "1m"\n'
+                + "".join(f'[[files]]\npath = "/sim/file{index}.txt"\ncommand = "build"\n' for index in range(20))
+                + '[[commands]]\ncommand = "report"\ninterval = "1m"\n'
+            )
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        EventJournal.close()
+        Clock.set_clock(None)
+        FileSystem.set_filesystem(None)
+        TimestampPrinter.set_output_sink(None)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _record_workload(self):
+        """Record a journal of an hour with file changes and commands taking time."""
+        clock = VirtualClock(WALL)
+        filesystem = MemoryFileSystem()
+        Clock.set_clock(clock)
+        FileSystem.set_filesystem(filesystem)
+        TimestampPrinter.set_output_sink(lambda line: None)
+        filesystem.write(self.config_file)
+        for index in range(20):
+            filesystem.write(f"/sim/file{index}.txt")
+        watcher = FileWatcher(self.config_file)
+        watcher._open_event_journal()
+
+        def run_command(command, filepath, settings, config=None):
+            clock.advance(2.0 if command == "build" else 0.5)
+
+        with patch.object(CommandExecutor, "execute_command", side_effect=run_command):
+            tick = 0
+            while clock.monotonic() < 3600:
+                if tick % 7 == 0:
+                    filesystem.write(f"/sim/file{tick % 20}.txt")
+                clock.advance(watcher.run_tick(10.0))
+                tick += 1
+        EventJournal.close()
+        Clock.set_clock(None)
+        FileSystem.set_filesystem(None)
+        TimestampPrinter.set_output_sink(None)
+
+    def test_replay_reproduces_recording(self):
+        """Test that replaying a journal reproduces its changes, commands and detection latency."""
+        self._record_workload()
+        report = JournalReplay.run(self.config_file, self.journal_file)
+        recorded, replayed = report["recorded"], report["replayed"]
+
+        assert recorded["counts"]["change"] > 0
+        assert replayed["counts"]["change"] == recorded["counts"]["change"]
+        # Periodic commands near the end of the journal may fall on either side of it
+        assert abs(replayed["counts"]["command finish"] - recorded["counts"]["command finish"]) <= 1
+        assert replayed["detection_latency"]["max"] <= recorded["detection_latency"]["max"] + 10
+        assert replayed["command_concurrency"]["max"] == recorded["command_concurrency"]["max"]
+        assert replayed["command_concurrency"]["mean"] == pytest.approx(
+            recorded["command_concurrency"]["mean"], rel=0.01
+        )
+        assert Clock.get_clock().__class__.__name__ == "SystemClock"
+
+        table = JournalReplay.format_report(report)
+        assert "detection latency p95" in table
+        assert "recorded" in table.splitlines()[0]
+
+    def test_cli(self):
+        """Test the replay command line."""
+        self._record_workload()
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "src",
+                "replay",
+                "--config-filename",
+                self.config_file,
+                "--journal",
+                self.journal_file,
+                "--json",
+            ],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        assert result.returncode == 0, result.stderr
+        report = json.loads(result.stdout)
+        assert report["replayed"]["counts"]["change"] == report["recorded"]["counts"]["change"]
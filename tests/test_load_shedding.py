@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for entry priority classes and load shedding under overload
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from command_executor import CommandExecutor
+from config_loader import ConfigLoader
+from file_monitor import FileMonitor
+from load_shedder import LoadShedder
+
+
+class TestLoadShedding:
+    """Test cases for priority-aware shedding."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        LoadShedder.reset()
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.marker_file = os.path.join(self.test_dir, "marker.txt")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        LoadShedder.reset()
+        CommandExecutor.set_concurrency_limiter(None)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _overrun(self, ticks):
+        """Record overrunning ticks and return the reported level changes."""
+        return [message for message in (LoadShedder.record_tick(True) for _ in range(ticks)) if message]
+
+    def test_escalates_and_recovers(self):
+        """Test that sustained overruns escalate one level at a time and on-time ticks step back."""
+        assert self._overrun(LoadShedder.OVERLOAD_TICKS - 1) == []
+        assert len(self._overrun(1)) == 1
+        assert LoadShedder.get_interval_factor({"priority": "background"}) == LoadShedder.STRETCH_FACTOR
+
+        self._overrun(LoadShedder.OVERLOAD_TICKS * 10)
+        assert LoadShedder.get_stats({})["shed_level"] == LoadShedder.LEVELS[-1]
+        assert LoadShedder.get_interval_factor({"priority": "background"}) is None
+        assert LoadShedder.get_interval_factor({}) == LoadShedder.STRETCH_FACTOR
+        assert LoadShedder.get_interval_factor({"priority": "critical"}) == 1.0
+
+        messages = [LoadShedder.record_tick(False) for _ in range(LoadShedder.RECOVERY_TICKS)]
+        assert messages[-1] == f"Load recovered; shedding reduced to: {LoadShedder.LEVELS[-2]}"
+        assert LoadShedder.get_interval_factor({}) == 1.0
+
+    def test_background_paused_and_critical_first(self):
+        """Test that paused background entries are skipped and critical entries go first under a budget."""
+        self._overrun(LoadShedder.OVERLOAD_TICKS * 2)
+        config = {
+            "files": [
+                {"path": "", "command": f"echo normal >> {self.marker_file}"},
+                {"path": "", "command": f"echo background >> {self.marker_file}", "priority": "background"},
+                {"path": "", "command": f"echo critical >> {self.marker_file}", "priority": "critical"},
+            ]
+        }
+        # A budget that is already spent lets exactly one entry run
+        FileMonitor.check_files(config, {}, {}, deadline=time.monotonic() - 1)
+        with open(self.marker_file) as f:
+            assert f.read() == "critical\n"
+
+        FileMonitor.check_files(config, {}, {})
+        with open(self.marker_file) as f:
+            assert "background" not in f.read()
+
+    def test_command_pool_honours_priority(self):
+        """Test that critical commands bypass a full pool and background commands are shed."""
+        limiter = threading.BoundedSemaphore(1)
+        limiter.acquire()
+        CommandExecutor.set_concurrency_limiter(limiter)
+
+        CommandExecutor.execute_command(f"echo background >> {self.marker_file}", "", {"priority": "background"})
+        CommandExecutor.execute_command(f"echo critical >> {self.marker_file}", "", {"priority": "critical"})
+
+        with open(self.marker_file) as f:
+            assert f.read() == "critical\n"
+        assert LoadShedder.get_stats({})["shed_commands"] == 1
+
+    def test_watcher_reports_shedding(self):
+        """Test that the watcher escalates on overrunning ticks and exposes the metrics."""
+        with open(self.config_file, "w") as f:
+            f.write('[[commands]]\ncommand = "echo"\npriority = "background"\n')
+        watcher = FileWatcher(self.config_file)
+        for _ in range(LoadShedder.OVERLOAD_TICKS):
+            watcher._record_tick(2.0, 1.0)
+
+        stats = watcher._handle_control_command("dump-stats", "")["stats"]
+        assert stats["shed_level"] == "stretch background"
+        assert stats["shed_stretched_entries"] == 1
+        assert stats["shed_escalations"] == 1
+
+    def test_invalid_priority_quarantined(self):
+        """Test that an unknown priority is reported at load."""
+        with open(self.config_file, "w") as f:
+            f.write('[[commands]]\ncommand = "echo"\npriority = "urgent"\n')
+        config = ConfigLoader.load_config(self.config_file)
+        assert config["files"] == []
+        assert "priority must be one of" in config["quarantined_files"][0]["reason"]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the main loop profiling mode
+"""
+
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from control_server import ControlServer
+from loop_profiler import LoopProfiler
+
+
+class TestLoopProfiler:
+    """Test cases for LoopProfiler and its use in the main loop."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.profile_file = os.path.join(self.test_dir, "watcher.prof")
+        self.test_file = os.path.join(self.test_dir, "test.txt")
+        with open(self.test_file, "w") as f:
+            f.write("Initial content\n")
+        with open(self.config_file, "w") as f:
+            f.write(f'''default_interval = "0.01s"
+profile_file = "{self.profile_file}"
+
+[[files]]
+path = "{self.test_file}"
+command = "echo changed"
+''')
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _run_ticks(self, watcher, ticks):
+        """Run the main loop for the given number of ticks."""
+        calls = []
+
+        def stop_after_ticks(interval):
+            calls.append(interval)
+            if len(calls) >= ticks:
+                raise KeyboardInterrupt
+
+        with patch.object(watcher, "_wait_for_next_tick", side_effect=stop_after_ticks):
+            watcher.run()
+
+    def test_profiles_requested_ticks_and_writes_report(self):
+        """Test that --profile writes pstats and a per-subsystem report after N ticks."""
+        watcher = FileWatcher(self.config_file)
+        watcher.start_profiling(self.profile_file, ticks=3, trace_memory=True)
+        self._run_ticks(watcher, 5)
+
+        assert watcher._profiler is None
+        assert not tracemalloc.is_tracing()
+        stats = pstats.Stats(self.profile_file)
+        assert any(function_name == "check_files" for _, _, function_name in stats.stats)
+
+        with open(f"{self.profile_file}.txt") as f:
+            report = f.read()
+        assert "Profiled ticks: 3" in report
+        for subsystem in ("stat", "time-period checks", "process scan", "scheduling", "command dispatch", "printing"):
+            assert subsystem in report
+        assert "Top allocation growth since the first tick" in report
+
+    def test_stopping_early_writes_partial_profile(self):
+        """Test that stopping the watcher writes the ticks profiled so far."""
+        watcher = FileWatcher(self.config_file)
+        watcher.start_profiling(self.profile_file, ticks=1000)
+        self._run_ticks(watcher, 2)
+
+        with open(f"{self.profile_file}.txt") as f:
+            assert "Profiled ticks: 2" in f.read()
+
+    def test_classify_function(self):
+        """Test that profiled functions are attributed to the expected subsystems."""
+        assert LoopProfiler.classify_function(("~", 0, "<built-in method posix.stat>")) == "stat"
+        assert LoopProfiler.classify_function(("/src/time_period_checker.py", 1, "f")) == "time-period checks"
+        assert LoopProfiler.classify_function(("/src/process_detector.py", 1, "f")) == "process scan"
+        assert LoopProfiler.classify_function(("/usr/lib/subprocess.py", 1, "run")) == "command dispatch"
+        assert LoopProfiler.classify_function(("/src/shell_session.py", 1, "run")) == "command dispatch"
+        assert LoopProfiler.classify_function(("~", 0, "<built-in method posix.posix_spawnp>")) == "command dispatch"
+        assert LoopProfiler.classify_function(("~", 0, "<built-in method select.select>")) == "command dispatch"
+        assert LoopProfiler.classify_function(("/src/timer_wheel.py", 1, "pop_until")) == "scheduling"
+        assert LoopProfiler.classify_function(("~", 0, "<built-in method builtins.print>")) == "printing"
+        assert LoopProfiler.classify_function(("/src/interval_parser.py", 1, "f")) == "other"
+
+    def test_control_socket_toggle(self):
+        """Test that the profile control command starts and stops profiling."""
+        watcher = FileWatcher(self.config_file)
+
+        response = ControlServer.dispatch("profile on 5", watcher._handle_control_command)
+        assert response == {"ok": True, "profiling": True, "output": self.profile_file, "ticks": 5}
+        watcher._profiler.begin_tick()
+        watcher._check_files()
+        watcher._profiler.end_tick()
+
+        response = ControlServer.dispatch("profile off", watcher._handle_control_command)
+        assert response == {"ok": True, "profiling": False, "stopped": True}
+        assert watcher._profiler is None
+        assert os.path.exists(self.profile_file)
+
+        response = ControlServer.dispatch("profile sideways", watcher._handle_control_command)
+        assert response["ok"] is False
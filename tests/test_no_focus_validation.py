@@ -202,7 +202,7 @@ no_focus = true
         import io
         from unittest.mock import patch
 
-        from file_monitor import FileMonitor
+        from config_validator import ConfigValidator
 
         # Entry with no_focus=true and argv but no command
         settings = {
@@ -210,11 +210,11 @@ no_focus = true
             "argv": ["notepad.exe", "test.txt"],
             "no_focus": True,
         }
-        # _should_process_entry should return True (no warning, entry is processed)
+        # The entry breaks no rule (no warning, entry is processed)
         captured_output = io.StringIO()
         with patch("sys.stdout", captured_output):
-            result = FileMonitor._should_process_entry("test.txt", settings, None)
-        self.assertTrue(result)
+            violation = ConfigValidator.get_entry_rule_violation(settings)
+        self.assertIsNone(violation)
         self.assertNotIn("No command specified", captured_output.getvalue())
 
     def test_no_command_and_no_argv_should_warn(self):
@@ -222,15 +222,16 @@ no_focus = true
         import io
         from unittest.mock import patch
 
-        from file_monitor import FileMonitor
+        from config_validator import ConfigValidator
 
         # Entry with no command and no argv
         settings = {"path": "test.txt"}
-        # _should_process_entry should return False (warning printed, entry skipped)
+        # The entry breaks a rule (warning printed, entry skipped)
         captured_output = io.StringIO()
         with patch("sys.stdout", captured_output):
-            result = FileMonitor._should_process_entry("test.txt", settings, None)
-        self.assertFalse(result)
+            violation = ConfigValidator.get_entry_rule_violation(settings)
+            self.assertIsNotNone(violation)
+            ConfigValidator.report_entry_rule_violation(violation, None)
         self.assertIn("No command specified", captured_output.getvalue())
 
 
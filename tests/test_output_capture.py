@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Tests for bounded per-entry command output capture
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from command_executor import CommandExecutor
+from config_loader import ConfigLoader
+from output_capture import OutputCapture
+from process_spawner import ProcessSpawner
+
+pytestmark = pytest.mark.skipif(not OutputCapture.is_supported(), reason="output capture needs a POSIX platform")
+
+
+class TestOutputCapture:
+    """Test cases for streaming command output into per-entry ring buffers."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = os.path.realpath(tempfile.mkdtemp())
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.error_log = os.path.join(self.test_dir, "errors.log")
+        self.config = {"capture_output": True, "error_log_file": self.error_log}
+        OutputCapture.configure({})
+        OutputCapture.reset()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        OutputCapture.configure({})
+        OutputCapture.reset()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _execute(self, settings, config=None):
+        """Run an entry's command, returning the lines printed for its output."""
+        with patch("output_capture.TimestampPrinter.print") as mock_print:
+            CommandExecutor.execute_command(
+                settings["command"], settings.get("path", ""), settings, self.config if config is None else config
+            )
+        # Output lines start with the entry's label, messages of the executor do not
+        return [call.args[0] for call in mock_print.call_args_list if call.args[0].startswith("[")]
+
+    @pytest.mark.parametrize("posix_spawn", [False, True])
+    def test_lines_are_prefixed_and_kept(self, posix_spawn):
+        """Test that shell and direct commands stream prefixed lines and keep their output."""
+        shell_entry = {"path": "", "command": "echo one; echo two >&2; printf three", "cwd": self.test_dir}
+        direct_entry = {"path": "src/app.c", "command": "printf 'a\\nb\\n'"}
+        with patch.object(ProcessSpawner, "uses_posix_spawn", return_value=posix_spawn):
+            assert self._execute(shell_entry) == [
+                f"[{shell_entry['command']}] {line}" for line in ("one", "two", "three")
+            ]
+            assert self._execute(direct_entry) == ["[src/app.c] a", "[src/app.c] b"]
+        assert OutputCapture.get_output(shell_entry) == "one\ntwo\nthree"
+        assert OutputCapture.get_output(direct_entry) == "a\nb\n"
+
+    def test_capture_is_opt_in_per_entry(self):
+        """Test that output is only captured where capture_output is enabled."""
+        entry = {"path": "", "command": "echo hidden"}
+        assert self._execute(entry, {}) == []
+        assert OutputCapture.get_output(entry) == ""
+        entry["capture_output"] = True
+        assert self._execute(entry, {}) == ["[echo hidden] hidden"]
+
+    def test_buffers_are_bounded(self):
+        """Test the per-entry size, the total size and the line length limits."""
+        OutputCapture.configure({"output_buffer_size": 1000})
+        chatty = {"path": "", "command": "seq 1 20000"}
+        self._execute(chatty)
+        assert OutputCapture.get_output(chatty).endswith("19999\n20000\n")
+        assert OutputCapture.get_output_size(chatty) == 1000
+
+        long_line = {"path": "", "command": f"head -c {OutputCapture.MAX_LINE_BYTES * 2 + 10} /dev/zero"}
+        assert len(self._execute(long_line)) == 3
+
+        with patch.object(OutputCapture, "MAX_TOTAL_BYTES", 2500):
+            for number in range(3):
+                self._execute({"path": "", "command": f"head -c 1000 /dev/zero # {number}"})
+        assert OutputCapture.get_stats() == {"output_buffers": 2, "output_buffer_bytes": 2000}
+        assert OutputCapture.get_output(chatty) == ""
+
+    def test_failure_output_goes_to_error_log(self):
+        """Test that the captured output of failing and timed out commands is logged."""
+        self._execute({"path": "", "command": "echo compile error in main.c; exit 2"})
+        with patch.object(CommandExecutor, "COMMAND_TIMEOUT", 0.5):
+            with pytest.raises(Exception):
+                self._execute({"path": "", "command": "echo started; exec sleep 30"})
+        with open(self.error_log) as f:
+            log = f.read()
+        assert "exit code 2" in log and "compile error in main.c" in log
+        assert "timed out" in log and "started" in log
+
+    def test_error_log_has_only_the_failed_run(self):
+        """Test that each run starts a new buffer and late output of an earlier run is not kept."""
+        entry = {"path": "", "command": 'echo "$RUN"; test "$RUN" = passing'}
+        with patch.dict(os.environ, {"RUN": "passing"}):
+            self._execute(entry)
+        with patch.dict(os.environ, {"RUN": "broken"}):
+            self._execute(entry)
+        with open(self.error_log) as f:
+            log = f.read()
+        assert "Output (last 7 bytes):\nbroken\n" in log and "\npassing\n" not in log
+        assert OutputCapture.get_output(entry) == "broken\n"
+
+        with patch("output_capture.TimestampPrinter.print") as mock_print:
+            earlier = OutputCapture.open(entry)
+            current = OutputCapture.open(entry)
+            earlier.feed(b"late\n")
+            current.feed(b"current\n")
+        assert OutputCapture.get_output(entry) == "current\n"
+        assert OutputCapture.get_stats() == {"output_buffers": 1, "output_buffer_bytes": 8}
+        assert mock_print.call_count == 2
+
+    def test_background_process_does_not_block(self):
+        """Test that a command is done when it exits even if a background child keeps the pipe open."""
+        started = time.monotonic()
+        lines = self._execute({"path": "", "command": "sleep 5 & echo done"})
+        assert time.monotonic() - started < 3
+        assert lines == ["[sleep 5 & echo done] done"]
+
+    @pytest.mark.parametrize("posix_spawn", [False, True])
+    def test_background_output_after_exit_is_read(self, posix_spawn):
+        """Test that a background child writing after the command exited does not get EPIPE."""
+        marker = os.path.join(self.test_dir, "written")
+        entry = {"path": "", "command": f"(sleep 0.3; echo late && touch {marker}) & echo done"}
+        with patch.object(ProcessSpawner, "uses_posix_spawn", return_value=posix_spawn):
+            with patch("output_capture.TimestampPrinter.print") as mock_print:
+                CommandExecutor.execute_command(entry["command"], "", entry, self.config)
+                deadline = time.monotonic() + 5
+                while not os.path.exists(marker) and time.monotonic() < deadline:
+                    time.sleep(0.05)
+                while OutputCapture.get_output(entry) != "done\nlate\n" and time.monotonic() < deadline:
+                    time.sleep(0.05)
+        assert os.path.exists(marker)
+        assert OutputCapture.get_output(entry) == "done\nlate\n"
+        assert f"[{entry['command']}] late" in [call.args[0] for call in mock_print.call_args_list]
+
+    @pytest.mark.parametrize("output", [None, lambda chunk: None])
+    def test_exit_is_waited_on_without_polling(self, output):
+        """Test that the exit of a command with idle or no captured output wakes the wait once."""
+        import select
+
+        if not hasattr(os, "pidfd_open") and not hasattr(select, "kqueue"):
+            pytest.skip("the platform cannot wait on a process with select")
+        with patch.object(ProcessSpawner, "uses_posix_spawn", return_value=True):
+            with patch("time.sleep") as mock_sleep, patch("select.select", wraps=select.select) as mock_select:
+                result = ProcessSpawner.run(["sh", "-c", "sleep 0.3; exit 3"], False, None, 5, output=output)
+        assert result.returncode == 3
+        mock_sleep.assert_not_called()
+        assert mock_select.call_count <= 3
+
+    def test_status_and_stats_report_output(self):
+        """Test that the control socket status and dump-stats expose the kept output."""
+        with open(self.config_file, "w") as f:
+            f.write('capture_output = true\n[[commands]]\ncommand = "echo built"\ngroup = "build"\n')
+        watcher = FileWatcher(self.config_file)
+        entry = watcher.config["files"][0]
+        self._execute(entry, watcher.config)
+
+        assert watcher._handle_control_command("status", "")["entries"][0]["output_bytes"] == 6
+        assert "output" not in watcher._handle_control_command("status", "")["entries"][0]
+        assert watcher._handle_control_command("status", "build")["entries"][0]["output"] == "built\n"
+        assert watcher._handle_control_command("dump-stats", "")["stats"]["output_buffer_bytes"] == 6
+
+    def test_invalid_options(self):
+        """Test that invalid capture options are rejected at load."""
+        with open(self.config_file, "w") as f:
+            f.write('[[commands]]\ncommand = "echo ok"\n[[commands]]\ncommand = "echo ok"\ncapture_output = "yes"\n')
+        with patch("config_validator.TimestampPrinter.print"):
+            config = ConfigLoader.load_config(self.config_file)
+        assert len(config["files"]) == 1
+        assert "capture_output must be true or false" in config["quarantined_files"][0]["reason"]
+
+        for option in ("output_buffer_size = 0", f"output_buffer_size = {OutputCapture.MAX_BUFFER_SIZE + 1}"):
+            with open(self.config_file, "w") as f:
+                f.write(f'{option}\n[[commands]]\ncommand = "echo ok"\n')
+            with pytest.raises(SystemExit):
+                ConfigLoader.load_config(self.config_file)
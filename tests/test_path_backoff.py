@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Tests for exponential backoff of missing or erroring paths
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from path_backoff import PathBackoff
+
+
+class TestPathBackoff:
+    """Test cases for PathBackoff state handling."""
+
+    def test_interval_unchanged_below_threshold(self):
+        """Test that the configured interval is used until the threshold is reached."""
+        file_backoff = {"#0": {"kind": "missing", "failures": PathBackoff.THRESHOLD - 1, "parent_mtime": None}}
+        assert PathBackoff.get_effective_interval(file_backoff, "#0", 1.0, {}) == 1.0
+        assert PathBackoff.get_effective_interval({}, "#0", 1.0, {}) == 1.0
+
+    def test_interval_grows_and_is_capped(self):
+        """Test that the interval doubles per failure and stops at backoff_max_interval."""
+        config = {"backoff_max_interval": "10s"}
+        file_backoff = {"#0": {"kind": "missing", "failures": PathBackoff.THRESHOLD, "parent_mtime": None}}
+        assert PathBackoff.get_effective_interval(file_backoff, "#0", 1.0, config) == 2.0
+
+        file_backoff["#0"]["failures"] += 1
+        assert PathBackoff.get_effective_interval(file_backoff, "#0", 1.0, config) == 4.0
+
+        file_backoff["#0"]["failures"] += 10
+        assert PathBackoff.get_effective_interval(file_backoff, "#0", 1.0, config) == 10.0
+
+    def test_ceiling_never_below_configured_interval(self):
+        """Test that a ceiling below the configured interval does not speed up polling."""
+        config = {"backoff_max_interval": "1s"}
+        file_backoff = {"#0": {"kind": "error", "failures": 10, "parent_mtime": None}}
+        assert PathBackoff.get_effective_interval(file_backoff, "#0", 5.0, config) == 5.0
+
+    def test_record_error_reports_only_first(self):
+        """Test that only the first error of a streak should be reported."""
+        file_backoff = {}
+        results = [PathBackoff.record_error(file_backoff, "#0") for _ in range(PathBackoff.THRESHOLD + 2)]
+        assert [should_report for should_report, _ in results].count(True) == 1
+        assert [started for _, started in results].count(True) == 1
+        assert results[PathBackoff.THRESHOLD - 1][1] is True
+
+
+class TestFileWatcherBackoff:
+    """Test cases for backoff integration in the file watcher."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "test_config.toml")
+        self.error_log_file = os.path.join(self.test_dir, "error.log")
+        self.missing_file = os.path.join(self.test_dir, "missing.txt")
+        self.test_file = os.path.join(self.test_dir, "test.txt")
+        with open(self.test_file, "w") as f:
+            f.write("Initial content\n")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _make_due(self, watcher, entry_key, seconds):
+        """Pretend the last check of an entry happened the given number of seconds ago."""
+        watcher.file_last_check[entry_key] = time.monotonic() - seconds
+        watcher.interval_scheduler.invalidate()
+
+    def test_missing_file_backs_off(self):
+        """Test that a missing file is not stat'ed at every interval after repeated misses."""
+        config_content = f'''default_interval = "1s"
+
+[[files]]
+path = "{self.missing_file}"
+command = "echo 'changed'"
+'''
+        with open(self.config_file, "w") as f:
+            f.write(config_content)
+
+        watcher = FileWatcher(self.config_file)
+        for _ in range(PathBackoff.THRESHOLD):
+            self._make_due(watcher, "#0", 1.1)
+            watcher._check_files()
+
+        assert watcher.file_backoff["#0"]["failures"] == PathBackoff.THRESHOLD
+
+        # Base interval elapsed but backed-off interval (2s) did not: no check
+        self._make_due(watcher, "#0", 1.1)
+        last_check = watcher.file_last_check["#0"]
+        watcher._check_files()
+        assert watcher.file_last_check["#0"] == last_check
+        assert watcher.file_backoff["#0"]["failures"] == PathBackoff.THRESHOLD
+
+        # Backed-off interval elapsed: checked again
+        self._make_due(watcher, "#0", 2.1)
+        watcher._check_files()
+        assert watcher.file_backoff["#0"]["failures"] == PathBackoff.THRESHOLD + 1
+
+    def test_backed_off_parent_checked_per_interval(self):
+        """Test that the parent of a backed-off path is looked at once per interval, not every tick."""
+        with open(self.config_file, "w") as f:
+            f.write(
+                f'default_interval = "1s"\nbackoff_max_interval = "1h"\n[[files]]\npath = "{self.missing_file}"\ncommand = "true"\n'
+            )
+
+        watcher = FileWatcher(self.config_file)
+        for _ in range(PathBackoff.THRESHOLD + 2):
+            self._make_due(watcher, "#0", 1000)
+            watcher._check_files()
+        self._make_due(watcher, "#0", 1.1)
+
+        with patch.object(PathBackoff, "has_parent_changed", return_value=False) as mock_parent:
+            for _ in range(5):
+                watcher._check_files()
+        assert mock_parent.call_count == 1
+
+    def test_missing_file_snaps_back_when_created(self):
+        """Test that backoff ends as soon as the path reappears in the parent directory."""
+        config_content = f'''default_interval = "1s"
+backoff_max_interval = "1h"
+
+[[files]]
+path = "{self.missing_file}"
+command = "echo 'changed'"
+'''
+        with open(self.config_file, "w") as f:
+            f.write(config_content)
+
+        watcher = FileWatcher(self.config_file)
+        for _ in range(PathBackoff.THRESHOLD + 5):
+            self._make_due(watcher, "#0", 1000)
+            watcher._check_files()
+        assert PathBackoff.is_backing_off(watcher.file_backoff, "#0")
+
+        # Ensure the parent directory mtime visibly changes
+        parent_mtime_ns = watcher.file_backoff["#0"]["parent_mtime"]
+        with open(self.missing_file, "w") as f:
+            f.write("Now it exists\n")
+        os.utime(self.test_dir, ns=(parent_mtime_ns + 10**9, parent_mtime_ns + 10**9))
+
+        self._make_due(watcher, "#0", 1.1)
+        watcher._check_files()
+        assert "#0" not in watcher.file_backoff
+        assert "#0" in watcher.file_timestamps
+
+    def test_repeated_errors_logged_once(self):
+        """Test that repeated errors for the same entry do not spam the error log."""
+        config_content = f'''default_interval = "1s"
+error_log_file = "{self.error_log_file}"
+
+[[files]]
+path = "{self.test_file}"
+command = "echo 'changed'"
+'''
+        with open(self.config_file, "w") as f:
+            f.write(config_content)
+
+        watcher = FileWatcher(self.config_file)
+        with patch("file_monitor.FileMonitor._process_entry", side_effect=RuntimeError("boom")):
+            for _ in range(PathBackoff.THRESHOLD + 3):
+                self._make_due(watcher, "#0", 1000)
+                watcher._check_files()
+
+        with open(self.error_log_file, "r") as f:
+            log_content = f.read()
+        assert log_content.count("Error processing file") == 1
+        assert log_content.count("backing off") == 1
+
+    def test_error_recovery_resets_backoff(self):
+        """Test that a successful check clears the error backoff state."""
+        config_content = f'''default_interval = "1s"
+
+[[files]]
+path = "{self.test_file}"
+command = "echo 'changed'"
+'''
+        with open(self.config_file, "w") as f:
+            f.write(config_content)
+
+        watcher = FileWatcher(self.config_file)
+        with patch("file_monitor.FileMonitor._process_entry", side_effect=RuntimeError("boom")):
+            for _ in range(PathBackoff.THRESHOLD):
+                self._make_due(watcher, "#0", 1000)
+                watcher._check_files()
+        assert PathBackoff.is_backing_off(watcher.file_backoff, "#0")
+
+        self._make_due(watcher, "#0", 1000)
+        watcher._check_files()
+        assert "#0" not in watcher.file_backoff
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the baseline-tracked performance regression harness
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import perf_harness
+import pytest
+
+
+class TestPerfHarness:
+    """Test cases for measuring scenarios and comparing them against baselines."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.baseline_file = os.path.join(self.test_dir, "baselines.json")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_compare_reports_regressions(self):
+        """Test that only slowdowns beyond the threshold regress, with a readable report."""
+        baselines = {"fast": {"relative": 1.0}, "slow": {"relative": 1.0}}
+        results = {"fast": {"relative": 0.8}, "slow": {"relative": 1.5}, "added": {"relative": 2.0}}
+
+        regressed, report = perf_harness.compare(baselines, results, threshold=0.25)
+        assert regressed == ["slow"]
+        lines = report.splitlines()
+        assert lines[1].split() == ["fast", "1.000x", "0.800x", "-20.0%"]
+        assert lines[2].split()[:4] == ["slow", "1.000x", "1.500x", "+50.0%"]
+        assert "REGRESSED (threshold +25%)" in lines[2]
+        assert "new, no baseline" in lines[3]
+
+        assert perf_harness.compare(baselines, results, threshold=0.6)[0] == []
+
+    def test_save_keeps_other_baselines(self):
+        """Test that updating some scenarios keeps the baselines of the others."""
+        perf_harness.save_baselines({"a": {"seconds": 1.0, "relative": 1.0}}, self.baseline_file)
+        perf_harness.save_baselines({"b": {"seconds": 2.0, "relative": 2.0}}, self.baseline_file)
+        assert set(perf_harness.load_baselines(self.baseline_file)) == {"a", "b"}
+        assert perf_harness.load_baselines(os.path.join(self.test_dir, "missing.json")) == {}
+
+    def test_scenarios_run(self):
+        """Test that every scenario runs at a small scale."""
+        results = perf_harness.measure(scale=0.01)
+        assert set(results) == set(perf_harness.SCENARIOS)
+        assert all(result["relative"] > 0 for result in results.values())
+
+    def test_stored_baselines_cover_scenarios(self):
+        """Test that the committed baselines cover every scenario."""
+        with open(perf_harness.BASELINE_FILE) as f:
+            assert set(json.load(f)["scenarios"]) == set(perf_harness.SCENARIOS)
+
+    @pytest.mark.skipif(not os.environ.get("PERF_HARNESS"), reason="set PERF_HARNESS=1 to compare against baselines")
+    def test_no_regressions(self):
+        """Test that no scenario regressed beyond the threshold (PERF_HARNESS_THRESHOLD, default 25%)."""
+        threshold = float(os.environ.get("PERF_HARNESS_THRESHOLD", perf_harness.DEFAULT_THRESHOLD))
+        regressed, report = perf_harness.compare(perf_harness.load_baselines(), perf_harness.measure(), threshold)
+        assert not regressed, f"Performance regressed:\n{report}"
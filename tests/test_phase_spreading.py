@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for phase spreading and jitter of entries with identical intervals
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from config_loader import ConfigLoader
+from deadline_scheduler import DeadlineScheduler
+from file_monitor import FileMonitor
+from phase_spreader import PhaseSpreader
+
+
+class TestPhaseSpreading:
+    """Test cases for spreading entry phases across their interval."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.watched_file = os.path.join(self.test_dir, "watched.txt")
+        self.marker_file = os.path.join(self.test_dir, "marker.txt")
+        with open(self.watched_file, "w") as f:
+            f.write("content\n")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_phase_is_deterministic_and_evenly_spread(self):
+        """Test that phases depend only on identity and cover the interval evenly."""
+        entries = [{"path": "", "command": f"echo {index}"} for index in range(2000)]
+        phases = [PhaseSpreader.get_phase(entry, 60.0) for entry in entries]
+
+        assert phases == [PhaseSpreader.get_phase(dict(entry), 60.0) for entry in entries]
+        assert all(0.0 <= phase < 60.0 for phase in phases)
+        for decile in range(10):
+            share = sum(1 for phase in phases if decile * 6 <= phase < (decile + 1) * 6) / len(phases)
+            assert 0.07 < share < 0.13
+
+    def test_file_entries_spread_after_first_check(self):
+        """Test that file entries are baselined at once, then come due at their own phases."""
+        config = {
+            "default_interval": "10s",
+            "spread_phases": True,
+            "files": [{"path": self.watched_file, "command": f"echo {index}"} for index in range(200)],
+        }
+        file_timestamps, file_last_check = FileMonitor.check_files(config, {}, {})
+        now = time.monotonic()
+
+        assert len(file_timestamps) == 200
+        next_due = sorted(last_check + 10.0 - now for last_check in file_last_check.values())
+        assert next_due[0] < 1.0 and next_due[-1] > 9.0
+        # No second of the interval holds more than a fifth of the entries
+        assert all(sum(1 for due in next_due if second <= due < second + 1) <= 40 for second in range(10))
+
+    def test_periodic_command_first_run_deferred_to_phase(self):
+        """Test that periodic commands do not all run on the first tick."""
+        entry = {"path": "", "command": f"echo run >> {self.marker_file}", "interval": "1h"}
+        config = {"spread_phases": True, "files": [entry]}
+        _, file_last_check = FileMonitor.check_files(config, {}, {})
+
+        assert not os.path.exists(self.marker_file)
+        expected = time.monotonic() - 3600 + PhaseSpreader.get_phase(entry, 3600)
+        assert file_last_check["#0"] == pytest.approx(expected, abs=1.0)
+
+    def test_without_spreading_entries_run_immediately(self):
+        """Test that spreading is opt-in."""
+        config = {"files": [{"path": "", "command": f"echo run >> {self.marker_file}", "interval": "1h"}]}
+        FileMonitor.check_files(config, {}, {})
+        assert os.path.exists(self.marker_file)
+
+    def test_jitter_delays_next_check(self):
+        """Test that jitter delays each check by up to the configured amount, entry overriding default."""
+        config = {"default_jitter": "5s", "files": [{"path": self.watched_file, "command": "echo"}]}
+        assert PhaseSpreader.get_jitter(config, config["files"][0]) == 5.0
+        assert PhaseSpreader.get_jitter(config, {"jitter": "500ms"}) == 0.5
+        assert PhaseSpreader.get_jitter({}, {}) == 0.0
+
+        before = time.monotonic()
+        _, file_last_check = FileMonitor.check_files(config, {}, {})
+        assert before <= file_last_check["#0"] <= time.monotonic() + 5.0
+
+    def test_jitter_delays_cron_firing(self):
+        """Test that jitter also delays cron-scheduled firings."""
+        config = {
+            "default_jitter": "30s",
+            "files": [{"path": "", "command": "echo", "schedule": "0 * * * *", "timezone": "UTC"}],
+        }
+        start = 1_700_000_000.0  # 22:13:20 UTC
+        scheduler = DeadlineScheduler()
+        scheduler.load(config, now=start)
+        assert start + 2800 <= scheduler.get_deadline("#0") <= start + 2830
+
+    def test_invalid_options_rejected(self):
+        """Test that invalid spreading options are reported at load."""
+        with open(self.config_file, "w") as f:
+            f.write('spread_phases = "yes"\n\n[[commands]]\ncommand = "echo"\n')
+        with pytest.raises(SystemExit):
+            ConfigLoader.load_config(self.config_file)
+
+        with open(self.config_file, "w") as f:
+            f.write('[[commands]]\ncommand = "echo"\njitter = "soon"\n')
+        config = ConfigLoader.load_config(self.config_file)
+        assert "Invalid jitter" in config["quarantined_files"][0]["reason"]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for starting commands without forking the watcher
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from command_executor import CommandExecutor
+from process_spawner import ProcessSpawner
+
+# Compares spawn times with and without 512 MB of touched memory in a fresh interpreter
+RSS_SCRIPT = textwrap.dedent(
+    """
+    import statistics, sys, time
+    sys.path.insert(0, sys.argv[1])
+    from process_spawner import ProcessSpawner
+
+    def spawn_ms():
+        samples = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(10):
+                ProcessSpawner.run("true", True, None, 30)
+            samples.append((time.perf_counter() - start) * 100)
+        return statistics.median(samples)
+
+    small = spawn_ms()
+    ballast = [bytearray(b"x" * (1 << 20)) for _ in range(512)]
+    print(small, spawn_ms())
+    """
+)
+
+
+@pytest.mark.skipif(os.name != "posix", reason="posix_spawn is POSIX only")
+class TestProcessSpawner:
+    """Test cases for the process spawner."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = os.path.realpath(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def posix_spawn(self):
+        """Force the posix_spawn path, which is otherwise used only where subprocess forks."""
+        with patch.object(ProcessSpawner, "uses_posix_spawn", return_value=True):
+            yield
+
+    def test_posix_spawn_shell_command(self, posix_spawn):
+        """Test that shell commands get their exit code and cwd through posix_spawn."""
+        out_file = os.path.join(self.test_dir, "out.txt")
+        result = ProcessSpawner.run(f"pwd > {out_file}; exit 3", True, self.test_dir, 5)
+        assert result.returncode == 3
+        with open(out_file) as f:
+            assert f.read().strip() == self.test_dir
+
+    def test_posix_spawn_argv_in_cwd(self, posix_spawn):
+        """Test that argv commands keep their arguments and run in their cwd."""
+        argv = ["sh", "-c", 'test "$(pwd) $0 $1" = "$2 first arg second"', "first arg", "second", self.test_dir]
+        assert ProcessSpawner.run(argv, False, self.test_dir, 5).returncode == 0
+        assert ProcessSpawner.run(argv, False, None, 5).returncode == 1
+        assert ProcessSpawner.run(["true"], False, self.test_dir, 5, executable=shutil.which("false")).returncode == 1
+
+    def test_posix_spawn_timeout_kills_command(self, posix_spawn):
+        """Test that a timed out command is killed and reported like with subprocess."""
+        pid_file = os.path.join(self.test_dir, "pid.txt")
+        with patch.object(CommandExecutor, "COMMAND_TIMEOUT", 0.5), patch("command_executor.TimestampPrinter.print"):
+            with pytest.raises(subprocess.TimeoutExpired):
+                CommandExecutor.execute_command(f"echo $$ > {pid_file}; exec sleep 30", "", {})
+        with open(pid_file) as f:
+            pid = int(f.read())
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+    def test_spawn_from_large_watcher(self):
+        """Test that a watcher holding a lot of memory still starts commands and gets their exit code."""
+        ballast = [bytearray(1 << 20) for _ in range(32)]
+        assert ProcessSpawner.run("exit 4", True, self.test_dir, 5).returncode == 4
+        assert ProcessSpawner.run(["true"], False, None, 5).returncode == 0
+        del ballast
+
+    @pytest.mark.skipif(not os.environ.get("PERF_HARNESS"), reason="set PERF_HARNESS=1 to compare spawn times")
+    def test_spawn_cost_does_not_grow_with_memory(self):
+        """Test that starting a command does not get much slower with a large watcher."""
+        src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+        result = subprocess.run(
+            [sys.executable, "-c", RSS_SCRIPT, src_dir], capture_output=True, text=True, timeout=120, check=True
+        )
+        small, large = map(float, result.stdout.split())
+        # A fork would copy about 1 MB of page tables here, taking several times as long
+        assert large < small * 2 + 1.0, f"{small:.2f} ms per spawn at startup, {large:.2f} ms with 512 MB"
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for running Python script commands in warm workers
+"""
+
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from command_executor import CommandExecutor
+from config_loader import ConfigLoader
+from python_worker_pool import PythonWorkerPool
+
+pytestmark = pytest.mark.skipif(not PythonWorkerPool.is_supported(), reason="python workers need os.fork")
+
+# The interpreter running the tests, which the workers run as well
+PYTHON = shlex.quote(sys.executable)
+
+# Records how it was run, then exits with the code given as its first argument
+REPORT_SCRIPT = """
+import json, os, sys
+with open(os.environ["REPORT_FILE"], "a") as f:
+    f.write(json.dumps({
+        "name": __name__,
+        "argv": sys.argv,
+        "cwd": os.getcwd(),
+        "worker": os.getppid(),
+        "preloaded": "decimal" in sys.modules,
+    }) + "\\n")
+sys.exit(int(sys.argv[1]))
+"""
+
+
+class TestPythonWorkerPool:
+    """Test cases for the python-worker runner."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = os.path.realpath(tempfile.mkdtemp())
+        self.script = os.path.join(self.test_dir, "report.py")
+        self.report_file = os.path.join(self.test_dir, "report.jsonl")
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        with open(self.script, "w") as f:
+            f.write(REPORT_SCRIPT)
+        os.environ["REPORT_FILE"] = self.report_file
+        PythonWorkerPool.configure({"python_worker_preload": ["decimal"]})
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        PythonWorkerPool.shutdown()
+        PythonWorkerPool.configure({})
+        os.environ.pop("REPORT_FILE", None)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _read_reports(self):
+        """Read the runs recorded by the report script."""
+        with open(self.report_file) as f:
+            return [json.loads(line) for line in f]
+
+    def test_parse_command(self):
+        """Test that scripts and modules are recognized and other commands rejected."""
+        assert PythonWorkerPool.parse_command("python3 tools/gen.py -o 'out dir'") == (
+            None,
+            ["tools/gen.py", "-o", "out dir"],
+        )
+        assert PythonWorkerPool.parse_command("/usr/bin/python3.12 -m pkg.tool x") == ("pkg.tool", ["pkg.tool", "x"])
+        for command in ("make build", "python", "python -u script.py", "python -", "python 'unterminated"):
+            with pytest.raises(ValueError):
+                PythonWorkerPool.parse_command(command)
+
+    def test_runs_script_in_warm_worker(self):
+        """Test that scripts run with their argv and cwd in a reused worker with preloaded modules."""
+        settings = {"command": f"{PYTHON} {self.script} 0 first", "runner": "python-worker", "cwd": self.test_dir}
+        assert CommandExecutor.execute_command(settings["command"], "", settings)
+        settings["command"] = f"{PYTHON} {self.script} 0 second"
+        assert CommandExecutor.execute_command(settings["command"], "", settings)
+
+        first, second = self._read_reports()
+        assert first["name"] == "__main__"
+        assert first["argv"] == [self.script, "0", "first"]
+        assert second["argv"][2] == "second"
+        assert first["cwd"] == self.test_dir
+        assert first["preloaded"]
+        assert first["worker"] == second["worker"] != os.getpid()
+
+    def test_other_interpreter_uses_shell(self):
+        """Test that a command naming another interpreter is reported at load and runs through the shell."""
+        other_python = os.path.join(self.test_dir, "python3")
+        with open(other_python, "w") as f:
+            f.write('#!/bin/sh\necho "{\\"worker\\": \\"other\\"}" > "$REPORT_FILE"\n')
+        os.chmod(other_python, 0o755)
+        settings = {"command": f"./python3 {self.script} 0", "runner": "python-worker", "cwd": self.test_dir}
+
+        with patch("python_worker_pool.TimestampPrinter.print") as mock_print:
+            PythonWorkerPool.configure({"files": [settings]})
+        assert mock_print.call_count == 1
+        assert "not the interpreter running the watcher" in mock_print.call_args.args[0]
+        assert PythonWorkerPool.uses_watcher_interpreter(f"{PYTHON} {self.script}", None)
+
+        with patch.object(PythonWorkerPool, "run") as mock_run:
+            assert CommandExecutor.execute_command(settings["command"], "", settings)
+        mock_run.assert_not_called()
+        assert self._read_reports() == [{"worker": "other"}]
+
+    def test_other_venv_is_another_interpreter(self):
+        """Test that a venv's python is not the watcher's although it links to the same binary."""
+        for venv in ("venv-a", "venv-b"):
+            os.makedirs(os.path.join(self.test_dir, venv, "bin"))
+            with open(os.path.join(self.test_dir, venv, "pyvenv.cfg"), "w") as f:
+                f.write(f"home = {os.path.dirname(sys.executable)}\n")
+            os.symlink(sys.executable, os.path.join(self.test_dir, venv, "bin", "python"))
+        command = f"venv-a/bin/python {self.script} 0"
+
+        assert not PythonWorkerPool.uses_watcher_interpreter(command, self.test_dir)
+        with patch("python_worker_pool.sys.executable", os.path.join(self.test_dir, "venv-b", "bin", "python")):
+            PythonWorkerPool.configure({})
+            assert not PythonWorkerPool.uses_watcher_interpreter(command, self.test_dir)
+        with patch("python_worker_pool.sys.executable", os.path.join(self.test_dir, "venv-a", "bin", "python")):
+            PythonWorkerPool.configure({})
+            assert PythonWorkerPool.uses_watcher_interpreter(command, self.test_dir)
+        PythonWorkerPool.configure({})
+
+    def test_failure_is_reported(self):
+        """Test that a script's exit code reaches the failure handling."""
+        settings = {"command": f"{PYTHON} {self.script} 3", "runner": "python-worker"}
+        with patch("command_executor.TimestampPrinter.print") as mock_print:
+            CommandExecutor.execute_command(settings["command"], "", settings)
+        messages = [call.args[0] for call in mock_print.call_args_list]
+        assert any("exit code 3" in message for message in messages)
+
+    def test_timeout_kills_worker(self):
+        """Test that a timed out script is killed with its worker, which is then replaced."""
+        settings = {"command": f"{PYTHON} {self.script} 0", "runner": "python-worker"}
+        sleep_script = os.path.join(self.test_dir, "sleep.py")
+        with open(sleep_script, "w") as f:
+            f.write("import time\ntime.sleep(30)\n")
+        sleep_settings = {"command": f"{PYTHON} {sleep_script}", "runner": "python-worker"}
+
+        CommandExecutor.execute_command(settings["command"], "", settings)
+        CommandExecutor.execute_command(settings["command"], "", settings)
+        with patch.object(CommandExecutor, "COMMAND_TIMEOUT", 0.5), patch("command_executor.TimestampPrinter.print"):
+            with pytest.raises(subprocess.TimeoutExpired):
+                CommandExecutor.execute_command(sleep_settings["command"], "", sleep_settings)
+        CommandExecutor.execute_command(settings["command"], "", settings)
+
+        reports = self._read_reports()
+        assert len(reports) == 3
+        assert reports[0]["worker"] == reports[1]["worker"] != reports[2]["worker"]
+
+    def test_invalid_runner_entries_quarantined(self):
+        """Test that unknown runners and non-Python python-worker commands are rejected at load."""
+        with open(self.config_file, "w") as f:
+            f.write(
+                '[[commands]]\ncommand = "echo ok"\nrunner = "shell"\n'
+                '[[commands]]\ncommand = "echo ok"\nrunner = "rocket"\n'
+                '[[commands]]\ncommand = "make build"\nrunner = "python-worker"\n'
+            )
+        with patch("config_validator.TimestampPrinter.print"):
+            config = ConfigLoader.load_config(self.config_file)
+        assert len(config["files"]) == 1
+        reasons = [entry["reason"] for entry in config["quarantined_files"]]
+        assert "runner must be one of" in reasons[0]
+        assert "needs a command starting with python" in reasons[1]
+
+    def test_invalid_pool_size(self):
+        """Test that a non-positive python_worker_pool_size is rejected at load."""
+        with open(self.config_file, "w") as f:
+            f.write('python_worker_pool_size = 0\n[[commands]]\ncommand = "echo ok"\n')
+        with pytest.raises(SystemExit):
+            ConfigLoader.load_config(self.config_file)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Tests for the sharded multi-process watcher
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from command_executor import CommandExecutor
+from config_loader import ConfigLoader
+from file_monitor import FileMonitor
+from load_shedder import LoadShedder
+from python_worker_pool import PythonWorkerPool
+from sharded_watcher import ShardedFileWatcher, _ShardWorker
+from timestamp_printer import TimestampPrinter
+
+
+class TestShardPartition:
+    """Test cases for splitting entries into shards."""
+
+    def _make_config(self):
+        """Build a config with file entries and periodic commands."""
+        files = [{"path": f"file{index}.txt", "command": f"echo {index}"} for index in range(20)]
+        files.append({"path": "file0.txt", "command": "echo again"})
+        files.extend({"path": "", "command": f"echo periodic {index}", "interval": "5s"} for index in range(5))
+        return {"default_interval": "1s", "commands": [{"command": "echo x"}], "files": files}
+
+    def test_partition_is_complete_and_disjoint(self):
+        """Test that every entry ends up in exactly one shard."""
+        config = self._make_config()
+        shards = ShardedFileWatcher.partition(config, 3)
+
+        assert len(shards) == 3
+        assigned = [entry for shard in shards for entry in shard["files"]]
+        assert len(assigned) == len(config["files"])
+        assert sorted(map(repr, assigned)) == sorted(map(repr, config["files"]))
+
+    def test_partition_is_deterministic(self):
+        """Test that the same config is always split the same way."""
+        config = self._make_config()
+        assert ShardedFileWatcher.partition(config, 4) == ShardedFileWatcher.partition(config, 4)
+
+    def test_entries_for_same_path_share_a_shard(self):
+        """Test that all entries watching the same path go to the same worker."""
+        shards = ShardedFileWatcher.partition(self._make_config(), 4)
+        owners = [
+            index for index, shard in enumerate(shards) for entry in shard["files"] if entry["path"] == "file0.txt"
+        ]
+        assert len(owners) == 2
+        assert owners[0] == owners[1]
+
+    def test_shards_keep_global_settings(self):
+        """Test that shard configs carry global settings but not the pre-merge sections."""
+        for shard in ShardedFileWatcher.partition(self._make_config(), 2):
+            assert shard["default_interval"] == "1s"
+            assert "commands" not in shard
+
+
+class TestConcurrencyLimiter:
+    """Test cases for the global command concurrency limit."""
+
+    def teardown_method(self):
+        """Clear the limiter."""
+        CommandExecutor.set_concurrency_limiter(None)
+
+    def test_limiter_held_while_command_runs(self):
+        """Test that a command acquires and releases the limiter."""
+        limiter = MagicMock()
+        CommandExecutor.set_concurrency_limiter(limiter)
+        with patch("subprocess.run", return_value=MagicMock(returncode=0, stderr="", stdout="")):
+            CommandExecutor.execute_command("echo hi", "", {"command": "echo hi"})
+        limiter.acquire.assert_called_once()
+        limiter.release.assert_called_once()
+
+    def test_invalid_max_concurrent_commands_exits(self):
+        """Test that a non-positive max_concurrent_commands is rejected at load."""
+        test_dir = tempfile.mkdtemp()
+        try:
+            config_file = os.path.join(test_dir, "config.toml")
+            with open(config_file, "w") as f:
+                f.write('max_concurrent_commands = 0\n\n[[commands]]\ncommand = "echo hi"\n')
+            with pytest.raises(SystemExit):
+                ConfigLoader.load_config(config_file)
+        finally:
+            shutil.rmtree(test_dir, ignore_errors=True)
+
+
+class TestShardedFileWatcher:
+    """End-to-end test cases for the sharded watcher."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.test_files = [os.path.join(self.test_dir, f"test{index}.txt") for index in range(4)]
+        self.marker_files = [os.path.join(self.test_dir, f"marker{index}.txt") for index in range(4)]
+        for test_file in self.test_files:
+            with open(test_file, "w") as f:
+                f.write("Initial content\n")
+
+        entries = "".join(
+            f'\n[[files]]\npath = "{test_file}"\ncommand = "echo changed >> {marker_file}"\n'
+            for test_file, marker_file in zip(self.test_files, self.marker_files)
+        )
+        with open(self.config_file, "w") as f:
+            f.write(f'default_interval = "0.05s"\nmax_concurrent_commands = 1\n{entries}')
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        TimestampPrinter.set_output_sink(None)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _poll_until(self, watcher, condition, timeout=10.0):
+        """Poll the supervisor until condition() holds or the timeout expires."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            watcher.poll_once(timeout=0.05)
+            if condition():
+                return True
+        return False
+
+    def test_workers_detect_changes_in_all_shards(self):
+        """Test that changes to entries in every shard run their commands."""
+        watcher = ShardedFileWatcher(self.config_file, 2)
+        assert sum(len(shard["files"]) for shard in watcher._shards) == len(self.test_files)
+        watcher.start_workers()
+        try:
+            # Give the workers time to record their baselines
+            time.sleep(0.5)
+            future = time.time() + 5
+            for test_file in self.test_files:
+                os.utime(test_file, (future, future))
+
+            assert self._poll_until(watcher, lambda: all(os.path.exists(marker) for marker in self.marker_files))
+        finally:
+            watcher.stop_workers()
+
+        assert all(process is None for process in watcher._processes)
+
+    def test_dead_worker_is_restarted(self):
+        """Test that the supervisor restarts a worker that exits."""
+        watcher = ShardedFileWatcher(self.config_file, 2)
+        watcher.start_workers()
+        try:
+            original = watcher._processes[0]
+            original.terminate()
+            original.join()
+            watcher.poll_once()
+            assert watcher._processes[0] is not original
+            assert watcher._processes[0].is_alive()
+        finally:
+            watcher.stop_workers()
+
+    def test_paused_entry_is_skipped_by_its_worker(self):
+        """Test that entries paused through the control socket are paused in the workers."""
+        watcher = ShardedFileWatcher(self.config_file, 2)
+        watcher.start_workers()
+        try:
+            time.sleep(0.5)
+            with patch("cat_file_watcher.TimestampPrinter.print"):
+                watcher._handle_control_command("pause", self.test_files[0])
+            time.sleep(0.3)
+            future = time.time() + 5
+            for test_file in self.test_files:
+                os.utime(test_file, (future, future))
+            assert self._poll_until(watcher, lambda: all(os.path.exists(m) for m in self.marker_files[1:]))
+            self._poll_until(watcher, lambda: False, timeout=0.5)
+            assert not os.path.exists(self.marker_files[0])
+
+            with patch("cat_file_watcher.TimestampPrinter.print"):
+                watcher._handle_control_command("resume", self.test_files[0])
+            assert self._poll_until(watcher, lambda: os.path.exists(self.marker_files[0]))
+        finally:
+            watcher.stop_workers()
+
+    def test_restart_stops_workers_on_supervisor_loop(self):
+        """Test that an auto-update restart has the supervisor loop stop the workers."""
+        watcher = ShardedFileWatcher(self.config_file, 2)
+        watcher.start_workers()
+        stopping_threads = []
+        stop_workers = watcher.stop_workers
+        restart = threading.Thread(target=watcher._before_restart)
+        try:
+            with patch.object(
+                watcher,
+                "stop_workers",
+                side_effect=lambda: stopping_threads.append(threading.current_thread()) or stop_workers(),
+            ):
+                restart.start()
+                while watcher._restart_request is None:
+                    time.sleep(0.01)
+                assert all(process.is_alive() for process in watcher._processes)
+                watcher._serve_restart_request()
+                restart.join(timeout=5)
+        finally:
+            watcher.stop_workers()
+        assert not restart.is_alive()
+        assert stopping_threads == [threading.main_thread()]
+
+    def test_worker_applies_tick_budget_and_shedding(self):
+        """Test that a worker budgets its ticks, sheds load and configures Python workers."""
+        import queue
+
+        shard_config = {
+            "default_interval": "0.05s",
+            "tick_budget": "0.01s",
+            "files": [{"path": self.test_files[0], "command": "true"}],
+        }
+        control_queue = queue.Queue()
+        control_queue.put(None)
+        with patch.object(PythonWorkerPool, "configure") as mock_configure:
+            with patch.object(FileMonitor, "check_files", wraps=FileMonitor.check_files) as mock_check:
+                with patch.object(LoadShedder, "record_tick", return_value=None) as mock_record_tick:
+                    worker = _ShardWorker(0, shard_config, frozenset())
+                    started = time.monotonic()
+                    worker.run(control_queue)
+        mock_configure.assert_called_once_with(shard_config)
+        deadline = mock_check.call_args.args[6]
+        assert started < deadline < time.monotonic() + 0.01
+        mock_record_tick.assert_called_once_with(False)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for running commands in persistent shell sessions
+"""
+
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from command_executor import CommandExecutor
+from shell_session import ShellSession
+
+pytestmark = pytest.mark.skipif(not ShellSession.is_supported(), reason="shell sessions need a POSIX shell")
+
+
+class TestShellSession:
+    """Test cases for the shell-session runner."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = os.path.realpath(tempfile.mkdtemp())
+        self.other_dir = os.path.join(self.test_dir, "other")
+        os.mkdir(self.other_dir)
+        self.pid_file = os.path.join(self.test_dir, "pids.txt")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        ShellSession.shutdown()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _run(self, command, cwd=None):
+        """Run a command through the executor with the shell-session runner."""
+        settings = {"command": command, "runner": "shell-session"}
+        if cwd is not None:
+            settings["cwd"] = cwd
+        return CommandExecutor._run_command_string(command, settings, cwd)
+
+    def _record_shell(self, cwd=None):
+        """Record the pid of the shell running commands for a cwd ($$ is the session shell in subshells)."""
+        self._run(f"echo $$ >> {self.pid_file}", cwd)
+        with open(self.pid_file) as f:
+            return int(f.read().split()[-1])
+
+    def test_commands_share_a_session_per_cwd(self):
+        """Test that commands in one cwd reuse its shell and other cwds get their own."""
+        first = self._record_shell(self.test_dir)
+        assert self._record_shell(self.test_dir) == first
+        assert self._record_shell(self.other_dir) != first
+        assert first != os.getpid()
+
+    def test_exit_codes_and_isolation(self):
+        """Test that exit codes are reported and commands cannot change the session."""
+        assert self._run("true", self.test_dir).returncode == 0
+        assert self._run("cd /; FOO=changed; exit 5", self.test_dir).returncode == 5
+        self._run('echo "$(pwd) ${FOO:-unset}" > out.txt', self.test_dir)
+        with open(os.path.join(self.test_dir, "out.txt")) as f:
+            assert f.read().split() == [self.test_dir, "unset"]
+
+    def test_syntax_error_does_not_hang(self):
+        """Test that a command the shell cannot parse fails instead of waiting for more input."""
+        with patch.object(CommandExecutor, "COMMAND_TIMEOUT", 5):
+            assert self._run("echo 'unterminated", self.test_dir).returncode != 0
+            assert self._run("true", self.test_dir).returncode == 0
+
+    def test_timeout_kills_session(self):
+        """Test that a timed out command is killed with its session, which is then replaced."""
+        first = self._record_shell(self.test_dir)
+        with patch.object(CommandExecutor, "COMMAND_TIMEOUT", 0.5):
+            with pytest.raises(subprocess.TimeoutExpired):
+                self._run("sleep 30", self.test_dir)
+        assert self._record_shell(self.test_dir) != first
+
+    def test_crashed_session_falls_back_to_new_shell(self):
+        """Test that a command is still run when its session shell has died."""
+        first = self._record_shell(self.test_dir)
+        session = ShellSession._sessions[self.test_dir]
+        os.kill(first, signal.SIGKILL)
+        session.process.wait()
+        # The next command notices the dead shell before sending and starts a new session
+        assert self._record_shell(self.test_dir) != first
+
+        second = ShellSession._sessions[self.test_dir]
+        with patch.object(second.process.stdin, "write", side_effect=BrokenPipeError("gone")):
+            with patch("shell_session.TimestampPrinter.print") as mock_print:
+                assert self._run("exit 7", self.test_dir).returncode == 7
+        assert "Running the command in a new shell" in mock_print.call_args.args[0]
+        assert self.test_dir not in ShellSession._sessions
+
+    def test_session_dying_during_command_is_not_rerun(self):
+        """Test that a command whose session died while running it fails instead of running again."""
+        with pytest.raises(RuntimeError, match="exited before reporting"):
+            self._run(f"echo ran >> {self.pid_file}; kill -9 $$", self.test_dir)
+        with open(self.pid_file) as f:
+            assert f.read() == "ran\n"
+        assert self.test_dir not in ShellSession._sessions
+
+    def test_fallback_gets_remaining_time(self):
+        """Test that the fresh shell of an undelivered command only gets the time left."""
+        self._run("true", self.test_dir)
+        session = ShellSession._sessions[self.test_dir]
+
+        def slow_broken_write(data):
+            time.sleep(0.3)
+            raise BrokenPipeError("gone")
+
+        with patch.object(session.process.stdin, "write", side_effect=slow_broken_write):
+            with patch("shell_session.TimestampPrinter.print"), patch("subprocess.run") as mock_run:
+                ShellSession.run("true", self.test_dir, 5)
+        assert 0 < mock_run.call_args.kwargs["timeout"] <= 4.7
+
+    def test_executor_reports_session_failures(self):
+        """Test that the executor handles a failing session command like any other."""
+        settings = {"command": "exit 3", "runner": "shell-session"}
+        with patch("command_executor.TimestampPrinter.print") as mock_print:
+            assert CommandExecutor.execute_command("exit 3", "", settings)
+        messages = [call.args[0] for call in mock_print.call_args_list]
+        assert any("exit code 3" in message for message in messages)
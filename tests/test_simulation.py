@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Tests for the injectable clock and filesystem, and a simulated day of a 50k-entry config
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from clock import Clock, SystemClock, VirtualClock
+from command_executor import CommandExecutor
+from filesystem import FileSystem, MemoryFileSystem, OsFileSystem
+from path_backoff import PathBackoff
+from time_period_checker import TimePeriodChecker
+from timestamp_printer import TimestampPrinter
+
+# 2023-11-14 22:13:20 UTC
+WALL = 1_700_000_000.0
+
+
+class TestVirtualClockAndFileSystem:
+    """Test cases for the in-memory clock and filesystem implementations."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = VirtualClock(WALL)
+        Clock.set_clock(self.clock)
+
+    def teardown_method(self):
+        """Restore the system clock and filesystem."""
+        Clock.set_clock(None)
+        FileSystem.set_filesystem(None)
+
+    def test_virtual_clock_moves_only_when_told(self):
+        """Test that advance, suspend and wall steps move the expected clocks."""
+        assert (Clock.time(), Clock.monotonic(), Clock.boottime()) == (WALL, 0.0, 0.0)
+        Clock.sleep(10)
+        self.clock.suspend(100)
+        self.clock.step_wall(-5)
+        assert (Clock.time(), Clock.monotonic(), Clock.boottime()) == (WALL + 105, 10.0, 110.0)
+        assert Clock.now().timestamp() == WALL + 105
+
+    def test_set_none_restores_system(self):
+        """Test that resetting the clock and filesystem restores the real implementations."""
+        Clock.set_clock(None)
+        FileSystem.set_filesystem(None)
+        assert isinstance(Clock.get_clock(), SystemClock)
+        assert isinstance(FileSystem.get_filesystem(), OsFileSystem)
+        assert abs(Clock.time() - time.time()) < 5
+
+    def test_memory_filesystem(self):
+        """Test that files carry modification times and touch their parent directory."""
+        filesystem = MemoryFileSystem()
+        FileSystem.set_filesystem(filesystem)
+        filesystem.mkdir("/data", mtime=WALL - 100)
+        filesystem.write("/data/a.txt")
+        assert FileSystem.getmtime("/data/a.txt") == WALL
+        assert FileSystem.getmtime("/data/../data/a.txt") == WALL
+        assert FileSystem.getmtime("/data") == WALL
+
+        self.clock.advance(5)
+        filesystem.write("/data/a.txt")
+        assert FileSystem.getmtime("/data/a.txt") == WALL + 5
+        assert FileSystem.getmtime("/data") == WALL
+
+        filesystem.remove("/data/a.txt")
+        assert FileSystem.stat_mtime_ns("/data") == int((WALL + 5) * 1_000_000_000)
+        with pytest.raises(FileNotFoundError):
+            FileSystem.getmtime("/data/a.txt")
+
+
+class TestSimulatedWatcher:
+    """Test cases driving the watcher on a virtual clock and in-memory filesystem."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.clock = VirtualClock(WALL)
+        self.filesystem = MemoryFileSystem()
+        Clock.set_clock(self.clock)
+        FileSystem.set_filesystem(self.filesystem)
+        TimestampPrinter.set_output_sink(lambda line: None)
+        TimePeriodChecker.clear_cache()
+        self.runs = []
+
+    def teardown_method(self):
+        """Restore the system clock and filesystem and clean up."""
+        Clock.set_clock(None)
+        FileSystem.set_filesystem(None)
+        TimestampPrinter.set_output_sink(None)
+        TimePeriodChecker.clear_cache()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _create_watcher(self, content):
+        """Write the config to disk and into the in-memory filesystem, and create a watcher."""
+        with open(self.config_file, "w") as f:
+            f.write(content)
+        self.filesystem.write(self.config_file)
+        return FileWatcher(self.config_file)
+
+    def _record_run(self, command, filename, settings, config=None):
+        """Stand-in for CommandExecutor.execute_command recording the run."""
+        self.runs.append((Clock.monotonic(), filename or command))
+
+    def _run_for(self, watcher, seconds, interval, on_tick=None):
+        """Run main loop ticks until the given number of virtual seconds have passed."""
+        end = Clock.monotonic() + seconds
+        with patch.object(CommandExecutor, "execute_command", side_effect=self._record_run):
+            while Clock.monotonic() < end:
+                if on_tick is not None:
+                    on_tick()
+                self.clock.advance(watcher.run_tick(interval))
+
+    def test_detects_changes_and_polls_commands(self):
+        """Test that in-memory writes and periodic commands follow the virtual clock."""
+        self.filesystem.write("/sim/a.txt")
+        watcher = self._create_watcher(
+            'config_check_interval = "1m"\n'
+            '[[files]]\npath = "/sim/a.txt"\ncommand = "echo"\ninterval = "10s"\n'
+            '[[commands]]\ncommand = "tick"\ninterval = "1m"\n'
+        )
+        self._run_for(watcher, 30, 10.0)
+        self.filesystem.write("/sim/a.txt")
+        self._run_for(watcher, 90, 10.0)
+
+        assert [target for _, target in self.runs if target == "/sim/a.txt"] == ["/sim/a.txt"]
+        # The command is due again after 60s and caught by the next 10s tick
+        ticks = [at for at, target in self.runs if target == "tick"]
+        assert len(ticks) == 2 and 60 <= ticks[1] - ticks[0] <= 70
+
+    def test_suspend_is_detected(self):
+        """Test that a simulated suspend reaches the clock discontinuity handling."""
+        watcher = self._create_watcher('[[commands]]\ncommand = "tick"\ninterval = "1m"\n')
+        self._run_for(watcher, 60, 1.0)
+        self.clock.suspend(3600)
+        self._run_for(watcher, 1, 1.0)
+        assert watcher.stats["suspends"] == 1
+
+    def test_time_periods_follow_virtual_time(self):
+        """Test that time periods are evaluated against the virtual wall clock."""
+        opens = time.strftime("%H:%M", time.localtime(WALL + 3600))
+        closes = time.strftime("%H:%M", time.localtime(WALL + 7200))
+        watcher = self._create_watcher(
+            f'[time_periods]\nnight = {{ start = "{opens}", end = "{closes}" }}\n'
+            '[[commands]]\ncommand = "tick"\ninterval = "10m"\ntime_period = "night"\n'
+        )
+        self._run_for(watcher, 3 * 3600, 60.0)
+        assert self.runs
+        assert all(3600 - 60 <= at <= 7200 + 60 for at, _ in self.runs)
+
+    def test_replays_a_day_of_50k_entries(self):
+        """Benchmark: replay 24 virtual hours of a 50k-entry config without touching the watched paths."""
+        entries = 50_000
+        paths = [f"/sim/dir{index % 100}/file{index}.txt" for index in range(entries)]
+        for path in paths:
+            self.filesystem.write(path)
+        watcher = self._create_watcher(
+            'default_interval = "1h"\nconfig_check_interval = "1h"\n'
+            + "".join(f'[[files]]\npath = "{path}"\ncommand = "echo"\n' for path in paths)
+        )
+        interval = watcher._calculate_main_loop_interval()
+
+        rng = random.Random(42)
+        changed = set()
+
+        def modify_some():
+            # A few writes per hour, then the clock moves on
+            for _ in range(5):
+                path = rng.choice(paths)
+                self.filesystem.write(path)
+                changed.add(path)
+
+        started = time.perf_counter()
+        self._run_for(watcher, 24 * 3600, interval, on_tick=modify_some)
+        elapsed = time.perf_counter() - started
+
+        print(f"\n24h of {entries} entries replayed in {elapsed:.1f}s, {len(self.runs)} command runs")
+        assert len(self.runs) >= len(changed) - 5
+        assert {target for _, target in self.runs} <= changed
+        assert not any(PathBackoff.is_backing_off(watcher.file_backoff, key) for key in watcher.file_backoff)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Tests for persistent watcher state across restarts
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from config_loader import ConfigLoader
+from repo_updater import RepoUpdater
+from state_store import StateStore
+
+
+class TestStateStore:
+    """Test cases for persistent watcher state."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.state_file = os.path.join(self.test_dir, "state.json")
+        self.marker_file = os.path.join(self.test_dir, "marker.txt")
+        self.test_file = os.path.join(self.test_dir, "test.txt")
+        with open(self.test_file, "w") as f:
+            f.write("Initial content\n")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write_config(self, extra=""):
+        """Write a config watching test_file with state_file enabled."""
+        with open(self.config_file, "w") as f:
+            f.write(f'''default_interval = "0.05s"
+state_file = "{self.state_file}"
+{extra}
+
+[[files]]
+path = "{self.test_file}"
+command = "echo changed >> {self.marker_file}"
+''')
+
+    def _modify_test_file(self):
+        """Modify test_file so its timestamp visibly changes."""
+        with open(self.test_file, "a") as f:
+            f.write("Modified while down\n")
+        future = time.time() + 5
+        os.utime(self.test_file, (future, future))
+
+    def _marker_count(self):
+        """Return how many times the command ran."""
+        if not os.path.exists(self.marker_file):
+            return 0
+        with open(self.marker_file) as f:
+            return len(f.readlines())
+
+    def test_save_writes_compact_state_atomically(self):
+        """Test that the state file is compact JSON with no temporary files left behind."""
+        self._write_config()
+        watcher = FileWatcher(self.config_file)
+        watcher._check_files()
+        watcher._save_state()
+
+        with open(self.state_file) as f:
+            content = f.read()
+        state = json.loads(content)
+        assert state["version"] == StateStore.STATE_VERSION
+        assert content.startswith('{"version":1,"entries":{')
+        assert list(state["entries"].values())[0][0] == watcher.file_timestamps["#0"]
+        assert [name for name in os.listdir(self.test_dir) if name.startswith(".state-")] == []
+
+    def test_change_while_down_fires_after_restart(self):
+        """Test that a file modified while the watcher was down triggers its command on restart."""
+        self._write_config()
+        watcher = FileWatcher(self.config_file)
+        watcher._check_files()
+        watcher._save_state()
+        assert self._marker_count() == 0
+
+        self._modify_test_file()
+
+        restarted = FileWatcher(self.config_file)
+        restarted._check_files()
+        assert self._marker_count() == 1
+
+    def test_unchanged_file_does_not_fire_after_restart(self):
+        """Test that an unchanged file does not trigger its command on restart."""
+        self._write_config()
+        watcher = FileWatcher(self.config_file)
+        watcher._check_files()
+        watcher._save_state()
+
+        restarted = FileWatcher(self.config_file)
+        restarted._check_files()
+        assert self._marker_count() == 0
+
+    def test_skip_policy_does_not_catch_up(self):
+        """Test that state_catch_up = "skip" only records a fresh baseline."""
+        self._write_config('state_catch_up = "skip"')
+        watcher = FileWatcher(self.config_file)
+        watcher._check_files()
+        watcher._save_state()
+
+        self._modify_test_file()
+
+        restarted = FileWatcher(self.config_file)
+        restarted._check_files()
+        assert self._marker_count() == 0
+
+    def test_identity_survives_reordering(self):
+        """Test that saved state is matched by entry identity rather than index."""
+        self._write_config()
+        watcher = FileWatcher(self.config_file)
+        watcher._check_files()
+        watcher._save_state()
+        saved_mtime = watcher.file_timestamps["#0"]
+
+        # Insert another entry first so the watched entry moves from #0 to #1
+        with open(self.config_file) as f:
+            content = f.read()
+        header, files_part = content.split("[[files]]", 1)
+        with open(self.config_file, "w") as f:
+            f.write(f'{header}[[files]]\npath = "{self.config_file}"\ncommand = "echo other"\n\n[[files]]{files_part}')
+
+        restarted = FileWatcher(self.config_file)
+        assert restarted.config["files"][1]["path"] == self.test_file
+        assert restarted.file_timestamps["#1"] == saved_mtime
+        assert "#0" not in restarted.file_timestamps
+
+    def test_periodic_command_resumes_from_last_run(self):
+        """Test that a periodic command does not fire immediately if it ran recently before restart."""
+        with open(self.config_file, "w") as f:
+            f.write(f'''state_file = "{self.state_file}"
+
+[[commands]]
+command = "echo periodic >> {self.marker_file}"
+interval = "1h"
+''')
+        watcher = FileWatcher(self.config_file)
+        watcher._check_files()
+        watcher._save_state()
+        assert self._marker_count() == 1
+
+        restarted = FileWatcher(self.config_file)
+        restarted._check_files()
+        assert self._marker_count() == 1
+
+    def test_invalid_catch_up_policy_exits(self):
+        """Test that an unsupported state_catch_up value is rejected at load."""
+        self._write_config('state_catch_up = "sometimes"')
+        with pytest.raises(SystemExit):
+            ConfigLoader.load_config(self.config_file)
+
+    def test_state_saved_before_repo_updater_restart(self):
+        """Test that the auto-update restart hook checkpoints the state."""
+        before_restart = MagicMock()
+        updater = RepoUpdater({"auto_update": {"enabled": True}}, before_restart=before_restart)
+        with patch("os.execv"):
+            updater._restart()
+        before_restart.assert_called_once()
+
+    def test_duplicate_entries_are_rejected(self):
+        """Test that only entries that would share saved state are quarantined, and only with state_file."""
+        entries = """
+[[commands]]
+command = "make"
+interval = "1h"
+
+[[commands]]
+command = "make"
+interval = "2h"
+
+[[commands]]
+command = "make"
+interval = "1h"
+
+[[commands]]
+command = "backup.sh"
+schedule = "0 3 * * *"
+
+[[commands]]
+command = "backup.sh"
+schedule = "0 15 * * *"
+"""
+        with open(self.config_file, "w") as f:
+            f.write(f'state_file = "{self.state_file}"\n{entries}')
+        with patch("config_validator.TimestampPrinter.print"):
+            config = ConfigLoader.load_config(self.config_file)
+        assert [entry.get("interval") or entry["schedule"] for entry in config["files"]] == [
+            "1h",
+            "2h",
+            "0 3 * * *",
+            "0 15 * * *",
+        ]
+        assert "Duplicate entry 'make'" in config["quarantined_files"][0]["reason"]
+        assert len({StateStore.get_entry_identity(entry) for entry in config["files"]}) == 4
+
+        with open(self.config_file, "w") as f:
+            f.write(entries)
+        assert len(ConfigLoader.load_config(self.config_file)["files"]) == 5
+
+    def test_restart_state_saved_by_main_loop(self):
+        """Test that a restart requested on the updater's thread has the main loop save the state."""
+        self._write_config()
+        watcher = FileWatcher(self.config_file)
+        saving_threads = []
+        restart = threading.Thread(target=watcher._before_restart)
+        with patch.object(
+            StateStore, "save", side_effect=lambda *args: saving_threads.append(threading.current_thread())
+        ):
+            restart.start()
+            while watcher._restart_request is None:
+                time.sleep(0.01)
+            watcher.run_tick(0.05)
+            restart.join(timeout=5)
+        assert not restart.is_alive()
+        assert saving_threads == [threading.main_thread()]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for tick overrun reporting and time-budgeted ticks
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from config_loader import ConfigLoader
+from file_monitor import FileMonitor
+from load_shedder import LoadShedder
+from tick_monitor import TickMonitor
+
+
+class TestTickBudget:
+    """Test cases for tick cost accounting, overruns and the tick budget."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+        self.marker_file = os.path.join(self.test_dir, "marker.txt")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        TickMonitor.begin_tick()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write_commands(self, commands, extra=""):
+        """Write a config with one periodic [[commands]] entry per command."""
+        entries = "".join(f'\n[[commands]]\ncommand = "{command}"\ninterval = "1h"\n' for command in commands)
+        with open(self.config_file, "w") as f:
+            f.write(f"{extra}\n{entries}")
+
+    def _markers(self):
+        """Return the lines written to the marker file."""
+        if not os.path.exists(self.marker_file):
+            return []
+        with open(self.marker_file) as f:
+            return [line.strip() for line in f]
+
+    def test_overrun_reported_with_cause(self, capsys):
+        """Test that an overrunning tick is reported with the command as its cause."""
+        self._write_commands(["sleep 0.2"])
+        watcher = FileWatcher(self.config_file)
+
+        TickMonitor.begin_tick()
+        started = time.monotonic()
+        watcher._check_files()
+        watcher._record_tick(time.monotonic() - started, 0.05)
+
+        output = capsys.readouterr().out
+        assert "exceeding the 0.05s interval" in output
+        assert "mostly command" in output
+        assert watcher.stats["overruns"] == 1
+
+    def test_overrun_streak_reported_once(self, capsys):
+        """Test that consecutive overruns are counted but reported once."""
+        self._write_commands(["echo hi"])
+        watcher = FileWatcher(self.config_file)
+        capsys.readouterr()
+
+        for _ in range(3):
+            TickMonitor.begin_tick()
+            watcher._record_tick(0.5, 0.1)
+
+        assert capsys.readouterr().out.count("exceeding") == 1
+        assert watcher.stats["overruns"] == 3
+
+    def test_budget_carries_due_entries_over_oldest_first(self):
+        """Test that entries left over by an exhausted budget run first on later ticks."""
+        self._write_commands([f"echo {index} >> {self.marker_file}" for index in range(4)])
+        watcher = FileWatcher(self.config_file)
+
+        # An already expired deadline still processes one entry per tick
+        for tick in range(4):
+            TickMonitor.begin_tick()
+            watcher._check_files(deadline=time.monotonic() - 1)
+            assert self._markers() == [str(index) for index in range(tick + 1)]
+            assert TickMonitor.get_carried_over() == 3 - tick
+
+    def test_budget_orders_only_due_entries(self):
+        """Test that a budgeted tick ranks the due entries, not every entry of the config."""
+        config = {"files": [{"path": "", "command": f"echo {index}", "interval": "1h"} for index in range(1000)]}
+        file_last_check = {f"#{index}": time.monotonic() for index in range(1000)}
+        del file_last_check["#10"], file_last_check["#500"]
+        config["files"][500]["priority"] = "critical"
+
+        runs = []
+        execute = patch("file_monitor.CommandExecutor.execute_command", side_effect=lambda *args: runs.append(args[0]))
+        with execute, patch("file_monitor.LoadShedder.get_rank", wraps=LoadShedder.get_rank) as mock_rank:
+            FileMonitor.check_files(config, {}, file_last_check, deadline=time.monotonic() + 60)
+        assert runs == ["echo 500", "echo 10"]
+        assert mock_rank.call_count == 2
+
+    def test_loop_sleeps_remaining_interval(self):
+        """Test that the main loop subtracts the tick duration from its sleep."""
+        self._write_commands(["sleep 0.2"])
+        watcher = FileWatcher(self.config_file)
+        waits = []
+
+        def stop_after_first_tick(timeout):
+            waits.append(timeout)
+            raise KeyboardInterrupt
+
+        with patch.object(watcher, "_wait_for_next_tick", side_effect=stop_after_first_tick):
+            watcher.run(interval=1.0)
+
+        assert 0.0 < waits[0] <= 0.8
+
+    def test_invalid_tick_budget_exits(self):
+        """Test that an unparsable tick_budget is rejected at load."""
+        self._write_commands(["echo hi"], 'tick_budget = "soon"')
+        with pytest.raises(SystemExit):
+            ConfigLoader.load_config(self.config_file)
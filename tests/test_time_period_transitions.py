@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for precomputed time period transitions
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from datetime import time as dt_time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cat_file_watcher import FileWatcher
+from clock import Clock, VirtualClock
+from command_executor import CommandExecutor
+from time_period_checker import TimePeriodChecker
+
+
+class TestTimePeriodTransitions:
+    """Test cases for window transitions, parking and idle sleeping."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        TimePeriodChecker._window_cache.clear()
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        TimePeriodChecker._window_cache.clear()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_window_state_normal_period(self):
+        """Test transitions for a period within one day."""
+        start, end = dt_time(9, 0), dt_time(17, 0)
+        assert TimePeriodChecker.get_window_state(start, end, datetime(2024, 1, 1, 8, 0)) == (
+            False,
+            datetime(2024, 1, 1, 9, 0),
+        )
+        assert TimePeriodChecker.get_window_state(start, end, datetime(2024, 1, 1, 12, 0)) == (
+            True,
+            datetime(2024, 1, 1, 17, 0),
+        )
+        assert TimePeriodChecker.get_window_state(start, end, datetime(2024, 1, 1, 17, 0, 30)) == (
+            False,
+            datetime(2024, 1, 2, 9, 0),
+        )
+
+    def test_window_state_midnight_period(self):
+        """Test transitions for a period spanning midnight."""
+        start, end = dt_time(23, 0), dt_time(1, 0)
+        assert TimePeriodChecker.get_window_state(start, end, datetime(2024, 1, 1, 0, 30)) == (
+            True,
+            datetime(2024, 1, 1, 1, 0),
+        )
+        assert TimePeriodChecker.get_window_state(start, end, datetime(2024, 1, 1, 12, 0)) == (
+            False,
+            datetime(2024, 1, 1, 23, 0),
+        )
+        assert TimePeriodChecker.get_window_state(start, end, datetime(2024, 1, 1, 23, 30)) == (
+            True,
+            datetime(2024, 1, 2, 1, 0),
+        )
+
+    def test_window_state_matches_is_in_time_period(self):
+        """Test that the precomputed state agrees with the per-call check across a day."""
+        for start, end in ((dt_time(9, 0), dt_time(17, 0)), (dt_time(23, 0), dt_time(1, 0))):
+            moment = datetime(2024, 1, 1)
+            while moment < datetime(2024, 1, 2):
+                is_active, _ = TimePeriodChecker.get_window_state(start, end, moment)
+                assert is_active == TimePeriodChecker.is_in_time_period(start, end, moment.time())
+                moment += timedelta(minutes=7, seconds=13)
+
+    def test_parked_entries_skip_parsing(self):
+        """Test that the period is parsed once and then served from the cache until its transition."""
+        config = {"time_periods": {"night": {"start": "23:00", "end": "01:00"}}}
+        settings = {"time_period": "night"}
+
+        with patch.object(TimePeriodChecker, "parse_time", wraps=TimePeriodChecker.parse_time) as parse_time:
+            first = TimePeriodChecker.should_monitor_file(config, settings)
+            for _ in range(100):
+                assert TimePeriodChecker.should_monitor_file(config, settings) == first
+        assert parse_time.call_count == 2
+
+    def test_changed_period_definition_is_not_served_from_cache(self):
+        """Test that editing a period's times takes effect immediately."""
+        now = datetime(2024, 1, 1, 12, 0).timestamp()
+        config = {"time_periods": {"work": {"start": "09:00", "end": "17:00"}}}
+        assert TimePeriodChecker.get_period_state(config, "work", now)[0] is True
+
+        config["time_periods"]["work"] = {"start": "13:00", "end": "17:00"}
+        assert TimePeriodChecker.get_period_state(config, "work", now) == (
+            False,
+            datetime(2024, 1, 1, 13, 0).timestamp(),
+        )
+
+    def test_idle_until_earliest_opening(self):
+        """Test that the idle time ends when the first period opens."""
+        now = datetime(2024, 1, 1, 12, 0).timestamp()
+        config = {
+            "time_periods": {
+                "night": {"start": "23:00", "end": "01:00"},
+                "evening": {"start": "18:00", "end": "20:00"},
+                "midday": {"start": "11:00", "end": "13:00"},
+            }
+        }
+        assert TimePeriodChecker.get_idle_until(config, {"night", "evening"}, now) == (
+            datetime(2024, 1, 1, 18, 0).timestamp()
+        )
+        assert TimePeriodChecker.get_idle_until(config, {"night", "midday"}, now) is None
+
+    def _write_config(self, with_unrestricted_entry=False):
+        """Write a config whose only period opens two hours from now."""
+        opens = datetime.now() + timedelta(hours=2)
+        closes = opens + timedelta(hours=1)
+        extra = '\n[[commands]]\ncommand = "echo always"\n' if with_unrestricted_entry else ""
+        with open(self.config_file, "w") as f:
+            f.write(f'''config_check_interval = "1h"
+
+[time_periods]
+later = {{ start = "{opens:%H:%M}", end = "{closes:%H:%M}" }}
+
+[[commands]]
+command = "echo later"
+time_period = "later"
+{extra}''')
+
+    def test_watcher_sleeps_until_next_config_check_when_all_inactive(self):
+        """Test that the loop sleeps past the minimum interval when every entry is parked."""
+        self._write_config()
+        watcher = FileWatcher(self.config_file)
+        watcher._check_config_file()
+
+        wait = watcher._get_idle_wait()
+        assert 3500 < wait <= 3600
+
+    def test_watcher_does_not_idle_with_unrestricted_entry(self):
+        """Test that entries without a time period keep the normal interval."""
+        self._write_config(with_unrestricted_entry=True)
+        watcher = FileWatcher(self.config_file)
+        watcher._check_config_file()
+
+        assert watcher._get_idle_wait() == 0.0
+
+    def test_idle_wait_ends_when_window_opens(self):
+        """Test that the idle wait is bounded by the opening transition."""
+        self._write_config()
+        watcher = FileWatcher(self.config_file)
+        watcher.config["config_check_interval"] = "5h"
+        watcher._check_config_file()
+
+        wait = watcher._get_idle_wait()
+        opens_in = TimePeriodChecker.get_idle_until(watcher.config, {"later"}) - time.time()
+        assert abs(wait - opens_in) < 1
+        assert 3600 < wait <= 7200
+
+    def test_inactive_entry_sleeps_until_window_opens(self):
+        """Test that the interval scheduler leaves an entry outside its period alone until the period opens."""
+        clock = VirtualClock(datetime(2024, 1, 1, 12, 0).timestamp())
+        Clock.set_clock(clock)
+        try:
+            with open(self.config_file, "w") as f:
+                f.write("""[time_periods]
+lunch = { start = "13:00", end = "14:00" }
+
+[[commands]]
+command = "echo lunch"
+interval = "1s"
+time_period = "lunch"
+""")
+            watcher = FileWatcher(self.config_file)
+            should_monitor_file = TimePeriodChecker.should_monitor_file
+            with patch.object(TimePeriodChecker, "should_monitor_file", wraps=should_monitor_file) as mock_check:
+                with patch.object(CommandExecutor, "execute_command") as mock_execute:
+                    for _ in range(59):
+                        watcher._check_files()
+                        clock.advance(60)
+                    assert mock_check.call_count == 1
+                    clock.advance(60)
+                    watcher._check_files()
+            assert mock_check.call_count == 2
+            mock_execute.assert_called_once()
+        finally:
+            Clock.set_clock(None)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Tests and benchmark for the timer queues behind the deadline scheduler
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from clock import Clock, VirtualClock
+from config_loader import ConfigLoader
+from deadline_scheduler import DeadlineScheduler
+from file_monitor import FileMonitor
+from interval_scheduler import IntervalScheduler
+from time_period_checker import TimePeriodChecker
+from timer_wheel import HeapQueue, TimerWheel
+
+START = 1_700_000_000.0
+
+# Minute-to-hour intervals, as used by large [[commands]] configs
+BENCHMARK_INTERVALS = (60, 300, 900, 1800, 3600)
+
+
+def run_benchmark(queue_class, timers, seconds=600):
+    """Schedule periodic timers and expire them over simulated one-second ticks.
+
+    Args:
+        queue_class: HeapQueue or TimerWheel
+        timers: Number of timers
+        seconds: Simulated seconds to run
+
+    Returns:
+        tuple: (insert seconds, expiry seconds, list of (deadline, key) firings)
+    """
+    rng = random.Random(timers)
+    intervals = [rng.choice(BENCHMARK_INTERVALS) for _ in range(timers)]
+    offsets = [rng.uniform(0, interval) for interval in intervals]
+    queue = queue_class(START)
+
+    started = time.perf_counter()
+    for key in range(timers):
+        queue.push(START + offsets[key], key)
+    inserted = time.perf_counter()
+
+    firings = []
+    for second in range(1, seconds + 1):
+        for deadline, key in queue.pop_until(START + second):
+            firings.append((deadline, key))
+            queue.push(deadline + intervals[key], key)
+    finished = time.perf_counter()
+    return inserted - started, finished - inserted, firings
+
+
+class TestTimerWheel:
+    """Test cases for the hierarchical timer wheel."""
+
+    def test_matches_heap_for_random_deadlines(self):
+        """Test that the wheel expires the same timers as the heap, never early."""
+        rng = random.Random(7)
+        heap, wheel = HeapQueue(START), TimerWheel(START)
+        # Spread over all levels, including the overflow list beyond ~194 days
+        for key in range(2000):
+            deadline = START + rng.choice((rng.uniform(0, 100), rng.uniform(0, 10**5), rng.uniform(0, 4 * 10**7)))
+            heap.push(deadline, key)
+            wheel.push(deadline, key)
+
+        now = START
+        while heap:
+            now += rng.uniform(0, 2 * 10**5)
+            expected = heap.pop_until(now)
+            assert wheel.pop_until(now) == expected
+            assert all(deadline <= now for deadline, _ in expected)
+        assert len(wheel) == 0
+        assert wheel.peek_deadline() is None
+
+    def test_fires_at_first_tick_boundary(self):
+        """Test that a timer expires at the first tick at or after its deadline."""
+        wheel = TimerWheel(START)
+        wheel.push(START + 5.5, "a")
+        assert wheel.pop_until(START + 5.9) == []
+        assert wheel.pop_until(START + 6.0) == [(START + 5.5, "a")]
+
+    def test_past_deadline_expires_on_next_pop(self):
+        """Test that a timer pushed with a passed deadline is expired immediately."""
+        wheel = TimerWheel(START)
+        wheel.pop_until(START + 100)
+        wheel.push(START + 50, "late")
+        assert wheel.peek_deadline() == START + 50
+        assert wheel.pop_until(START + 100) == [(START + 50, "late")]
+
+    def test_clock_going_back_does_not_fire_early(self):
+        """Test that timers set after the clock went back wait for their deadline."""
+        wheel = TimerWheel(START)
+        wheel.push(START + 2000, "before")
+        wheel.pop_until(START + 1000)
+        assert wheel.pop_until(START) == []
+        wheel.push(START + 60, "after")
+        assert wheel.pop_until(START + 59) == []
+        assert wheel.pop_until(START + 60) == [(START + 60, "after")]
+        assert wheel.pop_until(START + 1999) == []
+        assert wheel.pop_until(START + 2000) == [(START + 2000, "before")]
+
+    def test_peek_deadline(self):
+        """Test that the earliest deadline is found across levels."""
+        wheel = TimerWheel(START)
+        wheel.push(START + 7200, "b")
+        wheel.push(START + 90, "a")
+        assert wheel.peek_deadline() == START + 90
+        wheel.pop_until(START + 90)
+        assert wheel.peek_deadline() == START + 7200
+
+
+class TestSchedulerSelection:
+    """Test cases for selecting the timer queue by config."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.test_dir, "config.toml")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    @pytest.mark.parametrize("scheduler", ["heap", "timer-wheel"])
+    def test_scheduler_fires_cron_entries(self, scheduler):
+        """Test that both queue implementations drive cron entries the same way."""
+        config = {
+            "scheduler": scheduler,
+            "files": [
+                {"path": "", "command": "echo hourly", "schedule": "0 * * * *", "timezone": "UTC"},
+                {"path": "", "command": "echo quarter", "schedule": "*/15 * * * *", "timezone": "UTC"},
+            ],
+        }
+        scheduler = DeadlineScheduler()
+        scheduler.load(config, now=START)
+
+        # START is 22:13:20 UTC
+        assert scheduler.next_deadline() == START + 100
+        assert scheduler.pop_due(START + 99) == []
+        assert scheduler.pop_due(START + 3600) == ["#1", "#0"]
+        assert scheduler.get_deadline("#1") == START + 3700
+        assert scheduler.next_deadline() == START + 3700
+
+    @pytest.mark.parametrize("scheduler", ["heap", "timer-wheel"])
+    def test_interval_entries_visited_when_due(self, scheduler):
+        """Test that interval entries are only visited by ticks at which they may be due."""
+        config = {
+            "scheduler": scheduler,
+            "files": [{"path": "", "command": f"echo {index}", "interval": f"{index + 1}s"} for index in range(100)],
+        }
+        clock = VirtualClock()
+        file_timestamps, file_last_check = {}, {}
+        interval_scheduler = IntervalScheduler(config)
+        runs, visits = [], []
+        monitor_file = TimePeriodChecker.should_monitor_file
+
+        def record_visit(config, settings):
+            visits.append(settings["command"])
+            return monitor_file(config, settings)
+
+        Clock.set_clock(clock)
+        execute = patch("file_monitor.CommandExecutor.execute_command", side_effect=lambda *args: runs.append(args[0]))
+        try:
+            with execute, patch("file_monitor.TimePeriodChecker.should_monitor_file", side_effect=record_visit):
+                for second in range(21):
+                    FileMonitor.check_files(
+                        config, file_timestamps, file_last_check, interval_scheduler=interval_scheduler
+                    )
+                    if second == 0:
+                        assert len(visits) == 100
+                        visits.clear()
+                    clock.advance(1.0)
+        finally:
+            Clock.set_clock(None)
+
+        # An entry with an interval of n seconds runs at 0, n, 2n, ... and is visited only then
+        expected = [f"echo {index}" for index in range(100) for _ in range(0, 21, index + 1)]
+        assert sorted(runs) == sorted(expected)
+        assert len(visits) == len(runs) - 100
+
+    def test_unknown_scheduler_exits(self):
+        """Test that an unknown scheduler name is rejected at load."""
+        with open(self.config_file, "w") as f:
+            f.write('scheduler = "calendar"\n\n[[commands]]\ncommand = "echo hi"\n')
+        with pytest.raises(SystemExit):
+            ConfigLoader.load_config(self.config_file)
+
+
+class TestTimerQueueBenchmark:
+    """Benchmark comparing heap and timer wheel scheduling at 10k/100k timers.
+
+    Run with "pytest -s" to see the timings.
+    """
+
+    @pytest.mark.parametrize("timers", [10_000, 100_000])
+    def test_heap_vs_timer_wheel(self, timers):
+        """Test that both queues fire identically and report their timings."""
+        heap_insert, heap_expire, heap_firings = run_benchmark(HeapQueue, timers)
+        wheel_insert, wheel_expire, wheel_firings = run_benchmark(TimerWheel, timers)
+
+        print(
+            f"\n{timers} timers, 600 simulated seconds, {len(heap_firings)} firings:"
+            f"\n  heap:        insert {heap_insert * 1000:.1f}ms, expire {heap_expire * 1000:.1f}ms"
+            f"\n  timer-wheel: insert {wheel_insert * 1000:.1f}ms, expire {wheel_expire * 1000:.1f}ms"
+        )
+        assert wheel_firings == heap_firings